@@ -20,10 +20,14 @@ except Exception:  # Fallback for dev/linters
         def log_message(self, *a, **k):
             print(*a)
 
+        def update_display(self):
+            pass
+
 
 class Fadebender(ControlSurface):
     def __init__(self, c_instance):  # noqa: N803 (Live API uses this name)
         super(Fadebender, self).__init__(c_instance)
+        self._flush_events = None
         try:
             self.log_message("[Fadebender] Remote Script loaded")
         except Exception:
@@ -40,6 +44,9 @@ class Fadebender(ControlSurface):
                     lom_ops.set_scheduler(self.schedule_message)
                     # Provide Application.view for view switching
                     lom_ops.set_app_view_getter(lambda: self.application().view)
+                    # Flush batched listener events once per display tick
+                    lom_ops.set_tick_flush(True)
+                    self._flush_events = lom_ops.flush_events
                 except Exception:
                     pass
                 t = threading.Thread(target=start_udp_server, name="FadebenderUDP", daemon=True)
@@ -52,6 +59,15 @@ class Fadebender(ControlSurface):
             except Exception as e:  # pragma: no cover
                 self.log_message(f"[Fadebender] UDP not started: {e}")
 
+    def update_display(self):
+        super(Fadebender, self).update_display()
+        flush = getattr(self, "_flush_events", None)
+        if flush is not None:
+            try:
+                flush()
+            except Exception:
+                pass
+
 
 def create_instance(c_instance):  # noqa: N802 (Live API name)
     return Fadebender(c_instance)
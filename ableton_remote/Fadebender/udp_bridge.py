@@ -10,8 +10,11 @@ from __future__ import annotations
 import json
 import os
 import socket
+import time
+from collections import OrderedDict
 from . import lom_ops
-from typing import Callable, Optional, Any, Dict
+from . import wire
+from typing import Callable, Optional, Any, Dict, Iterable, List
 
 
 HOST = os.getenv("ABLETON_UDP_HOST", "127.0.0.1")
@@ -21,12 +24,106 @@ CLIENT_PORT = int(os.getenv("ABLETON_UDP_CLIENT_PORT", os.getenv("ABLETON_EVENT_
 
 _LIVE_ACCESSOR: Optional[Callable[[], Any]] = None
 
+# Fragmented replies kept for selective retransmission (see wire.py)
+FRAG_BYTES = int(os.getenv("FADEBENDER_UDP_FRAG_BYTES", str(wire.FRAG_BYTES)))
+STREAM_CACHE_MAX = 8
+STREAM_TTL_SEC = 15.0
+_STREAMS: "OrderedDict[int, Dict[str, Any]]" = OrderedDict()
+_NEXT_STREAM_ID = 1
+
+# fbp1 only pays off on param-value dumps (float columns); structure-only
+# replies (device tree, skip_param_values snapshots) encode faster as JSON
+COMPACT_OPS = {
+    "get_full_snapshot",
+    "get_track_device_params",
+    "get_return_device_params",
+    "get_master_device_params",
+}
+
 
 def set_live_accessor(getter: Callable[[], Any]):  # pragma: no cover
     global _LIVE_ACCESSOR
     _LIVE_ACCESSOR = getter
 
 
+def _reply_encoding(msg: Dict[str, Any]) -> str:
+    """Encoding for a reply: the client's choice, narrowed to JSON where fbp1 is slower."""
+    enc = wire.choose(msg.get("accept"))
+    if enc == wire.ENCODING and (msg.get("op") not in COMPACT_OPS or msg.get("skip_param_values")):
+        return wire.JSON
+    return enc
+
+
+def _open_stream(addr) -> Dict[str, Any]:
+    global _NEXT_STREAM_ID
+    now = time.time()
+    for sid in [s for s, st in _STREAMS.items() if now - st["ts"] > STREAM_TTL_SEC]:
+        del _STREAMS[sid]
+    while len(_STREAMS) >= STREAM_CACHE_MAX:
+        _STREAMS.popitem(last=False)
+    sid = _NEXT_STREAM_ID
+    _NEXT_STREAM_ID = (_NEXT_STREAM_ID % 0xFFFFFFFF) + 1
+    st = {"id": sid, "addr": addr, "parts": [], "ts": now, "done": False}
+    _STREAMS[sid] = st
+    return st
+
+
+def _send_stream(sock, addr, msg: Dict[str, Any], parts: Iterable[Dict[str, Any]]) -> None:
+    """Send each part as soon as it is produced, fragmented; the final part is flagged last."""
+    enc = _reply_encoding(msg)
+    st = _open_stream(addr)
+    pending = None
+    for part in parts:
+        if pending is not None:
+            _send_part(sock, st, wire.dumps(pending, enc), last=False)
+        pending = part
+    if pending is not None:
+        _send_part(sock, st, wire.dumps(pending, enc), last=True)
+
+
+def _send_part(sock, st: Dict[str, Any], blob: bytes, last: bool) -> None:
+    frags = wire.fragment(st["id"], len(st["parts"]), blob, last, FRAG_BYTES)
+    st["parts"].append(frags)
+    st["done"] = last
+    for f in frags:
+        try:
+            sock.sendto(f, st["addr"])
+        except Exception:
+            pass
+
+
+def _resend(sock, addr, msg: Dict[str, Any]) -> None:
+    st = _STREAMS.get(int(msg.get("stream_id") or 0))
+    if st is None or st["addr"] != addr:
+        return
+    parts: List[List[bytes]] = st["parts"]
+    out: List[bytes] = []
+    for item in msg.get("missing") or []:
+        try:
+            p, f = int(item[0]), int(item[1])
+        except Exception:
+            continue
+        if 0 <= p < len(parts):
+            out.extend(parts[p] if f < 0 else parts[p][f:f + 1])
+    # Tail probe: only the final part, so probes queued while parts were still
+    # being produced don't replay the whole stream
+    if msg.get("tail") and st["done"] and parts:
+        out.extend(parts[-1])
+    for f in out:
+        try:
+            sock.sendto(f, addr)
+        except Exception:
+            pass
+
+
+def _snapshot_parts(live_ctx, skip_param_values: bool) -> Iterable[Dict[str, Any]]:
+    count = 0
+    for kind, data in lom_ops.iter_full_snapshot(live_ctx, skip_param_values=skip_param_values):
+        count += 1
+        yield {"ok": True, "op": "get_full_snapshot", "part": kind, "data": data}
+    yield {"ok": True, "op": "get_full_snapshot", "part": "end", "count": count}
+
+
 def start_udp_server():  # pragma: no cover
     sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
     sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
@@ -34,8 +131,9 @@ def start_udp_server():  # pragma: no cover
     event_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
 
     def notify(payload: Dict[str, Any]):  # pragma: no cover
+        # payload is a single event or a {"event": "batch", "events": [...]} envelope
         try:
-            event_sock.sendto(json.dumps(payload).encode("utf-8"), (CLIENT_HOST, CLIENT_PORT))
+            event_sock.sendto(json.dumps(payload, separators=(",", ":")).encode("utf-8"), (CLIENT_HOST, CLIENT_PORT))
         except Exception:
             pass
 
@@ -45,6 +143,10 @@ def start_udp_server():  # pragma: no cover
             lom_ops.init_listeners(_LIVE_ACCESSOR())
     except Exception:
         pass
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 4 * 1024 * 1024)
+    except Exception:
+        pass
     while True:
         data, addr = sock.recvfrom(64 * 1024)
         try:
@@ -52,7 +154,15 @@ def start_udp_server():  # pragma: no cover
         except Exception:
             continue
         op = (msg.get("op") or "").strip()
+        if op == "resend":
+            _resend(sock, addr, msg)
+            continue
         try:
+            if op == "get_full_snapshot" and msg.get("stream") and msg.get("frag"):
+                # One part per section so the server can build the snapshot as it arrives
+                live_ctx = _LIVE_ACCESSOR() if _LIVE_ACCESSOR else None
+                _send_stream(sock, addr, msg, _snapshot_parts(live_ctx, bool(msg.get("skip_param_values", False))))
+                continue
             if op == "ping":
                 resp = {"ok": True, "op": "ping"}
             elif op == "get_overview":
@@ -82,6 +192,18 @@ def start_udp_server():  # pragma: no cover
                 live_ctx = _LIVE_ACCESSOR() if _LIVE_ACCESSOR else None
                 ok = lom_ops.set_send(live_ctx, track_index, send_index, value)
                 resp = {"ok": bool(ok), "op": op}
+            elif op == "set_mixer_bulk":
+                field = str(msg.get("field"))
+                send_index = msg.get("send_index")
+                pairs = []
+                for item in msg.get("values") or []:
+                    if isinstance(item, dict):
+                        pairs.append((int(item.get("track_index", 0)), float(item.get("value", 0.0))))
+                    else:
+                        pairs.append((int(item[0]), float(item[1])))
+                live_ctx = _LIVE_ACCESSOR() if _LIVE_ACCESSOR else None
+                data_out = lom_ops.set_mixer_bulk(live_ctx, field, pairs, send_index=send_index)
+                resp = {"ok": bool(data_out.get("ok")), "op": op, "data": data_out}
             elif op == "set_device_param":
                 track_index = int(msg.get("track_index", 0))
                 device_index = int(msg.get("device_index", 0))
@@ -216,6 +338,23 @@ def start_udp_server():  # pragma: no cover
                 live_ctx = _LIVE_ACCESSOR() if _LIVE_ACCESSOR else None
                 ok = lom_ops.set_return_device_param(live_ctx, return_index, device_index, param_index, value)
                 resp = {"ok": bool(ok), "op": op}
+            elif op == "set_device_params_bulk":
+                domain = str(msg.get("domain", "return"))
+                index = int(msg.get("index", msg.get("return_index", msg.get("track_index", 0))))
+                device_index = int(msg.get("device_index", 0))
+                pairs = []
+                for item in msg.get("params") or []:
+                    if isinstance(item, dict):
+                        pairs.append((int(item.get("param_index", 0)), float(item.get("value", 0.0))))
+                    else:
+                        pairs.append((int(item[0]), float(item[1])))
+                live_ctx = _LIVE_ACCESSOR() if _LIVE_ACCESSOR else None
+                data_out = lom_ops.set_device_params_bulk(live_ctx, domain, index, device_index, pairs)
+                resp = {"ok": bool(data_out.get("ok")), "op": op, "data": data_out}
+            elif op == "apply_writes":
+                live_ctx = _LIVE_ACCESSOR() if _LIVE_ACCESSOR else None
+                data_out = lom_ops.apply_writes(live_ctx, list(msg.get("writes") or []))
+                resp = {"ok": bool(data_out.get("ok")), "op": op, "data": data_out}
             elif op == "get_track_devices":
                 track_index = int(msg.get("track_index", 0))
                 live_ctx = _LIVE_ACCESSOR() if _LIVE_ACCESSOR else None
@@ -445,6 +584,10 @@ def start_udp_server():  # pragma: no cover
                 live_ctx = _LIVE_ACCESSOR() if _LIVE_ACCESSOR else None
                 ok = lom_ops.set_return_device_name(live_ctx, return_index, device_index, name)
                 resp = {"ok": bool(ok), "op": op}
+            elif op == "get_device_tree":
+                live_ctx = _LIVE_ACCESSOR() if _LIVE_ACCESSOR else None
+                data_out = lom_ops.get_device_tree(live_ctx)
+                resp = {"ok": True, "op": op, "data": data_out}
             elif op == "get_full_snapshot":
                 skip_param_values = bool(msg.get("skip_param_values", False))
                 live_ctx = _LIVE_ACCESSOR() if _LIVE_ACCESSOR else None
@@ -490,6 +633,12 @@ def start_udp_server():  # pragma: no cover
             resp = {"ok": False, "error": f"exception: {e}"}
 
         try:
-            sock.sendto(json.dumps(resp).encode("utf-8"), addr)
+            # Compact encoding only when the client asked for it and the op benefits (see wire.py)
+            blob = wire.dumps(resp, _reply_encoding(msg))
+            if msg.get("frag") and len(blob) > FRAG_BYTES:
+                # Too big for one datagram: send as a one-part stream
+                _send_part(sock, _open_stream(addr), blob, last=True)
+            else:
+                sock.sendto(blob, addr)
         except Exception:
             pass
@@ -0,0 +1,404 @@
+"""
+Compact wire encoding for UDP bridge responses.
+
+Pure stdlib (struct), so it runs inside Live's embedded Python; the server
+imports this same module to decode. Requests stay JSON; a client that can
+decode the compact form lists it in the request's "accept" field and the
+bridge answers in the first encoding it supports, so either side can be
+upgraded first and JSON remains the fallback. The bridge only uses the
+compact form for param-value dumps (udp_bridge.COMPACT_OPS); string-heavy
+structure replies are cheaper to produce as JSON.
+
+Frame ("fbp1"): MAGIC followed by one tagged value.
+  N T F            None / True / False
+  i <q  f <d       int64 / float64
+  j str            int outside int64 (decimal string)
+  s len utf8       new string, appended to the intern table
+  r ref            previously sent string (dict keys, repeated labels)
+  l n items        list
+  d n (key val)*   dict
+  C rows nkeys keys columns
+                   list of dicts sharing the same keys, stored column-wise:
+    D <nd          float column
+    I <ni          int32 column
+    Z len blob     string column joined with NUL (ASCII/UTF-8)
+    K len blob <nH string column with repeats: the distinct values joined
+                   with NUL, then one uint16 index per row
+    R ref          string column identical to an earlier one (param names
+                   of every device with the same signature are sent once)
+    X items        anything else (and short string columns), one tagged
+                   value per row
+
+Lengths/counts/refs are unsigned LEB128 varints. decode(encode(x)) equals
+json.loads(json.dumps(x)) for any JSON-serialisable x.
+
+Fragments: a client that sends "frag": 1 accepts replies split across
+datagrams, so a reply is no longer limited to one 64 KiB datagram. A reply
+is a stream of one or more parts (a streamed snapshot sends one part per
+track); each encoded part is cut into fragments of at most FRAG_BYTES:
+  FRAG_MAGIC <IIHHB stream_id part frag nfrags flags(1 = last part) payload
+The client reassembles parts in order and asks for fragments it knows are
+missing with {"op": "resend", "stream_id", "missing": [[part, frag], ...]}
+(frag -1 = whole part). When nothing is known missing but the stream has
+been idle for a while, {"op": "resend", "stream_id", "tail": 1} asks for the
+final part again, in case it was the one lost.
+"""
+from __future__ import annotations
+
+import json
+import struct
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+MAGIC = b"FB\x01"
+ENCODING = "fbp1"
+JSON = "json"
+SUPPORTED = (ENCODING, JSON)
+
+_TABLE_MIN_ROWS = 2
+# Shorter string columns go value-by-value so each string is interned
+# set-wide (e.g. a signature shared by many small device lists)
+_STR_COLUMN_MIN_ROWS = 8
+_INT32_MIN, _INT32_MAX = -(2 ** 31), 2 ** 31 - 1
+_INT64_MIN, _INT64_MAX = -(2 ** 63), 2 ** 63 - 1
+_pack_q = struct.Struct("<q").pack
+_pack_d = struct.Struct("<d").pack
+_unpack_q = struct.Struct("<q").unpack_from
+_unpack_d = struct.Struct("<d").unpack_from
+
+
+def choose(accept: Any) -> str:
+    """Pick the response encoding for a request's "accept" list (first supported wins)."""
+    if isinstance(accept, str):
+        accept = [accept]
+    for enc in accept or ():
+        if enc in SUPPORTED:
+            return str(enc)
+    return JSON
+
+
+def dumps(obj: Any, encoding: str = JSON) -> bytes:
+    if encoding == ENCODING:
+        try:
+            return encode(obj)
+        except Exception:
+            pass  # unexpected value type: JSON still carries it
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+def loads(data: bytes) -> Any:
+    """Decode a response in either encoding (detected by MAGIC)."""
+    if data[:3] == MAGIC:
+        return decode(data)
+    return json.loads(data.decode("utf-8"))
+
+
+def _json_key(k: Any) -> str:
+    # Same coercion json.dumps applies to non-string dict keys
+    return k if isinstance(k, str) else json.dumps(k)
+
+
+# --------- Encoder ---------
+class _Encoder:
+    def __init__(self) -> None:
+        self.out = bytearray()
+        self.strings: Dict[str, int] = {}
+        self.columns: Dict[Tuple[str, ...], int] = {}
+
+    def varint(self, n: int) -> None:
+        out = self.out
+        while n > 0x7F:
+            out.append((n & 0x7F) | 0x80)
+            n >>= 7
+        out.append(n)
+
+    def string(self, s: str) -> None:
+        ref = self.strings.get(s)
+        if ref is not None:
+            self.out += b"r"
+            self.varint(ref)
+            return
+        self.strings[s] = len(self.strings)
+        raw = s.encode("utf-8")
+        self.out += b"s"
+        self.varint(len(raw))
+        self.out += raw
+
+    def value(self, v: Any) -> None:
+        out = self.out
+        if v is None:
+            out += b"N"
+        elif v is True:
+            out += b"T"
+        elif v is False:
+            out += b"F"
+        elif isinstance(v, int):
+            if _INT64_MIN <= v <= _INT64_MAX:
+                out += b"i"
+                out += _pack_q(v)
+            else:
+                out += b"j"
+                self.string(str(v))
+        elif isinstance(v, float):
+            out += b"f"
+            out += _pack_d(v)
+        elif isinstance(v, str):
+            self.string(v)
+        elif isinstance(v, dict):
+            out += b"d"
+            self.varint(len(v))
+            for k, item in v.items():
+                self.string(_json_key(k))
+                self.value(item)
+        elif isinstance(v, (list, tuple)):
+            if not self.table(v):
+                out += b"l"
+                self.varint(len(v))
+                for item in v:
+                    self.value(item)
+        else:
+            raise TypeError(f"not JSON serializable: {type(v).__name__}")
+
+    def table(self, rows: Any) -> bool:
+        if len(rows) < _TABLE_MIN_ROWS or not isinstance(rows[0], dict):
+            return False
+        keys = tuple(rows[0].keys())
+        if not keys:
+            return False
+        for r in rows:
+            if not isinstance(r, dict) or tuple(r.keys()) != keys:
+                return False
+        self.out += b"C"
+        self.varint(len(rows))
+        self.varint(len(keys))
+        for k in keys:
+            self.string(_json_key(k))
+        for k in keys:
+            self.column([r[k] for r in rows])
+        return True
+
+    def column(self, col: List[Any]) -> None:
+        out = self.out
+        types = {type(x) for x in col}
+        if types == {float}:
+            out += b"D"
+            out += struct.pack(f"<{len(col)}d", *col)
+            return
+        if types == {int} and _INT32_MIN <= min(col) and max(col) <= _INT32_MAX:
+            out += b"I"
+            out += struct.pack(f"<{len(col)}i", *col)
+            return
+        if types == {str} and len(col) >= _STR_COLUMN_MIN_ROWS:
+            key = tuple(col)
+            ref = self.columns.get(key)
+            if ref is not None:
+                out += b"R"
+                self.varint(ref)
+                return
+            uniq = list(dict.fromkeys(col))
+            blob = "\x00".join(uniq)
+            if blob.count("\x00") == len(uniq) - 1:
+                self.columns[key] = len(self.columns)
+                raw = blob.encode("utf-8")
+                if len(uniq) * 2 <= len(col) and len(uniq) <= 0xFFFF:
+                    pos = {s: i for i, s in enumerate(uniq)}
+                    out += b"K"
+                    self.varint(len(raw))
+                    out += raw
+                    out += struct.pack(f"<{len(col)}H", *[pos[s] for s in col])
+                else:
+                    raw = "\x00".join(col).encode("utf-8")
+                    out += b"Z"
+                    self.varint(len(raw))
+                    out += raw
+                return
+        out += b"X"
+        for x in col:
+            self.value(x)
+
+
+def encode(obj: Any) -> bytes:
+    enc = _Encoder()
+    enc.out += MAGIC
+    enc.value(obj)
+    return bytes(enc.out)
+
+
+# --------- Decoder ---------
+class _Decoder:
+    def __init__(self, data: bytes, pos: int) -> None:
+        self.data = data
+        self.pos = pos
+        self.strings: List[str] = []
+        self.columns: List[List[str]] = []
+
+    def varint(self) -> int:
+        data = self.data
+        shift = n = 0
+        while True:
+            b = data[self.pos]
+            self.pos += 1
+            n |= (b & 0x7F) << shift
+            if b < 0x80:
+                return n
+            shift += 7
+
+    def raw(self, n: int) -> bytes:
+        start = self.pos
+        self.pos += n
+        return self.data[start:self.pos]
+
+    def value(self) -> Any:
+        tag = self.data[self.pos:self.pos + 1]
+        self.pos += 1
+        if tag == b"s":
+            s = self.raw(self.varint()).decode("utf-8")
+            self.strings.append(s)
+            return s
+        if tag == b"r":
+            return self.strings[self.varint()]
+        if tag == b"i":
+            v = _unpack_q(self.data, self.pos)[0]
+            self.pos += 8
+            return v
+        if tag == b"f":
+            v = _unpack_d(self.data, self.pos)[0]
+            self.pos += 8
+            return v
+        if tag == b"N":
+            return None
+        if tag == b"T":
+            return True
+        if tag == b"F":
+            return False
+        if tag == b"j":
+            return int(self.value())
+        if tag == b"d":
+            n = self.varint()
+            out: Dict[str, Any] = {}
+            for _ in range(n):
+                k = self.value()
+                out[k] = self.value()
+            return out
+        if tag == b"l":
+            return [self.value() for _ in range(self.varint())]
+        if tag == b"C":
+            return self.table()
+        raise ValueError(f"bad tag {tag!r} at {self.pos - 1}")
+
+    def table(self) -> List[Dict[str, Any]]:
+        rows = self.varint()
+        keys = [self.value() for _ in range(self.varint())]
+        cols = [self.column(rows) for _ in keys]
+        return [dict(zip(keys, vals)) for vals in zip(*cols)]
+
+    def column(self, n: int) -> Iterable[Any]:
+        tag = self.data[self.pos:self.pos + 1]
+        self.pos += 1
+        if tag == b"D":
+            col = struct.unpack_from(f"<{n}d", self.data, self.pos)
+            self.pos += 8 * n
+            return col
+        if tag == b"I":
+            col = struct.unpack_from(f"<{n}i", self.data, self.pos)
+            self.pos += 4 * n
+            return col
+        if tag == b"Z":
+            strs = self.raw(self.varint()).decode("utf-8").split("\x00")
+            self.columns.append(strs)
+            return strs
+        if tag == b"K":
+            uniq = self.raw(self.varint()).decode("utf-8").split("\x00")
+            idx = struct.unpack_from(f"<{n}H", self.data, self.pos)
+            self.pos += 2 * n
+            strs = [uniq[i] for i in idx]
+            self.columns.append(strs)
+            return strs
+        if tag == b"R":
+            return self.columns[self.varint()]
+        if tag == b"X":
+            return [self.value() for _ in range(n)]
+        raise ValueError(f"bad column tag {tag!r} at {self.pos - 1}")
+
+
+def decode(data: bytes) -> Any:
+    if data[:3] != MAGIC:
+        raise ValueError("not an fbp1 frame")
+    return _Decoder(data, 3).value()
+
+
+# --------- Fragments ---------
+FRAG_MAGIC = b"FBF"
+FRAG_BYTES = 32000  # payload per datagram; well under the 64 KiB UDP limit
+LAST_PART = 1
+_FRAG_HEADER = struct.Struct("<IIHHB")
+_FRAG_HEAD_LEN = len(FRAG_MAGIC) + _FRAG_HEADER.size
+
+
+def fragment(stream_id: int, part: int, blob: bytes, last: bool, frag_bytes: int = FRAG_BYTES) -> List[bytes]:
+    """Split one encoded part into datagrams."""
+    frag_bytes = max(1, int(frag_bytes))
+    chunks = [blob[i:i + frag_bytes] for i in range(0, len(blob), frag_bytes)] or [b""]
+    flags = LAST_PART if last else 0
+    return [
+        FRAG_MAGIC + _FRAG_HEADER.pack(stream_id, part, n, len(chunks), flags) + chunk
+        for n, chunk in enumerate(chunks)
+    ]
+
+
+def parse_fragment(data: bytes) -> Optional[Tuple[int, int, int, int, bool, bytes]]:
+    """(stream_id, part, frag, nfrags, last, payload), or None for an unfragmented reply."""
+    if data[:3] != FRAG_MAGIC or len(data) < _FRAG_HEAD_LEN:
+        return None
+    sid, part, frag, nfrags, flags = _FRAG_HEADER.unpack_from(data, 3)
+    return sid, part, frag, nfrags, bool(flags & LAST_PART), data[_FRAG_HEAD_LEN:]
+
+
+class Reassembler:
+    """Collects the fragments of one stream and releases parts in order."""
+
+    def __init__(self) -> None:
+        self.stream_id: Optional[int] = None
+        self.next_part = 0
+        self.last_part: Optional[int] = None
+        self._parts: Dict[int, List[Optional[bytes]]] = {}
+
+    @property
+    def done(self) -> bool:
+        return self.last_part is not None and self.next_part > self.last_part
+
+    @property
+    def incomplete(self) -> bool:
+        """True when a fragment is known to be missing (held parts are always behind a gap)."""
+        return bool(self._parts)
+
+    def add(self, frag: Tuple[int, int, int, int, bool, bytes]) -> List[Any]:
+        """Store a fragment; returns the parts (decoded) that became complete, in order."""
+        sid, part, n, nfrags, last, payload = frag
+        if self.stream_id is None:
+            self.stream_id = sid
+        if sid != self.stream_id or part < self.next_part or nfrags == 0 or n >= nfrags:
+            return []  # stale stream or duplicate
+        slots = self._parts.setdefault(part, [None] * nfrags)
+        if len(slots) == nfrags:
+            slots[n] = payload
+        if last:
+            self.last_part = part
+        ready = []
+        while True:
+            slots = self._parts.get(self.next_part)
+            if slots is None or any(c is None for c in slots):
+                break
+            del self._parts[self.next_part]
+            self.next_part += 1
+            ready.append(loads(b"".join(slots)))  # type: ignore[arg-type]
+        return ready
+
+    def resend_request(self) -> Dict[str, Any]:
+        """Ask for the fragments known to be missing, or for the final part when none are."""
+        if not self.incomplete:
+            return {"op": "resend", "stream_id": self.stream_id, "missing": [], "tail": 1}
+        missing = [[p, i] for p, slots in sorted(self._parts.items()) for i, c in enumerate(slots) if c is None]
+        for p in range(self.next_part, max(self._parts)):
+            if p not in self._parts:
+                missing.append([p, -1])  # whole part lost
+        return {"op": "resend", "stream_id": self.stream_id, "missing": missing}
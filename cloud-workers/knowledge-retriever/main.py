@@ -1,26 +1,50 @@
 from __future__ import annotations
 
 """
-Minimal FastAPI service scaffold for knowledge retrieval on Cloud Run.
+FastAPI service for knowledge retrieval (Cloud Run or local).
 
 Endpoints:
-- POST /ingest: Ingest Markdown from GCS, chunk, embed via Vertex, store in Firestore/GCS
-- POST /search: Semantic + keyword hybrid search over stored chunks
-
-Note: This is a scaffold. Wire credentials and libraries before deployment.
+- POST /ingest: Ingest Markdown from GCS (gs://bucket/prefix) or a local directory,
+  chunk by headings, embed, and store in the file-backed ChunkStore (see store.py)
+- POST /search: BM25 + cosine hybrid search over stored chunks, optional tag filter
+
+Config (env):
+- KR_DATA_DIR: store directory (default /tmp/knowledge-retriever)
+- KR_EMBEDDER: "hash" (deterministic, offline; default) or "vertex"
+- KR_LOCAL_ROOT: directory local ingest may read from; unset (the default
+  for deployed workers) accepts only gs:// prefixes
 """
 
-from typing import Any, Dict, List, Optional
-from fastapi import FastAPI
+import os
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel
 
-app = FastAPI(title="Fadebender Knowledge Retriever", version="0.1.0")
+from store import ChunkStore, content_hash, make_embedder
+
+app = FastAPI(title="Fadebender Knowledge Retriever", version="0.2.0")
+
+DATA_DIR = os.getenv("KR_DATA_DIR", "/tmp/knowledge-retriever")
+LOCAL_ROOT = os.getenv("KR_LOCAL_ROOT") or None
+
+_STORE: Optional[ChunkStore] = None
+_STORE_LOCK = threading.Lock()
+
+
+def get_store() -> ChunkStore:
+    global _STORE
+    with _STORE_LOCK:
+        if _STORE is None:
+            _STORE = ChunkStore(DATA_DIR, make_embedder())
+        return _STORE
 
 
 class IngestBody(BaseModel):
     gcs_prefix: str
     chunk_strategy: Optional[str] = "markdown_headings"
     overwrite: bool = False
+    tags: Optional[List[str]] = None
 
 
 class SearchBody(BaseModel):
@@ -34,27 +58,92 @@ def health() -> Dict[str, Any]:
     return {"ok": True, "service": "knowledge-retriever"}
 
 
+def _path_tags(rel: str, extra: Optional[List[str]]) -> List[str]:
+    """Tags for a doc: its directory names under the ingest prefix plus any given tags."""
+    parts = [p for p in rel.replace("\\", "/").split("/")[:-1] if p]
+    return parts + list(extra or [])
+
+
+def _gcs_docs(prefix: str, known: Dict[str, Dict[str, Any]], overwrite: bool) -> Tuple[str, Dict[str, Tuple[str, str]]]:
+    """List .md blobs under gs://bucket/prefix; download only those whose md5 changed."""
+    from google.cloud import storage  # type: ignore
+
+    bucket_name, _, blob_prefix = prefix[len("gs://"):].partition("/")
+    client = storage.Client(project=os.getenv("GOOGLE_CLOUD_PROJECT") or None)
+    docs: Dict[str, Tuple[str, str]] = {}
+    for blob in client.list_blobs(bucket_name, prefix=blob_prefix):
+        if not blob.name.endswith(".md"):
+            continue
+        path = f"gs://{bucket_name}/{blob.name}"
+        digest = blob.md5_hash or ""
+        prev = known.get(path)
+        if not overwrite and digest and prev and prev.get("hash") == digest:
+            docs[path] = (digest, "")
+            continue
+        text = blob.download_as_text()
+        docs[path] = (digest or content_hash(text), text)
+    return f"gs://{bucket_name}/{blob_prefix}", docs
+
+
+def _within(path: str, base: str) -> bool:
+    return os.path.commonpath([path, base]) == base
+
+
+def _local_docs(root: str) -> Tuple[str, Dict[str, Tuple[str, str]]]:
+    if not LOCAL_ROOT:
+        raise HTTPException(status_code=400, detail="local ingest disabled: gcs_prefix must start with gs://")
+    allowed = os.path.realpath(LOCAL_ROOT)
+    root = os.path.realpath(root)
+    if not _within(root, allowed):
+        raise HTTPException(status_code=403, detail="path outside KR_LOCAL_ROOT")
+    if not os.path.isdir(root):
+        raise HTTPException(status_code=400, detail=f"not a directory: {root}")
+    docs: Dict[str, Tuple[str, str]] = {}
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if not d.startswith(".")]
+        for name in filenames:
+            if not name.endswith(".md"):
+                continue
+            path = os.path.join(dirpath, name)
+            if not _within(os.path.realpath(path), allowed):
+                continue  # symlink escaping the root
+            with open(path, "r", encoding="utf-8", errors="replace") as f:
+                text = f.read()
+            docs[path] = (content_hash(text), text)
+    return root.rstrip(os.sep) + os.sep, docs
+
+
 @app.post("/ingest")
 def ingest(body: IngestBody) -> Dict[str, Any]:
-    # TODO: Implement
-    # 1) List GCS objects under prefix
-    # 2) Download .md files
-    # 3) Chunk by headings → [{id,path,title,section,text}]
-    # 4) Call Vertex Text Embeddings → vectors
-    # 5) Store vectors + metadata (Firestore or GCS JSONL); add tags
-    return {"ok": True, "enqueued": True, "prefix": body.gcs_prefix}
+    if body.chunk_strategy not in (None, "markdown_headings"):
+        raise HTTPException(status_code=400, detail=f"unsupported chunk_strategy: {body.chunk_strategy}")
+    store = get_store()
+    if body.gcs_prefix.startswith("gs://"):
+        prefix, docs = _gcs_docs(body.gcs_prefix, store.files, body.overwrite)
+    else:
+        prefix, docs = _local_docs(body.gcs_prefix)
+    stats = store.ingest(
+        docs,
+        prefix=prefix,
+        tags_for=lambda path: _path_tags(path[len(prefix):], body.tags),
+        overwrite=body.overwrite,
+    )
+    return {"ok": True, "prefix": body.gcs_prefix, "files": len(docs), "generation": store.generation, **stats}
 
 
 @app.post("/search")
 def search(body: SearchBody) -> Dict[str, Any]:
-    # TODO: Implement
-    # - Hybrid: combine semantic nearest neighbors with keyword overlap
-    # - Return minimal fields with citations
-    # For now, return an empty result set
-    return {"ok": True, "hits": [], "query": body.query, "top_k": body.top_k}
+    store = get_store()
+    hits = store.search(body.query, top_k=body.top_k, tags=body.tags)
+    return {
+        "ok": True,
+        "hits": hits,
+        "query": body.query,
+        "top_k": body.top_k,
+        "usage": {"chunks": len(store.chunks), "embedder": store.embedder.name, "generation": store.generation},
+    }
 
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8080)
-
+    uvicorn.run(app, host="0.0.0.0", port=int(os.getenv("PORT", "8080")))
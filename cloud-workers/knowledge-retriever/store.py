@@ -0,0 +1,370 @@
+"""
+File-backed chunk store for the knowledge retriever.
+
+Layout under the data dir:
+- vectors.f32: float32 matrix (rows x dim), L2-normalized, opened memory-mapped
+- chunks.jsonl: one metadata line per matrix row ({id,path,title,section,text,tags})
+- manifest.json: embedder + dim, and per source path its content hash, tags and row count
+
+Ingest is incremental: a source whose hash is unchanged keeps its rows (copied
+from the old mmap), so only new or edited documents are embedded. Search fuses
+BM25 over chunk text with cosine similarity against the mmap.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import os
+import re
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+STORE_VERSION = 1
+
+# Sections longer than this are split on paragraph boundaries
+CHUNK_MAX_CHARS = int(os.getenv("KR_CHUNK_MAX_CHARS", "3000"))
+BM25_K1 = 1.2
+BM25_B = 0.75
+BM25_WEIGHT = float(os.getenv("KR_BM25_WEIGHT", "0.3"))
+
+_TOKEN_RE = re.compile(r"[a-z0-9_]+")
+_HEADING_RE = re.compile(r"^(#{1,6})\s+(.+?)\s*#*\s*$", re.M)
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+# ---------- Chunking ----------
+def _split_long(text: str, limit: int) -> List[str]:
+    if len(text) <= limit:
+        return [text]
+    parts: List[str] = []
+    buf = ""
+    for para in re.split(r"\n\s*\n", text):
+        if buf and len(buf) + len(para) + 2 > limit:
+            parts.append(buf)
+            buf = para
+        else:
+            buf = f"{buf}\n\n{para}" if buf else para
+    if buf:
+        parts.append(buf)
+    return parts
+
+
+def chunk_markdown(path: str, text: str, tags: Iterable[str] = ()) -> List[Dict[str, Any]]:
+    """Split a markdown doc at headings; section is the heading trail ("A > B")."""
+    tag_list = sorted(set(tags))
+    matches = list(_HEADING_RE.finditer(text))
+    doc_title = os.path.splitext(os.path.basename(path))[0]
+    for m in matches:
+        if len(m.group(1)) == 1:
+            doc_title = m.group(2).strip()
+            break
+
+    spans: List[Tuple[List[str], str]] = []
+    preamble = text[: matches[0].start()] if matches else text
+    if preamble.strip():
+        spans.append(([], preamble.strip()))
+    trail: List[Tuple[int, str]] = []
+    for i, m in enumerate(matches):
+        level = len(m.group(1))
+        trail = [t for t in trail if t[0] < level] + [(level, m.group(2).strip())]
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(text)
+        body = text[m.end():end].strip()
+        if body:
+            spans.append(([t[1] for t in trail], body))
+
+    chunks: List[Dict[str, Any]] = []
+    for headings, body in spans:
+        section = " > ".join(headings)
+        for part in _split_long(body, CHUNK_MAX_CHARS):
+            n = len(chunks)
+            chunks.append({
+                "id": f"{content_hash(path)[:12]}-{n}",
+                "path": path,
+                "title": doc_title,
+                "section": section,
+                "text": part,
+                "tags": tag_list,
+            })
+    return chunks
+
+
+# ---------- Embedders ----------
+class HashingEmbedder:
+    """Deterministic offline embedder: signed feature hashing of unigrams + bigrams.
+
+    No model or network; useful for local runs and tests. Vectors are
+    L2-normalized so cosine similarity is a dot product.
+    """
+
+    def __init__(self, dim: int = 512) -> None:
+        self.dim = int(dim)
+        self.name = f"hash-{self.dim}"
+
+    def _vector(self, text: str) -> np.ndarray:
+        vec = np.zeros(self.dim, dtype="float32")
+        toks = tokenize(text)
+        for feat in toks + [f"{a} {b}" for a, b in zip(toks, toks[1:])]:
+            h = int.from_bytes(hashlib.blake2b(feat.encode("utf-8"), digest_size=8).digest(), "little")
+            vec[h % self.dim] += 1.0 if (h >> 63) & 1 else -1.0
+        return vec
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        if not texts:
+            return np.zeros((0, self.dim), dtype="float32")
+        return np.stack([self._vector(t) for t in texts])
+
+
+class VertexEmbedder:
+    """Vertex AI text embeddings (requires google-cloud-aiplatform and credentials)."""
+
+    def __init__(self, model: Optional[str] = None, batch_size: int = 100) -> None:
+        import vertexai  # type: ignore
+        from vertexai.language_models import TextEmbeddingModel  # type: ignore
+
+        project = os.getenv("VERTEX_PROJECT") or os.getenv("GOOGLE_CLOUD_PROJECT")
+        vertexai.init(project=project, location=os.getenv("VERTEX_LOCATION", "us-central1"))
+        model = model or os.getenv("KR_VERTEX_EMBED_MODEL", "text-embedding-004")
+        self._model = TextEmbeddingModel.from_pretrained(model)
+        self._batch = batch_size
+        self.dim = int(os.getenv("KR_VERTEX_EMBED_DIM", "768"))
+        self.name = f"vertex-{model}-{self.dim}"
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        rows: List[List[float]] = []
+        for i in range(0, len(texts), self._batch):
+            batch = self._model.get_embeddings(texts[i:i + self._batch], output_dimensionality=self.dim)
+            rows.extend(e.values for e in batch)
+        return np.asarray(rows, dtype="float32").reshape(len(rows), self.dim)
+
+
+def make_embedder(kind: Optional[str] = None):
+    """Embedder selected by KR_EMBEDDER ("hash" default, or "vertex")."""
+    kind = (kind or os.getenv("KR_EMBEDDER", "hash")).lower()
+    if kind == "vertex":
+        return VertexEmbedder()
+    return HashingEmbedder(int(os.getenv("KR_HASH_DIM", "512")))
+
+
+def _normalize_rows(mat: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(mat, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (mat / norms).astype("float32")
+
+
+# ---------- Store ----------
+class ChunkStore:
+    def __init__(self, data_dir: str, embedder: Any) -> None:
+        self.data_dir = data_dir
+        self.embedder = embedder
+        os.makedirs(data_dir, exist_ok=True)
+        self._lock = threading.RLock()
+        self.files: Dict[str, Dict[str, Any]] = {}
+        # Bumped on every ingest that changes the store; clients key caches on it
+        self.generation = 0
+        self.chunks: List[Dict[str, Any]] = []
+        self.vectors: np.ndarray = np.zeros((0, embedder.dim), dtype="float32")
+        self._postings: Dict[str, Dict[int, int]] = {}
+        self._lengths: np.ndarray = np.zeros(0)
+        self._avg_len = 0.0
+        self._load()
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.data_dir, name)
+
+    # ---------- Persistence ----------
+    def _load(self) -> None:
+        try:
+            with open(self._path("manifest.json"), "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+            if manifest.get("version") != STORE_VERSION or manifest.get("embedder") != self.embedder.name:
+                return
+            with open(self._path("chunks.jsonl"), "r", encoding="utf-8") as f:
+                chunks = [json.loads(line) for line in f if line.strip()]
+            rows = int(manifest.get("rows", 0))
+            if rows != len(chunks):
+                return
+            vectors = (
+                np.memmap(self._path("vectors.f32"), dtype="float32", mode="r", shape=(rows, self.embedder.dim))
+                if rows else np.zeros((0, self.embedder.dim), dtype="float32")
+            )
+        except Exception:
+            return
+        self.files = manifest.get("files") or {}
+        self.generation = int(manifest.get("generation", 0))
+        self.chunks = chunks
+        self.vectors = vectors
+        self._index_text()
+
+    def _save(self, vectors: np.ndarray, chunks: List[Dict[str, Any]], files: Dict[str, Dict[str, Any]]) -> None:
+        tmp = self._path("vectors.f32.tmp")
+        np.ascontiguousarray(vectors, dtype="float32").tofile(tmp)
+        os.replace(tmp, self._path("vectors.f32"))
+        tmp = self._path("chunks.jsonl.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            for c in chunks:
+                f.write(json.dumps(c, ensure_ascii=False) + "\n")
+        os.replace(tmp, self._path("chunks.jsonl"))
+        # Manifest last: it is what marks the store as complete
+        tmp = self._path("manifest.json.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({
+                "version": STORE_VERSION,
+                "embedder": self.embedder.name,
+                "dim": self.embedder.dim,
+                "rows": len(chunks),
+                "generation": self.generation + 1,
+                "files": files,
+            }, f)
+        os.replace(tmp, self._path("manifest.json"))
+
+    def _index_text(self) -> None:
+        postings: Dict[str, Dict[int, int]] = {}
+        lengths = np.zeros(len(self.chunks))
+        for i, c in enumerate(self.chunks):
+            toks = tokenize(f"{c.get('title', '')} {c.get('section', '')} {c.get('text', '')}")
+            lengths[i] = len(toks)
+            for t in toks:
+                row = postings.setdefault(t, {})
+                row[i] = row.get(i, 0) + 1
+        self._postings = postings
+        self._lengths = lengths
+        self._avg_len = float(lengths.mean()) if len(lengths) else 0.0
+
+    # ---------- Ingest ----------
+    def ingest(
+        self,
+        docs: Dict[str, Tuple[str, str]],
+        prefix: str = "",
+        tags_for: Any = None,
+        overwrite: bool = False,
+    ) -> Dict[str, Any]:
+        """Bring the store in line with ``docs`` (path -> (hash, text or "")).
+
+        Paths under ``prefix`` that are missing from ``docs`` are dropped.
+        An empty text means "unchanged, not downloaded" and is only valid
+        when the hash matches what is stored.
+        """
+        with self._lock:
+            old_rows: Dict[str, List[int]] = {}
+            for i, c in enumerate(self.chunks):
+                old_rows.setdefault(c["path"], []).append(i)
+
+            keep_idx: List[int] = []
+            new_chunks: List[Dict[str, Any]] = []
+            files: Dict[str, Dict[str, Any]] = {}
+            retag: Dict[str, List[str]] = {}
+            stats = {"unchanged": 0, "retagged": 0, "embedded": 0, "removed": 0, "chunks": 0}
+
+            for path, meta in self.files.items():
+                if path in docs:
+                    continue
+                if path.startswith(prefix):
+                    stats["removed"] += 1
+                else:
+                    keep_idx.extend(old_rows.get(path, []))
+                    files[path] = meta
+
+            for path in sorted(docs):
+                digest, text = docs[path]
+                prev = self.files.get(path)
+                tags = sorted(set(tags_for(path))) if tags_for else []
+                if not overwrite and prev and prev.get("hash") == digest and path in old_rows:
+                    # Tags aren't embedded: same text under new tags keeps its vectors
+                    keep_idx.extend(old_rows[path])
+                    if prev.get("tags") != tags:
+                        retag[path] = tags
+                        files[path] = {**prev, "tags": tags}
+                        stats["retagged"] += 1
+                    else:
+                        files[path] = prev
+                        stats["unchanged"] += 1
+                    continue
+                if not text:
+                    continue
+                chunks = chunk_markdown(path, text, tags)
+                new_chunks.extend(chunks)
+                files[path] = {"hash": digest, "tags": tags, "chunks": len(chunks)}
+                stats["embedded"] += 1
+
+            new_vecs = (
+                _normalize_rows(self.embedder.embed([f"{c['title']}\n{c['section']}\n{c['text']}" for c in new_chunks]))
+                if new_chunks else np.zeros((0, self.embedder.dim), dtype="float32")
+            )
+            kept = np.asarray(self.vectors[keep_idx], dtype="float32") if keep_idx else np.zeros((0, self.embedder.dim), dtype="float32")
+            vectors = np.concatenate([kept, new_vecs]) if len(new_vecs) else kept
+            kept_chunks = [self.chunks[i] for i in keep_idx]
+            if retag:
+                kept_chunks = [{**c, "tags": retag[c["path"]]} if c["path"] in retag else c for c in kept_chunks]
+            chunks = kept_chunks + new_chunks
+
+            if stats["embedded"] or stats["removed"] or stats["retagged"] or len(chunks) != len(self.chunks):
+                # Drop the old mmap before replacing its file
+                self.vectors = np.zeros((0, self.embedder.dim), dtype="float32")
+                self._save(vectors, chunks, files)
+                self.files = {}
+                self.chunks = []
+                self._load()
+            stats["chunks"] = len(self.chunks)
+            return stats
+
+    # ---------- Search ----------
+    def _bm25(self, tokens: List[str], rows: np.ndarray) -> np.ndarray:
+        n = len(self.chunks)
+        scores = np.zeros(n)
+        for t in set(tokens):
+            plist = self._postings.get(t)
+            if not plist:
+                continue
+            idf = math.log(1.0 + (n - len(plist) + 0.5) / (len(plist) + 0.5))
+            ids = np.fromiter(plist.keys(), dtype=np.int64, count=len(plist))
+            tf = np.fromiter(plist.values(), dtype="float64", count=len(plist))
+            norm = BM25_K1 * (1.0 - BM25_B + BM25_B * self._lengths[ids] / (self._avg_len or 1.0))
+            scores[ids] += idf * tf * (BM25_K1 + 1.0) / (tf + norm)
+        return scores[rows]
+
+    def search(self, query: str, top_k: int = 5, tags: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        with self._lock:
+            if not self.chunks:
+                return []
+            rows = np.arange(len(self.chunks))
+            if tags:
+                wanted = set(tags)
+                rows = np.array([i for i, c in enumerate(self.chunks) if wanted.intersection(c.get("tags") or ())], dtype=np.int64)
+                if not len(rows):
+                    return []
+
+            bm25 = self._bm25(tokenize(query), rows)
+            if bm25.max() > 0:
+                bm25 = bm25 / bm25.max()
+            q = _normalize_rows(self.embedder.embed([query]))[0]
+            cosine = np.clip(np.asarray(self.vectors[rows]) @ q, 0.0, None)
+            combined = BM25_WEIGHT * bm25 + (1.0 - BM25_WEIGHT) * cosine
+
+            k = min(int(top_k), len(rows))
+            top = np.argpartition(-combined, k - 1)[:k] if k < len(rows) else np.arange(len(rows))
+            top = top[np.argsort(-combined[top])]
+            hits = []
+            for j in top:
+                c = self.chunks[int(rows[j])]
+                hits.append({
+                    "id": c["id"],
+                    "path": c["path"],
+                    "title": c["title"],
+                    "section": c["section"],
+                    "text": c["text"],
+                    "tags": c.get("tags") or [],
+                    "score": float(combined[j]),
+                    "bm25_score": float(bm25[j]),
+                    "semantic_score": float(cosine[j]),
+                })
+            return hits
@@ -2,6 +2,7 @@
 
 __all__ = [
     "fetch_session_devices",
+    "fetch_session_vocabulary",
     "fetch_preset_devices",
     "fetch_mixer_params",
     "fetch_devices_cached",
@@ -9,7 +10,7 @@ __all__ = [
     "invalidate_cache",
 ]
 
-from .session_fetcher import fetch_session_devices
+from .session_fetcher import fetch_session_devices, fetch_session_vocabulary
 from .preset_fetcher import fetch_preset_devices, fetch_mixer_params
 from .cached_fetch import fetch_devices_cached, fetch_mixer_params_cached
 from .cache import invalidate_cache
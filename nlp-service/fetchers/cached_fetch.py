@@ -19,26 +19,26 @@ def fetch_devices_cached() -> List[Dict[str, str]] | None:
     """Fetch devices with caching.
 
     Priority:
-    1. Check cache (5 second TTL by default)
-    2. Fetch from session (Ableton Live)
-    3. Fallback to Firestore presets
+    1. Session vocabulary (Ableton Live), revalidated by ETag on each call
+    2. Cache of Firestore presets (5 second TTL by default)
+    3. Firestore presets
 
     Returns:
         List of devices or None
     """
+    # Session devices are revalidated (304) rather than expired on a timer
+    devices = fetch_session_devices()
+    if devices:
+        return devices
+
     ttl = get_cache_ttl()
 
-    # Try cache first
     cached = get_cached_devices(ttl)
     if cached is not None:
         return cached
 
-    # Fetch from session (most accurate)
-    devices = fetch_session_devices()
-
     # Fallback to Firestore if session unavailable
-    if not devices:
-        devices = fetch_preset_devices()
+    devices = fetch_preset_devices()
 
     # Cache the result
     if devices:
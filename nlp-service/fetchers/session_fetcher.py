@@ -2,49 +2,57 @@
 
 from __future__ import annotations
 
-from typing import Dict, List
+import os
+from typing import Any, Dict, List
 
+VOCABULARY_URL = os.getenv("FADEBENDER_VOCABULARY_URL", "http://127.0.0.1:8722/vocabulary")
 
-def fetch_session_devices() -> List[Dict[str, str]] | None:
-    """Fetch all devices from current Live session snapshot.
+# Last /vocabulary body and its ETag, revalidated with If-None-Match
+_VOCAB: Dict[str, Any] = {"etag": None, "body": None}
+
+
+def fetch_session_vocabulary() -> Dict[str, Any] | None:
+    """Current session vocabulary from the server's /vocabulary endpoint.
+
+    The server answers from memory; a 304 means the cached body is still
+    current, so repeated calls cost one tiny request and no parsing.
 
     Returns:
-        List of device dictionaries with 'name' and 'type' keys, or None if unavailable.
+        Dict with 'devices', 'mixer_params', 'parse_index_version', or None if unavailable.
     """
     try:
         import requests
 
-        resp = requests.get("http://127.0.0.1:8722/snapshot", timeout=2.0)
+        headers = {"If-None-Match": _VOCAB["etag"]} if _VOCAB["etag"] and _VOCAB["body"] else {}
+        resp = requests.get(VOCABULARY_URL, headers=headers, timeout=0.5)
+        if resp.status_code == 304:
+            return _VOCAB["body"]
         if not resp.ok:
             return None
 
-        snapshot = resp.json()
-        if not snapshot or not snapshot.get("ok"):
+        body = resp.json()
+        if not body or not body.get("ok"):
             return None
 
-        devices = []
-        seen = set()
-
-        # Extract from data.devices structure (more detailed)
-        data = snapshot.get("data", {})
-        device_data = data.get("devices", {})
-
-        # Process track devices
-        for track_idx, track_info in device_data.get("tracks", {}).items():
-            for dev in track_info.get("devices", []):
-                name = dev.get("name", "").strip()
-                if name and name not in seen:
-                    devices.append({"name": name, "type": "unknown"})
-                    seen.add(name)
-
-        # Process return devices
-        for return_idx, return_info in device_data.get("returns", {}).items():
-            for dev in return_info.get("devices", []):
-                name = dev.get("name", "").strip()
-                if name and name not in seen:
-                    devices.append({"name": name, "type": "unknown"})
-                    seen.add(name)
-
-        return devices if devices else None
+        _VOCAB["etag"] = resp.headers.get("ETag")
+        _VOCAB["body"] = body
+        return body
     except Exception:
         return None
+
+
+def fetch_session_devices() -> List[Dict[str, str]] | None:
+    """Fetch all devices in the current Live session.
+
+    Returns:
+        List of device dictionaries with 'name' and 'type' keys, or None if unavailable.
+    """
+    vocab = fetch_session_vocabulary()
+    if not vocab:
+        return None
+    devices = [
+        {"name": str(d.get("name", "")).strip(), "type": d.get("type") or "unknown"}
+        for d in vocab.get("devices") or []
+        if str(d.get("name", "")).strip()
+    ]
+    return devices if devices else None
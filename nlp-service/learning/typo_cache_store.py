@@ -13,6 +13,7 @@ from typing import Dict
 # Global cache
 _TYPO_CACHE: Dict[str, str] | None = None
 _CACHE_TIMESTAMP: float = 0
+_CACHE_VERSION: int = 0  # Bumped whenever the cached map is replaced
 _FIRESTORE_CLIENT = None
 _FIRESTORE_ENABLED = False
 
@@ -86,7 +87,7 @@ def get_typo_corrections() -> Dict[str, str]:
     Returns:
         Dictionary mapping typo -> correction (e.g., {"paning": "pan"})
     """
-    global _TYPO_CACHE, _CACHE_TIMESTAMP
+    global _TYPO_CACHE, _CACHE_TIMESTAMP, _CACHE_VERSION
 
     now = time.time()
 
@@ -101,6 +102,7 @@ def get_typo_corrections() -> Dict[str, str]:
     if _TYPO_CACHE is None or cache_age > TTL_SECONDS:
         _TYPO_CACHE = _load_from_firestore()
         _CACHE_TIMESTAMP = now
+        _CACHE_VERSION += 1
 
         if _TYPO_CACHE:
             print(f"[TYPO CACHE] Refreshed cache (age: {cache_age:.1f}s, {len(_TYPO_CACHE)} corrections)")
@@ -119,7 +121,7 @@ def save_typo_corrections(corrections: Dict[str, str]) -> bool:
     Returns:
         True if saved successfully, False otherwise
     """
-    global _TYPO_CACHE, _CACHE_TIMESTAMP
+    global _TYPO_CACHE, _CACHE_TIMESTAMP, _CACHE_VERSION
 
     _init_firestore()
 
@@ -149,6 +151,7 @@ def save_typo_corrections(corrections: Dict[str, str]) -> bool:
         # Update cache immediately
         _TYPO_CACHE = merged
         _CACHE_TIMESTAMP = time.time()
+        _CACHE_VERSION += 1
 
         print(f"[TYPO CACHE] Saved {len(corrections)} correction(s) to Firestore")
         return True
@@ -164,9 +167,20 @@ def force_refresh() -> Dict[str, str]:
     Returns:
         Updated typo corrections dictionary
     """
-    global _TYPO_CACHE, _CACHE_TIMESTAMP
+    global _TYPO_CACHE, _CACHE_TIMESTAMP, _CACHE_VERSION
 
     _TYPO_CACHE = _load_from_firestore()
     _CACHE_TIMESTAMP = time.time()
+    _CACHE_VERSION += 1
 
     return _TYPO_CACHE or {}
+
+
+def get_typo_cache_version() -> int:
+    """Version of the cached corrections map.
+
+    Changes whenever the map is reloaded or saved, so consumers can rebuild
+    derived structures (e.g. compiled matchers) only when it moves.
+    """
+    get_typo_corrections()  # apply TTL refresh first
+    return _CACHE_VERSION
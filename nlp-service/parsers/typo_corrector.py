@@ -2,20 +2,26 @@
 
 from __future__ import annotations
 
+import os
 import re
-from typing import Dict
+import threading
+from typing import Any, Dict, Optional, Tuple
 
 # Import typo sources at module level (avoid repeated imports)
 _firestore_typos = None
+_firestore_typo_version = None
 _config_typos = None
+_app_config = None
 
 try:
     from learning.typo_cache_store import get_typo_corrections as _firestore_typos
+    from learning.typo_cache_store import get_typo_cache_version as _firestore_typo_version
 except Exception:
     pass
 
 try:
     from server.config.app_config import get_typo_corrections as _config_typos
+    from server.config import app_config as _app_config
 except Exception:
     pass
 
@@ -35,6 +41,63 @@ ORDINAL_WORD_MAP = {
 }
 
 
+_WORD_RE = re.compile(r"\w+")
+_COMPACT_PAN_RE = re.compile(r"(\d+)([lr])")
+
+
+class TypoCorrector:
+    """Single-pass corrector compiled from a typo map.
+
+    Single-word typos, ordinal words and compact pan values ("30l", "25r")
+    are resolved per token with one dict lookup, so cost does not grow with
+    the size of the typo map. Typos that span several words or contain
+    non-word characters are matched by one compiled longest-first
+    alternation before the token pass.
+    """
+
+    def __init__(self, typo_map: Dict[str, str]) -> None:
+        words: Dict[str, str] = {}
+        phrases: Dict[str, str] = {}
+        for typo, correct in (typo_map or {}).items():
+            key = str(typo).strip().lower()
+            if not key:
+                continue
+            if _WORD_RE.fullmatch(key):
+                words[key] = str(correct)
+            else:
+                phrases[key] = str(correct)
+        self.size = len(words) + len(phrases)
+        # Ordinals take precedence, matching the original expansion order
+        self._tokens: Dict[str, str] = {**words, **ORDINAL_WORD_MAP}
+        self._phrases = phrases
+        self._phrase_re: Optional[re.Pattern[str]] = None
+        if phrases:
+            alternation = "|".join(re.escape(k) for k in sorted(phrases, key=len, reverse=True))
+            self._phrase_re = re.compile(rf"(?<!\w)(?:{alternation})(?!\w)")
+
+    def _token(self, m: "re.Match[str]") -> str:
+        tok = m.group(0)
+        hit = self._tokens.get(tok)
+        if hit is not None:
+            return hit
+        pan = _COMPACT_PAN_RE.fullmatch(tok)
+        if pan:
+            # Compact pan: 30l -> -30 (left is negative), 30r -> 30
+            return f"-{pan.group(1)}" if pan.group(2) == "l" else pan.group(1)
+        return tok
+
+    def apply(self, query: str) -> str:
+        q = query.lower().strip()
+        if self._phrase_re is not None:
+            q = self._phrase_re.sub(lambda m: self._phrases[m.group(0)], q)
+        return _WORD_RE.sub(self._token, q)
+
+
+_CORRECTOR: Optional[TypoCorrector] = None
+_CORRECTOR_KEY: Any = None
+_CORRECTOR_LOCK = threading.Lock()
+
+
 def get_typo_corrections() -> Dict[str, str]:
     """Get typo correction map from Firestore with TTL caching.
 
@@ -63,6 +126,38 @@ def get_typo_corrections() -> Dict[str, str]:
     return {}
 
 
+def _corrections_with_version() -> Tuple[Any, Dict[str, str]]:
+    """(version key, typo map) from the first available source."""
+    if _firestore_typos and _firestore_typo_version:
+        try:
+            version = _firestore_typo_version()
+            return ("firestore", version), _firestore_typos() or {}
+        except Exception:
+            pass
+    if _config_typos:
+        try:
+            # Config is cached per load; a reload swaps the dict
+            return ("config", id(_app_config._load())), _config_typos() or {}
+        except Exception:
+            pass
+    return ("none", 0), {}
+
+
+def get_typo_corrector() -> TypoCorrector:
+    """Compiled corrector, rebuilt only when the typo source reports a new version."""
+    global _CORRECTOR, _CORRECTOR_KEY
+    key, typo_map = _corrections_with_version()
+    if _CORRECTOR is not None and key == _CORRECTOR_KEY:
+        return _CORRECTOR
+    with _CORRECTOR_LOCK:
+        if _CORRECTOR is None or key != _CORRECTOR_KEY:
+            _CORRECTOR = TypoCorrector(typo_map)
+            _CORRECTOR_KEY = key
+            if os.getenv("DEBUG_TYPO_CORRECTION", "").lower() in ("1", "true", "yes"):
+                print(f"[TYPO CORRECTOR] Compiled {_CORRECTOR.size} corrections ({key[0]})")
+        return _CORRECTOR
+
+
 def apply_typo_corrections(query: str) -> str:
     """Apply typo corrections, expand ordinal words, and normalize compact pan format.
 
@@ -82,34 +177,7 @@ def apply_typo_corrections(query: str) -> str:
         >>> apply_typo_corrections("pan return A to 25R")
         'pan return a to 25'
     """
-    q = query.lower().strip()
-
-    # Expand ordinal words (first → 1, second → 2, etc.)
-    for word, digit in ORDINAL_WORD_MAP.items():
-        q = re.sub(rf"\b{word}\b", digit, q)
-
-    # Normalize compact pan format: 30L → -30, 30R → 30
-    # Must happen after lowercase conversion so "30L" becomes "30l"
-    q = re.sub(r'\b(\d+)l\b', r'-\1', q)  # 30l → -30 (left is negative)
-    q = re.sub(r'\b(\d+)r\b', r'\1', q)   # 30r → 30 (right stays positive)
-
-    # Apply typo corrections
-    typo_map = get_typo_corrections()
-
-    # Debug logging
-    import os
-    if os.getenv("DEBUG_TYPO_CORRECTION", "").lower() in ("1", "true", "yes"):
-        print(f"[TYPO CORRECTOR] Loaded {len(typo_map)} corrections")
-        if "pain" in query.lower():
-            print(f"[TYPO CORRECTOR] Query contains 'pain', checking corrections...")
-            print(f"[TYPO CORRECTOR] 'pain' in typo_map: {'pain' in typo_map}")
-            if 'pain' in typo_map:
-                print(f"[TYPO CORRECTOR] Will correct 'pain' → '{typo_map['pain']}'")
-
-    for typo, correct in typo_map.items():
-        old_q = q
-        q = re.sub(rf"\b{typo}\b", correct, q)
-        if old_q != q and os.getenv("DEBUG_TYPO_CORRECTION", "").lower() in ("1", "true", "yes"):
-            print(f"[TYPO CORRECTOR] Applied: '{typo}' → '{correct}'")
-
+    q = get_typo_corrector().apply(query)
+    if os.getenv("DEBUG_TYPO_CORRECTION", "").lower() in ("1", "true", "yes") and q != query.lower().strip():
+        print(f"[TYPO CORRECTOR] '{query}' → '{q}'")
     return q
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Listener-storm benchmark for Remote Script event batching.
+
+Drives the lom_ops stub (live=None) with a burst of mixer writes, the same
+shape as automation playback firing value listeners, and ships events over a
+real UDP socket to a local receiver that decodes them like
+server/services/event_listener.py does.
+
+Compares:
+  - unbatched: one JSON datagram per event (FADEBENDER_EVENT_BATCH_MS=0)
+  - batched:   events collapsed per parameter and flushed per window/tick
+
+Usage:
+  python3 scripts/benchmark_event_batching.py --events 20000 --window-ms 20
+  python3 scripts/benchmark_event_batching.py --tick-ms 100
+"""
+
+import argparse
+import json
+import socket
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ableton_remote.Fadebender import lom_ops
+
+
+class Receiver:
+    """Counts datagrams/events the way the server listener would decode them."""
+
+    def __init__(self) -> None:
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4 * 1024 * 1024)
+        self.sock.bind(("127.0.0.1", 0))
+        self.sock.settimeout(0.2)
+        self.addr = self.sock.getsockname()
+        self.datagrams = 0
+        self.events = 0
+        self.bytes = 0
+        self.decode_sec = 0.0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                data, _ = self.sock.recvfrom(64 * 1024)
+            except socket.timeout:
+                continue
+            except OSError:
+                return
+            t0 = time.perf_counter()
+            payload = json.loads(data.decode("utf-8"))
+            if payload.get("event") == "batch":
+                self.events += len(payload.get("events") or [])
+            else:
+                self.events += 1
+            self.decode_sec += time.perf_counter() - t0
+            self.datagrams += 1
+            self.bytes += len(data)
+
+    def stop(self) -> None:
+        time.sleep(0.3)  # drain in-flight datagrams
+        self._stop.set()
+        self._thread.join()
+        self.sock.close()
+
+
+def run_storm(n_events: int, window_ms: float, tick_ms: float) -> dict:
+    recv = Receiver()
+    recv.start()
+    send_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sent = {"datagrams": 0}
+
+    def notify(payload):
+        sent["datagrams"] += 1
+        send_sock.sendto(json.dumps(payload, separators=(",", ":")).encode("utf-8"), recv.addr)
+
+    lom_ops.set_notifier(notify)
+    lom_ops.EVENT_BATCH_WINDOW_SEC = max(0.0, window_ms) / 1000.0
+    lom_ops.set_tick_flush(tick_ms > 0 and window_ms > 0)
+
+    ticker_stop = threading.Event()
+
+    def ticker():
+        while not ticker_stop.is_set():
+            time.sleep(tick_ms / 1000.0)
+            lom_ops.flush_events()
+
+    tick_thread = None
+    if tick_ms > 0 and window_ms > 0:
+        tick_thread = threading.Thread(target=ticker, daemon=True)
+        tick_thread.start()
+
+    # Stub targets: 2 tracks, 2 returns, master; volume + pan each (10 value slots)
+    writers = [
+        lambda v: lom_ops.set_mixer(None, 1, "volume", v),
+        lambda v: lom_ops.set_mixer(None, 2, "volume", v),
+        lambda v: lom_ops.set_mixer(None, 1, "pan", v - 0.5),
+        lambda v: lom_ops.set_mixer(None, 2, "pan", v - 0.5),
+        lambda v: lom_ops.set_return_mixer(None, 0, "volume", v),
+        lambda v: lom_ops.set_return_mixer(None, 1, "volume", v),
+        lambda v: lom_ops.set_return_mixer(None, 0, "pan", v - 0.5),
+        lambda v: lom_ops.set_return_mixer(None, 1, "pan", v - 0.5),
+        lambda v: lom_ops.set_master_mixer(None, "volume", v),
+        lambda v: lom_ops.set_master_mixer(None, "pan", v - 0.5),
+    ]
+
+    t0 = time.perf_counter()
+    for i in range(n_events):
+        writers[i % len(writers)]((i % 1000) / 1000.0)
+    produce_sec = time.perf_counter() - t0
+    lom_ops.flush_events()
+    ticker_stop.set()
+    if tick_thread:
+        tick_thread.join()
+    recv.stop()
+    send_sock.close()
+    lom_ops.set_notifier(None)  # type: ignore[arg-type]
+    lom_ops.set_tick_flush(False)
+
+    return {
+        "produce_ms": produce_sec * 1000.0,
+        "events_per_sec": n_events / produce_sec if produce_sec > 0 else float("inf"),
+        "datagrams_sent": sent["datagrams"],
+        "datagrams_recv": recv.datagrams,
+        "events_recv": recv.events,
+        "bytes_recv": recv.bytes,
+        "decode_ms": recv.decode_sec * 1000.0,
+    }
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Benchmark Remote Script event batching")
+    ap.add_argument("--events", type=int, default=20000, help="Number of listener events to fire")
+    ap.add_argument("--window-ms", type=float, default=20.0, help="Batch window for the batched run")
+    ap.add_argument("--tick-ms", type=float, default=0.0, help="Simulate update_display ticks instead of timer flushes")
+    args = ap.parse_args()
+
+    print("=" * 72)
+    print(f"Listener storm: {args.events} events over 10 value slots")
+    print("=" * 72)
+    rows = [
+        ("unbatched", run_storm(args.events, 0.0, 0.0)),
+        ("batched", run_storm(args.events, args.window_ms, args.tick_ms)),
+    ]
+    print(f"{'mode':<10} {'events/s':>12} {'dgram sent':>11} {'dgram recv':>11} {'events recv':>12} {'KiB recv':>9} {'decode ms':>10}")
+    for name, r in rows:
+        print(
+            f"{name:<10} {r['events_per_sec']:>12.0f} {r['datagrams_sent']:>11} {r['datagrams_recv']:>11} "
+            f"{r['events_recv']:>12} {r['bytes_recv'] / 1024:>9.1f} {r['decode_ms']:>10.1f}"
+        )
+    print()
+    print("events recv < events fired in batched mode is expected: repeated values")
+    print("for the same parameter within a window are collapsed to the latest one.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
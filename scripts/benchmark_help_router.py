@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Benchmark HelpRouter.classify_query on a chat command mix.
+
+handle_chat classifies every message before parsing it, so the router's
+cost is paid by plain commands too. Compares the legacy path (uncompiled
+re.search over each pattern list in priority order) with the compiled
+router, cold (memo cleared each round) and warm (memoized), and checks
+both agree on every query outside the command fast path.
+
+Usage:
+    python3 scripts/benchmark_help_router.py
+    python3 scripts/benchmark_help_router.py --rounds 200
+"""
+import argparse
+import os
+import re
+import sys
+import time
+from typing import Any, Dict, List, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from server.services.help_router import HelpRouter, QueryType
+
+
+COMMANDS = [
+    "set track 1 volume to -6 db",
+    "set track 2 volume to -12 db",
+    "increase track 1 volume by 3 db",
+    "decrease return a volume by 2 db",
+    "mute track 3",
+    "solo track 2",
+    "unmute return b",
+    "pan track 4 to 25% left",
+    "set track 1 send a to -18 db",
+    "set return a reverb decay to 2 s",
+    "set return b delay feedback to 40%",
+    "turn off compressor on track 2",
+    "set master volume to -3 db",
+    "raise track 5 pan by 10",
+    "load reverb on track 1",
+    "what is track 1 volume",
+    "track 2 volume -6",
+]
+
+HELP = [
+    "how many reverb presets are there?",
+    "list all delay presets",
+    "what parameters can reverb have",
+    "reverb presets with decay less than 2",
+    "best reverb for vocals",
+    "compare reverb and delay",
+    "what's the difference between compressor and limiter",
+    "how to automate a filter sweep",
+    "why does my mix sound muddy",
+]
+
+
+def legacy_classify(router: HelpRouter, query: str) -> Tuple[QueryType, Dict[str, Any]]:
+    q = query.lower()
+    for p in router.COUNT_PATTERNS:
+        m = re.search(p, q)
+        if m and router._extract_device(m.groups()):
+            return QueryType.FACTUAL_COUNT, {}
+    for p in router.SEMANTIC_PATTERNS:
+        if re.search(p, q):
+            return QueryType.SEMANTIC, {}
+    for p in router.COMPARISON_PATTERNS:
+        if re.search(p, q):
+            return QueryType.COMPARISON, {}
+    for p in router.LIST_PATTERNS:
+        m = re.search(p, q)
+        if m and router._extract_device(m.groups()):
+            return QueryType.FACTUAL_LIST, {}
+    for p in router.PARAM_PATTERNS:
+        m = re.search(p, q)
+        if m and router._extract_device(m.groups()):
+            return QueryType.FACTUAL_PARAMS, {}
+    for p in router.PARAM_SEARCH_PATTERNS:
+        m = re.search(p, q)
+        if m:
+            groups = m.groups()
+            if router._extract_device(groups) and router._extract_param_constraint(groups, q)[0]:
+                return QueryType.PARAMETER_SEARCH, {}
+    for p in router.WORKFLOW_PATTERNS:
+        if re.search(p, q):
+            return QueryType.WORKFLOW, {}
+    return QueryType.COMPLEX, {}
+
+
+def bench(fn, queries: List[str], rounds: int, before_round=None) -> float:
+    total = 0.0
+    for _ in range(rounds):
+        if before_round:
+            before_round()
+        t0 = time.perf_counter()
+        for q in queries:
+            fn(q)
+        total += time.perf_counter() - t0
+    return total / (rounds * len(queries)) * 1e6
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Benchmark HelpRouter classification")
+    ap.add_argument("--rounds", type=int, default=500)
+    args = ap.parse_args()
+
+    router = HelpRouter()
+    mix = COMMANDS * 4 + HELP  # chat traffic is mostly commands
+
+    mismatches = []
+    for q in mix:
+        if router._command.match(q.lower()):
+            continue
+        if legacy_classify(router, q)[0] != router.classify_query(q)[0]:
+            mismatches.append(q)
+
+    rows = [
+        ("legacy", bench(lambda q: legacy_classify(router, q), mix, args.rounds)),
+        ("compiled cold", bench(router.classify_query, mix, args.rounds, router._cache.clear)),
+        ("compiled warm", bench(router.classify_query, mix, args.rounds)),
+    ]
+    print("=" * 60)
+    print(f"HelpRouter.classify_query: {len(mix)} queries x {args.rounds} rounds")
+    print("=" * 60)
+    for name, us in rows:
+        print(f"{name:<16} {us:>8.2f} µs/query  ({rows[0][1] / us:>5.1f}x)")
+    fast = sum(1 for q in mix if router._command.match(q.lower()))
+    print(f"\ncommand fast path: {fast}/{len(mix)} queries")
+    print(f"classification mismatches vs legacy (non-command): {len(mismatches)} {mismatches or ''}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Benchmark typo correction latency vs typo map size.
+
+Compares the legacy approach (one re.sub per typo entry, plus per-ordinal
+and compact-pan passes) against the compiled single-pass TypoCorrector in
+nlp-service/parsers/typo_corrector.py for maps of 10, 1k and 10k entries.
+The compiled path should stay flat as the map grows.
+
+Usage:
+    python3 scripts/benchmark_typo_corrector.py
+    python3 scripts/benchmark_typo_corrector.py --sizes 10 1000 10000 --iterations 2000
+"""
+import argparse
+import os
+import random
+import re
+import string
+import sys
+import time
+from typing import Dict, List
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'nlp-service'))
+
+from parsers.typo_corrector import ORDINAL_WORD_MAP, TypoCorrector
+
+
+QUERIES = [
+    "set tack 1 vilme to -6",
+    "set first reverb decay to 2s",
+    "pan master to 30L",
+    "pan return A to 25R",
+    "increse track 2 volme by 3 db",
+    "set second delay feedbak to 40%",
+    "mute trak 3",
+    "set return b sned a to -12 db",
+]
+
+BASE_TYPOS = {
+    "tack": "track",
+    "trak": "track",
+    "volme": "volume",
+    "vilme": "volume",
+    "increse": "increase",
+    "feedbak": "feedback",
+    "sned": "send",
+}
+
+
+def legacy_apply(query: str, typo_map: Dict[str, str]) -> str:
+    q = query.lower().strip()
+    for word, digit in ORDINAL_WORD_MAP.items():
+        q = re.sub(rf"\b{word}\b", digit, q)
+    q = re.sub(r'\b(\d+)l\b', r'-\1', q)
+    q = re.sub(r'\b(\d+)r\b', r'\1', q)
+    for typo, correct in typo_map.items():
+        q = re.sub(rf"\b{typo}\b", correct, q)
+    return q
+
+
+def make_typo_map(size: int, seed: int = 7) -> Dict[str, str]:
+    rng = random.Random(seed)
+    typo_map = dict(BASE_TYPOS)
+    while len(typo_map) < size:
+        word = "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(5, 10)))
+        typo_map[word] = word[:-1]
+    return dict(list(typo_map.items())[:max(size, len(BASE_TYPOS))])
+
+
+def time_per_query(fn, queries: List[str], iterations: int) -> float:
+    t0 = time.perf_counter()
+    for i in range(iterations):
+        fn(queries[i % len(queries)])
+    return (time.perf_counter() - t0) / iterations * 1e6
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Benchmark typo correction vs map size")
+    ap.add_argument("--sizes", type=int, nargs="+", default=[10, 1000, 10000])
+    ap.add_argument("--iterations", type=int, default=2000, help="Queries per compiled-path measurement")
+    args = ap.parse_args()
+
+    print("=" * 72)
+    print("Typo correction latency (µs/query)")
+    print("=" * 72)
+    print(f"{'entries':>8} {'legacy':>12} {'compiled':>10} {'build ms':>9} {'speedup':>9}  match")
+    for size in args.sizes:
+        typo_map = make_typo_map(size)
+        t0 = time.perf_counter()
+        corrector = TypoCorrector(typo_map)
+        build_ms = (time.perf_counter() - t0) * 1000.0
+        # Legacy cost is linear in the map; keep its wall time bounded
+        legacy_iters = max(len(QUERIES), min(args.iterations, 200000 // max(size, 1)))
+        legacy_us = time_per_query(lambda q: legacy_apply(q, typo_map), QUERIES, legacy_iters)
+        compiled_us = time_per_query(corrector.apply, QUERIES, args.iterations)
+        same = all(legacy_apply(q, typo_map) == corrector.apply(q) for q in QUERIES)
+        print(f"{size:>8} {legacy_us:>12.1f} {compiled_us:>10.1f} {build_ms:>9.1f} {legacy_us / compiled_us:>8.0f}x  {'yes' if same else 'NO'}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Wire-format benchmark for UDP bridge responses (JSON vs compact fbp1).
+
+Builds a synthetic Live set (default 100 tracks x 4 devices plus returns),
+produces real Remote Script payloads with lom_ops against it, and reports
+per payload:
+  - encoded size in each format and whether it fits one UDP datagram
+  - encode CPU (Remote Script side) and decode CPU (server side)
+  - request round-trip latency through a local udp_bridge server (replies
+    over one datagram arrive as fragments)
+
+Usage:
+  python3 scripts/benchmark_wire_format.py --tracks 100 --devices 4
+  python3 scripts/benchmark_wire_format.py --no-udp
+"""
+
+import argparse
+import json
+import os
+import random
+import socket
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ableton_remote.Fadebender import lom_ops, wire
+
+UDP_MAX = 65507
+
+# (device name, param count) - sizes in the range of common Live devices
+CATALOG = [("EQ Eight", 86), ("Compressor", 24), ("Reverb", 33), ("Utility", 12), ("Saturator", 18), ("Auto Filter", 34)]
+
+
+class FakeParam:
+    def __init__(self, name: str, value: float) -> None:
+        self.name = name
+        self.value = value
+        self.min = 0.0
+        self.max = 1.0
+        self.display_value = f"{value * 100.0:.1f} %"
+
+
+class FakeDevice:
+    def __init__(self, name: str, n_params: int, rng: random.Random) -> None:
+        self.name = name
+        self.class_display_name = name
+        self.parameters = [FakeParam("Device On" if i == 0 else f"{name} Param {i}", rng.random()) for i in range(n_params)]
+
+
+class FakeMixer:
+    def __init__(self, rng: random.Random, n_sends: int) -> None:
+        self.volume = FakeParam("Volume", rng.random())
+        self.panning = FakeParam("Pan", rng.random() * 2 - 1)
+        self.sends = [FakeParam(f"Send {chr(65 + i)}", rng.random()) for i in range(n_sends)]
+
+
+class FakeTrack:
+    def __init__(self, name: str, devices, rng: random.Random, n_sends: int) -> None:
+        self.name = name
+        self.devices = devices
+        self.mixer_device = FakeMixer(rng, n_sends)
+        self.has_audio_input = True
+        self.mute = False
+        self.solo = False
+
+
+class FakeSong:
+    def __init__(self, n_tracks: int, n_devices: int, n_returns: int, seed: int = 7) -> None:
+        rng = random.Random(seed)
+
+        def chain():
+            return [FakeDevice(*rng.choice(CATALOG), rng) for _ in range(n_devices)]
+
+        self.tracks = [FakeTrack(f"Track {i + 1}", chain(), rng, n_returns) for i in range(n_tracks)]
+        self.return_tracks = [FakeTrack(f"{chr(65 + i)} Return", chain(), rng, 0) for i in range(n_returns)]
+        self.master_track = FakeTrack("Master", chain(), rng, 0)
+        self.tempo = 120.0
+        self.metronome = False
+        self.is_playing = False
+        self.is_recording = False
+
+
+def time_it(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000.0
+
+
+def measure_codec(name: str, payload: dict, repeat: int) -> dict:
+    resp = {"ok": True, "op": name, "data": payload}
+    row = {"payload": name}
+    for enc in (wire.JSON, wire.ENCODING):
+        blob = wire.dumps(resp, enc)
+        assert wire.loads(blob) == json.loads(json.dumps(resp)), f"{enc} round-trip mismatch for {name}"
+        row[enc] = {
+            "bytes": len(blob),
+            "fits_datagram": len(blob) <= UDP_MAX,
+            "encode_ms": round(time_it(lambda: wire.dumps(resp, enc), repeat), 3),
+            "decode_ms": round(time_it(lambda: wire.loads(blob), repeat), 3),
+        }
+    row["size_ratio"] = round(row[wire.ENCODING]["bytes"] / row[wire.JSON]["bytes"], 3)
+    return row
+
+
+def start_bridge(song: FakeSong) -> int:
+    """Run udp_bridge against the fake song on a free port; returns the port."""
+    probe = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    probe.bind(("127.0.0.1", 0))
+    port = probe.getsockname()[1]
+    probe.close()
+    from ableton_remote.Fadebender import udp_bridge
+
+    udp_bridge.HOST, udp_bridge.PORT = "127.0.0.1", port
+    udp_bridge.CLIENT_PORT = 9  # discard events
+    udp_bridge.set_live_accessor(lambda: song)
+    threading.Thread(target=udp_bridge.start_udp_server, daemon=True).start()
+    time.sleep(0.2)
+    return port
+
+
+def measure_udp(port: int, op: str, params: dict, repeat: int) -> dict:
+    from server.ableton import client_udp
+
+    os.environ["ABLETON_UDP_HOST"], os.environ["ABLETON_UDP_PORT"] = "127.0.0.1", str(port)
+    row = {"op": op}
+    for enc in (wire.JSON, wire.ENCODING):
+        client_udp.WIRE_ACCEPT = [enc]
+        times = []
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            resp = client_udp.request({"op": op, **params}, timeout=5.0)
+            times.append(time.perf_counter() - t0)
+            if resp is None:
+                break
+        row[enc] = "no reply" if resp is None else f"{sorted(times)[len(times) // 2] * 1000.0:.2f} ms median"
+    return row
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--tracks", type=int, default=100)
+    ap.add_argument("--devices", type=int, default=4, help="devices per track")
+    ap.add_argument("--returns", type=int, default=4)
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--no-udp", action="store_true", help="skip the UDP round-trip section")
+    args = ap.parse_args()
+
+    song = FakeSong(args.tracks, args.devices, args.returns)
+    n_params = sum(len(d.parameters) for t in song.tracks for d in t.devices)
+    print(f"Set: {args.tracks} tracks x {args.devices} devices, {args.returns} returns, {n_params} track params\n")
+
+    payloads = {
+        "get_full_snapshot": lom_ops.get_full_snapshot(song),
+        "get_full_snapshot(skip_param_values)": lom_ops.get_full_snapshot(song, skip_param_values=True),
+        "get_device_tree": lom_ops.get_device_tree(song),
+        "get_track_device_params": lom_ops.get_track_device_params(song, 1, 0),
+    }
+    print(f"{'payload':40} {'json B':>9} {'fbp1 B':>9} {'ratio':>6} {'enc json':>9} {'enc fbp1':>9} {'dec json':>9} {'dec fbp1':>9}")
+    for name, payload in payloads.items():
+        r = measure_codec(name, payload, args.repeat)
+        j, f = r[wire.JSON], r[wire.ENCODING]
+        flag = lambda x: "" if x["fits_datagram"] else "*"
+        print(
+            f"{name:40} {j['bytes']:>8}{flag(j):1} {f['bytes']:>8}{flag(f):1} {r['size_ratio']:>6} "
+            f"{j['encode_ms']:>7.2f}ms {f['encode_ms']:>7.2f}ms {j['decode_ms']:>7.2f}ms {f['decode_ms']:>7.2f}ms"
+        )
+    print(f"\n* exceeds one UDP datagram ({UDP_MAX} bytes); sent as fragments")
+
+    if args.no_udp:
+        return
+    port = start_bridge(song)
+    print("\nUDP round trip (local udp_bridge, fake song; fbp1 = client accepts fbp1,")
+    print("the bridge still answers JSON for ops outside udp_bridge.COMPACT_OPS):")
+    for op, params in (
+        ("get_track_device_params", {"track_index": 1, "device_index": 0}),
+        ("get_device_tree", {}),
+        ("get_full_snapshot", {"skip_param_values": True}),
+        ("get_full_snapshot", {}),
+    ):
+        r = measure_udp(port, op, params, args.repeat)
+        label = op + ("(skip_param_values)" if params.get("skip_param_values") else "")
+        print(f"  {label:40} json: {r[wire.JSON]:32} fbp1: {r[wire.ENCODING]}")
+
+
+if __name__ == "__main__":
+    main()
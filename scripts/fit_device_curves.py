@@ -4,6 +4,7 @@ Generic device curve fitting tool - fits curves for continuous parameters using
 
 Usage:
   python3 fit_device_curves.py --signature <device_sig> [--database dev-display-value]
+  python3 fit_device_curves.py --all [--database dev-display-value]
 
 Examples:
   # Fit Compressor curves from presets
@@ -20,158 +21,71 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from google.cloud import firestore
 import numpy as np
-from scipy.optimize import curve_fit
-from scipy.stats import pearsonr
-import json
 
+from server.services.curve_fitting import fit_device_params
 
-# Fitting functions
-def linear_fit(x, a, b):
-    """y = a*x + b"""
-    return a * x + b
-
-
-def exponential_fit(x, a, b, c):
-    """y = a * exp(b*x) + c"""
-    return a * np.exp(b * x) + c
 
+def collect_param_data(presets):
+    """param_name -> (norm values, display values) across preset dicts."""
+    param_data = {}
+    for preset in presets:
+        param_values = preset.get("parameter_values", {})
+        param_display_values = preset.get("parameter_display_values", {})
 
-def logarithmic_fit(x, a, b, c):
-    """y = a * log(b*x + 1) + c"""
-    return a * np.log(b * x + 1) + c
+        for param_name, norm_val in param_values.items():
+            display_val = param_display_values.get(param_name)
+            if display_val is None or norm_val is None:
+                continue
+            try:
+                point = (float(norm_val), float(display_val))
+            except (TypeError, ValueError):
+                continue
+            xs, ys = param_data.setdefault(param_name, ([], []))
+            xs.append(point[0])
+            ys.append(point[1])
+    return param_data
+
+
+def fit_continuous_params(params_meta, param_data, verbose=True):
+    """Fit every continuous param of one device in a single batched pass.
+
+    Updates params_meta in place; returns (fitted_count, skipped_count).
+    """
+    continuous = [p for p in params_meta if p.get("control_type") == "continuous"]
+    skipped = [p.get("name") for p in continuous if p.get("name") not in param_data]
+    fits = fit_device_params({p["name"]: param_data[p["name"]] for p in continuous if p.get("name") in param_data})
 
+    for name in skipped:
+        if verbose:
+            print(f"  ⚠️  {name}: No preset data available (skipping)")
 
-def power_fit(x, a, b, c):
-    """y = a * x^b + c"""
-    return a * np.power(x, b) + c
+    fitted_count = 0
+    for param in continuous:
+        param_name = param.get("name")
+        fit_result = fits.get(param_name)
+        if fit_result is None:
+            if param_name in param_data and verbose:
+                print(f"  ⚠️  {param_name}: Not enough data points ({len(param_data[param_name][0])}), skipping")
+            continue
 
+        param["fit"] = fit_result
+        param["confidence"] = fit_result["r_squared"]
+        fitted_count += 1
 
-def fit_parameter(norm_values, display_values, param_name):
-    """
-    Try multiple curve types and return the best fit.
+        if verbose:
+            norm_vals = np.asarray(param_data[param_name][0])
+            disp_vals = np.asarray(param_data[param_name][1])
+            print(f"\n  {param_name}:")
+            print(f"    Data points: {norm_vals.size}")
+            print(f"    Norm range: [{norm_vals.min():.3f}, {norm_vals.max():.3f}]")
+            print(f"    Display range: [{disp_vals.min():.3f}, {disp_vals.max():.3f}]")
+            print(f"    Best fit: {fit_result['type']} (R² = {fit_result['r_squared']:.4f})")
+            if "coeffs" in fit_result:
+                print(f"    Coefficients: {fit_result['coeffs']}")
+            else:
+                print(f"    Knots: {len(fit_result['points'])}")
 
-    Returns:
-        dict with keys: type, coeffs, r_squared
-    """
-    x = np.array(norm_values)
-    y = np.array(display_values)
-
-    if len(x) < 3:
-        print(f"  ⚠️  {param_name}: Not enough data points ({len(x)}), using linear")
-        return fit_linear(x, y)
-
-    fits = []
-
-    # Try linear
-    try:
-        fit = fit_linear(x, y)
-        fits.append(("linear", fit))
-    except Exception as e:
-        print(f"  ⚠️  {param_name}: Linear fit failed: {e}")
-
-    # Try exponential
-    try:
-        fit = fit_exponential(x, y)
-        fits.append(("exponential", fit))
-    except Exception:
-        pass  # Exponential often fails, don't spam
-
-    # Try logarithmic
-    try:
-        fit = fit_logarithmic(x, y)
-        fits.append(("logarithmic", fit))
-    except Exception:
-        pass
-
-    # Try power
-    try:
-        fit = fit_power(x, y)
-        fits.append(("power", fit))
-    except Exception:
-        pass
-
-    if not fits:
-        print(f"  ❌ {param_name}: All fits failed, using fallback linear")
-        # Fallback: simple linear from min to max
-        a = y.max() - y.min()
-        b = y.min()
-        return {
-            "type": "linear",
-            "function": "linear",
-            "coeffs": {"a": float(a), "b": float(b)},
-            "r_squared": 0.0
-        }
-
-    # Choose best fit by R²
-    best_name, best_fit = max(fits, key=lambda f: f[1]["r_squared"])
-
-    return best_fit
-
-
-def fit_linear(x, y):
-    """Fit linear: y = a*x + b"""
-    popt, _ = curve_fit(linear_fit, x, y)
-    a, b = popt
-    y_pred = linear_fit(x, a, b)
-    r2 = pearsonr(y, y_pred)[0] ** 2
-
-    return {
-        "type": "linear",
-        "function": "linear",
-        "coeffs": {"a": float(a), "b": float(b)},
-        "r_squared": float(r2)
-    }
-
-
-def fit_exponential(x, y):
-    """Fit exponential: y = a * exp(b*x) + c"""
-    # Initial guess
-    p0 = [y.max() - y.min(), 1.0, y.min()]
-    popt, _ = curve_fit(exponential_fit, x, y, p0=p0, maxfev=5000)
-    a, b, c = popt
-    y_pred = exponential_fit(x, a, b, c)
-    r2 = pearsonr(y, y_pred)[0] ** 2
-
-    return {
-        "type": "exponential",
-        "function": "exponential",
-        "coeffs": {"a": float(a), "b": float(b), "c": float(c)},
-        "r_squared": float(r2)
-    }
-
-
-def fit_logarithmic(x, y):
-    """Fit logarithmic: y = a * log(b*x + 1) + c"""
-    # Initial guess
-    p0 = [y.max() - y.min(), 1.0, y.min()]
-    popt, _ = curve_fit(logarithmic_fit, x, y, p0=p0, maxfev=5000)
-    a, b, c = popt
-    y_pred = logarithmic_fit(x, a, b, c)
-    r2 = pearsonr(y, y_pred)[0] ** 2
-
-    return {
-        "type": "logarithmic",
-        "function": "logarithmic",
-        "coeffs": {"a": float(a), "b": float(b), "c": float(c)},
-        "r_squared": float(r2)
-    }
-
-
-def fit_power(x, y):
-    """Fit power: y = a * x^b + c"""
-    # Initial guess
-    p0 = [y.max() - y.min(), 2.0, y.min()]
-    popt, _ = curve_fit(power_fit, x, y, p0=p0, maxfev=5000)
-    a, b, c = popt
-    y_pred = power_fit(x, a, b, c)
-    r2 = pearsonr(y, y_pred)[0] ** 2
-
-    return {
-        "type": "power",
-        "function": "power",
-        "coeffs": {"a": float(a), "b": float(b), "c": float(c)},
-        "r_squared": float(r2)
-    }
+    return fitted_count, len(skipped)
 
 
 def fit_device_curves(device_sig, database="dev-display-value", auto_confirm=False):
@@ -200,24 +114,12 @@ def fit_device_curves(device_sig, database="dev-display-value", auto_confirm=Fal
     print("STEP 2: Extracting parameter values")
     print("=" * 80)
 
-    # Collect data: param_name -> [(norm_val, display_val), ...]
-    param_data = {}
-
-    for preset_doc in presets:
-        preset = preset_doc.to_dict()
-        param_values = preset.get("parameter_values", {})
-        param_display_values = preset.get("parameter_display_values", {})
-
-        for param_name, norm_val in param_values.items():
-            display_val = param_display_values.get(param_name)
-            if display_val is not None and norm_val is not None:
-                if param_name not in param_data:
-                    param_data[param_name] = []
-                param_data[param_name].append((float(norm_val), float(display_val)))
+    # Collect data: param_name -> ([norm_val, ...], [display_val, ...])
+    param_data = collect_param_data(p.to_dict() for p in presets)
 
     print(f"✓ Collected data for {len(param_data)} parameters")
-    for name, points in param_data.items():
-        print(f"  - {name}: {len(points)} data points")
+    for name, (norm_vals, _disp_vals) in param_data.items():
+        print(f"  - {name}: {len(norm_vals)} data points")
 
     # Step 3: Load device mapping to identify continuous parameters
     print("\n" + "=" * 80)
@@ -241,41 +143,7 @@ def fit_device_curves(device_sig, database="dev-display-value", auto_confirm=Fal
     print("STEP 4: Fitting curves for continuous parameters")
     print("=" * 80)
 
-    fitted_count = 0
-    skipped_count = 0
-
-    for param in params_meta:
-        param_name = param.get("name")
-        control_type = param.get("control_type")
-
-        if control_type != "continuous":
-            continue
-
-        if param_name not in param_data:
-            print(f"  ⚠️  {param_name}: No preset data available (skipping)")
-            skipped_count += 1
-            continue
-
-        data_points = param_data[param_name]
-        norm_vals = [p[0] for p in data_points]
-        disp_vals = [p[1] for p in data_points]
-
-        print(f"\n  {param_name}:")
-        print(f"    Data points: {len(data_points)}")
-        print(f"    Norm range: [{min(norm_vals):.3f}, {max(norm_vals):.3f}]")
-        print(f"    Display range: [{min(disp_vals):.3f}, {max(disp_vals):.3f}]")
-
-        # Fit
-        fit_result = fit_parameter(norm_vals, disp_vals, param_name)
-
-        # Update param
-        param["fit"] = fit_result
-        param["confidence"] = fit_result["r_squared"]
-
-        print(f"    Best fit: {fit_result['type']} (R² = {fit_result['r_squared']:.4f})")
-        print(f"    Coefficients: {fit_result['coeffs']}")
-
-        fitted_count += 1
+    fitted_count, skipped_count = fit_continuous_params(params_meta, param_data)
 
     print(f"\n✓ Fitted {fitted_count} continuous parameters")
     if skipped_count > 0:
@@ -325,6 +193,63 @@ def fit_device_curves(device_sig, database="dev-display-value", auto_confirm=Fal
     return True
 
 
+def fit_all_devices(database="dev-display-value", auto_confirm=False):
+    """Refit every device mapping from one pass over the presets collection."""
+
+    client = firestore.Client(database=database)
+
+    print("=" * 80)
+    print("Loading all presets")
+    print("=" * 80)
+    by_sig = {}
+    for preset_doc in client.collection("presets").stream():
+        preset = preset_doc.to_dict()
+        sig = preset.get("structure_signature")
+        if sig:
+            by_sig.setdefault(sig, []).append(preset)
+    print(f"✓ {sum(len(v) for v in by_sig.values())} presets across {len(by_sig)} devices")
+
+    updates = {}
+    for sig, presets in sorted(by_sig.items()):
+        device_doc = client.collection("device_mappings").document(sig).get()
+        if not device_doc.exists:
+            print(f"  ⚠️  {sig}: no device mapping (skipping)")
+            continue
+        device_data = device_doc.to_dict()
+        params_meta = device_data.get("params_meta", [])
+        fitted, skipped = fit_continuous_params(params_meta, collect_param_data(presets), verbose=False)
+        print(f"  {device_data.get('device_name', 'Unknown Device')} ({sig[:10]}): "
+              f"{len(presets)} presets, fitted {fitted}, skipped {skipped}")
+        if fitted:
+            updates[sig] = params_meta
+
+    if not updates:
+        print("\n❌ No parameters were fitted - aborting")
+        return False
+
+    print("\n" + "=" * 80)
+    if auto_confirm:
+        print("Auto-confirming changes...")
+        response = 'yes'
+    else:
+        response = input(f"Apply curve fits for {len(updates)} devices to Firestore? (yes/no): ")
+
+    if response.lower() not in ['yes', 'y']:
+        print("❌ Aborted - no changes made")
+        return False
+
+    batch = client.batch()
+    for n, (sig, params_meta) in enumerate(updates.items(), 1):
+        batch.update(client.collection("device_mappings").document(sig), {"params_meta": params_meta})
+        if n % 400 == 0:
+            batch.commit()
+            batch = client.batch()
+    batch.commit()
+
+    print(f"\n✅ SUCCESS - updated {len(updates)} device mappings in {database}")
+    return True
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Fit curves for device continuous parameters using preset data",
@@ -339,11 +264,17 @@ Examples:
 
   # Auto-confirm (no prompt)
   python3 fit_device_curves.py --signature abc123... --yes
+
+  # Refit every device that has presets
+  python3 fit_device_curves.py --all
 """
     )
 
-    parser.add_argument('--signature', '-s', required=True,
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument('--signature', '-s',
                        help='Device structure signature (SHA1 hash)')
+    target.add_argument('--all', action='store_true',
+                       help='Refit all devices from the full presets collection')
     parser.add_argument('--database', '-d', default='dev-display-value',
                        help='Firestore database ID (default: dev-display-value)')
     parser.add_argument('--yes', '-y', action='store_true',
@@ -354,11 +285,14 @@ Examples:
     # Set database env var
     os.environ["FIRESTORE_DATABASE_ID"] = args.database
 
-    success = fit_device_curves(
-        device_sig=args.signature,
-        database=args.database,
-        auto_confirm=args.yes
-    )
+    if args.all:
+        success = fit_all_devices(database=args.database, auto_confirm=args.yes)
+    else:
+        success = fit_device_curves(
+            device_sig=args.signature,
+            database=args.database,
+            auto_confirm=args.yes
+        )
 
     sys.exit(0 if success else 1)
 
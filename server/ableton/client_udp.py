@@ -1,7 +1,23 @@
 import json
 import os
 import socket
-from typing import Any, Dict, Optional, Tuple
+import time
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from ableton_remote.Fadebender import wire
+
+# Response encodings offered to the Remote Script, preferred first (it only
+# answers fbp1 for param-value dumps). ABLETON_UDP_WIRE=json turns it off.
+WIRE_ACCEPT = [wire.ENCODING, wire.JSON] if os.getenv("ABLETON_UDP_WIRE", wire.ENCODING) != wire.JSON else [wire.JSON]
+
+# Fragmented replies: silence after which fragments known to be missing are
+# re-requested, and how many re-requests in a row are allowed without progress
+RESEND_GAP_SEC = float(os.getenv("ABLETON_UDP_RESEND_GAP_MS", "150")) / 1000.0
+MAX_RESENDS = int(os.getenv("ABLETON_UDP_MAX_RESENDS", "5"))
+# Silence between complete parts: the bridge may still be producing the next
+# one (streamed snapshots read Live track by track), so only probe for a lost
+# final part after this long; the request timeout bounds the wait
+PART_IDLE_SEC = float(os.getenv("ABLETON_UDP_PART_IDLE_MS", "1000")) / 1000.0
 
 
 def _udp_target() -> Tuple[str, int]:
@@ -17,15 +33,64 @@ def send(message: Dict[str, Any]) -> None:
         sock.sendto(data, (host, port))
 
 
-def request(message: Dict[str, Any], timeout: float = 0.75) -> Optional[Dict[str, Any]]:
-    data = json.dumps(message).encode("utf-8")
-    host, port = _udp_target()
+def _exchange(message: Dict[str, Any], timeout: float) -> Iterator[Dict[str, Any]]:
+    """Send one request and yield its reply parts in order (one part unless streamed).
+
+    Replies larger than a datagram arrive as fragments (see wire.py). Once a
+    fragment is known to be missing it is re-requested after RESEND_GAP_SEC
+    of silence; between complete parts the client waits PART_IDLE_SEC before
+    probing for a lost final part. Ends early, without error, on timeout.
+    """
+    data = json.dumps({**message, "accept": WIRE_ACCEPT, "frag": 1}).encode("utf-8")
+    target = _udp_target()
     with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
-        sock.settimeout(timeout)
-        sock.sendto(data, (host, port))
         try:
-            resp, _ = sock.recvfrom(64 * 1024)
-            return json.loads(resp.decode("utf-8"))
-        except socket.timeout:
-            return None
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4 * 1024 * 1024)
+        except OSError:
+            pass
+        sock.sendto(data, target)
+        deadline = time.monotonic() + timeout
+        rs = wire.Reassembler()
+        resends = 0
+        while not rs.done:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            # Until the first fragment there is nothing to re-request
+            if rs.stream_id is None:
+                wait = remaining
+            else:
+                wait = min(remaining, RESEND_GAP_SEC if rs.incomplete else PART_IDLE_SEC)
+            sock.settimeout(wait)
+            try:
+                pkt, _ = sock.recvfrom(64 * 1024)
+            except socket.timeout:
+                if rs.stream_id is None:
+                    return
+                if rs.incomplete:
+                    if resends >= MAX_RESENDS:
+                        return
+                    resends += 1
+                sock.sendto(json.dumps(rs.resend_request()).encode("utf-8"), target)
+                continue
+            frag = wire.parse_fragment(pkt)
+            if frag is None:
+                yield wire.loads(pkt)
+                return
+            resends = 0
+            yield from rs.add(frag)
+
+
+def request(message: Dict[str, Any], timeout: float = 0.75) -> Optional[Dict[str, Any]]:
+    for part in _exchange(message, timeout):
+        return part
+    return None
+
+
+def request_stream(message: Dict[str, Any], timeout: float = 10.0) -> Iterator[Dict[str, Any]]:
+    """Yield the parts of a streamed reply as each one completes (e.g. get_full_snapshot with stream=True).
+
+    Against a Remote Script without streaming the single whole reply is yielded.
+    """
+    return _exchange({**message, "stream": True}, timeout)
 
@@ -3,6 +3,7 @@ from __future__ import annotations
 from typing import Any, Dict
 
 from fastapi import APIRouter
+from server.services import history as History
 from server.services.chat_models import ChatBody, HelpBody
 from server.services.chat_handlers import handle_chat, handle_help
 
@@ -12,7 +13,9 @@ router = APIRouter()
 
 @router.post("/chat")
 def chat(body: ChatBody) -> Dict[str, Any]:
-    return handle_chat(body)
+    # Everything one chat command changes is a single undo step
+    with History.transaction(f"chat: {body.text}"):
+        return handle_chat(body)
 
 
 @router.post("/help")
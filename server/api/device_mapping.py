@@ -7,12 +7,13 @@ import os
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 
-from server.core.deps import get_store
+from server.core.deps import get_store, get_live_index
 from server.services.ableton_client import request_op, data_or_raw
-from server.services.mapping_utils import make_device_signature, detect_device_type
+from server.services.mapping_utils import make_device_signature, detect_device_type, reported_signature
 from server.services.device_mapping_service import ensure_device_mapping
 from server.services.preset_service import save_base_preset
 from server.services import device_mapping_io as dmio
+from server.services.curve_fitting import fit_models as _fit_models
 import math
 import re as _re
 from server.services.mapping_utils import detect_device_type
@@ -240,18 +241,22 @@ def get_device_mapping(signature: Optional[str] = None, index: Optional[int] = N
     if not sig:
         if index is None or device is None:
             raise HTTPException(400, "Provide signature or index+device")
-        devs = request_op("get_return_devices", timeout=1.0, return_index=int(index))
-        devices = ((devs or {}).get("data") or {}).get("devices") or []
-        dname = None
-        for d in devices:
-            if int(d.get("index", -1)) == int(device):
-                dname = str(d.get("name", f"Device {device}"))
-                break
-        if dname is None:
-            raise HTTPException(404, "device_not_found")
-        params_resp = request_op("get_return_device_params", timeout=1.2, return_index=int(index), device_index=int(device))
-        live_params = ((params_resp or {}).get("data") or {}).get("params") or []
-        sig = make_device_signature(dname, live_params)
+        sig = _indexed_signature(int(index), int(device))
+        if not sig:
+            devs = request_op("get_return_devices", timeout=1.0, return_index=int(index))
+            devices = ((devs or {}).get("data") or {}).get("devices") or []
+            dname = None
+            for d in devices:
+                if int(d.get("index", -1)) == int(device):
+                    dname = str(d.get("name", f"Device {device}"))
+                    break
+            if dname is None:
+                raise HTTPException(404, "device_not_found")
+            sig = reported_signature(devices, int(device)) or ""
+            if not sig:
+                params_resp = request_op("get_return_device_params", timeout=1.2, return_index=int(index), device_index=int(device))
+                live_params = ((params_resp or {}).get("data") or {}).get("params") or []
+                sig = make_device_signature(dname, live_params)
     store = get_store()
     mapping = store.get_device_mapping(sig) if store.enabled else None
     if not mapping:
@@ -372,9 +377,20 @@ def _resolve_param_index(ri: int, di: int, ref: str) -> int:
     raise HTTPException(404, f"param_not_found:{ref}")
 
 
+def _indexed_signature(index: int, device: int) -> str:
+    """Return-device signature cached in the LiveIndex ("" when not indexed yet)."""
+    return get_live_index().get_device_signature("return", int(index), int(device)) or ""
+
+
 def _compute_signature_for(index: int, device: int) -> str:
+    sig = _indexed_signature(index, device)
+    if sig:
+        return sig
     devs = request_op("get_return_devices", timeout=1.0, return_index=int(index))
     devices = ((devs or {}).get("data") or {}).get("devices") or []
+    sig = reported_signature(devices, int(device))
+    if sig:
+        return sig
     dname = None
     for d in devices:
         if int(d.get("index", -1)) == int(device):
@@ -585,18 +601,22 @@ def get_device_mapping_fits(signature: Optional[str] = None, index: Optional[int
     if not sig:
         if index is None or device is None:
             raise HTTPException(400, "Provide signature or index+device")
-        devs = request_op("get_return_devices", timeout=1.0, return_index=int(index))
-        devices = ((devs or {}).get("data") or {}).get("devices") or []
-        dname = None
-        for d in devices:
-            if int(d.get("index", -1)) == int(device):
-                dname = str(d.get("name", f"Device {device}"))
-                break
-        if dname is None:
-            raise HTTPException(404, "device_not_found")
-        params_resp = request_op("get_return_device_params", timeout=1.2, return_index=int(index), device_index=int(device))
-        live_params = ((params_resp or {}).get("data") or {}).get("params") or []
-        sig = make_device_signature(dname, live_params)
+        sig = _indexed_signature(int(index), int(device))
+        if not sig:
+            devs = request_op("get_return_devices", timeout=1.0, return_index=int(index))
+            devices = ((devs or {}).get("data") or {}).get("devices") or []
+            dname = None
+            for d in devices:
+                if int(d.get("index", -1)) == int(device):
+                    dname = str(d.get("name", f"Device {device}"))
+                    break
+            if dname is None:
+                raise HTTPException(404, "device_not_found")
+            sig = reported_signature(devices, int(device)) or ""
+            if not sig:
+                params_resp = request_op("get_return_device_params", timeout=1.2, return_index=int(index), device_index=int(device))
+                live_params = ((params_resp or {}).get("data") or {}).get("params") or []
+                sig = make_device_signature(dname, live_params)
     store = get_store()
     mapping = store.get_device_mapping(sig) if store.enabled else None
     if not mapping:
@@ -679,74 +699,6 @@ def enumerate_param_labels(index: int, device: int, param_ref: str) -> Dict[str,
     return {"ok": True, "param": name, "index": pi, "range": [int(vmin), int(vmax)], "samples": labels, "label_map_suggested": label_map}
 
 
-def _fit_models(samples: list[dict]) -> dict | None:
-    pts = [
-        (float(s["value"]), float(s["display_num"]))
-        for s in samples
-        if s.get("display_num") is not None
-    ]
-    pts = [(x, y) for x, y in pts if math.isfinite(x) and math.isfinite(y)]
-    if len(pts) < 3:
-        return None
-    pts.sort(key=lambda t: t[0])
-    xs = [p[0] for p in pts]
-    ys = [p[1] for p in pts]
-
-    def lin_fit(u, v):
-        n = len(u)
-        sx = sum(u)
-        sy = sum(v)
-        sxx = sum(a * a for a in u)
-        sxy = sum(a * b for a, b in zip(u, v))
-        den = n * sxx - sx * sx
-        if den == 0:
-            return None
-        a = (n * sxy - sx * sy) / den
-        b = (sy - a * sx) / n
-        yhat = [a * t + b for t in u]
-        ss_res = sum((vi - hi) ** 2 for vi, hi in zip(v, yhat))
-        ymean = sy / n
-        ss_tot = sum((vi - ymean) ** 2 for vi in v) or 1.0
-        r2 = 1.0 - ss_res / ss_tot
-        return {"type": "linear", "a": a, "b": b, "r2": r2}
-
-    def log_fit(u, v):
-        u2 = [math.log(max(1e-9, t)) for t in u]
-        base = lin_fit(u2, v)
-        return base and {**base, "type": "log", "x_transform": "ln(x)"}
-
-    def exp_fit(u, v):
-        if any(val <= 0 for val in v):
-            return None
-        v2 = [math.log(val) for val in v]
-        fit = lin_fit(u, v2)
-        if not fit:
-            return None
-        a = fit["a"]
-        b = fit["b"]
-        r2 = fit["r2"]
-        return {"type": "exp", "a": a, "b": b, "r2": r2}
-
-    cands = []
-    f1 = lin_fit(xs, ys)
-    if f1:
-        cands.append(f1)
-    f2 = log_fit(xs, ys)
-    if f2:
-        cands.append(f2)
-    f3 = exp_fit(xs, ys)
-    if f3:
-        cands.append(f3)
-    best = max(cands, key=lambda d: d["r2"]) if cands else None
-    if best and best["r2"] >= 0.9:
-        return best
-    return {
-        "type": "piecewise",
-        "r2": best["r2"] if best else 0.0,
-        "points": [{"x": x, "y": y} for x, y in pts],
-    }
-
-
 @router.post("/mappings/fit")
 def fit_mapping(index: Optional[int] = None, device: Optional[int] = None, signature: Optional[str] = None) -> Dict[str, Any]:
     store = get_store()
@@ -816,23 +768,14 @@ def migrate_mapping_schema(index: Optional[int] = None, device: Optional[int] =
         parse_unit_from_display,
         build_groups_from_params,
     )
-    from server.services.mapping_utils import make_device_signature, detect_device_type
+    from server.services.mapping_utils import detect_device_type
 
     store = get_store()
     sig = (signature or "").strip()
     if not sig:
         if index is None or device is None:
             raise HTTPException(400, "index_device_or_signature_required")
-        devs = request_op("get_return_devices", timeout=1.0, return_index=int(index))
-        devices = ((devs or {}).get("data") or {}).get("devices") or []
-        dname = None
-        for d in devices:
-            if int(d.get("index", -1)) == int(device):
-                dname = str(d.get("name", f"Device {device}"))
-                break
-        params_resp = request_op("get_return_device_params", timeout=1.2, return_index=int(index), device_index=int(device))
-        live_params = ((params_resp or {}).get("data") or {}).get("params") or []
-        sig = make_device_signature(dname or f"Device {device}", live_params)
+        sig = _compute_signature_for(int(index), int(device))
 
     data = store.get_device_map_local(sig)
     if not data and store.enabled:
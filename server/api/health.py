@@ -9,6 +9,7 @@ from fastapi import APIRouter, Response
 
 from server.services.ableton_client import request_op
 from server.config.feature_flags import get_flag_status
+from server.services.event_listener import get_listener_stats
 
 
 router = APIRouter()
@@ -16,8 +17,11 @@ router = APIRouter()
 
 @router.get("/health")
 def server_health() -> Dict[str, Any]:
-    """Simple controller health endpoint for UI status."""
-    return {"status": "healthy", "service": "controller"}
+    """Simple controller health endpoint for UI status.
+
+    Includes Ableton event listener counters (datagrams, events, errors).
+    """
+    return {"status": "healthy", "service": "controller", "event_listener": get_listener_stats()}
 
 
 @router.get("/llm/health")
@@ -523,6 +523,12 @@ def execute_intent(intent: CanonicalIntent, debug: bool = False) -> Dict[str, An
         return set_return_routing(intent)
 
     # Mixer (track/return/master)
+    if d == "track" and (intent.track_indices or intent.track_collection) and field in ("volume", "pan", "mute", "solo", "send"):
+        # Track range/group: one validation read, one batched op, one undo entry
+        from server.services.intents.mixer_service import set_tracks_mixer
+        result = set_tracks_mixer(intent)
+        result["request_id"] = request_id
+        return result
     if d == "track" and field in ("volume", "pan", "mute", "solo"):
         from server.services.intents.mixer_service import set_track_mixer
         result = set_track_mixer(intent)
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Dict
+
+from fastapi import APIRouter, HTTPException
+from pydantic import BaseModel
+
+from server.models.macro import Macro
+from server.services.macro_runtime import cancel_run, get_run, list_runs, prepare_macro, start_run
+
+
+router = APIRouter()
+
+
+class MacroRunBody(BaseModel):
+    macro: Macro
+    dry_run: bool = False
+
+
+@router.post("/macro/run")
+async def run_macro(body: MacroRunBody) -> Dict[str, Any]:
+    """Resolve and precompute a macro, then schedule it against Live's beat clock.
+
+    With dry_run the resolved plan is returned without starting a run.
+    """
+    plan = await asyncio.to_thread(prepare_macro, body.macro)
+    if body.dry_run:
+        return {"ok": True, "dry_run": True, "plan": plan.summary(), "timeline": plan.description}
+    run = start_run(plan)
+    return {"ok": True, "run": run.status()}
+
+
+@router.get("/macro/runs")
+def get_macro_runs() -> Dict[str, Any]:
+    return {"ok": True, "runs": list_runs()}
+
+
+@router.get("/macro/runs/{run_id}")
+def get_macro_run(run_id: str) -> Dict[str, Any]:
+    run = get_run(run_id)
+    if run is None:
+        raise HTTPException(404, "run_not_found")
+    return {"ok": True, "run": run.status()}
+
+
+@router.post("/macro/runs/{run_id}/cancel")
+def cancel_macro_run(run_id: str) -> Dict[str, Any]:
+    if get_run(run_id) is None:
+        raise HTTPException(404, "run_not_found")
+    return {"ok": True, "cancelled": cancel_run(run_id)}
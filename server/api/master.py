@@ -211,6 +211,7 @@ def set_master_device_param(body: MasterDeviceParamBody) -> Dict[str, Any]:
             normalized_value=body.value,
             display_value=resp.get("display_value"),
             unit=resp.get("unit"),
+            param_index=body.param_index,
             source="web_ui"
         )
         # Reset device cache timestamp to mark as fresh
@@ -9,6 +9,7 @@ import sys
 
 from fastapi import APIRouter, HTTPException
 
+from server.core.deps import get_parse_index_service
 from server.models.requests import IntentParseBody
 from server.services.ableton_client import request_op
 from server.services.intent_mapper import map_llm_to_canonical
@@ -21,10 +22,6 @@ router = APIRouter()
 USE_LAYERED = os.getenv("USE_LAYERED_PARSER", "").lower() in ("1", "true", "yes")
 print(f"[NLP] USE_LAYERED_PARSER env var: {os.getenv('USE_LAYERED_PARSER')}, USE_LAYERED={USE_LAYERED}")
 
-# Module-level cache for parse index (only needed for layered parser)
-_PARSE_INDEX = None
-_PARSE_INDEX_TIMESTAMP = 0.0
-_PARSE_INDEX_TTL = 60.0  # Refresh every 60 seconds to pick up device changes
 
 
 _VERB_CANONICAL_MAP = {
@@ -98,97 +95,13 @@ def _normalize_command_verbs(text: str) -> str:
 
 
 def _get_parse_index() -> Dict[str, Any]:
-    """Get or build the parse index for layered parser.
+    """Shared parse index for the layered parser (see ParseIndexService)."""
+    return get_parse_index_service().get()
 
-    Builds index from Live set if available, otherwise returns minimal index.
-    Cached at module level with 60s TTL to pick up device changes.
-    """
-    global _PARSE_INDEX, _PARSE_INDEX_TIMESTAMP
-
-    import time
-
-    # Check if cache is still valid (non-empty AND not expired)
-    cache_age = time.time() - _PARSE_INDEX_TIMESTAMP
-    if _PARSE_INDEX is not None and cache_age < _PARSE_INDEX_TTL:
-        return _PARSE_INDEX
-
-    try:
-        from server.services.parse_index.parse_index_builder import ParseIndexBuilder
-
-        # Try to build index from Live snapshot devices (tracks + returns + master).
-        try:
-            # Use fast snapshot/full endpoint (structure only, no param values needed)
-            # This is 6-7x faster than old snapshot endpoint (1.0s vs 6.8s)
-            import requests
-
-            snap_resp = requests.get("http://127.0.0.1:8722/snapshot/full?skip_param_values=true", timeout=3.0)
-            live_devices = []
-            if snap_resp.ok:
-                snapshot = snap_resp.json()
-                data = snapshot.get("data", {})
-
-                # Extract devices from tracks
-                for track in data.get("tracks", []):
-                    for dev in track.get("devices", []):
-                        live_devices.append(
-                            {
-                                "name": dev.get("name"),
-                                "device_type": str(dev.get("device_type", "unknown")).lower(),
-                                "ordinals": 1,
-                            }
-                        )
-
-                # Extract devices from returns
-                for ret in data.get("returns", []):
-                    for dev in ret.get("devices", []):
-                        live_devices.append(
-                            {
-                                "name": dev.get("name"),
-                                "device_type": str(dev.get("device_type", "unknown")).lower(),
-                                "ordinals": 1,
-                            }
-                        )
-
-                # Extract devices from master
-                for dev in data.get("master", {}).get("devices", []):
-                    live_devices.append(
-                        {
-                            "name": dev.get("name"),
-                            "device_type": str(dev.get("device_type", "unknown")).lower(),
-                            "ordinals": 1,
-                        }
-                    )
-
-            builder = ParseIndexBuilder()
-            _PARSE_INDEX = builder.build_from_live_set(live_devices)
-            _PARSE_INDEX_TIMESTAMP = time.time()
-            print(f"[LAYERED] Built parse index with {len(_PARSE_INDEX.get('devices_in_set', []))} devices from fast snapshot")
-        except Exception as e:
-            print(f"[LAYERED] Failed to build parse index from snapshot: {e}, using minimal index")
-            _PARSE_INDEX = {
-                "version": "pi-minimal",
-                "devices_in_set": [],
-                "params_by_device": {},
-                "device_type_index": {},
-                "param_to_device_types": {},
-                "mixer_params": ["volume", "pan", "mute", "solo", "send a", "send b", "send c", "send d"],
-                "typo_map": {},
-            }
-            _PARSE_INDEX_TIMESTAMP = time.time()
-    except Exception as e:
-        print(f"[LAYERED] Failed to initialize parse index: {e}")
-        _PARSE_INDEX = {
-            "version": "pi-minimal",
-            "devices_in_set": [],
-            "params_by_device": {},
-            "device_type_index": {},
-            "param_to_device_types": {},
-            "mixer_params": ["volume", "pan", "mute", "solo", "send a", "send b", "send c", "send d"],
-            "typo_map": {},
-        }
-        _PARSE_INDEX_TIMESTAMP = time.time()
 
-    return _PARSE_INDEX
+@router.get("/intent/parse_index/stats")
+def parse_index_stats() -> Dict[str, Any]:
+    return {"ok": True, "data": get_parse_index_service().stats()}
 
 
 @router.post("/intent/parse")
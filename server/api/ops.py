@@ -7,13 +7,13 @@ from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 
 from server.services import events as Events
-from server.services.ableton_client import request_op
+from server.services.ableton_client import request_op, udp_request
 from server.models.ops import MixerOp, SendOp, DeviceParamOp
 from server.models.requests import VolumeDbBody
 from server.volume_utils import db_to_live_float
-from server.core.deps import get_store
+from server.core.deps import get_store, get_write_queue
 from server.services import value_registry as VR
-from server.services.mapping_utils import make_device_signature
+from server.services.mapping_utils import make_device_signature, reported_signature
 from server.services import history as History
 import math
 import re as _re
@@ -22,6 +22,23 @@ import re as _re
 router = APIRouter()
 
 
+def _queue_write(op: str, entity: str, index: int, field: str, value: float, *, confirm: bool, **ids: Any) -> Dict[str, Any]:
+    """Hand a value write to the coalescing write queue.
+
+    Returns immediately unless confirm=True, in which case it waits for
+    Live's ack (504 when none arrives).
+    """
+    res = get_write_queue().submit(entity, index, field, value, wait=confirm, **ids)
+    if confirm and res.get("error") in ("timeout", "no_reply"):
+        raise HTTPException(504, "No reply from Ableton Remote Script")
+    return {"op": op, **res}
+
+
+@router.get("/op/write_queue/stats")
+def op_write_queue_stats() -> Dict[str, Any]:
+    return {"ok": True, **get_write_queue().stats()}
+
+
 class ReturnDeviceParamBody(BaseModel):
     return_index: int
     device_index: int
@@ -30,17 +47,17 @@ class ReturnDeviceParamBody(BaseModel):
 
 
 @router.post("/op/return/device/param")
-def op_return_device_param(op: ReturnDeviceParamBody) -> Dict[str, Any]:
-    resp = request_op(
+def op_return_device_param(op: ReturnDeviceParamBody, confirm: bool = False) -> Dict[str, Any]:
+    resp = _queue_write(
         "set_return_device_param",
-        timeout=1.0,
-        return_index=int(op.return_index),
+        "return",
+        int(op.return_index),
+        "param",
+        float(op.value),
+        confirm=confirm,
         device_index=int(op.device_index),
         param_index=int(op.param_index),
-        value=float(op.value),
     )
-    if not resp:
-        raise HTTPException(504, "No reply from Ableton Remote Script")
 
     # Update ValueRegistry for snapshot
     try:
@@ -52,6 +69,7 @@ def op_return_device_param(op: ReturnDeviceParamBody) -> Dict[str, Any]:
             normalized_value=op.value,
             display_value=resp.get("display_value"),
             unit=resp.get("unit"),
+            param_index=op.param_index,
             source="web_ui",
         )
         # Reset device cache timestamp to mark as fresh
@@ -77,16 +95,16 @@ class ReturnSendBody(BaseModel):
 
 
 @router.post("/op/return/send")
-def op_return_send(body: ReturnSendBody) -> Dict[str, Any]:
-    resp = request_op(
+def op_return_send(body: ReturnSendBody, confirm: bool = False) -> Dict[str, Any]:
+    resp = _queue_write(
         "set_return_send",
-        timeout=1.0,
-        return_index=int(body.return_index),
+        "return",
+        int(body.return_index),
+        "send",
+        float(body.value),
+        confirm=confirm,
         send_index=int(body.send_index),
-        value=float(body.value),
     )
-    if not resp:
-        raise HTTPException(504, "No reply from Ableton Remote Script")
     try:
         Events.publish("return_send_changed", **{"return": int(body.return_index), "send_index": int(body.send_index)})
     except Exception:
@@ -101,18 +119,10 @@ class ReturnMixerBody(BaseModel):
 
 
 @router.post("/op/return/mixer")
-def op_return_mixer(body: ReturnMixerBody) -> Dict[str, Any]:
+def op_return_mixer(body: ReturnMixerBody, confirm: bool = False) -> Dict[str, Any]:
     if body.field not in ("volume", "pan", "mute", "solo"):
         raise HTTPException(400, "invalid_field")
-    resp = request_op(
-        "set_return_mixer",
-        timeout=1.0,
-        return_index=int(body.return_index),
-        field=str(body.field),
-        value=float(body.value),
-    )
-    if not resp:
-        raise HTTPException(504, "No reply from Ableton Remote Script")
+    resp = _queue_write("set_return_mixer", "return", int(body.return_index), str(body.field), float(body.value), confirm=confirm)
 
     # Update ValueRegistry for snapshot
     try:
@@ -136,10 +146,8 @@ def op_return_mixer(body: ReturnMixerBody) -> Dict[str, Any]:
 
 
 @router.post("/op/mixer")
-def op_mixer(op: MixerOp) -> Dict[str, Any]:
-    resp = request_op("set_mixer", timeout=1.0, **op.dict())
-    if not resp:
-        raise HTTPException(504, "No reply from Ableton Remote Script")
+def op_mixer(op: MixerOp, confirm: bool = False) -> Dict[str, Any]:
+    resp = _queue_write("set_mixer", "track", int(op.track_index), str(op.field), float(op.value), confirm=confirm)
 
     # Update ValueRegistry for snapshot
     try:
@@ -163,10 +171,8 @@ def op_mixer(op: MixerOp) -> Dict[str, Any]:
 
 
 @router.post("/op/send")
-def op_send(op: SendOp) -> Dict[str, Any]:
-    resp = request_op("set_send", timeout=1.0, **op.dict())
-    if not resp:
-        raise HTTPException(504, "No reply from Ableton Remote Script")
+def op_send(op: SendOp, confirm: bool = False) -> Dict[str, Any]:
+    resp = _queue_write("set_send", "track", int(op.track_index), "send", float(op.value), confirm=confirm, send_index=int(op.send_index))
     try:
         Events.publish("send_changed", track=op.track_index, send_index=op.send_index)
     except Exception:
@@ -175,10 +181,17 @@ def op_send(op: SendOp) -> Dict[str, Any]:
 
 
 @router.post("/op/device/param")
-def op_device_param(op: DeviceParamOp) -> Dict[str, Any]:
-    resp = request_op("set_device_param", timeout=1.0, **op.dict())
-    if not resp:
-        raise HTTPException(504, "No reply from Ableton Remote Script")
+def op_device_param(op: DeviceParamOp, confirm: bool = False) -> Dict[str, Any]:
+    resp = _queue_write(
+        "set_device_param",
+        "track",
+        int(op.track_index),
+        "param",
+        float(op.value),
+        confirm=confirm,
+        device_index=int(op.device_index),
+        param_index=int(op.param_index),
+    )
 
     # Update ValueRegistry for snapshot
     try:
@@ -190,6 +203,7 @@ def op_device_param(op: DeviceParamOp) -> Dict[str, Any]:
             normalized_value=op.value,
             display_value=resp.get("display_value"),
             unit=resp.get("unit"),
+            param_index=op.param_index,
             source="web_ui",
         )
         # Reset device cache timestamp to mark as fresh
@@ -369,7 +383,7 @@ def set_return_param_by_name(body: ReturnParamByNameBody) -> Dict[str, Any]:
     devs = request_op("get_return_devices", timeout=1.0, return_index=ri)
     devices = ((devs or {}).get("data") or {}).get("devices") or []
     dname = device_name or next((str(d.get("name", "")) for d in devices if int(d.get("index", -1)) == di), f"Device {di}")
-    sig = make_device_signature(dname, p_list)
+    sig = reported_signature(devices, di) or make_device_signature(dname, p_list)
     store = get_store()
     mapping = None
     try:
@@ -455,9 +469,9 @@ def op_history_state() -> Dict[str, Any]:
 
 @router.post("/op/undo_last")
 def op_undo_last() -> Dict[str, Any]:
-    return History.undo_last(request_op)
+    return History.undo_last(udp_request)
 
 
 @router.post("/op/redo_last")
 def op_redo_last() -> Dict[str, Any]:
-    return History.redo_last(request_op)
+    return History.redo_last(udp_request)
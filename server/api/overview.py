@@ -3,13 +3,14 @@ from __future__ import annotations
 import asyncio
 import logging
 import time
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, List, Optional
 
 from fastapi import APIRouter
 from pydantic import BaseModel
 
-from server.services.ableton_client import request_op, data_or_raw
+from server.services.ableton_client import request_op, request_op_stream, data_or_raw
 from server.core.deps import get_live_index, get_value_registry
+from server.services.value_registry import send_field
 from server.config.app_config import get_snapshot_config
 
 logger = logging.getLogger(__name__)
@@ -237,6 +238,7 @@ async def _refresh_device_values_chunked(tracks: List[Dict[str, Any]], returns:
                             normalized_value=param.get("value"),
                             display_value=param.get("display_value"),
                             unit=param.get("unit"),
+                            param_index=param.get("index"),
                             source="snapshot_refresh"
                         )
                     except Exception:
@@ -428,53 +430,70 @@ async def invalidate_device_type_cache() -> Dict[str, Any]:
     return {"ok": True, "message": f"Device type cache invalidated ({cache_size} entries cleared)"}
 
 
+def _enrich_devices(section: Dict[str, Any]) -> None:
+    # Enrich with device_type from Firestore (cached)
+    for dev in section.get("devices", []):
+        dev.update(_enrich_device_with_type(dev.get("name", "")))
+
+
+def _collect_full_snapshot(skip_param_values: bool) -> Optional[Dict[str, Any]]:
+    """Build the snapshot from the streamed get_full_snapshot parts as they arrive.
+
+    Each track/return is enriched on arrival, overlapping with the rest of
+    the transfer. Returns None unless the stream completed.
+    """
+    data: Dict[str, Any] = {"tracks": [], "returns": [], "master": {}, "transport": {}}
+    for part in request_op_stream("get_full_snapshot", timeout=10.0, skip_param_values=skip_param_values):
+        if not part.get("ok"):
+            return None
+        kind = part.get("part")
+        if kind is None:
+            # Remote Script without streaming: the whole snapshot in one reply
+            whole = data_or_raw(part) or {}
+            for section in (*whole.get("tracks", []), *whole.get("returns", []), whole.get("master", {})):
+                _enrich_devices(section)
+            return whole
+        if kind == "end":
+            return data
+        section = part.get("data") or {}
+        if kind in ("track", "return"):
+            _enrich_devices(section)
+            data[kind + "s"].append(section)
+        elif kind == "master":
+            _enrich_devices(section)
+            data["master"] = section
+        else:
+            data[kind] = section
+    return None
+
+
 @router.get("/snapshot/full")
 async def snapshot_full(skip_param_values: bool = False) -> Dict[str, Any]:
-    """NEW: Get full snapshot in a single UDP call for performance testing.
+    """NEW: Get full snapshot in a single UDP request for performance testing.
 
-    This uses the new get_full_snapshot operation which gets everything in one call
-    instead of making dozens of separate UDP calls.
+    This uses the get_full_snapshot operation, streamed one part per
+    track/return so any set size fits (fragments are reassembled and lost
+    ones re-requested), instead of making dozens of separate UDP calls.
 
     Args:
         skip_param_values: If True, only get device structure (no param values)
 
     Returns:
-        Complete snapshot from single UDP call
+        Complete snapshot from single UDP request
     """
-    import time
     start = time.time()
 
-    # Single UDP call to get everything
-    resp = request_op("get_full_snapshot", timeout=10.0, skip_param_values=skip_param_values)
-
-    if not resp or not resp.get("ok"):
+    data = await asyncio.to_thread(_collect_full_snapshot, skip_param_values)
+    if data is None:
         return {"ok": False, "error": "failed_to_get_snapshot"}
-
-    data = data_or_raw(resp) or {}
     elapsed = time.time() - start
 
-    # Enrich with device_type from Firestore (cached)
-    # Enrich track devices
-    for track in data.get("tracks", []):
-        for dev in track.get("devices", []):
-            dev.update(_enrich_device_with_type(dev.get("name", "")))
-
-    # Enrich return devices
-    for ret in data.get("returns", []):
-        for dev in ret.get("devices", []):
-            dev.update(_enrich_device_with_type(dev.get("name", "")))
-
-    # Enrich master devices
-    master = data.get("master", {})
-    for dev in master.get("devices", []):
-        dev.update(_enrich_device_with_type(dev.get("name", "")))
-
     return {
         "ok": True,
         "data": data,
         "performance": {
             "elapsed_seconds": round(elapsed, 3),
-            "method": "single_udp_call",
+            "method": "streamed_udp_request",
         }
     }
 
@@ -517,6 +536,41 @@ class SnapshotQueryRequest(BaseModel):
     targets: List[QueryTarget]
 
 
+class _LiveReads:
+    """Per-request memo of Live reads for /snapshot/query.
+
+    Each distinct (op, args) is sent once; targets that need the same read
+    await the same future, and reads for different entities run
+    concurrently on the default executor.
+    """
+
+    def __init__(self) -> None:
+        self._pending: Dict[Any, "asyncio.Future[Any]"] = {}
+
+    def op(self, op: str, timeout: float = 1.0, **params: Any) -> "asyncio.Future[Any]":
+        return self.call((op, tuple(sorted(params.items()))), lambda: request_op(op, timeout=timeout, **params))
+
+    def call(self, key: Any, fn: Callable[[], Any]) -> "asyncio.Future[Any]":
+        fut = self._pending.get(key)
+        if fut is None:
+            fut = asyncio.get_running_loop().run_in_executor(None, fn)
+            self._pending[key] = fut
+        return fut
+
+    async def data(self, op: str, timeout: float = 1.0, **params: Any) -> Dict[str, Any]:
+        """data_or_raw of a memoized read ({} on failure)."""
+        try:
+            return data_or_raw(await self.op(op, timeout=timeout, **params)) or {}
+        except Exception:
+            return {}
+
+
+_PROJECT_QUERIES = {
+    "tracks_count", "track_count", "count_tracks", "audio_tracks_count", "midi_tracks_count",
+    "return_tracks_count", "tracks_list", "audio_tracks_list", "midi_tracks_list", "return_tracks_list",
+}
+
+
 @router.post("/snapshot/query")
 async def query_parameters(request: SnapshotQueryRequest) -> Dict[str, Any]:
     """Query parameter values from snapshot with Live fallback (Phase 2: mixer + transport).
@@ -524,247 +578,217 @@ async def query_parameters(request: SnapshotQueryRequest) -> Dict[str, Any]:
     Returns conversational answer plus structured values.
     Phase 2: Snapshot-first with Live fallback and snapshot update
     Phase 3: Will add device parameters + capabilities
+
+    Targets are answered concurrently. Fresh ValueRegistry slots are served
+    without touching Live, and the remaining Live reads go through one
+    per-request _LiveReads, so each distinct track/return/device is read once
+    no matter how many targets refer to it.
     """
-    from server.services.ableton_client import get_transport as svc_get_transport
+    reads = _LiveReads()
+    results = await asyncio.gather(*(_query_target(target, reads) for target in request.targets))
+    results = list(results)
 
-    reg = get_value_registry()
-    results = []
+    # Format conversational answer
+    answer = _format_query_answer(results)
+
+    return {
+        "ok": True,
+        "answer": answer,
+        "values": results,
+    }
 
-    for target in request.targets:
-        track_name = target.track or ""
-        param_name = target.parameter
 
-        # Global project queries (counts/lists)
-        if not track_name and isinstance(param_name, str):
-            pn = param_name.strip().lower()
+async def _query_target(target: QueryTarget, reads: _LiveReads) -> Dict[str, Any]:
+    """Answer one /snapshot/query target."""
+    from server.services.ableton_client import get_transport as svc_get_transport
+
+    reg = get_value_registry()
+    max_age, pushed_max_age = _registry_max_ages()
+    track_name = target.track or ""
+    param_name = target.parameter
+
+    # Global project queries (counts/lists)
+    pn = param_name.strip().lower() if isinstance(param_name, str) else ""
+    if not track_name and pn in _PROJECT_QUERIES:
+        data, rdata = await asyncio.gather(reads.data("get_overview"), reads.data("get_return_tracks"))
+        tracks = data.get("tracks") or []
+        returns = rdata.get("returns") or []
+
+        def _display_track(t: Dict[str, Any]) -> str:
             try:
-                ov = request_op("get_overview", timeout=1.0) or {}
-                data = data_or_raw(ov) or {}
-                tracks = data.get("tracks") or []
+                idx = int(t.get("index", 0))
+                name = str(t.get("name", f"Track {idx}"))
+                return f"Track {idx} ({name})"
             except Exception:
-                tracks = []
-            # Returns list via dedicated op
+                return str(t.get("name", "Track"))
+
+        if pn in ("tracks_count", "track_count", "count_tracks"):
+            return {"track": None, "parameter": "tracks_count", "value": len([t for t in tracks if str(t.get("type","track")) != "return"]), "display_value": str(len([t for t in tracks if str(t.get("type","track")) != "return"]))}
+        if pn == "audio_tracks_count":
+            audio = [t for t in tracks if str(t.get("type", "")).lower() == "audio"]
+            return {"track": None, "parameter": "audio_tracks_count", "value": len(audio), "display_value": str(len(audio))}
+        if pn == "midi_tracks_count":
+            midi = [t for t in tracks if str(t.get("type", "")).lower() == "midi"]
+            return {"track": None, "parameter": "midi_tracks_count", "value": len(midi), "display_value": str(len(midi))}
+        if pn == "return_tracks_count":
+            return {"track": None, "parameter": "return_tracks_count", "value": len(returns), "display_value": str(len(returns))}
+        if pn == "tracks_list":
+            non_returns = [t for t in tracks if str(t.get("type", "track")) != "return"]
+            names = [_display_track(t) for t in non_returns]
+            return {"track": None, "parameter": "tracks_list", "value": names, "display_value": ", ".join(names) or "(none)"}
+        if pn == "audio_tracks_list":
+            audio = [t for t in tracks if str(t.get("type", "")).lower() == "audio"]
+            names = [_display_track(t) for t in audio]
+            return {"track": None, "parameter": "audio_tracks_list", "value": names, "display_value": ", ".join(names) or "(none)"}
+        if pn == "midi_tracks_list":
+            midi = [t for t in tracks if str(t.get("type", "")).lower() == "midi"]
+            names = [_display_track(t) for t in midi]
+            return {"track": None, "parameter": "midi_tracks_list", "value": names, "display_value": ", ".join(names) or "(none)"}
+        rnames = []
+        for r in returns:
             try:
-                rs = request_op("get_return_tracks", timeout=1.0) or {}
-                rdata = data_or_raw(rs) or {}
-                returns = rdata.get("returns") or []
+                idx = int(r.get("index", 0))
+                nm = str(r.get("name", f"Return {idx}"))
+                letter = chr(ord('A') + idx)
+                rnames.append(f"Return {letter} ({nm})")
             except Exception:
-                returns = []
-
-            def _display_track(t: Dict[str, Any]) -> str:
-                try:
-                    idx = int(t.get("index", 0))
-                    name = str(t.get("name", f"Track {idx}"))
-                    return f"Track {idx} ({name})"
-                except Exception:
-                    return str(t.get("name", "Track"))
-
-            if pn in ("tracks_count", "track_count", "count_tracks"):
-                results.append({"track": None, "parameter": "tracks_count", "value": len([t for t in tracks if str(t.get("type","track")) != "return"]), "display_value": str(len([t for t in tracks if str(t.get("type","track")) != "return"]))})
-                continue
-            if pn == "audio_tracks_count":
-                audio = [t for t in tracks if str(t.get("type", "")).lower() == "audio"]
-                results.append({"track": None, "parameter": "audio_tracks_count", "value": len(audio), "display_value": str(len(audio))})
-                continue
-            if pn == "midi_tracks_count":
-                midi = [t for t in tracks if str(t.get("type", "")).lower() == "midi"]
-                results.append({"track": None, "parameter": "midi_tracks_count", "value": len(midi), "display_value": str(len(midi))})
-                continue
-            if pn == "return_tracks_count":
-                results.append({"track": None, "parameter": "return_tracks_count", "value": len(returns), "display_value": str(len(returns))})
-                continue
-            if pn == "tracks_list":
-                non_returns = [t for t in tracks if str(t.get("type", "track")) != "return"]
-                names = [_display_track(t) for t in non_returns]
-                results.append({"track": None, "parameter": "tracks_list", "value": names, "display_value": ", ".join(names) or "(none)"})
-                continue
-            if pn == "audio_tracks_list":
-                audio = [t for t in tracks if str(t.get("type", "")).lower() == "audio"]
-                names = [_display_track(t) for t in audio]
-                results.append({"track": None, "parameter": "audio_tracks_list", "value": names, "display_value": ", ".join(names) or "(none)"})
-                continue
-            if pn == "midi_tracks_list":
-                midi = [t for t in tracks if str(t.get("type", "")).lower() == "midi"]
-                names = [_display_track(t) for t in midi]
-                results.append({"track": None, "parameter": "midi_tracks_list", "value": names, "display_value": ", ".join(names) or "(none)"})
-                continue
-            if pn == "return_tracks_list":
-                rnames = []
-                for r in returns:
-                    try:
-                        idx = int(r.get("index", 0))
-                        nm = str(r.get("name", f"Return {idx}"))
-                        letter = chr(ord('A') + idx)
-                        rnames.append(f"Return {letter} ({nm})")
-                    except Exception:
-                        rnames.append(str(r.get("name", "Return")))
-                results.append({"track": None, "parameter": "return_tracks_list", "value": rnames, "display_value": ", ".join(rnames) or "(none)"})
-                continue
+                rnames.append(str(r.get("name", "Return")))
+        return {"track": None, "parameter": "return_tracks_list", "value": rnames, "display_value": ", ".join(rnames) or "(none)"}
 
-        # Transport params (no track)
-        if not track_name and param_name in ("tempo", "metronome"):
-            transport = reg.get_transport()
-            param_data = transport.get(param_name)
-            if param_data:
-                results.append({
+    # Transport params (no track)
+    if not track_name and param_name in ("tempo", "metronome"):
+        param_data = reg.get_transport_field(param_name, max_age=max_age, pushed_max_age=pushed_max_age)
+        if param_data:
+            return {
+                "track": None,
+                "parameter": param_name,
+                "value": param_data.get("value"),
+                "display_value": str(param_data.get("value")),
+                "source": param_data.get("source"),
+            }
+        # Fallback to Live
+        transport_live = await reads.call(("get_transport",), lambda: svc_get_transport(timeout=1.0))
+        if transport_live and transport_live.get("ok"):
+            transport_data = transport_live.get("data") or {}
+            value = transport_data.get(param_name)
+            if value is not None:
+                # Update snapshot
+                reg.update_transport(param_name, value, source="live_fallback")
+                return {
                     "track": None,
                     "parameter": param_name,
-                    "value": param_data.get("value"),
-                    "display_value": str(param_data.get("value")),
-                    "source": param_data.get("source"),
-                })
-            else:
-                # Fallback to Live
-                loop = asyncio.get_event_loop()
-                transport_live = await loop.run_in_executor(None, lambda: svc_get_transport(timeout=1.0))
-                if transport_live and transport_live.get("ok"):
-                    transport_data = transport_live.get("data") or {}
-                    value = transport_data.get(param_name)
-                    if value is not None:
-                        # Update snapshot
-                        reg.update_transport(param_name, value, source="live_fallback")
-                        results.append({
-                            "track": None,
-                            "parameter": param_name,
-                            "value": value,
-                            "display_value": str(value),
-                            "source": "live_fallback",
-                        })
-                    else:
-                        results.append({
-                            "track": None,
-                            "parameter": param_name,
-                            "error": "not_available",
-                        })
-                else:
-                    results.append({
-                        "track": None,
-                        "parameter": param_name,
-                        "error": "live_query_failed",
-                    })
-            continue
-
-        # Parse track/return/master
-        domain, index = _parse_track_name(track_name)
-        if not domain:
-            results.append({
-                "track": track_name,
+                    "value": value,
+                    "display_value": str(value),
+                    "source": "live_fallback",
+                }
+            return {
+                "track": None,
                 "parameter": param_name,
-                "error": f"Could not parse track: {track_name}",
-            })
-            continue
-
-        # Device parameters (if plugin specified)
-        if target.plugin:
-            result = await _query_device_param(domain, index, target.plugin, param_name, track_name, target.device_ordinal)
-            results.append(result)
-            continue
+                "error": "not_available",
+            }
+        return {
+            "track": None,
+            "parameter": param_name,
+            "error": "live_query_failed",
+        }
 
-        # Special queries for sends/connectivity and device lists
-        special = await _handle_special_queries(domain, index, track_name, param_name)
-        if special is not None:
-            results.append(special)
-            continue
+    # Parse track/return/master
+    domain, index = _parse_track_name(track_name)
+    if not domain:
+        return {
+            "track": track_name,
+            "parameter": param_name,
+            "error": f"Could not parse track: {track_name}",
+        }
 
-        # Query mixer parameter from snapshot
-        mixer_map = reg.get_mixer()
-        entity_data = mixer_map.get(domain, {})
+    # Device parameters (if plugin specified)
+    if target.plugin:
+        return await _query_device_param(domain, index, target.plugin, param_name, track_name, target.device_ordinal, reads)
 
-        # Get track/return/master data
-        if domain == "master":
-            track_data = entity_data.get(0, {})
-        else:
-            track_data = entity_data.get(index, {})
+    # Special queries for sends/connectivity and device lists
+    special = await _handle_special_queries(domain, index, track_name, param_name, reads)
+    if special is not None:
+        return special
 
-        # Special case: track/return/master name
-        if param_name == "name":
-            try:
-                if domain == "master":
-                    results.append({
-                        "track": "Master",
-                        "parameter": "name",
-                        "value": "Master",
-                        "display_value": "Master",
-                        "source": "overview",
-                    })
-                elif domain == "track":
-                    ov = request_op("get_overview", timeout=1.0) or {}
-                    data = data_or_raw(ov) or {}
-                    tracks = data.get("tracks") or []
-                    name = None
-                    for t in tracks:
-                        try:
-                            if int(t.get("index", -1)) == int(index):
-                                name = str(t.get("name", f"Track {index}"))
-                                break
-                        except Exception:
-                            continue
-                    if name is None:
-                        name = f"Track {index}"
-                    results.append({
-                        "track": f"Track {index}",
-                        "parameter": "name",
-                        "value": name,
-                        "display_value": name,
-                        "source": "overview",
-                    })
-                elif domain == "return":
-                    rs = request_op("get_return_tracks", timeout=1.0) or {}
-                    rdata = data_or_raw(rs) or {}
-                    returns = rdata.get("returns") or []
-                    name = None
-                    for r in returns:
-                        try:
-                            if int(r.get("index", -1)) == int(index):
-                                name = str(r.get("name", f"Return {chr(ord('A') + int(index))}"))
-                                break
-                        except Exception:
-                            continue
-                    if name is None:
-                        name = f"Return {chr(ord('A') + int(index))}"
-                    results.append({
-                        "track": f"Return {chr(ord('A') + int(index))}",
-                        "parameter": "name",
-                        "value": name,
-                        "display_value": name,
-                        "source": "overview",
-                    })
-            except Exception:
-                results.append({
-                    "track": track_name,
+    # Special case: track/return/master name
+    if param_name == "name":
+        try:
+            if domain == "master":
+                return {
+                    "track": "Master",
                     "parameter": "name",
-                    "error": "name_lookup_failed",
-                })
-            continue
-
-        param_data = track_data.get(param_name)
-
-        if param_data:
-            # Found in snapshot
-            display_val = param_data.get("display") or _format_mixer_display(param_name, param_data.get("normalized"))
-            results.append({
+                    "value": "Master",
+                    "display_value": "Master",
+                    "source": "overview",
+                }
+            if domain == "track":
+                tracks = (await reads.data("get_overview")).get("tracks") or []
+                name = None
+                for t in tracks:
+                    try:
+                        if int(t.get("index", -1)) == int(index):
+                            name = str(t.get("name", f"Track {index}"))
+                            break
+                    except Exception:
+                        continue
+                if name is None:
+                    name = f"Track {index}"
+                return {
+                    "track": f"Track {index}",
+                    "parameter": "name",
+                    "value": name,
+                    "display_value": name,
+                    "source": "overview",
+                }
+            returns = (await reads.data("get_return_tracks")).get("returns") or []
+            name = None
+            for r in returns:
+                try:
+                    if int(r.get("index", -1)) == int(index):
+                        name = str(r.get("name", f"Return {chr(ord('A') + int(index))}"))
+                        break
+                except Exception:
+                    continue
+            if name is None:
+                name = f"Return {chr(ord('A') + int(index))}"
+            return {
+                "track": f"Return {chr(ord('A') + int(index))}",
+                "parameter": "name",
+                "value": name,
+                "display_value": name,
+                "source": "overview",
+            }
+        except Exception:
+            return {
                 "track": track_name,
-                "parameter": param_name,
-                "value": param_data.get("normalized"),
-                "display_value": display_val,
-                "source": param_data.get("source"),
-            })
-        else:
-            # Fallback to Live
-            result = await _query_live_mixer_param(domain, index, param_name, track_name, reg)
-            results.append(result)
+                "parameter": "name",
+                "error": "name_lookup_failed",
+            }
 
-    # Format conversational answer
-    answer = _format_query_answer(results)
+    # Query mixer parameter from registry (fresh slots only)
+    param_data = reg.get_mixer_field(
+        domain,
+        index or 0,
+        _mixer_field_key(param_name),
+        max_age=max_age,
+        pushed_max_age=pushed_max_age,
+    )
 
-    return {
-        "ok": True,
-        "answer": answer,
-        "values": results,
-    }
+    if param_data:
+        # Found in snapshot
+        display_val = param_data.get("display") or _format_mixer_display(param_name, param_data.get("normalized"))
+        return {
+            "track": track_name,
+            "parameter": param_name,
+            "value": param_data.get("normalized"),
+            "display_value": display_val,
+            "source": param_data.get("source"),
+        }
+    # Fallback to Live
+    return await _query_live_mixer_param(domain, index, param_name, track_name, reg, reads)
 
 
-async def _handle_special_queries(domain: str | None, index: int | None, track_name: str, param_name: str):
+async def _handle_special_queries(domain: str | None, index: int | None, track_name: str, param_name: str, reads: _LiveReads | None = None):
     """Handle enhanced get_parameter queries that infer topology or lists.
 
     Supports:
@@ -774,6 +798,7 @@ async def _handle_special_queries(domain: str | None, index: int | None, track_n
     """
     if not domain:
         return None
+    reads = reads or _LiveReads()
 
     import re
     pn = (param_name or "").strip().lower()
@@ -798,11 +823,7 @@ async def _handle_special_queries(domain: str | None, index: int | None, track_n
         ri = _letter_to_index(letter)
         devices = li.get_return_devices_cached(ri)
         if not devices:
-            try:
-                resp = request_op("get_return_devices", timeout=1.0, return_index=int(ri)) or {}
-                devices = (data_or_raw(resp) or {}).get("devices") or []
-            except Exception:
-                devices = []
+            devices = (await reads.data("get_return_devices", return_index=int(ri))).get("devices") or []
         dev_names = [str(d.get("name", "")).strip() for d in devices]
         return {
             "track": f"Track {index}",
@@ -818,11 +839,7 @@ async def _handle_special_queries(domain: str | None, index: int | None, track_n
         if domain == "track":
             devices = li.get_track_devices_cached(index)
             if not devices:
-                try:
-                    resp = request_op("get_track_devices", timeout=1.0, track_index=int(index)) or {}
-                    devices = (data_or_raw(resp) or {}).get("devices") or []
-                except Exception:
-                    devices = []
+                devices = (await reads.data("get_track_devices", track_index=int(index))).get("devices") or []
             dev_names = [str(d.get("name", "")).strip() for d in devices]
             return {
                 "track": f"Track {index}",
@@ -834,11 +851,7 @@ async def _handle_special_queries(domain: str | None, index: int | None, track_n
         if domain == "return":
             devices = li.get_return_devices_cached(index)
             if not devices:
-                try:
-                    resp = request_op("get_return_devices", timeout=1.0, return_index=int(index)) or {}
-                    devices = (data_or_raw(resp) or {}).get("devices") or []
-                except Exception:
-                    devices = []
+                devices = (await reads.data("get_return_devices", return_index=int(index))).get("devices") or []
             dev_names = [str(d.get("name", "")).strip() for d in devices]
             return {
                 "track": f"Return {chr(ord('A') + int(index))}",
@@ -868,14 +881,14 @@ async def _handle_special_queries(domain: str | None, index: int | None, track_n
         # Fallback: query Live for each track's sends when snapshot has no data
         if not sources:
             try:
-                ov = request_op("get_overview", timeout=1.0) or {}
-                data = data_or_raw(ov) or {}
-                tracks = data.get("tracks") or []
-                for t in tracks:
+                tracks = (await reads.data("get_overview")).get("tracks") or []
+                # Read every track's sends at once
+                all_sends = await asyncio.gather(*(
+                    reads.data("get_track_sends", timeout=0.8, track_index=int(t.get("index", 0))) for t in tracks
+                ))
+                for t, sdata in zip(tracks, all_sends):
                     try:
                         ti = int(t.get("index", 0))
-                        resp = request_op("get_track_sends", timeout=0.8, track_index=ti) or {}
-                        sdata = data_or_raw(resp) or {}
                         sends = sdata.get("sends") or []
                         send_idx = int(ord(letter) - ord('A'))
                         send = next((s for s in sends if int(s.get("index", -1)) == send_idx), None)
@@ -902,8 +915,7 @@ async def _handle_special_queries(domain: str | None, index: int | None, track_n
     if returns_pat and domain == "track" and isinstance(index, int):
         try:
             # Try Live directly to get up-to-date send values
-            resp = request_op("get_track_sends", timeout=1.0, track_index=int(index)) or {}
-            data = data_or_raw(resp) or {}
+            data = await reads.data("get_track_sends", track_index=int(index))
             sends = data.get("sends") or []
             # Build letter-keyed map with readable display (prefer dB if provided; fallback to normalized %)
             from server.volume_utils import live_float_to_db_send
@@ -949,8 +961,12 @@ async def _handle_special_queries(domain: str | None, index: int | None, track_n
         ent = mixer_map.get(domain or "", {})
         fields = ent.get(index, {}) if domain != "master" else (mixer_map.get("master", {}) or {})
 
+        max_age, pushed_max_age = _registry_max_ages()
+
         def _val(name: str) -> Tuple[float | None, str]:
             d = fields.get(name) or {}
+            if not reg.is_fresh(d, max_age, pushed_max_age):
+                return None, _fmt(name, None)
             n = d.get("normalized")
             return n, _fmt(name, n)
 
@@ -972,18 +988,15 @@ async def _handle_special_queries(domain: str | None, index: int | None, track_n
         if needed:
             try:
                 if domain == "track":
-                    from server.services.mixer_readers import read_track_status
-                    st = read_track_status(int(index)) or {}
+                    st = await reads.data("get_track_status", track_index=int(index))
                     vol = st.get("volume"); pan = st.get("pan"); mute = st.get("mute"); solo = st.get("solo")
                 elif domain == "return":
-                    rs = request_op("get_return_tracks", timeout=1.0) or {}
-                    rdata = data_or_raw(rs) or {}
+                    rdata = await reads.data("get_return_tracks")
                     r = next((r for r in (rdata.get("returns") or []) if int(r.get("index", -1)) == int(index)), {})
                     mix = r.get("mixer") or {}
                     vol = mix.get("volume"); pan = mix.get("pan"); mute = mix.get("mute"); solo = mix.get("solo")
                 else:  # master
-                    ms = request_op("get_master_status", timeout=1.0) or {}
-                    mdata = data_or_raw(ms) or {}
+                    mdata = await reads.data("get_master_status")
                     mmix = mdata.get("mixer") or {}
                     vol = mmix.get("volume"); pan = mmix.get("pan"); mute = mmix.get("mute"); solo = mmix.get("solo")
 
@@ -1011,11 +1024,9 @@ async def _handle_special_queries(domain: str | None, index: int | None, track_n
         routing = None
         try:
             if domain == "track":
-                rr = request_op("get_track_routing", timeout=1.0, track_index=int(index)) or {}
-                routing = data_or_raw(rr) or {}
+                routing = await reads.data("get_track_routing", track_index=int(index))
             elif domain == "return":
-                rr = request_op("get_return_routing", timeout=1.0, return_index=int(index)) or {}
-                routing = data_or_raw(rr) or {}
+                routing = await reads.data("get_return_routing", return_index=int(index))
             else:
                 routing = {"audio_to": {"type": "Master", "channel": "1/2"}}
         except Exception:
@@ -1118,6 +1129,21 @@ def _parse_track_name(track_name: str) -> tuple[str | None, int | None]:
     return None, None
 
 
+def _registry_max_ages() -> tuple[float, float]:
+    """(max_age, pushed_max_age) in seconds for serving values from ValueRegistry."""
+    cfg = get_snapshot_config()
+    return float(cfg.get("value_max_age_seconds", 30.0)), float(cfg.get("pushed_value_max_age_seconds", 300.0))
+
+
+def _mixer_field_key(param_name: str) -> str:
+    """Registry field for a mixer param ("send a" -> "send A")."""
+    name = str(param_name or "").strip()
+    parts = name.split()
+    if len(parts) == 2 and parts[0].lower() == "send" and len(parts[1]) == 1 and parts[1].isalpha():
+        return send_field(ord(parts[1].upper()) - ord("A"))
+    return name
+
+
 def _format_mixer_display(param_name: str, normalized_value: float | None) -> str:
     """Format normalized mixer value to display string."""
     if normalized_value is None:
@@ -1185,10 +1211,10 @@ def _format_query_answer(results: List[Dict[str, Any]]) -> str:
     return f"{track_name} - " + ", ".join(parts)
 
 
-async def _query_live_mixer_param(domain: str, index: int, param_name: str, track_name: str, reg: Any) -> Dict[str, Any]:
+async def _query_live_mixer_param(domain: str, index: int, param_name: str, track_name: str, reg: Any, reads: _LiveReads | None = None) -> Dict[str, Any]:
     """Query mixer parameter from Live and update snapshot."""
     import re
-    loop = asyncio.get_event_loop()
+    reads = reads or _LiveReads()
 
     try:
         # Handle sends separately
@@ -1199,10 +1225,7 @@ async def _query_live_mixer_param(domain: str, index: int, param_name: str, trac
                 send_letter = match.group(1).upper()
                 send_index = ord(send_letter) - ord('A')
 
-                resp = await loop.run_in_executor(
-                    None,
-                    lambda: request_op("get_track_sends", timeout=1.0, track_index=index)
-                )
+                resp = await reads.op("get_track_sends", track_index=index)
 
                 if resp and resp.get("ok"):
                     sends_data = data_or_raw(resp) or {}
@@ -1215,7 +1238,7 @@ async def _query_live_mixer_param(domain: str, index: int, param_name: str, trac
                             reg.update_mixer(
                                 entity="track",
                                 index=index,
-                                field=param_name,
+                                field=send_field(send_index),
                                 normalized_value=value,
                                 display_value=None,
                                 unit=None,
@@ -1238,20 +1261,11 @@ async def _query_live_mixer_param(domain: str, index: int, param_name: str, trac
 
         # Query based on domain
         if domain == "track":
-            resp = await loop.run_in_executor(
-                None,
-                lambda: request_op("get_track_status", timeout=1.0, track_index=index)
-            )
+            resp = await reads.op("get_track_status", track_index=index)
         elif domain == "return":
-            resp = await loop.run_in_executor(
-                None,
-                lambda: request_op("get_return_tracks", timeout=1.0)
-            )
+            resp = await reads.op("get_return_tracks")
         elif domain == "master":
-            resp = await loop.run_in_executor(
-                None,
-                lambda: request_op("get_master_status", timeout=1.0)
-            )
+            resp = await reads.op("get_master_status")
         else:
             return {
                 "track": track_name,
@@ -1322,37 +1336,59 @@ async def _query_live_mixer_param(domain: str, index: int, param_name: str, trac
         }
 
 
-async def _query_device_param(domain: str, index: int, plugin_name: str, param_name: str, track_name: str, device_ordinal: int | None) -> Dict[str, Any]:
+async def _read_device_params_live(domain: str, index: int, device_index: int, reads: _LiveReads | None = None) -> List[Dict[str, Any]] | None:
+    """Read all params of one device from Live; None when the read fails."""
+    reads = reads or _LiveReads()
+    if domain == "track":
+        op, kwargs = "get_track_device_params", {"track_index": index, "device_index": device_index}
+    elif domain == "return":
+        op, kwargs = "get_return_device_params", {"return_index": index, "device_index": device_index}
+    elif domain == "master":
+        op, kwargs = "get_master_device_params", {"device_index": device_index}
+    else:
+        return None
+    resp = await reads.op(op, **kwargs)
+    if not resp or not resp.get("ok"):
+        return None
+    return (data_or_raw(resp) or {}).get("params") or []
+
+
+async def _query_device_param(domain: str, index: int, plugin_name: str, param_name: str, track_name: str, device_ordinal: int | None, reads: _LiveReads | None = None) -> Dict[str, Any]:
     """Query device parameter using shared resolver and return value + capabilities.
 
     - Uses DeviceResolver to honor device_type aliases and cached types
     - Honors device_ordinal even when plugin_name is generic (e.g., "device 1")
     - Uses alias-aware param resolution consistent with executor
     """
-    loop = asyncio.get_event_loop()
+    reads = reads or _LiveReads()
 
     try:
         # Step 1: Resolve device_index using shared resolver
         from server.core.deps import get_device_resolver
         resolver = get_device_resolver()
+        ordinal_hint = int(device_ordinal) if device_ordinal else None
+        # The resolver may read device lists from Live; run it off the loop, once per device ref
         if domain == "track":
-            device_index, _resolved_name, _notes = resolver.resolve_track(
-                track_index=int(index),
-                device_name_hint=str(plugin_name or ""),
-                device_ordinal_hint=int(device_ordinal) if device_ordinal else None,
+            device_index, _resolved_name, _notes = await reads.call(
+                ("resolve", domain, int(index), str(plugin_name or ""), ordinal_hint),
+                lambda: resolver.resolve_track(
+                    track_index=int(index),
+                    device_name_hint=str(plugin_name or ""),
+                    device_ordinal_hint=ordinal_hint,
+                ),
             )
         elif domain == "return":
-            device_index, _resolved_name, _notes = resolver.resolve_return(
-                return_index=int(index),
-                device_name_hint=str(plugin_name or ""),
-                device_ordinal_hint=int(device_ordinal) if device_ordinal else None,
+            device_index, _resolved_name, _notes = await reads.call(
+                ("resolve", domain, int(index), str(plugin_name or ""), ordinal_hint),
+                lambda: resolver.resolve_return(
+                    return_index=int(index),
+                    device_name_hint=str(plugin_name or ""),
+                    device_ordinal_hint=ordinal_hint,
+                ),
             )
         elif domain == "master":
             # Master: fall back to name/ordinal match
-            devs_resp = await loop.run_in_executor(
-                None,
-                lambda: request_op("get_master_devices", timeout=1.0)
-            )
+            devs_resp = await reads.op("get_master_devices")
             if not devs_resp or not devs_resp.get("ok"):
                 return {"track": track_name, "plugin": plugin_name, "parameter": param_name, "error": "failed_to_get_devices"}
             devices_data = data_or_raw(devs_resp) or {}
@@ -1373,40 +1409,39 @@ async def _query_device_param(domain: str, index: int, plugin_name: str, param_n
         else:
             return {"track": track_name, "plugin": plugin_name, "parameter": param_name, "error": f"unsupported_domain:{domain}"}
 
-        # Step 2: Query parameter value using param_lookup endpoint for the resolved device
-        if domain == "track":
-            param_resp = await loop.run_in_executor(
-                None,
-                lambda: request_op("get_track_device_params", timeout=1.0, track_index=index, device_index=device_index)
-            )
-        elif domain == "return":
-            param_resp = await loop.run_in_executor(
-                None,
-                lambda: request_op("get_return_device_params", timeout=1.0, return_index=index, device_index=device_index)
-            )
-        elif domain == "master":
-            param_resp = await loop.run_in_executor(
-                None,
-                lambda: request_op("get_master_device_params", timeout=1.0, device_index=device_index)
-            )
+        # Step 2: Serve params from the registry when every slot is fresh,
+        # otherwise read them from Live and write them back
+        reg = get_value_registry()
+        max_age, pushed_max_age = _registry_max_ages()
+        cached = reg.get_device_params(domain, int(index or 0), int(device_index), max_age=max_age, pushed_max_age=pushed_max_age)
+        if cached and all("index" in e for e in cached.values()):
+            params = [
+                {"name": name, "value": e.get("normalized"), "display_value": e.get("display"), "unit": e.get("unit"), "index": e.get("index")}
+                for name, e in sorted(cached.items(), key=lambda kv: kv[1].get("index", 0))
+            ]
+            value_source = "registry"
         else:
-            return {
-                "track": track_name,
-                "plugin": plugin_name,
-                "parameter": param_name,
-                "error": "unsupported_domain_for_params",
-            }
-
-        if not param_resp or not param_resp.get("ok"):
-            return {
-                "track": track_name,
-                "plugin": plugin_name,
-                "parameter": param_name,
-                "error": "failed_to_get_params",
-            }
-
-        params_data = data_or_raw(param_resp) or {}
-        params = params_data.get("params") or []
+            params = await _read_device_params_live(domain, int(index or 0), int(device_index), reads)
+            if params is None:
+                return {
+                    "track": track_name,
+                    "plugin": plugin_name,
+                    "parameter": param_name,
+                    "error": "failed_to_get_params",
+                }
+            for p in params:
+                reg.update_device_param(
+                    domain,
+                    int(index or 0),
+                    int(device_index),
+                    str(p.get("name", "")),
+                    p.get("value"),
+                    p.get("display_value"),
+                    p.get("unit"),
+                    param_index=p.get("index"),
+                    source="live_fallback",
+                )
+            value_source = "live"
 
         # Step 3: Resolve parameter using alias-aware logic (same as executor)
         try:
@@ -1492,10 +1527,7 @@ async def _query_device_param(domain: str, index: int, plugin_name: str, param_n
         capabilities = None
         try:
             if domain == "return":
-                caps_resp = await loop.run_in_executor(
-                    None,
-                    lambda: request_op("get_return_device_capabilities", timeout=1.0, return_index=index, device_index=device_index)
-                )
+                caps_resp = await reads.op("get_return_device_capabilities", return_index=index, device_index=device_index)
                 if caps_resp and caps_resp.get("ok"):
                     capabilities = data_or_raw(caps_resp)
         except Exception:
@@ -1507,7 +1539,7 @@ async def _query_device_param(domain: str, index: int, plugin_name: str, param_n
             "parameter": param_actual_name,
             "value": param_value,
             "display_value": param_display,
-            "source": "live",
+            "source": value_source,
             "device_index": device_index,
             "param_index": param_index,
         }
@@ -2,14 +2,17 @@ from __future__ import annotations
 
 import asyncio
 import time
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Literal, Optional
 
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 
 from server.core.deps import get_store
 from server.core.events import broker
-from server.services.ableton_client import request_op, data_or_raw
+from server.services.ableton_client import request_op, data_or_raw, set_device_params_bulk
+from server.services import history as History
+from server.services import value_registry as VR
+from server.services.preset_morph import MorphJob, MorphPlan, cancel_morph, get_morph, list_morphs, start_morph
 from server.services.mapping_utils import make_device_signature, detect_device_type
 from server.services.preset_metadata import generate_preset_metadata_llm
 from server.cloud.enrich_queue import enqueue_preset_enrich
@@ -82,15 +85,8 @@ class ApplyPresetBody(BaseModel):
     preset_id: str
 
 
-@router.post("/return/device/apply_preset")
-def apply_preset(body: ApplyPresetBody) -> Dict[str, Any]:
-    store = get_store()
-    ret_idx = int(body.return_index)
-    dev_idx = int(body.device_index)
-    preset_id = str(body.preset_id)
-    preset = store.get_preset(preset_id)
-    if not preset:
-        raise HTTPException(status_code=404, detail=f"Preset not found: {preset_id}")
+def _read_return_device_for(preset: Dict[str, Any], ret_idx: int, dev_idx: int) -> tuple:
+    """(device_name, params) of a return device, checked against the preset's structure."""
     devs = request_op("get_return_devices", timeout=1.0, return_index=ret_idx)
     data = (devs or {}).get("data") or devs or {}
     devices = data.get("devices", [])
@@ -105,35 +101,134 @@ def apply_preset(body: ApplyPresetBody) -> Dict[str, Any]:
     preset_signature = preset.get("structure_signature")
     if current_signature != preset_signature:
         raise HTTPException(status_code=400, detail=f"Device structure mismatch. Current: {current_signature}, Preset: {preset_signature}")
+    return device_name, params
+
+
+@router.post("/return/device/apply_preset")
+def apply_preset(body: ApplyPresetBody) -> Dict[str, Any]:
+    store = get_store()
+    ret_idx = int(body.return_index)
+    dev_idx = int(body.device_index)
+    preset_id = str(body.preset_id)
+    preset = store.get_preset(preset_id)
+    if not preset:
+        raise HTTPException(status_code=404, detail=f"Preset not found: {preset_id}")
+    device_name, params = _read_return_device_for(preset, ret_idx, dev_idx)
     parameter_values = preset.get("parameter_values", {})
-    applied = 0
     errors = []
-    import time
+    by_name = {p.get("name"): p for p in params}
+    pairs = []
+    prev_values: Dict[int, Any] = {}
     for param_name, target_value in parameter_values.items():
+        param = by_name.get(param_name)
+        if not param or param.get("index") is None:
+            errors.append(f"Parameter not found: {param_name}")
+            continue
         try:
-            param = next((p for p in params if p.get("name") == param_name), None)
-            if not param:
-                errors.append(f"Parameter not found: {param_name}")
-                continue
-            param_index = param.get("index")
-            result = request_op(
-                "set_return_device_param",
-                timeout=0.5,
-                return_index=ret_idx,
+            value = float(target_value)
+        except (TypeError, ValueError):
+            errors.append(f"Invalid value for {param_name}")
+            continue
+        pairs.append((int(param["index"]), value))
+        prev_values[int(param["index"])] = param.get("value")
+    # One Remote Script op applies every parameter in the same Live tick
+    result = set_device_params_bulk("return", ret_idx, dev_idx, pairs) if pairs else {"applied": 0, "results": []}
+    applied = int(result.get("applied", 0))
+    if pairs and not result.get("results") and result.get("error"):
+        errors.append(f"Bulk set failed: {result.get('error')}")
+    names = {int(p["index"]): n for n, p in by_name.items() if n and p.get("index") is not None}
+    for r in result.get("results") or []:
+        if r.get("ok"):
+            pi = int(r.get("index", -1))
+            VR.update_device_param(
+                domain="return",
+                index=ret_idx,
                 device_index=dev_idx,
-                param_index=param_index,
-                value=float(target_value),
+                param_name=names.get(pi, f"param_{pi}"),
+                normalized_value=r.get("value"),
+                param_index=pi,
             )
-            if result and result.get("ok"):
-                applied += 1
-            else:
-                errors.append(f"Failed to set {param_name}")
-            time.sleep(0.005)
-        except Exception as e:
-            errors.append(f"Error setting {param_name}: {str(e)}")
+        else:
+            errors.append(f"Failed to set {names.get(int(r.get('index', -1)), r.get('index'))}: {r.get('error', 'error')}")
+    History.record(
+        [
+            History.param_change("return", ret_idx, dev_idx, int(r["index"]), float(prev_values[int(r["index"])]), float(r.get("value", 0.0)))
+            for r in result.get("results") or []
+            if r.get("ok") and prev_values.get(int(r.get("index", -1))) is not None
+        ],
+        label=f"apply preset {preset.get('name') or preset_id}",
+    )
     return {"ok": applied > 0, "preset_name": preset.get("name"), "device_name": device_name, "applied": applied, "total": len(parameter_values), "errors": errors or None}
 
 
+class MorphPresetBody(BaseModel):
+    return_index: int
+    device_index: int
+    to_preset_id: str
+    from_preset_id: Optional[str] = None  # None = morph from the device's current state
+    duration_beats: Optional[float] = None  # default 4 beats when neither duration is given
+    duration_sec: Optional[float] = None
+    curve: Literal["linear", "ease_in", "ease_out", "ease_in_out", "exp", "log"] = "linear"
+    fps: Optional[float] = None
+
+
+@router.post("/return/device/morph_preset")
+async def morph_preset(body: MorphPresetBody) -> Dict[str, Any]:
+    """Crossfade a return device to a preset over time (tempo-aware when in beats)."""
+    store = get_store()
+    ret_idx = int(body.return_index)
+    dev_idx = int(body.device_index)
+    target = await asyncio.to_thread(store.get_preset, str(body.to_preset_id))
+    if not target:
+        raise HTTPException(status_code=404, detail=f"Preset not found: {body.to_preset_id}")
+    source: Dict[str, Any] = {}
+    if body.from_preset_id:
+        src = await asyncio.to_thread(store.get_preset, str(body.from_preset_id))
+        if not src:
+            raise HTTPException(status_code=404, detail=f"Preset not found: {body.from_preset_id}")
+        if src.get("structure_signature") != target.get("structure_signature"):
+            raise HTTPException(status_code=400, detail="Presets have different device structures")
+        source = src.get("parameter_values") or {}
+    device_name, params = await asyncio.to_thread(_read_return_device_for, target, ret_idx, dev_idx)
+    sig = target.get("structure_signature")
+    mapping = store.get_device_map_local(sig) or (await asyncio.to_thread(store.get_device_map, sig) if store.enabled else None)
+    plan = MorphPlan(params, source, target.get("parameter_values") or {}, (mapping or {}).get("params"))
+    if not len(plan):
+        raise HTTPException(status_code=400, detail="Preset has no parameters matching the device")
+    job = start_morph(MorphJob(
+        plan,
+        "return",
+        ret_idx,
+        dev_idx,
+        duration_beats=body.duration_beats,
+        duration_sec=body.duration_sec,
+        curve=body.curve,
+        fps=body.fps,
+        label=f"morph to {target.get('name') or body.to_preset_id}",
+    ))
+    return {"ok": True, "morph_id": job.id, "device_name": device_name, **job.status()}
+
+
+@router.get("/morphs")
+def list_morph_jobs() -> Dict[str, Any]:
+    return {"ok": True, "morphs": list_morphs()}
+
+
+@router.get("/morphs/{morph_id}")
+def get_morph_job(morph_id: str) -> Dict[str, Any]:
+    job = get_morph(morph_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Morph not found: {morph_id}")
+    return {"ok": True, **job.status()}
+
+
+@router.post("/morphs/{morph_id}/cancel")
+def cancel_morph_job(morph_id: str) -> Dict[str, Any]:
+    job = get_morph(morph_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Morph not found: {morph_id}")
+    return {"ok": cancel_morph(morph_id), **job.status()}
+
 @router.get("/presets")
 def list_presets(device_type: Optional[str] = None, structure_signature: Optional[str] = None, preset_type: Optional[str] = None) -> Dict[str, Any]:
     store = get_store()
@@ -11,10 +11,11 @@ from server.services.ableton_client import request_op, data_or_raw
 from server.services.mixer_readers import read_return_sends
 from server.services.device_readers import read_return_devices
 from server.core.deps import get_store
-from server.services.mapping_utils import make_device_signature
+from server.services.mapping_utils import make_device_signature, reported_signature
 import re as _re
 from server.core.deps import get_store
-from server.services.history import DEVICE_BYPASS_CACHE, UNDO_STACK, REDO_STACK
+from server.services import history as History
+from server.services.history import DEVICE_BYPASS_CACHE
 
 
 router = APIRouter()
@@ -163,17 +164,7 @@ def bypass_return_device(body: BypassBody) -> Dict[str, Any]:
             value=float(target),
         )
         if ok and ok.get("ok", True):
-            UNDO_STACK.append(
-                {
-                    "type": "device_param",
-                    "return_index": ri,
-                    "device_index": di,
-                    "param_index": idx,
-                    "prev": prev,
-                    "new": target,
-                }
-            )
-            REDO_STACK.clear()
+            History.record([History.param_change("return", ri, di, idx, prev, target)], label=f"bypass return {ri} device {di}")
             try:
                 schedule_emit({"event": "device_bypass_changed", "return_index": ri, "device_index": di, "on": body.on})
             except Exception:
@@ -205,17 +196,7 @@ def bypass_return_device(body: BypassBody) -> Dict[str, Any]:
         value=float(target),
     )
     if ok and ok.get("ok", True):
-        UNDO_STACK.append(
-            {
-                "type": "device_param",
-                "return_index": ri,
-                "device_index": di,
-                "param_index": idx,
-                "prev": prev,
-                "new": target,
-            }
-        )
-        REDO_STACK.clear()
+        History.record([History.param_change("return", ri, di, idx, prev, target)], label=f"bypass return {ri} device {di}")
         if body.on and key in DEVICE_BYPASS_CACHE:
             try:
                 del DEVICE_BYPASS_CACHE[key]
@@ -534,7 +515,7 @@ def get_return_device_capabilities(index: int, device: int) -> Dict[str, Any]:
     dlist = (data_or_raw(dv) or {}).get("devices") or []
     dname = next((str(d.get("name", "")) for d in dlist if int(d.get("index", -1)) == di), f"Device {di}")
     # Build signature and fetch mapping
-    sig = make_device_signature(dname, params)
+    sig = reported_signature(dlist, di) or make_device_signature(dname, params)
     store = get_store()
     mapping = store.get_device_map(sig) if store.enabled else None
 
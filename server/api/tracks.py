@@ -11,7 +11,7 @@ from server.services.ableton_client import request_op, data_or_raw
 from server.services.mixer_readers import read_track_status, read_track_sends
 from server.services.device_readers import read_track_devices, read_track_device_params
 from server.core.deps import get_store
-from server.services.mapping_utils import make_device_signature
+from server.services.mapping_utils import make_device_signature, reported_signature
 import re as _re
 
 
@@ -405,7 +405,7 @@ def get_track_device_capabilities(index: int, device: int) -> Dict[str, Any]:
     dlist = (data_or_raw(dv) or {}).get("devices") or []
     dname = next((str(d.get("name", "")) for d in dlist if int(d.get("index", -1)) == di), f"Device {di}")
     # Build signature and fetch mapping
-    sig = make_device_signature(dname, params)
+    sig = reported_signature(dlist, di) or make_device_signature(dname, params)
     store = get_store()
     mapping = store.get_device_map(sig) if store.enabled else None
 
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from typing import Any, Dict, Optional
+
+from fastapi import APIRouter, Header, Response
+
+from server.core.deps import get_live_index, get_parse_index_service
+from server.services.parse_index.parse_index_service import MIXER_PARAMS
+
+
+router = APIRouter()
+
+
+def _etag(body: Dict[str, Any]) -> str:
+    raw = json.dumps(body, sort_keys=True, separators=(",", ":"), default=str).encode("utf-8")
+    return '"' + hashlib.sha1(raw).hexdigest()[:20] + '"'
+
+
+@router.get("/vocabulary")
+def get_vocabulary(response: Response, if_none_match: Optional[str] = Header(default=None)) -> Any:
+    """Device names/types, mixer params and parse-index version for NLP prompts.
+
+    Served purely from in-memory LiveIndex/parse-index state (never touches
+    Live or Firestore). Clients revalidate with If-None-Match and get 304
+    when nothing changed.
+    """
+    vocab = get_live_index().vocabulary()
+    parse_version = None
+    mixer_params = MIXER_PARAMS
+    pi = get_parse_index_service().peek()
+    if pi:
+        parse_version = pi.get("version")
+        mixer_params = list(pi.get("mixer_params") or mixer_params)
+    body = {
+        "ok": True,
+        "devices": vocab["devices"],
+        "mixer_params": mixer_params,
+        "live_index_version": vocab["version"],
+        "parse_index_version": parse_version,
+    }
+    etag = _etag(body)
+    if if_none_match and etag in [t.strip() for t in if_none_match.split(",")]:
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
+    return {**body, "etag": etag}
@@ -55,17 +55,16 @@ from server.services.preset_metadata import generate_preset_metadata_llm
 from server.services.history import (
     DEVICE_BYPASS_CACHE,
     LAST_SENT,
-    REDO_STACK,
-    UNDO_STACK,
     history_state as get_history_state,
     redo_last as history_redo_last,
     undo_last as history_undo_last,
     _key,
-    _rate_limited,
 )
+from server.services.knowledge import get_knowledge_index
 from server.services.event_listener import (
     schedule_live_index_tasks,
     start_ableton_event_listener,
+    stop_ableton_event_listener,
 )
 from server.core.deps import set_store_instance, get_live_index
 from server.core.events import broker, emit_event, schedule_emit
@@ -79,10 +78,12 @@ from server.api.returns import router as returns_router
 from server.api.ops import router as ops_router
 from server.api.device_mapping import router as device_mapping_router
 from server.api.presets import router as presets_router
+from server.api.macro import router as macro_router
 from server.api.devices import router as devices_router
 from server.api.workflow import router as workflow_router
 from server.api.intents import router as intents_router
 from server.api.nlp import router as nlp_router
+from server.api.vocabulary import router as vocabulary_router
 from server.api.overview import router as overview_router
 from server.api.overview_status import router as overview_status_router
 from server.api.overview_devices import router as overview_devices_router
@@ -135,9 +136,11 @@ app.include_router(tracks_router)
 app.include_router(returns_router)
 app.include_router(device_mapping_router)
 app.include_router(presets_router)
+app.include_router(macro_router)
 app.include_router(ops_router)
 app.include_router(intents_router)
 app.include_router(nlp_router)
+app.include_router(vocabulary_router)
 app.include_router(overview_router)
 app.include_router(health_router)
 app.include_router(chat_router)
@@ -633,5 +636,16 @@ app.include_router(workflow_router, prefix="/workflow", tags=["workflow"])
 
 @app.on_event("startup")
 async def _ableton_startup_listener() -> None:
-    start_ableton_event_listener()
+    await start_ableton_event_listener()
     schedule_live_index_tasks()
+
+
+@app.on_event("startup")
+async def _warm_knowledge_index() -> None:
+    # Build (or load) the help search index off the event loop
+    asyncio.get_running_loop().run_in_executor(None, get_knowledge_index)
+
+
+@app.on_event("shutdown")
+async def _ableton_shutdown_listener() -> None:
+    stop_ableton_event_listener()
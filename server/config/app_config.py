@@ -361,6 +361,9 @@ def get_snapshot_config() -> Dict[str, Any]:
         "device_ttl_seconds": int(os.getenv("DEVICE_SNAPSHOT_TTL_SECONDS", "30")),
         "device_chunk_size": int(os.getenv("DEVICE_REFRESH_CHUNK_SIZE", "3")),
         "device_chunk_delay_ms": int(os.getenv("DEVICE_REFRESH_CHUNK_DELAY_MS", "40")),
+        # ValueRegistry freshness: op/snapshot-written slots vs slots kept current by Live push events
+        "value_max_age_seconds": float(os.getenv("REGISTRY_VALUE_MAX_AGE_SECONDS", "30")),
+        "pushed_value_max_age_seconds": float(os.getenv("REGISTRY_PUSHED_VALUE_MAX_AGE_SECONDS", "300")),
     }
 
 
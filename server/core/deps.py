@@ -6,12 +6,16 @@ from server.services.mapping_store import MappingStore
 from server.services.live_index import LiveIndex
 from server.services.device_resolver import DeviceResolver
 from server.services.value_registry import ValueRegistry
+from server.services.parse_index.parse_index_service import ParseIndexService
+from server.services.write_queue import WriteQueue
 
 
 _STORE: Optional[MappingStore] = None
 _INDEX: Optional[LiveIndex] = None
 _RESOLVER: Optional[DeviceResolver] = None
 _REGISTRY: Optional[ValueRegistry] = None
+_PARSE_INDEX: Optional[ParseIndexService] = None
+_WRITE_QUEUE: Optional[WriteQueue] = None
 
 
 def set_store_instance(store: MappingStore) -> None:
@@ -45,3 +49,17 @@ def get_value_registry() -> ValueRegistry:
     if _REGISTRY is None:
         _REGISTRY = ValueRegistry()
     return _REGISTRY
+
+
+def get_parse_index_service() -> ParseIndexService:
+    global _PARSE_INDEX
+    if _PARSE_INDEX is None:
+        _PARSE_INDEX = ParseIndexService(get_store(), get_live_index())
+    return _PARSE_INDEX
+
+
+def get_write_queue() -> WriteQueue:
+    global _WRITE_QUEUE
+    if _WRITE_QUEUE is None:
+        _WRITE_QUEUE = WriteQueue()
+    return _WRITE_QUEUE
@@ -5,7 +5,7 @@ import os
 import json
 import time
 import asyncio
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 
 class EventBroker:
@@ -69,14 +69,16 @@ async def emit_event(payload: Dict[str, Any]) -> None:
             event = payload.get("event")
             field = payload.get("field")
             value = payload.get("value")
-            print(f"[SSE-CONVERT] Event={event}, field={field}, value={value}, has_display={('display_value' in payload)}")
+            if _debug_enabled():
+                print(f"[SSE-CONVERT] Event={event}, field={field}, value={value}, has_display={('display_value' in payload)}")
 
             if event in ("mixer_changed", "return_mixer_changed", "master_mixer_changed"):
                 if field == "volume" and isinstance(value, (int, float)):
                     from server.volume_utils import live_float_to_db
                     display = round(live_float_to_db(float(value)), 2)
                     payload["display_value"] = display
-                    print(f"[SSE-CONVERT] Added volume display_value: {display}")
+                    if _debug_enabled():
+                        print(f"[SSE-CONVERT] Added volume display_value: {display}")
                 elif field == "pan" and isinstance(value, (int, float)):
                     pan_val = float(value) * 50.0
                     payload["display_value"] = round(pan_val, 1)
@@ -99,15 +101,25 @@ async def emit_event(payload: Dict[str, Any]) -> None:
     await broker.publish(payload)
 
 
-def schedule_emit(payload: Dict[str, Any]) -> None:
+async def emit_events(payloads: List[Dict[str, Any]]) -> None:
+    """Emit a batch of events (e.g. one Remote Script batch datagram) in order."""
+    for payload in payloads:
+        await emit_event(payload)
+
+
+def _schedule(coro) -> None:
     try:
         loop = asyncio.get_running_loop()
-        loop.create_task(emit_event(payload))
+        loop.create_task(coro)
     except RuntimeError:
         try:
-            asyncio.run(emit_event(payload))
+            asyncio.run(coro)
         except RuntimeError:
             try:
-                asyncio.ensure_future(emit_event(payload))
+                asyncio.ensure_future(coro)
             except Exception:
                 pass
+
+
+def schedule_emit(payload: Dict[str, Any]) -> None:
+    _schedule(emit_event(payload))
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Any, Dict, Literal, Optional
+from typing import Any, Dict, List, Literal, Optional
 
 from pydantic import BaseModel, Field
 
@@ -19,6 +19,8 @@ class CanonicalIntent(BaseModel):
 
     # Targets (one of):
     track_index: Optional[int] = None
+    track_indices: Optional[List[int]] = None  # several tracks (1-based), e.g. "tracks 1-16" OR
+    track_collection: Optional[str] = None  # all|audio|midi or a track-name match ("drums")
     return_index: Optional[int] = None      # numeric index (0-based) OR
     return_ref: Optional[str] = None        # letter reference: "A", "B", "C"
     device_index: Optional[int] = None      # device on track or return (depending on which index is present)
@@ -34,6 +36,7 @@ class CanonicalIntent(BaseModel):
 
     # Value + unit (absolute only in v1)
     # For routing intents, value may be an object with routing keys
+    # For track_indices/track_collection, value may be a list (one per resolved track)
     value: Optional[Any] = None
     unit: Optional[str] = None             # db|percent|normalized|ms|hz|on|off
     # For device params: accept display strings (e.g., "245 ms", "5.0 kHz", "High")
@@ -28,6 +28,7 @@ class TransportStep(BaseModel):
     type: Literal["transport"] = "transport"
     action: Literal["play", "stop", "session_record", "arrangement_record", "locate"]
     time_beats: Optional[float] = None  # used for 'locate'
+    record: bool = True  # target record state for session/arrangement_record
 
 
 class SetParamStep(BaseModel):
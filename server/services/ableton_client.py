@@ -1,8 +1,8 @@
 from __future__ import annotations
 
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
 
-from server.ableton.client_udp import request as udp_request, send as udp_send  # noqa: F401
+from server.ableton.client_udp import request as udp_request, request_stream as udp_request_stream, send as udp_send  # noqa: F401
 
 
 def request_op(op: str, timeout: float = 1.0, **params: Any) -> Optional[Dict[str, Any]]:
@@ -16,6 +16,14 @@ def request_op(op: str, timeout: float = 1.0, **params: Any) -> Optional[Dict[st
     return udp_request(msg, timeout=timeout)
 
 
+def request_op_stream(op: str, timeout: float = 10.0, **params: Any) -> Iterator[Dict[str, Any]]:
+    """Like request_op for streamed replies: yields each part as it arrives."""
+    msg: Dict[str, Any] = {"op": op}
+    if params:
+        msg.update(params)
+    return udp_request_stream(msg, timeout=timeout)
+
+
 def ok(resp: Optional[Dict[str, Any]]) -> bool:
     return bool(resp and (resp.get("ok", True)))
 
@@ -46,3 +54,53 @@ def set_transport(action: str, value: Optional[float] = None, timeout: float = 1
         return {"ok": False, "error": "no response"}
     return resp if isinstance(resp, dict) else {"ok": True, "data": resp}
 
+
+
+def set_device_params_bulk(
+    domain: str,
+    index: int,
+    device_index: int,
+    params: Iterable[Tuple[int, float]],
+    timeout: float = 2.0,
+) -> Dict[str, Any]:
+    """Apply (param_index, value) pairs to one device in a single Live tick.
+
+    domain is "track" (1-based index), "return" or "master". Returns the
+    Remote Script's { ok, applied, total, results } (per-param status).
+    """
+    pairs = [[int(pi), float(v)] for pi, v in params]
+    resp = request_op(
+        "set_device_params_bulk",
+        timeout=timeout,
+        domain=str(domain),
+        index=int(index),
+        device_index=int(device_index),
+        params=pairs,
+    )
+    if not resp:
+        return {"ok": False, "error": "no response", "applied": 0, "total": len(pairs), "results": []}
+    data = data_or_raw(resp)
+    return data if isinstance(data, dict) else {"ok": bool(resp.get("ok")), "applied": 0, "total": len(pairs), "results": []}
+
+
+def set_mixer_bulk(
+    field: str,
+    values: Iterable[Tuple[int, float]],
+    send_index: Optional[int] = None,
+    timeout: float = 2.0,
+) -> Dict[str, Any]:
+    """Apply one mixer field to (track_index, value) pairs in a single Live tick.
+
+    field is volume|pan|mute|solo|send (send needs send_index). Returns the
+    Remote Script's { ok, applied, total, results } where each applied
+    result carries the replaced ``prev`` value.
+    """
+    pairs = [[int(ti), float(v)] for ti, v in values]
+    params: Dict[str, Any] = {"field": str(field), "values": pairs}
+    if send_index is not None:
+        params["send_index"] = int(send_index)
+    resp = request_op("set_mixer_bulk", timeout=timeout, **params)
+    if not resp:
+        return {"ok": False, "error": "no response", "applied": 0, "total": len(pairs), "results": []}
+    data = data_or_raw(resp)
+    return data if isinstance(data, dict) else {"ok": bool(resp.get("ok")), "applied": 0, "total": len(pairs), "results": []}
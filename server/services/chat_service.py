@@ -16,16 +16,14 @@ from fastapi import HTTPException
 from pydantic import BaseModel
 
 from server.config.app_config import get_send_aliases
-from server.core.deps import get_store
+from server.core.deps import get_store, get_write_queue
 from server.core.events import broker, schedule_emit
 from server.services.ableton_client import request_op
+from server.services import history as History
 from server.services.history import (
     DEVICE_BYPASS_CACHE,
     LAST_SENT,
-    REDO_STACK,
-    UNDO_STACK,
     _key,
-    _rate_limited,
 )
 from server.services.intent_mapper import map_llm_to_canonical
 from server.services.knowledge import search_knowledge
@@ -48,9 +46,6 @@ from server.services.rag_service import get_rag_service
 # This is intentionally separate from USE_LAYERED_PARSER (which controls /intent/parse).
 USE_LAYERED_CHAT = os.getenv("USE_LAYERED_CHAT", "").lower() in ("1", "true", "yes")
 
-# Cached parse index for layered parser (avoids repeated initialization)
-_PARSE_INDEX: Optional[Dict[str, Any]] = None
-
 
 def _find_device_index_by_hint(device_hint: str, devices: list[Dict[str, Any]]) -> Optional[int]:
     """Find device index matching a hint using device_map fuzzy matching.
@@ -140,58 +135,10 @@ def _find_device_index_by_hint(device_hint: str, devices: list[Dict[str, Any]])
 
 
 def _get_parse_index() -> Dict[str, Any]:
-    """Get or build parse index for layered parser.
+    """Shared parse index for the layered parser (see ParseIndexService)."""
+    from server.core.deps import get_parse_index_service
 
-    Uses minimal index when device mappings are unavailable so that
-    mixer/track/open/list commands still work.
-    """
-    global _PARSE_INDEX
-    if _PARSE_INDEX is not None:
-        return _PARSE_INDEX
-
-    try:
-        from server.services.parse_index.parse_index_builder import ParseIndexBuilder
-
-        try:
-            # For now build from empty Live set; device-aware parsing
-            # still falls back to LLM if needed.
-            live_devices: list[Dict[str, Any]] = []
-            builder = ParseIndexBuilder()
-            _PARSE_INDEX = builder.build_from_live_set(live_devices)
-        except Exception:
-            _PARSE_INDEX = {
-                "version": "pi-minimal",
-                "devices_in_set": [],
-                "params_by_device": {},
-                "device_type_index": {},
-                "param_to_device_types": {},
-                "mixer_params": [
-                    "volume",
-                    "pan",
-                    "mute",
-                    "solo",
-                    *[f"send {chr(ord('a') + i)}" for i in range(12)],
-                ],
-                "typo_map": {},
-            }
-    except Exception:
-        _PARSE_INDEX = {
-            "version": "pi-minimal",
-            "devices_in_set": [],
-            "params_by_device": {},
-            "device_type_index": {},
-            "param_to_device_types": {},
-            "mixer_params": [
-                "volume",
-                "pan",
-                "mute",
-                "solo",
-                *[f"send {chr(ord('a') + i)}" for i in range(12)],
-            ],
-            "typo_map": {},
-        }
-
-    return _PARSE_INDEX
+    return get_parse_index_service().get()
 
 
 def udp_request(msg: Dict[str, Any], timeout: float = 1.0):
@@ -1119,9 +1066,6 @@ def handle_chat_legacy(body: ChatBody) -> Dict[str, Any]:
         summary = f"Set Track {track_index} volume to {val:g} dB (target)"
         if not body.confirm:
             return {"ok": True, "preview": msg, "intent": intent, "summary": summary}
-        # Rate limit
-        if _rate_limited("volume", track_index):
-            return {"ok": False, "reason": "rate_limited", "intent": intent, "summary": summary}
         # Prepare undo entry
         k = _key("volume", track_index)
         prev = _get_prev_mixer_value(track_index, "volume")
@@ -1130,11 +1074,10 @@ def handle_chat_legacy(body: ChatBody) -> Dict[str, Any]:
         if prev is None:
             # Default previous volume to mid (0.5) when unknown (useful with UDP stub)
             prev = 0.5
-        resp = udp_request(msg, timeout=1.0)
+        # Through the write queue so it coalesces with in-flight UI drags on this slider
+        resp = get_write_queue().submit("track", track_index, "volume", float_value, wait=True)
         if resp and resp.get("ok", True):
-            # We cannot know the exact normalized value here; store None and rely on readback for undo if needed
-            UNDO_STACK.append({"key": k, "field": "volume", "track_index": track_index, "prev": prev, "new": None})
-            REDO_STACK.clear()
+            History.record([History.mixer_change("track", track_index, "volume", prev, float_value)], label=summary)
             # Readback to cache LAST_SENT
             try:
                 ts = udp_request({"op": "get_track_status", "track_index": track_index}, timeout=0.6)
@@ -1164,8 +1107,7 @@ def handle_chat_legacy(body: ChatBody) -> Dict[str, Any]:
         fb_resp = udp_request(fallback_msg, timeout=1.0)
         ok = bool(fb_resp and fb_resp.get("ok", True))
         if ok:
-            UNDO_STACK.append({"key": k, "field": "volume", "track_index": track_index, "prev": prev, "new": fallback_msg["value"]})
-            REDO_STACK.clear()
+            History.record([History.mixer_change("track", track_index, "volume", prev, fallback_msg["value"])], label=summary)
             LAST_SENT[k] = fallback_msg["value"]
         return {"ok": ok, "preview": fallback_msg, "resp": fb_resp, "intent": intent, "summary": summary + (" (fallback)" if ok else "")}
 
@@ -1187,8 +1129,6 @@ def handle_chat_legacy(body: ChatBody) -> Dict[str, Any]:
         summary = f"Set Track {track_index} pan to {label}"
         if not body.confirm:
             return {"ok": True, "preview": msg, "intent": intent, "summary": summary}
-        if _rate_limited("pan", track_index):
-            return {"ok": False, "reason": "rate_limited", "intent": intent, "summary": summary}
         k = _key("pan", track_index)
         prev = _get_prev_mixer_value(track_index, "pan")
         if prev is None:
@@ -1196,10 +1136,9 @@ def handle_chat_legacy(body: ChatBody) -> Dict[str, Any]:
         if prev is None:
             # Default previous pan to center when unknown
             prev = 0.0
-        resp = udp_request(msg, timeout=1.0)
+        resp = get_write_queue().submit("track", track_index, "pan", msg["value"], wait=True)
         if resp and resp.get("ok", True):
-            UNDO_STACK.append({"key": k, "field": "pan", "track_index": track_index, "prev": prev, "new": msg["value"]})
-            REDO_STACK.clear()
+            History.record([History.mixer_change("track", track_index, "pan", prev, msg["value"])], label=summary)
             LAST_SENT[k] = msg["value"]
         return {"ok": bool(resp and resp.get("ok", True)), "preview": msg, "resp": resp, "intent": intent, "summary": summary}
 
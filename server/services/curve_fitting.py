@@ -0,0 +1,277 @@
+"""Batched display-curve fitting for device parameters.
+
+All continuous params of a device are fitted together: their (normalized,
+display) samples are packed into one masked (params x samples) array, so each
+model is a handful of NumPy reductions instead of a Python loop per param.
+
+Models and their ``coeffs`` (the shapes invert_fit_to_value understands):
+
+    linear       y = a*x + b
+    exponential  y = a*exp(b*x) + c
+    logarithmic  y = a*ln(b*x + 1) + c
+    power        y = a*x^b + c
+
+For the three-coefficient models the inner ``b`` is found by a coarse grid
+search plus two local refinements, with ``a``/``c`` solved in closed form at
+every grid point (batched over params and grid). R² is computed the same
+way for every candidate. Params whose best R² is under ``min_r2`` fall back
+to a monotone piecewise-linear curve with only as many knots as needed to
+stay within ``PIECEWISE_TOL`` of the data.
+
+``fit_models`` keeps the older learner format (flat a/b/r2, piecewise x/y
+points) for the /mappings/fit and quick-learn paths.
+"""
+
+from __future__ import annotations
+
+import math
+import os
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+MIN_R2 = float(os.getenv("CURVE_FIT_MIN_R2", "0.9"))
+# Max piecewise error as a fraction of the param's display span
+PIECEWISE_TOL = float(os.getenv("CURVE_FIT_PIECEWISE_TOL", "0.005"))
+MAX_KNOTS = int(os.getenv("CURVE_FIT_MAX_KNOTS", "24"))
+
+_GRID = 48
+_REFINE = 16
+_REFINE_ROUNDS = 2
+# Search ranges for the inner coefficient of each nonlinear model
+_B_RANGES = {
+    "exponential": (1e-2, 25.0),
+    "logarithmic": (1e-3, 1e4),
+    "power": (5e-2, 12.0),
+}
+
+
+def _pack(series: Sequence[Tuple[Sequence[float], Sequence[float]]]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Pad ragged (xs, ys) pairs into (P, N) arrays plus a 0/1 weight mask."""
+    n = max((len(xs) for xs, _ in series), default=0)
+    X = np.zeros((len(series), n))
+    Y = np.zeros((len(series), n))
+    W = np.zeros((len(series), n))
+    for i, (xs, ys) in enumerate(series):
+        x = np.asarray(xs, dtype="float64")
+        y = np.asarray(ys, dtype="float64")
+        ok = np.isfinite(x) & np.isfinite(y)
+        k = int(ok.sum())
+        X[i, :k] = x[ok]
+        Y[i, :k] = y[ok]
+        W[i, :k] = 1.0
+    return X, Y, W
+
+
+def _lstsq(G: np.ndarray, Y: np.ndarray, W: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Weighted y ~ a*g + c over the last axis; returns (a, c, sse).
+
+    G may carry extra leading axes (e.g. a grid axis) that broadcast
+    against Y and W.
+    """
+    sw = W.sum(-1)
+    sg = (W * G).sum(-1)
+    sy = (W * Y).sum(-1)
+    sgg = (W * G * G).sum(-1)
+    sgy = (W * G * Y).sum(-1)
+    den = sw * sgg - sg * sg
+    with np.errstate(all="ignore"):
+        a = np.where(np.abs(den) > 1e-12, (sw * sgy - sg * sy) / den, np.nan)
+        c = (sy - a * sg) / sw
+        sse = (W * (Y - (a[..., None] * G + c[..., None])) ** 2).sum(-1)
+    return a, c, np.where(np.isfinite(sse), sse, np.inf)
+
+
+def _r2(sse: np.ndarray, Y: np.ndarray, W: np.ndarray) -> np.ndarray:
+    sw = W.sum(-1)
+    mean = (W * Y).sum(-1) / np.maximum(sw, 1.0)
+    sst = (W * (Y - mean[:, None]) ** 2).sum(-1)
+    with np.errstate(all="ignore"):
+        r2 = np.where(sst > 0, 1.0 - sse / sst, np.where(sse < 1e-12, 1.0, 0.0))
+    return np.nan_to_num(r2, nan=-np.inf)
+
+
+def _features(kind: str, X: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Model feature g_b(x) with the grid axis inserted before samples."""
+    with np.errstate(all="ignore"):
+        if kind == "exponential":
+            return np.exp(b[..., None] * X[:, None, :])
+        if kind == "logarithmic":
+            return np.log(b[..., None] * X[:, None, :] + 1.0)
+        return np.power(np.maximum(X[:, None, :], 0.0), b[..., None])
+
+
+def _fit_nonlinear(kind: str, X: np.ndarray, Y: np.ndarray, W: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Grid-search the inner coefficient for every param at once; returns (a, b, c, sse)."""
+    lo, hi = _B_RANGES[kind]
+    grid = np.geomspace(lo, hi, _GRID)
+    if kind == "exponential":
+        # Decaying curves need negative rates as well
+        grid = np.concatenate([-grid[::-1], grid])
+    P = X.shape[0]
+    Bs = np.broadcast_to(grid, (P, grid.size))
+    Wg = W[:, None, :]
+    Yg = Y[:, None, :]
+    rows = np.arange(P)
+    a, c, sse = _lstsq(_features(kind, X, Bs), Yg, Wg)
+    for _ in range(_REFINE_ROUNDS):
+        # Zoom in between the neighbouring grid points of each param's best
+        best = np.argmin(sse, axis=1)
+        left = Bs[rows, np.maximum(best - 1, 0)]
+        right = Bs[rows, np.minimum(best + 1, Bs.shape[1] - 1)]
+        Bs = left[:, None] + (right - left)[:, None] * np.linspace(0.0, 1.0, _REFINE)[None, :]
+        a, c, sse = _lstsq(_features(kind, X, Bs), Yg, Wg)
+    best = np.argmin(sse, axis=1)
+    return a[rows, best], Bs[rows, best], c[rows, best], sse[rows, best]
+
+
+def _isotonic(y: np.ndarray, increasing: bool) -> np.ndarray:
+    """Pool-adjacent-violators: closest monotone sequence to y."""
+    v = y if increasing else -y
+    vals: List[float] = []
+    counts: List[int] = []
+    for yi in v.tolist():
+        vals.append(yi)
+        counts.append(1)
+        while len(vals) > 1 and vals[-2] > vals[-1]:
+            n = counts[-2] + counts[-1]
+            vals[-2] = (vals[-2] * counts[-2] + vals[-1] * counts[-1]) / n
+            counts[-2] = n
+            vals.pop()
+            counts.pop()
+    out = np.repeat(np.asarray(vals), counts)
+    return out if increasing else -out
+
+
+def monotone_piecewise(xs: Sequence[float], ys: Sequence[float], tol: Optional[float] = None, max_knots: int = MAX_KNOTS) -> List[Tuple[float, float]]:
+    """Monotone piecewise-linear (x, y) knots through the samples.
+
+    Duplicate x are averaged, the sequence is made monotone in the
+    direction of its overall trend, then knots are added greedily at the
+    worst-fit sample until every sample is within ``tol`` of the display
+    span (or ``max_knots`` is reached).
+    """
+    x = np.asarray(xs, dtype="float64")
+    y = np.asarray(ys, dtype="float64")
+    ok = np.isfinite(x) & np.isfinite(y)
+    x, y = x[ok], y[ok]
+    if not x.size:
+        return []
+    ux, inv = np.unique(x, return_inverse=True)
+    uy = np.bincount(inv, weights=y) / np.bincount(inv)
+    if ux.size < 3:
+        return list(zip(ux.tolist(), uy.tolist()))
+    my = _isotonic(uy, increasing=bool(uy[-1] >= uy[0]))
+    span = float(my.max() - my.min()) or 1.0
+    limit = (PIECEWISE_TOL if tol is None else tol) * span
+    keep = np.zeros(ux.size, dtype=bool)
+    keep[[0, -1]] = True
+    while keep.sum() < max_knots:
+        err = np.abs(np.interp(ux, ux[keep], my[keep]) - my)
+        worst = int(np.argmax(err))
+        if err[worst] <= limit:
+            break
+        keep[worst] = True
+    return list(zip(ux[keep].tolist(), my[keep].tolist()))
+
+
+def fit_device_params(
+    series: Dict[str, Tuple[Sequence[float], Sequence[float]]],
+    min_r2: float = MIN_R2,
+) -> Dict[str, Dict[str, Any]]:
+    """Best fit per param name from (normalized values, display values).
+
+    Returns ``{name: {"type", "function", "coeffs", "r_squared"}}``; piecewise
+    fallbacks carry ``points`` as [{"db": display, "normalized": x}] (the
+    key names follow the mixer volume tables invert_fit_to_value reads).
+    Params with fewer than 3 usable samples are omitted.
+    """
+    names = [n for n, (xs, _ys) in series.items() if len(xs) >= 3]
+    if not names:
+        return {}
+    X, Y, W = _pack([series[n] for n in names])
+    usable = W.sum(-1) >= 3
+
+    cands: List[Tuple[str, np.ndarray, Dict[str, np.ndarray]]] = []
+    a, b, sse = _lstsq(X, Y, W)
+    cands.append(("linear", _r2(sse, Y, W), {"a": a, "b": b}))
+    for kind in ("exponential", "logarithmic", "power"):
+        a, bb, c, sse = _fit_nonlinear(kind, X, Y, W)
+        cands.append((kind, _r2(sse, Y, W), {"a": a, "b": bb, "c": c}))
+
+    r2s = np.stack([r for _k, r, _c in cands])
+    # Prefer simpler models unless a richer one is clearly better
+    r2s[1:] -= 1e-6
+    best = np.argmax(r2s, axis=0)
+    out: Dict[str, Dict[str, Any]] = {}
+    for i, name in enumerate(names):
+        if not usable[i]:
+            continue
+        kind, r2, coeffs = cands[int(best[i])]
+        score = float(r2[i])
+        if score >= min_r2 and all(math.isfinite(float(v[i])) for v in coeffs.values()):
+            out[name] = {
+                "type": kind,
+                "function": kind,
+                "coeffs": {k: float(v[i]) for k, v in coeffs.items()},
+                "r_squared": score,
+            }
+            continue
+        k = int(W[i].sum())
+        knots = monotone_piecewise(X[i, :k], Y[i, :k])
+        pw_y = np.interp(X[i, :k], [p[0] for p in knots], [p[1] for p in knots])
+        sse_pw = float(((Y[i, :k] - pw_y) ** 2).sum())
+        out[name] = {
+            "type": "piecewise",
+            "function": "piecewise",
+            "points": [{"db": ky, "normalized": kx} for kx, ky in knots],
+            "r_squared": float(_r2(np.array([sse_pw]), Y[i:i + 1, :k], W[i:i + 1, :k])[0]),
+        }
+    return out
+
+
+def fit_models(samples: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Learner-format fit from [{"value", "display_num"}] samples.
+
+    Candidates are y = a*x + b, y = a*ln(x) + b and ln(y) = a*x + b, fitted
+    in one batched pass. Under R² 0.9 the result is a monotone piecewise
+    curve with x/y points.
+    """
+    pts: List[Tuple[float, float]] = []
+    for s in samples:
+        if s.get("display_num") is None:
+            continue
+        try:
+            x = float(s["value"])
+            y = float(s["display_num"])
+        except (KeyError, TypeError, ValueError):
+            continue
+        if math.isfinite(x) and math.isfinite(y):
+            pts.append((x, y))
+    if len(pts) < 3:
+        return None
+    x = np.array([p[0] for p in pts])
+    y = np.array([p[1] for p in pts])
+    ones = np.ones_like(x)
+    with np.errstate(all="ignore"):
+        feats = np.stack([x, np.log(np.maximum(x, 1e-9)), x])
+        targets = np.stack([y, y, np.log(np.where(y > 0, y, 1.0))])
+    W = np.stack([ones, ones, ones * bool((y > 0).all())])
+    a, b, sse = _lstsq(feats, targets, W)
+    r2 = _r2(sse, targets, W)
+
+    cands = []
+    for i, kind in enumerate(("linear", "log", "exp")):
+        if W[i].any() and math.isfinite(float(a[i])):
+            fit: Dict[str, Any] = {"type": kind, "a": float(a[i]), "b": float(b[i]), "r2": float(r2[i])}
+            if kind == "log":
+                fit["x_transform"] = "ln(x)"
+            cands.append(fit)
+    best = max(cands, key=lambda d: d["r2"]) if cands else None
+    if best and best["r2"] >= 0.9:
+        return best
+    return {
+        "type": "piecewise",
+        "r2": best["r2"] if best else 0.0,
+        "points": [{"x": kx, "y": ky} for kx, ky in monotone_piecewise(x, y)],
+    }
@@ -2,46 +2,150 @@ from __future__ import annotations
 
 import json
 import os
-import socket
-import threading
-from typing import Optional
+import time
+from typing import Any, Dict, List, Optional, Tuple
 
 import asyncio
 
-from server.core.events import schedule_emit
-from server.core.deps import get_live_index
+from server.core.events import emit_events
+from server.core.deps import get_live_index, get_value_registry
+from server.services.value_registry import _DEVICE_STRUCTURE_EVENTS
 
-_EVENT_THREAD: Optional[threading.Thread] = None
+try:  # optional fast JSON decoder
+    import orjson  # type: ignore
+except ImportError:
+    orjson = None  # type: ignore
 
+_TRANSPORT: Optional[asyncio.DatagramTransport] = None
 
-def start_ableton_event_listener() -> None:
-    global _EVENT_THREAD
-    if _EVENT_THREAD and _EVENT_THREAD.is_alive():
+# Counters surfaced at /health
+_STATS: Dict[str, Any] = {
+    "listening": False,
+    "address": None,
+    "decoder": "orjson" if orjson is not None else "json",
+    "datagrams": 0,
+    "batches": 0,
+    "events": 0,
+    "registry_updates": 0,
+    "decode_errors": 0,
+    "dispatch_errors": 0,
+    "socket_errors": 0,
+    "last_event_ts": None,
+}
+
+
+def _decode(data: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data.decode("utf-8"))
+
+
+def _unpack(payload: Any) -> List[Dict[str, Any]]:
+    """Flatten a single event or a Remote Script batch envelope into a list."""
+    if not isinstance(payload, dict):
+        return []
+    if payload.get("event") == "batch":
+        _STATS["batches"] += 1
+        events = payload.get("events")
+        if not isinstance(events, list):
+            return []
+        return [e for e in events if isinstance(e, dict)]
+    return [payload]
+
+
+def _write_through(events: List[Dict[str, Any]]) -> None:
+    """Apply pushed events to ValueRegistry slots so reads can skip UDP."""
+    reg = get_value_registry()
+    for event in events:
+        if reg.apply_event(event):
+            _STATS["registry_updates"] += 1
+
+
+def _invalidate_live_index(events: List[Dict[str, Any]]) -> None:
+    """Drop LiveIndex device lists touched by load/delete/reorder, then refetch them.
+
+    Runs before the events are dispatched, so no signature lookup sees the old
+    device at a moved index.
+    """
+    li = None
+    for event in events:
+        domain = _DEVICE_STRUCTURE_EVENTS.get(str(event.get("event")))
+        raw = event.get(domain) if domain else None
+        if raw is None:
+            continue
+        li = li or get_live_index()
+        li.invalidate(domain, int(raw))
+        refresh = li.refresh_track if domain == "track" else li.refresh_return
+        asyncio.get_running_loop().create_task(refresh(int(raw)))
+
+
+class AbletonEventProtocol(asyncio.DatagramProtocol):
+    """Decode-and-dispatch pipeline for Remote Script notifications.
+
+    Runs on the server's event loop: decode -> unpack batch -> registry
+    write-through -> one emit task per datagram. No thread hop per event.
+    """
+
+    def datagram_received(self, data: bytes, addr: Tuple[str, int]) -> None:
+        _STATS["datagrams"] += 1
+        try:
+            payload = _decode(data)
+        except Exception:
+            _STATS["decode_errors"] += 1
+            return
+        events = _unpack(payload)
+        if not events:
+            return
+        _STATS["events"] += len(events)
+        _STATS["last_event_ts"] = time.time()
+        _write_through(events)
+        try:
+            _invalidate_live_index(events)
+        except Exception:
+            _STATS["dispatch_errors"] += 1
+        try:
+            asyncio.get_running_loop().create_task(emit_events(events))
+        except Exception:
+            _STATS["dispatch_errors"] += 1
+
+    def error_received(self, exc: Exception) -> None:
+        _STATS["socket_errors"] += 1
+
+    def connection_lost(self, exc: Optional[Exception]) -> None:
+        _STATS["listening"] = False
+
+
+def get_listener_stats() -> Dict[str, Any]:
+    return dict(_STATS)
+
+
+async def start_ableton_event_listener() -> None:
+    global _TRANSPORT
+    if _TRANSPORT is not None and not _TRANSPORT.is_closing():
         return
     host = os.getenv("ABLETON_UDP_CLIENT_HOST", "127.0.0.1")
     port = int(os.getenv("ABLETON_UDP_CLIENT_PORT", os.getenv("ABLETON_EVENT_PORT", "19846")))
     try:
-        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        sock.bind((host, port))
+        loop = asyncio.get_running_loop()
+        transport, _ = await loop.create_datagram_endpoint(AbletonEventProtocol, local_addr=(host, port))
         print(f"[Ableton] Listening for notifications on {host}:{port}")
     except Exception as e:
         print(f"[Ableton] Failed to bind event listener on {host}:{port} -> {e}")
         return
+    _TRANSPORT = transport  # type: ignore[assignment]
+    _STATS["listening"] = True
+    _STATS["address"] = f"{host}:{port}"
+
 
-    def loop():
-        while True:
-            try:
-                data, _ = sock.recvfrom(64 * 1024)
-            except Exception:
-                continue
-            try:
-                payload = json.loads(data.decode("utf-8"))
-            except Exception:
-                continue
-            schedule_emit(payload)
-
-    _EVENT_THREAD = threading.Thread(target=loop, name="AbletonEventListener", daemon=True)
-    _EVENT_THREAD.start()
+def stop_ableton_event_listener() -> None:
+    global _TRANSPORT
+    if _TRANSPORT is not None:
+        try:
+            _TRANSPORT.close()
+        except Exception:
+            pass
+    _TRANSPORT = None
+    _STATS["listening"] = False
 
 
 def schedule_live_index_tasks() -> None:
@@ -6,7 +6,9 @@ Routes to Firestore, vector search, or RAG based on query type
 import re
 import time
 import logging
-from typing import Dict, Any, Optional, Tuple
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Pattern, Tuple
 from enum import Enum
 
 logger = logging.getLogger(__name__)
@@ -79,70 +81,114 @@ class HelpRouter:
         r'how to (load|set|change|automate)',
     ]
 
+    # Leading verbs that make a query a DAW command, never a help question
+    COMMAND_VERBS = (
+        'set', 'increase', 'decrease', 'raise', 'lower', 'reduce', 'boost', 'cut',
+        'mute', 'unmute', 'solo', 'unsolo', 'pan', 'turn', 'bypass', 'enable',
+        'disable', 'arm', 'disarm', 'play', 'stop', 'open', 'close', 'undo', 'redo',
+    )
+
+    CACHE_SIZE = 1024
+
     def __init__(self):
+        # Compile every pattern list once, in priority order
+        self._count = self._compile(self.COUNT_PATTERNS)
+        self._semantic = self._compile(self.SEMANTIC_PATTERNS)
+        self._comparison = self._compile(self.COMPARISON_PATTERNS)
+        self._list = self._compile(self.LIST_PATTERNS)
+        self._params = self._compile(self.PARAM_PATTERNS)
+        self._param_search = self._compile(self.PARAM_SEARCH_PATTERNS)
+        self._workflow = self._compile(self.WORKFLOW_PATTERNS)
+        # One alternation over all patterns: no hit means COMPLEX without walking the lists
+        every = (
+            self.COUNT_PATTERNS + self.SEMANTIC_PATTERNS + self.COMPARISON_PATTERNS + self.LIST_PATTERNS
+            + self.PARAM_PATTERNS + self.PARAM_SEARCH_PATTERNS + self.WORKFLOW_PATTERNS
+        )
+        self._any = re.compile("|".join(f"(?:{p})" for p in every))
+        self._command = re.compile(r'^\s*(?:' + "|".join(self.COMMAND_VERBS) + r')\b')
+        self._cache: "OrderedDict[str, Tuple[QueryType, Dict[str, Any]]]" = OrderedDict()
+        self._cache_lock = threading.Lock()  # classify_query runs on FastAPI's threadpool
         logger.info("[HelpRouter] Initialized")
 
+    @staticmethod
+    def _compile(patterns: List[str]) -> List[Pattern[str]]:
+        return [re.compile(p) for p in patterns]
+
     def classify_query(self, query: str) -> Tuple[QueryType, Dict[str, Any]]:
         """
         Classify query and extract entities
 
+        Results are memoized per lowercased query (LRU of CACHE_SIZE).
+
         Returns:
             (QueryType, metadata_dict)
         """
         query_lower = query.lower()
+        with self._cache_lock:
+            hit = self._cache.get(query_lower)
+            if hit is not None:
+                self._cache.move_to_end(query_lower)
+        if hit is not None:
+            return hit[0], dict(hit[1])
+        query_type, meta = self._classify(query_lower)
+        with self._cache_lock:
+            self._cache[query_lower] = (query_type, meta)
+            if len(self._cache) > self.CACHE_SIZE:
+                self._cache.popitem(last=False)
+        logger.debug(f"[HelpRouter] Classified as {query_type.name}: {meta}")
+        return query_type, dict(meta)
+
+    def _classify(self, query_lower: str) -> Tuple[QueryType, Dict[str, Any]]:
+        # Fast path: commands ("set track 1 volume -6") and text no pattern can match
+        if self._command.match(query_lower) or not self._any.search(query_lower):
+            return QueryType.COMPLEX, {}
 
         # Check each pattern type in priority order (most specific first!)
         # 1. Count queries (most specific)
-        for pattern in self.COUNT_PATTERNS:
-            match = re.search(pattern, query_lower)
+        for pattern in self._count:
+            match = pattern.search(query_lower)
             if match:
                 device = self._extract_device(match.groups())
                 if device:
-                    logger.info(f"[HelpRouter] Classified as FACTUAL_COUNT: device={device}")
                     return QueryType.FACTUAL_COUNT, {'device': device}
 
         # 2. Semantic queries (best for, recommend) - CHECK BEFORE LIST!
-        for pattern in self.SEMANTIC_PATTERNS:
-            if re.search(pattern, query_lower):
-                logger.info(f"[HelpRouter] Classified as SEMANTIC")
+        for pattern in self._semantic:
+            if pattern.search(query_lower):
                 return QueryType.SEMANTIC, {}
 
         # 3. Comparison queries
-        for pattern in self.COMPARISON_PATTERNS:
-            if re.search(pattern, query_lower):
-                logger.info(f"[HelpRouter] Classified as COMPARISON")
+        for pattern in self._comparison:
+            if pattern.search(query_lower):
                 return QueryType.COMPARISON, {}
 
         # 4. List queries (broader pattern - check after semantic/comparison)
-        for pattern in self.LIST_PATTERNS:
-            match = re.search(pattern, query_lower)
+        for pattern in self._list:
+            match = pattern.search(query_lower)
             if match:
                 device = self._extract_device(match.groups())
                 if device:
                     # Check if IDs requested
                     include_ids = 'id' in query_lower or 'ids' in query_lower
-                    logger.info(f"[HelpRouter] Classified as FACTUAL_LIST: device={device}, ids={include_ids}")
                     return QueryType.FACTUAL_LIST, {'device': device, 'include_ids': include_ids}
 
         # 5. Parameter queries
-        for pattern in self.PARAM_PATTERNS:
-            match = re.search(pattern, query_lower)
+        for pattern in self._params:
+            match = pattern.search(query_lower)
             if match:
                 device = self._extract_device(match.groups())
                 if device:
-                    logger.info(f"[HelpRouter] Classified as FACTUAL_PARAMS: device={device}")
                     return QueryType.FACTUAL_PARAMS, {'device': device}
 
         # 6. Parameter search queries
-        for pattern in self.PARAM_SEARCH_PATTERNS:
-            match = re.search(pattern, query_lower)
+        for pattern in self._param_search:
+            match = pattern.search(query_lower)
             if match:
                 groups = match.groups()
                 device = self._extract_device(groups)
                 param_name, operator, value = self._extract_param_constraint(groups, query_lower)
 
                 if device and param_name:
-                    logger.info(f"[HelpRouter] Classified as PARAMETER_SEARCH: {device}.{param_name} {operator} {value}")
                     return QueryType.PARAMETER_SEARCH, {
                         'device': device,
                         'param_name': param_name,
@@ -151,13 +197,11 @@ class HelpRouter:
                     }
 
         # 7. Workflow queries
-        for pattern in self.WORKFLOW_PATTERNS:
-            if re.search(pattern, query_lower):
-                logger.info(f"[HelpRouter] Classified as WORKFLOW")
+        for pattern in self._workflow:
+            if pattern.search(query_lower):
                 return QueryType.WORKFLOW, {}
 
         # 8. Default to complex RAG
-        logger.info(f"[HelpRouter] Classified as COMPLEX (default)")
         return QueryType.COMPLEX, {}
 
     def _extract_device(self, groups: tuple) -> Optional[str]:
@@ -1,29 +1,261 @@
+"""
+Undo/redo journal for mixer, send and device-parameter changes.
+
+History is a bounded ring buffer (HISTORY_MAX_ENTRIES, default 256) of
+typed entries; each entry is one undo step holding every Change made by one
+command (a chat message, a preset apply, a group set, ...). Undo/redo
+restores all of an entry's changes with a single apply_writes op, so a
+60-param preset comes back in one round trip.
+
+Set HISTORY_LOG_PATH to keep an append-only JSON-lines log that is replayed
+on startup, so a server restart does not lose history.
+"""
+
 from __future__ import annotations
 
+import json
+import os
+import threading
 import time
-from typing import Any, Callable, Dict, List, Optional, Tuple
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Tuple
 
-# Simple shared state for mixer/device history and throttling
-MIN_INTERVAL_SEC = 0.05  # 50ms per target key
-UNDO_STACK: List[Dict[str, Any]] = []
-REDO_STACK: List[Dict[str, Any]] = []
 DEVICE_BYPASS_CACHE: Dict[Tuple[int, int], float] = {}
 LAST_SENT: Dict[str, float] = {}
-LAST_TS: Dict[str, float] = {}
 
 
 def _key(field: str, track_index: int) -> str:
     return f"mixer:{field}:{track_index}"
 
 
-def _rate_limited(field: str, track_index: int) -> bool:
-    k = _key(field, track_index)
-    now = time.time()
-    last = LAST_TS.get(k, 0.0)
-    if now - last < MIN_INTERVAL_SEC:
-        return True
-    LAST_TS[k] = now
-    return False
+@dataclass
+class Change:
+    """One value write: entity track|return|master, field volume|pan|mute|solo|cue|send|param."""
+
+    entity: str
+    index: int
+    field: str
+    prev: float
+    new: float
+    send_index: Optional[int] = None
+    device_index: Optional[int] = None
+    param_index: Optional[int] = None
+
+    @property
+    def slot(self) -> Tuple[Any, ...]:
+        return (self.entity, self.index, self.field, self.send_index, self.device_index, self.param_index)
+
+    def write(self, which: str) -> Dict[str, Any]:
+        """apply_writes item setting this slot to its ``which`` value (prev/new)."""
+        w: Dict[str, Any] = {"entity": self.entity, "index": self.index, "field": self.field, "value": float(getattr(self, which))}
+        for k in ("send_index", "device_index", "param_index"):
+            if getattr(self, k) is not None:
+                w[k] = getattr(self, k)
+        return w
+
+    def to_row(self) -> List[Any]:
+        return [self.entity, self.index, self.field, self.prev, self.new, self.send_index, self.device_index, self.param_index]
+
+    @classmethod
+    def from_row(cls, row: List[Any]) -> "Change":
+        return cls(str(row[0]), int(row[1]), str(row[2]), float(row[3]), float(row[4]), *row[5:8])
+
+
+@dataclass
+class Entry:
+    label: str
+    changes: List[Change]
+    ts: float = field(default_factory=time.time)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"label": self.label, "ts": self.ts, "changes": [c.to_row() for c in self.changes]}
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "Entry":
+        return cls(str(d.get("label") or ""), [Change.from_row(r) for r in d.get("changes") or []], float(d.get("ts") or 0.0))
+
+
+def mixer_change(entity: str, index: int, field: str, prev: float, new: float) -> Change:
+    return Change(str(entity), int(index), str(field), float(prev), float(new))
+
+
+def send_change(entity: str, index: int, send_index: int, prev: float, new: float) -> Change:
+    return Change(str(entity), int(index), "send", float(prev), float(new), send_index=int(send_index))
+
+
+def param_change(domain: str, index: int, device_index: int, param_index: int, prev: float, new: float) -> Change:
+    return Change(str(domain), int(index), "param", float(prev), float(new), device_index=int(device_index), param_index=int(param_index))
+
+
+class HistoryJournal:
+    def __init__(self, max_entries: Optional[int] = None, log_path: Optional[str] = None) -> None:
+        self.max_entries = max(1, int(max_entries if max_entries is not None else os.getenv("HISTORY_MAX_ENTRIES", "256")))
+        self.log_path = log_path if log_path is not None else (os.getenv("HISTORY_LOG_PATH") or None)
+        self.undo: Deque[Entry] = deque(maxlen=self.max_entries)
+        self.redo: Deque[Entry] = deque(maxlen=self.max_entries)
+        self._lock = threading.RLock()
+        self._log_lines = 0
+        if self.log_path:
+            self._replay()
+
+    # --------- Mutations (each one logged) ---------
+    def push(self, entry: Entry) -> None:
+        with self._lock:
+            self.undo.append(entry)
+            self.redo.clear()
+            self._log({"op": "push", "entry": entry.to_dict()})
+
+    def pop_undo(self) -> Optional[Entry]:
+        with self._lock:
+            return self.undo.pop() if self.undo else None
+
+    def pop_redo(self) -> Optional[Entry]:
+        with self._lock:
+            return self.redo.pop() if self.redo else None
+
+    def undone(self, entry: Entry) -> None:
+        with self._lock:
+            self.redo.append(entry)
+            self._log({"op": "undo"})
+
+    def redone(self, entry: Entry) -> None:
+        with self._lock:
+            self.undo.append(entry)
+            self._log({"op": "redo"})
+
+    def restore(self, entry: Entry, to_undo: bool) -> None:
+        """Put back an entry whose restore failed (no log line: state is unchanged)."""
+        with self._lock:
+            (self.undo if to_undo else self.redo).append(entry)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.undo.clear()
+            self.redo.clear()
+            self._log({"op": "clear"})
+
+    # --------- On-disk log ---------
+    def _log(self, rec: Dict[str, Any]) -> None:
+        if not self.log_path:
+            return
+        try:
+            with open(self.log_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(rec, separators=(",", ":")) + "\n")
+            self._log_lines += 1
+            if self._log_lines > 4 * self.max_entries:
+                self._compact()
+        except Exception as e:
+            print(f"[HISTORY] log write failed: {e}")
+
+    def _compact(self) -> None:
+        """Rewrite the log as one snapshot line of the current state."""
+        snap = {
+            "op": "snapshot",
+            "undo": [e.to_dict() for e in self.undo],
+            "redo": [e.to_dict() for e in self.redo],
+        }
+        tmp = f"{self.log_path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(json.dumps(snap, separators=(",", ":")) + "\n")
+        os.replace(tmp, self.log_path)
+        self._log_lines = 1
+
+    def _replay(self) -> None:
+        try:
+            with open(self.log_path, "r", encoding="utf-8") as f:  # type: ignore[arg-type]
+                lines = f.readlines()
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            print(f"[HISTORY] log read failed: {e}")
+            return
+        for line in lines:
+            try:
+                rec = json.loads(line)
+            except Exception:
+                continue  # torn final line after a crash
+            op = rec.get("op")
+            if op == "push":
+                self.undo.append(Entry.from_dict(rec.get("entry") or {}))
+                self.redo.clear()
+            elif op == "undo" and self.undo:
+                self.redo.append(self.undo.pop())
+            elif op == "redo" and self.redo:
+                self.undo.append(self.redo.pop())
+            elif op == "clear":
+                self.undo.clear()
+                self.redo.clear()
+            elif op == "snapshot":
+                self.undo = deque((Entry.from_dict(e) for e in rec.get("undo") or []), maxlen=self.max_entries)
+                self.redo = deque((Entry.from_dict(e) for e in rec.get("redo") or []), maxlen=self.max_entries)
+        self._log_lines = len(lines)
+        if self._log_lines > self.max_entries:
+            self._compact()
+
+
+JOURNAL = HistoryJournal()
+
+
+class _Txn:
+    __slots__ = ("changes", "open")
+
+    def __init__(self) -> None:
+        self.changes: List[Change] = []
+        self.open = True
+
+
+# Open transaction for the current request, if any. Tasks spawned inside it
+# inherit the context, so a closed transaction is ignored rather than extended.
+_TXN: ContextVar[Optional[_Txn]] = ContextVar("history_txn", default=None)
+
+
+@contextmanager
+def transaction(label: str) -> Iterator[None]:
+    """Group every change recorded inside into one undo step (nested calls join the outer one)."""
+    outer = _TXN.get()
+    if outer is not None and outer.open:
+        yield
+        return
+    txn = _Txn()
+    token = _TXN.set(txn)
+    try:
+        yield
+    finally:
+        txn.open = False
+        _TXN.reset(token)
+        if txn.changes:
+            JOURNAL.push(Entry(label, txn.changes))
+
+
+def record(changes: List[Change], label: str = "") -> None:
+    """Record applied changes as one undo step (or into the open transaction)."""
+    changes = [c for c in changes if c is not None]
+    if not changes:
+        return
+    txn = _TXN.get()
+    if txn is not None and txn.open:
+        txn.changes.extend(changes)
+    else:
+        JOURNAL.push(Entry(label, list(changes)))
+
+
+def _restore_msg(entry: Entry, which: str) -> Dict[str, Any]:
+    """One apply_writes message setting every slot to its value before (prev) or after (new) the entry."""
+    slots: Dict[Tuple[Any, ...], Dict[str, Any]] = {}
+    # Undo: the first change to a slot holds its original value; redo: the last holds its final one
+    ordered = reversed(entry.changes) if which == "prev" else entry.changes
+    for c in ordered:
+        slots[c.slot] = c.write(which)
+    return {"op": "apply_writes", "writes": list(slots.values())}
+
+
+def _after_restore(msg: Dict[str, Any]) -> None:
+    for w in msg["writes"]:
+        if w["entity"] == "track" and w["field"] in ("volume", "pan"):
+            LAST_SENT[_key(w["field"], w["index"])] = float(w["value"])
 
 
 def undo_last(
@@ -31,149 +263,54 @@ def undo_last(
     *,
     schedule_emit_fn: Optional[Callable[[Dict[str, Any]], Any]] = None,
 ) -> Dict[str, Any]:
-    """Undo the last successful change (mixer or device param) if previous value is known."""
-    while UNDO_STACK:
-        entry = UNDO_STACK.pop()
-        etype = entry.get("type", "mixer")
-        if etype == "mixer":
-            prev = entry.get("prev")
-            track_index = entry.get("track_index")
-            field = entry.get("field")
-            if prev is None or track_index is None or field not in ("volume", "pan"):
-                continue
-            msg = {
-                "op": "set_mixer",
-                "track_index": int(track_index),
-                "field": field,
-                "value": float(prev),
-            }
-            resp = udp_request_fn(msg, timeout=1.0)
-            if resp and resp.get("ok", True):
-                LAST_SENT[_key(field, int(track_index))] = float(prev)
-                REDO_STACK.append(
-                    {
-                        "type": "mixer",
-                        "key": entry.get("key"),
-                        "field": field,
-                        "track_index": track_index,
-                        "prev": msg["value"],
-                        "new": entry.get("new"),
-                    }
-                )
-                return {"ok": True, "undone": entry, "resp": resp}
-            return {"ok": False, "error": "undo_send_failed", "attempt": entry}
-        if etype == "device_param":
-            prev = entry.get("prev")
-            ri = entry.get("return_index")
-            di = entry.get("device_index")
-            pi = entry.get("param_index")
-            if prev is None or ri is None or di is None or pi is None:
-                continue
-            msg = {
-                "op": "set_return_device_param",
-                "return_index": int(ri),
-                "device_index": int(di),
-                "param_index": int(pi),
-                "value": float(prev),
-            }
-            resp = udp_request_fn(msg, timeout=1.0)
-            if resp and resp.get("ok", True):
-                REDO_STACK.append(
-                    {
-                        "type": "device_param",
-                        "return_index": ri,
-                        "device_index": di,
-                        "param_index": pi,
-                        "prev": entry.get("new"),
-                        "new": prev,
-                    }
-                )
-                if schedule_emit_fn is not None:
-                    try:
-                        schedule_emit_fn(
-                            {
-                                "event": "device_param_restored",
-                                "return_index": ri,
-                                "device_index": di,
-                            }
-                        )
-                    except Exception:
-                        pass
-                return {"ok": True, "undone": entry, "resp": resp}
-            return {"ok": False, "error": "undo_send_failed", "attempt": entry}
-    return {"ok": False, "error": "nothing_to_undo"}
+    """Undo the last journal entry, restoring all its changes in one batched op."""
+    entry = JOURNAL.pop_undo()
+    if entry is None:
+        return {"ok": False, "error": "nothing_to_undo"}
+    msg = _restore_msg(entry, "prev")
+    resp = udp_request_fn(msg, timeout=1.0 + 0.01 * len(msg["writes"]))
+    if not (resp and resp.get("ok", True)):
+        JOURNAL.restore(entry, to_undo=True)
+        return {"ok": False, "error": "undo_send_failed", "attempt": entry.to_dict()}
+    _after_restore(msg)
+    JOURNAL.undone(entry)
+    if schedule_emit_fn is not None:
+        devices = {(c.entity, c.index, c.device_index) for c in entry.changes if c.field == "param"}
+        for domain, index, device_index in devices:
+            try:
+                schedule_emit_fn({"event": "device_param_restored", "domain": domain, "index": index, "device_index": device_index})
+            except Exception:
+                pass
+    return {"ok": True, "undone": entry.to_dict(), "resp": resp}
 
 
 def redo_last(
     udp_request_fn: Callable[..., Any],
 ) -> Dict[str, Any]:
-    """Re-apply the last undone change (mixer or device param) if available."""
-    while REDO_STACK:
-        entry = REDO_STACK.pop()
-        etype = entry.get("type", "mixer")
-        if etype == "mixer":
-            new_val = entry.get("new")
-            track_index = entry.get("track_index")
-            field = entry.get("field")
-            if new_val is None or track_index is None or field not in ("volume", "pan"):
-                continue
-            msg = {
-                "op": "set_mixer",
-                "track_index": int(track_index),
-                "field": field,
-                "value": float(new_val),
-            }
-            resp = udp_request_fn(msg, timeout=1.0)
-            if resp and resp.get("ok", True):
-                LAST_SENT[_key(field, int(track_index))] = float(new_val)
-                UNDO_STACK.append(
-                    {
-                        "type": "mixer",
-                        "key": entry.get("key"),
-                        "field": field,
-                        "track_index": track_index,
-                        "prev": entry.get("prev"),
-                        "new": new_val,
-                    }
-                )
-                return {"ok": True, "redone": entry, "resp": resp}
-            return {"ok": False, "error": "redo_send_failed", "attempt": entry}
-        if etype == "device_param":
-            new_val = entry.get("new")
-            ri = entry.get("return_index")
-            di = entry.get("device_index")
-            pi = entry.get("param_index")
-            if new_val is None or ri is None or di is None or pi is None:
-                continue
-            msg = {
-                "op": "set_return_device_param",
-                "return_index": int(ri),
-                "device_index": int(di),
-                "param_index": int(pi),
-                "value": float(new_val),
-            }
-            resp = udp_request_fn(msg, timeout=1.0)
-            if resp and resp.get("ok", True):
-                UNDO_STACK.append(
-                    {
-                        "type": "device_param",
-                        "return_index": ri,
-                        "device_index": di,
-                        "param_index": pi,
-                        "prev": entry.get("prev"),
-                        "new": new_val,
-                    }
-                )
-                return {"ok": True, "redone": entry, "resp": resp}
-            return {"ok": False, "error": "redo_send_failed", "attempt": entry}
-    return {"ok": False, "error": "nothing_to_redo"}
+    """Re-apply the last undone entry in one batched op."""
+    entry = JOURNAL.pop_redo()
+    if entry is None:
+        return {"ok": False, "error": "nothing_to_redo"}
+    msg = _restore_msg(entry, "new")
+    resp = udp_request_fn(msg, timeout=1.0 + 0.01 * len(msg["writes"]))
+    if not (resp and resp.get("ok", True)):
+        JOURNAL.restore(entry, to_undo=False)
+        return {"ok": False, "error": "redo_send_failed", "attempt": entry.to_dict()}
+    _after_restore(msg)
+    JOURNAL.redone(entry)
+    return {"ok": True, "redone": entry.to_dict(), "resp": resp}
 
 
 def history_state() -> Dict[str, Any]:
+    undo, redo = JOURNAL.undo, JOURNAL.redo
     return {
         "ok": True,
-        "undo_available": bool(UNDO_STACK),
-        "redo_available": bool(REDO_STACK),
-        "undo_depth": len(UNDO_STACK),
-        "redo_depth": len(REDO_STACK),
+        "undo_available": bool(undo),
+        "redo_available": bool(redo),
+        "undo_depth": len(undo),
+        "redo_depth": len(redo),
+        "undo_label": undo[-1].label if undo else None,
+        "redo_label": redo[-1].label if redo else None,
+        "capacity": JOURNAL.max_entries,
+        "log_path": JOURNAL.log_path,
     }
@@ -15,8 +15,11 @@ import os
 import logging
 import time
 import re
-from typing import Dict, Any, List
-from server.services.rag_service import get_rag_service
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple
+from server.services.rag_service import get_rag_service, normalize_query
+from server.services.knowledge_retriever_client import get_remote_retriever
 
 # Import Vertex AI Gemini
 try:
@@ -34,13 +37,30 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Words that carry no topic on their own; a follow-up made only of these
+# (plus terms already in the previous question) keeps the previous context
+_FOLLOWUP_STOPWORDS = {
+    'a', 'an', 'the', 'and', 'or', 'of', 'to', 'in', 'on', 'for', 'with', 'at', 'by', 'from',
+    'is', 'are', 'was', 'be', 'it', 'its', 'this', 'that', 'these', 'those', 'they', 'them',
+    'what', 'which', 'who', 'how', 'why', 'when', 'where', 'about', 'more', 'other', 'else',
+    'one', 'ones', 'can', 'could', 'would', 'should', 'do', 'does', 'i', 'me', 'my', 'you',
+    'your', 'tell', 'explain', 'show', 'please', 'also', 'again', 'then', 'so', 'there',
+    'any', 'some', 'all', 'each', 'detail', 'details', 'further', 'ok', 'okay',
+}
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+def _topic_terms(question: str) -> frozenset:
+    return frozenset(t for t in _WORD_RE.findall(question.lower()) if t not in _FOLLOWUP_STOPWORDS)
+
 
 class HybridRAGService:
     """Hybrid RAG with OpenAI embeddings + Gemini generation"""
 
     def __init__(self):
         """Initialize hybrid RAG service"""
-        self.rag_service = get_rag_service()
+        # Shared knowledge-retriever worker if configured, else in-process indexes
+        self.rag_service = get_remote_retriever() or get_rag_service()
 
         # Initialize Vertex AI (if available)
         if vertexai is not None:
@@ -68,6 +88,13 @@ class HybridRAGService:
         # Cache of preset names to IDs for image lookup
         self._preset_lookup_cache = None
 
+        # (normalized question, index version) -> retrieved docs
+        self._retrieval_cache: "OrderedDict[Tuple[str, int], List[Dict[str, Any]]]" = OrderedDict()
+        self._retrieval_cache_max = int(os.getenv('RAG_RETRIEVAL_CACHE_SIZE', '256'))
+        self._retrieval_lock = threading.Lock()
+        # user_id -> (topic terms, index version, docs) of the last retrieval
+        self._last_context: Dict[str, Tuple[frozenset, int, List[Dict[str, Any]]]] = {}
+
     def _detect_query_complexity(self, query: str) -> str:
         """
         Detect query complexity for smart model routing
@@ -196,6 +223,38 @@ class HybridRAGService:
             logger.error(f"Failed to extract preset images: {e}")
             return []
 
+    def _retrieve(self, user_id: str, question: str, top_k: int = 5) -> Tuple[List[Dict[str, Any]], str]:
+        """
+        Retrieve documents for a question, avoiding repeat searches
+
+        Returns (docs, how) where how is 'reused' (follow-up on the same topic
+        as the user's previous turn), 'cached' (same question already seen at
+        this index version) or 'searched'.
+        """
+        version = getattr(self.rag_service, 'index_version', 0)
+        terms = _topic_terms(question)
+
+        last = self._last_context.get(user_id)
+        if last is not None and last[1] == version and terms <= last[0]:
+            return last[2], 'reused'
+
+        key = (normalize_query(question), version)
+        with self._retrieval_lock:
+            docs: Optional[List[Dict[str, Any]]] = self._retrieval_cache.get(key)
+            if docs is not None:
+                self._retrieval_cache.move_to_end(key)
+        how = 'cached'
+        if docs is None:
+            docs = self.rag_service.search(question, top_k=top_k)
+            how = 'searched'
+            with self._retrieval_lock:
+                self._retrieval_cache[key] = docs
+                while len(self._retrieval_cache) > max(1, self._retrieval_cache_max):
+                    self._retrieval_cache.popitem(last=False)
+
+        self._last_context[user_id] = (terms, version, docs)
+        return docs, how
+
     def query(
         self,
         user_id: str,
@@ -221,6 +280,7 @@ class HybridRAGService:
             # Reset conversation if requested
             if reset_conversation:
                 self.conversations[user_id] = []
+                self._last_context.pop(user_id, None)
                 logger.info(f"Reset conversation for user {user_id}")
 
             # Detect query complexity for smart model routing
@@ -229,9 +289,9 @@ class HybridRAGService:
 
             # Search for relevant documents
             search_start = time.time()
-            top_docs = self.rag_service.search(question, top_k=5)
+            top_docs, retrieval = self._retrieve(user_id, question, top_k=5)
             search_time = time.time() - search_start
-            logger.info(f"Document search completed in {search_time:.2f}s")
+            logger.info(f"Document search ({retrieval}) completed in {search_time:.2f}s")
 
             # Build context from retrieved documents
             context_parts = []
@@ -368,6 +428,7 @@ Retrieved Documentation:
                 "sources": sources,
                 "mode": "hybrid-rag",
                 "model_complexity": complexity,
+                "retrieval": retrieval,
                 "timing": {
                     "total": round(total_time, 2),
                     "search": round(search_time, 2),
@@ -391,6 +452,7 @@ Retrieved Documentation:
 
     def reset_conversation(self, user_id: str):
         """Reset conversation for a user"""
+        self._last_context.pop(user_id, None)
         if user_id in self.conversations:
             del self.conversations[user_id]
             logger.info(f"Reset conversation for user {user_id}")
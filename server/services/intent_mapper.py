@@ -36,6 +36,8 @@ def _parse_track_target(track_str: str) -> Tuple[Optional[str], Optional[Dict[st
         ("track", {"track_index": 1}) for "Track 1"
         ("return", {"return_ref": "A"}) for "Return A"
         ("master", {}) for "Master"
+        ("track", {"track_indices": [1, 2, 3]}) for "Tracks 1,2,3" / "Tracks 1-3"
+        ("track", {"track_collection": "audio"}) for "audio tracks" / "drum tracks"
         (None, None) if invalid
     """
     if not track_str:
@@ -43,6 +45,23 @@ def _parse_track_target(track_str: str) -> Tuple[Optional[str], Optional[Dict[st
 
     try:
         s = str(track_str).strip()
+        low = s.lower()
+
+        # Tracks 1-16 / Tracks 1,3,5 → several tracks in one intent
+        if low.startswith("tracks "):
+            from server.services.nlp.track_parser import parse_track_range
+            rest = low[len("tracks "):].strip()
+            if rest.isdigit():
+                return "track", {"track_index": int(rest)}
+            m = parse_track_range(s)
+            return ("track", {"track_indices": m.indices}) if m and m.indices else (None, None)
+
+        # all/audio/midi/<name> tracks → collection resolved against track list
+        if (low == "tracks" or low.endswith(" tracks")) and not low.startswith("return"):
+            name = low[: -len("tracks")].strip()
+            if name.startswith("all "):
+                name = name[len("all "):].strip()
+            return "track", {"track_collection": name or "all"}
 
         # Track N → domain "track", track_index
         if s.lower().startswith("track "):
@@ -192,6 +211,15 @@ def map_llm_to_canonical(llm_intent: Dict[str, Any]) -> Tuple[Optional[Dict[str,
     value = op.get("value")
     unit = op.get("unit")
 
+    # Track ranges/groups only support absolute mixer/send sets
+    if "track_indices" in target_fields or "track_collection" in target_fields:
+        if plugin or device_ordinal is not None:
+            errors.append("device_params_not_supported_for_track_groups")
+            return None, errors
+        if op_type == "relative":
+            errors.append("relative_change_not_supported_for_track_groups")
+            return None, errors
+
     # Handle relative changes for MIXER parameters: convert to absolute by reading current value
     # Device parameters are handled later in their own section (line 517+)
     if op_type == "relative" and not (plugin or device_ordinal is not None):
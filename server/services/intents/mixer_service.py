@@ -1,12 +1,15 @@
 from __future__ import annotations
 
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
+import numpy as np
 from fastapi import HTTPException
 
 from server.config.app_config import get_feature_flags
-from server.services.ableton_client import request_op
+from server.services.ableton_client import request_op, set_mixer_bulk
 from server.core.deps import get_value_registry
+from server.services.value_registry import send_field
+from server.services import history as History
 from server.models.intents_api import CanonicalIntent
 from server.services.intents.utils.mixer import (
     clamp,
@@ -16,10 +19,32 @@ from server.services.intents.utils.mixer import (
     normalize_unit,
     apply_mixer_fit_inverse,
     apply_mixer_fit_forward,
+    apply_mixer_fit_inverse_array,
+    apply_mixer_fit_forward_array,
 )
 from server.services.intents.utils.refs import _resolve_send_index, _resolve_return_index
 
 
+def _registry_value(entity: str, index: int, field: str) -> Optional[float]:
+    """Last known normalized value of a mixer slot (the undo 'prev'), if any."""
+    try:
+        entry = get_value_registry().get_mixer_field(entity, index, field)
+        val = (entry or {}).get("normalized")
+        return float(val) if val is not None else None
+    except Exception:
+        return None
+
+
+def _record_mixer(entity: str, index: int, field: str, prev: Optional[float], new: float, send_idx: Optional[int] = None) -> None:
+    if prev is None:
+        return
+    if send_idx is not None:
+        change = History.send_change(entity, index, send_idx, prev, new)
+    else:
+        change = History.mixer_change(entity, index, field, prev, new)
+    History.record([change], label=f"set {entity} {index} {send_field(send_idx) if send_idx is not None else field}")
+
+
 def set_track_mixer(intent: CanonicalIntent) -> Dict[str, Any]:
     if intent.track_index is None:
         raise HTTPException(400, "track_index_required")
@@ -80,9 +105,11 @@ def set_track_mixer(intent: CanonicalIntent) -> Dict[str, Any]:
     if intent.dry_run:
         return {"ok": True, "preview": {"op": "set_mixer", "track_index": track_idx, "field": field, "value": v}}
 
+    prev = _registry_value("track", track_idx, field)
     resp = request_op("set_mixer", timeout=1.0, track_index=track_idx, field=str(field), value=float(v))
     if not resp:
         raise HTTPException(504, "no_reply")
+    _record_mixer("track", track_idx, field, prev, float(v))
 
     # Write-through to ValueRegistry
     try:
@@ -148,6 +175,184 @@ def set_track_mixer(intent: CanonicalIntent) -> Dict[str, Any]:
     return resp
 
 
+def _resolve_track_targets(intent: CanonicalIntent, tracks: List[Dict[str, Any]]) -> List[int]:
+    """1-based track indices for track_indices/track_collection against one overview read."""
+    if intent.track_indices:
+        targets = list(dict.fromkeys(int(i) for i in intent.track_indices))
+        if any(i < 1 for i in targets):
+            raise HTTPException(400, "track_index_must_be_at_least_1")
+        bad = [i for i in targets if tracks and i > len(tracks)]
+        if bad:
+            raise HTTPException(404, f"track_out_of_range:{bad}; available=1..{len(tracks)}")
+        return targets
+
+    coll = str(intent.track_collection or "").strip().lower()
+    if not tracks:
+        raise HTTPException(503, "track_list_unavailable")
+    if coll in ("all", "tracks", "all tracks"):
+        matched = tracks
+    elif coll in ("audio", "midi"):
+        matched = [t for t in tracks if str(t.get("type", "")).lower() == coll]
+    else:
+        # Name group: "drums" matches "Drums", "Drum Bus", "Kick Drum"
+        needle = coll[:-1] if coll.endswith("s") and len(coll) > 3 else coll
+        matched = [t for t in tracks if needle in str(t.get("name", "")).lower()]
+    if not matched:
+        raise HTTPException(404, f"no_tracks_match:{coll}")
+    return [int(t.get("index")) for t in matched]
+
+
+def _mixer_values_array(intent: CanonicalIntent, field: str, n: int) -> np.ndarray:
+    """Normalized values for n targets; one fit inverse over the whole array."""
+    if intent.display and field in ("pan", "volume"):
+        resolved = resolve_mixer_display_value(field, intent.display)
+        if resolved is not None:
+            return np.full(n, float(resolved))
+
+    raw = intent.value if intent.value is not None else 0.0
+    try:
+        v = np.asarray(raw, dtype=float).reshape(-1)
+    except (TypeError, ValueError):
+        raise HTTPException(400, "invalid_value")
+    if v.size == 1:
+        v = np.full(n, float(v[0]))
+    elif v.size != n:
+        raise HTTPException(400, f"value_count_mismatch:{v.size}!={n}")
+
+    display_only_io = bool((get_feature_flags() or {}).get("display_only_io", False))
+    unit_l = normalize_unit(intent.unit) or ""
+    if field in ("volume", "send"):
+        if field == "volume" and display_only_io and intent.unit is None and np.all((v >= 0.0) & (v <= 1.0)):
+            raise HTTPException(400, "normalized_not_allowed_for_volume: provide display value or percent")
+        if unit_l in ("percent", "%"):
+            v = v / 100.0
+        else:
+            # Use piecewise fit to convert dB -> normalized
+            pm = get_mixer_param_meta("track", field)
+            if pm and pm.get("fit"):
+                inv = apply_mixer_fit_inverse_array(pm, v)
+                if inv is not None:
+                    v = inv
+        return np.clip(v, 0.0, 1.0) if intent.clamp else v
+    if field == "pan":
+        if display_only_io and not intent.unit and np.all(np.abs(v) <= 1.0):
+            raise HTTPException(400, "normalized_not_allowed_for_pan: provide display like '30L'/'30R'")
+        display_min, display_max = get_mixer_display_range("pan")
+        display_scale = max(abs(display_min), abs(display_max))
+        scaled = np.clip(v, display_min, display_max) / display_scale
+        v = np.where(np.abs(v) > 1.0, scaled, np.clip(v, -1.0, 1.0) if intent.clamp else v)
+        return v
+    # mute/solo
+    return (v >= 0.5).astype(float)
+
+
+def _mixer_display_array(field: str, values: np.ndarray) -> Tuple[List[Optional[str]], Optional[str]]:
+    """Display strings (and unit) for normalized values, converted in one pass."""
+    disp: List[Optional[str]] = [None] * len(values)
+    if field in ("volume", "send"):
+        pm = get_mixer_param_meta("track", field)
+        fwd = apply_mixer_fit_forward_array(pm, values) if pm and pm.get("fit") else None
+        if fwd is not None:
+            return [f"{float(d):.2f}" for d in fwd], "dB"
+    elif field == "pan":
+        display_min, display_max = get_mixer_display_range("pan")
+        display_scale = max(abs(display_min), abs(display_max))
+        return [f"{float(d):.2f}" for d in values * display_scale], None
+    return disp, None
+
+
+def set_tracks_mixer(intent: CanonicalIntent) -> Dict[str, Any]:
+    """Apply one mixer/send change across a track range or group in one pass.
+
+    Targets come from track_indices or track_collection, resolved against a
+    single get_overview read. Values are converted as one array and sent as
+    one set_mixer_bulk op, and the whole group is one undo entry.
+    """
+    field = str(intent.field or "")
+    if field not in ("volume", "pan", "mute", "solo", "send"):
+        raise HTTPException(400, f"unsupported_field_for_track_group:{field}")
+    send_idx: Optional[int] = None
+    if field == "send":
+        if intent.send_index is None and intent.send_ref is None:
+            raise HTTPException(400, "send_index_or_send_ref_required")
+        send_idx = _resolve_send_index(intent.send_index, intent.send_ref)
+
+    try:
+        ov = request_op("get_overview", timeout=1.0) or {}
+        tracks = ((ov.get("data") or ov) if isinstance(ov, dict) else ov).get("tracks", [])
+    except Exception:
+        tracks = []
+    targets = _resolve_track_targets(intent, tracks)
+    values = _mixer_values_array(intent, field, len(targets))
+    pairs = list(zip(targets, values.tolist()))
+
+    if intent.dry_run:
+        preview: Dict[str, Any] = {"op": "set_mixer_bulk", "field": field, "values": [list(p) for p in pairs]}
+        if send_idx is not None:
+            preview["send_index"] = send_idx
+        return {"ok": True, "preview": preview}
+
+    result = set_mixer_bulk(field, pairs, send_index=send_idx)
+    if result.get("error") == "no response":
+        raise HTTPException(504, "no_reply")
+
+    applied = [r for r in result.get("results") or [] if r.get("ok")]
+    reg_field = send_field(send_idx) if send_idx is not None else field
+
+    # Write-through to ValueRegistry
+    try:
+        reg = get_value_registry()
+        if intent.display and field in ("volume", "pan"):
+            disp = [intent.display] * len(applied)
+            unit = intent.unit if field == "volume" else None
+        else:
+            disp, unit = _mixer_display_array(field, np.array([float(r.get("value", 0.0)) for r in applied]))
+        for r, d in zip(applied, disp):
+            reg.update_mixer("track", int(r["track_index"]), reg_field, float(r.get("value", 0.0)), d, unit, source="op")
+    except Exception:
+        pass
+
+    # One undo entry for the whole group
+    History.record(
+        [
+            History.send_change("track", int(r["track_index"]), send_idx, float(r["prev"]), float(r.get("value", 0.0)))
+            if send_idx is not None
+            else History.mixer_change("track", int(r["track_index"]), field, float(r["prev"]), float(r.get("value", 0.0)))
+            for r in applied
+            if r.get("prev") is not None
+        ],
+        label=f"set {reg_field} on {len(applied)} tracks",
+    )
+
+    label = f"send {chr(ord('A') + send_idx)}" if send_idx is not None else field
+    if intent.display and field in ("volume", "pan"):
+        summary = f"Set {len(applied)} tracks {label} to {intent.display}"
+    elif len(set(values.tolist())) == 1:
+        v0 = float(values[0])
+        disp, unit = _mixer_display_array(field, values[:1])
+        if field in ("mute", "solo"):
+            txt = "On" if v0 >= 0.5 else "Off"
+        elif field == "pan":
+            pan_val = float(disp[0])
+            txt = "C" if abs(pan_val) < 0.5 else f"{abs(pan_val):.0f}{'R' if pan_val > 0 else 'L'}"
+        elif disp[0] is not None:
+            txt = f"{float(disp[0]):.1f} {unit}"
+        else:
+            txt = f"{v0:.2f}"
+        summary = f"Set {len(applied)} tracks {label} to {txt}"
+    else:
+        summary = f"Set {label} on {len(applied)} tracks"
+    failed = [r for r in result.get("results") or [] if not r.get("ok")]
+    return {
+        "ok": bool(applied),
+        "applied": len(applied),
+        "total": len(pairs),
+        "track_indices": [int(r["track_index"]) for r in applied],
+        "errors": [f"Track {r.get('track_index')}: {r.get('error', 'error')}" for r in failed] or None,
+        "summary": summary,
+    }
+
+
 def set_return_mixer(intent: CanonicalIntent) -> Dict[str, Any]:
     return_idx: Optional[int]
     if intent.return_ref is not None and intent.return_index is None:
@@ -211,9 +416,11 @@ def set_return_mixer(intent: CanonicalIntent) -> Dict[str, Any]:
     if intent.dry_run:
         return {"ok": True, "preview": {"op": "set_return_mixer", "return_index": return_idx, "field": field, "value": v}}
 
+    prev = _registry_value("return", return_idx, field)
     resp = request_op("set_return_mixer", timeout=1.0, return_index=return_idx, field=str(field), value=float(v))
     if not resp:
         raise HTTPException(504, "no_reply")
+    _record_mixer("return", return_idx, field, prev, float(v))
 
     try:
         reg = get_value_registry()
@@ -302,9 +509,11 @@ def set_track_send(intent: CanonicalIntent) -> Dict[str, Any]:
     if intent.dry_run:
         return {"ok": True, "preview": {"op": "set_send", "track_index": track_idx, "send_index": send_idx, "value": v}}
 
+    prev = _registry_value("track", track_idx, send_field(send_idx))
     resp = request_op("set_send", timeout=1.0, track_index=track_idx, send_index=send_idx, value=float(v))
     if not resp:
         raise HTTPException(504, "no_reply")
+    _record_mixer("track", track_idx, "send", prev, float(v), send_idx)
 
     # Write-through to ValueRegistry
     try:
@@ -321,7 +530,7 @@ def set_track_send(intent: CanonicalIntent) -> Dict[str, Any]:
                 if dval is not None:
                     disp = f"{float(dval):.2f}"
                     unit = "dB"
-        reg.update_mixer("track", track_idx, f"send_{send_idx}", float(v), disp, unit, source="op")
+        reg.update_mixer("track", track_idx, send_field(send_idx), float(v), disp, unit, source="op")
     except Exception:
         pass
 
@@ -376,9 +585,11 @@ def set_return_send(intent: CanonicalIntent) -> Dict[str, Any]:
     if intent.dry_run:
         return {"ok": True, "preview": {"op": "set_return_send", "return_index": return_idx, "send_index": send_idx, "value": v}}
 
+    prev = _registry_value("return", return_idx, send_field(send_idx))
     resp = request_op("set_return_send", timeout=1.0, return_index=return_idx, send_index=send_idx, value=float(v))
     if not resp:
         raise HTTPException(504, "no_reply")
+    _record_mixer("return", return_idx, "send", prev, float(v), send_idx)
 
     try:
         reg = get_value_registry()
@@ -394,7 +605,7 @@ def set_return_send(intent: CanonicalIntent) -> Dict[str, Any]:
                     unit = "dB"
         except Exception:
             pass
-        reg.update_mixer("return", return_idx, f"send_{send_idx}", float(v), disp, unit, source="op")
+        reg.update_mixer("return", return_idx, send_field(send_idx), float(v), disp, unit, source="op")
     except Exception:
         pass
 
@@ -483,9 +694,11 @@ def set_master_mixer(intent: CanonicalIntent) -> Dict[str, Any]:
     if intent.dry_run:
         return {"ok": True, "preview": {"op": "set_master_mixer", "field": field, "value": v}}
 
+    prev = _registry_value("master", 0, field)
     resp = request_op("set_master_mixer", timeout=1.0, field=str(field), value=float(v))
     if not resp:
         raise HTTPException(504, "no_reply")
+    _record_mixer("master", 0, field, prev, float(v))
 
     try:
         reg = get_value_registry()
@@ -8,6 +8,7 @@ from fastapi import HTTPException
 
 from server.core.deps import get_store, get_device_resolver, get_value_registry
 from server.services.ableton_client import request_op
+from server.services import history as History
 from server.services.mapping_utils import make_device_signature
 from server.models.intents_api import CanonicalIntent
 from server.config.app_config import get_device_param_aliases, get_app_config
@@ -630,10 +631,9 @@ def set_return_device_param(intent: CanonicalIntent, debug: bool = False) -> Dic
     pm = None
     try:
         store = get_store()
-        devs = request_op("get_return_devices", timeout=1.0, return_index=ri)
-        devices = ((devs or {}).get("data") or {}).get("devices") or []
-        dname = next((str(d.get("name", "")) for d in devices if int(d.get("index", -1)) == di), f"Device {di}")
-        sig = make_device_signature(dname, params)
+        # Hash the live params fetched above: always the device now at this
+        # index (a cached signature can lag a swap/reorder), no extra round trip
+        sig = make_device_signature(f"Device {di}", params)
         mapping = store.get_device_mapping(sig) if store.enabled else None
         if mapping:
             pm = next((pme for pme in (mapping.get("params_meta") or []) if str(pme.get("name", "")).lower() == str(sel.get("name", "")).lower()), None)
@@ -809,14 +809,19 @@ def set_return_device_param(intent: CanonicalIntent, debug: bool = False) -> Dic
     if intent.dry_run:
         return {"ok": True, "preview": preview}
 
+    changes = []
     for prereq in prereq_changes:
         pd = prereq["param_dict"]
-        request_op("set_return_device_param", timeout=1.0, return_index=ri, device_index=di, param_index=int(pd.get("index", 0)), value=float(prereq["target_value"]))
+        r = request_op("set_return_device_param", timeout=1.0, return_index=ri, device_index=di, param_index=int(pd.get("index", 0)), value=float(prereq["target_value"]))
+        if r and pd.get("value") is not None:
+            changes.append(History.param_change("return", ri, di, int(pd.get("index", 0)), float(pd["value"]), float(prereq["target_value"])))
 
     old_val = float(sel.get("value", 0.0))
     resp = request_op("set_return_device_param", timeout=1.0, return_index=ri, device_index=di, param_index=int(sel.get("index", 0)), value=float(preview["value"]))
     if not resp:
         raise HTTPException(504, "no_reply")
+    changes.append(History.param_change("return", ri, di, int(sel.get("index", 0)), old_val, float(preview["value"])))
+    History.record(changes, label=f"set return {ri} device {di} {sel.get('name', '')}")
 
     try:
         readback = request_op("get_return_device_params", timeout=1.0, return_index=ri, device_index=di)
@@ -848,7 +853,7 @@ def set_return_device_param(intent: CanonicalIntent, debug: bool = False) -> Dic
                         unit_out = str(pm.get("unit")).lower()
                 except Exception:
                     pass
-                reg.update_device_param("return", ri, di, str(sel.get("name", "")), new_val, new_display, unit_out, source="op")
+                reg.update_device_param("return", ri, di, str(sel.get("name", "")), new_val, new_display, unit_out, param_index=int(sel.get("index", 0)), source="op")
             except Exception:
                 pass
     except Exception:
@@ -986,10 +991,9 @@ def set_track_device_param(intent: CanonicalIntent, debug: bool = False) -> Dict
     pm = None
     try:
         store = get_store()
-        devs = request_op("get_track_devices", timeout=1.0, track_index=ti)
-        devices = ((devs or {}).get("data") or {}).get("devices") or []
-        dname = next((str(d.get("name", "")) for d in devices if int(d.get("index", -1)) == di), f"Device {di}")
-        sig = make_device_signature(dname, params)
+        # Hash the live params fetched above: always the device now at this
+        # index (a cached signature can lag a swap/reorder), no extra round trip
+        sig = make_device_signature(f"Device {di}", params)
         mapping = store.get_device_mapping(sig) if store.enabled else None
         if mapping:
             pm = next((pme for pme in (mapping.get("params_meta") or []) if str(pme.get("name", "")).lower() == str(sel.get("name", "")).lower()), None)
@@ -1139,6 +1143,11 @@ def set_track_device_param(intent: CanonicalIntent, debug: bool = False) -> Dict
     resp = request_op("set_device_param", timeout=1.0, track_index=ti, device_index=di, param_index=int(sel.get("index", 0)), value=float(preview["value"]))
     if not resp:
         raise HTTPException(504, "no_reply")
+    if sel.get("value") is not None:
+        History.record(
+            [History.param_change("track", ti, di, int(sel.get("index", 0)), float(sel["value"]), float(preview["value"]))],
+            label=f"set track {ti} device {di} {sel.get('name', '')}",
+        )
 
     try:
         rb = request_op("get_track_device_params", timeout=1.0, track_index=ti, device_index=di)
@@ -1149,7 +1158,7 @@ def set_track_device_param(intent: CanonicalIntent, debug: bool = False) -> Dict
             new_val = float(up.get("value", preview["value"]))
             try:
                 reg = get_value_registry()
-                reg.update_device_param("track", ti, di, str(sel.get("name", "")), new_val, new_display, None, source="op")
+                reg.update_device_param("track", ti, di, str(sel.get("name", "")), new_val, new_display, None, param_index=int(sel.get("index", 0)), source="op")
             except Exception:
                 pass
     except Exception:
@@ -14,7 +14,7 @@ from server.models.intents_api import ReadIntent
 from server.services.ableton_client import request_op
 from server.volume_utils import live_float_to_db_send
 from server.services.intents.utils.refs import _letter_to_index
-from server.services.mapping_utils import make_device_signature
+from server.services.mapping_utils import make_device_signature, reported_signature
 from server.core.deps import get_store
 
 
@@ -150,7 +150,7 @@ def _read_device_param(intent: ReadIntent, param_name: str) -> Dict[str, Any]:
         dname = next((str(d.get("name", "")) for d in dlist if int(d.get("index", -1)) == di), f"Device {di}")
 
         # Build signature and fetch mapping to get unit/min/max/label_map for params
-        sig = make_device_signature(dname, params)
+        sig = reported_signature(dlist, di) or make_device_signature(dname, params)
         store = get_store()
         mapping = store.get_device_map(sig) if store.enabled else None
 
@@ -254,7 +254,7 @@ def _read_device_param(intent: ReadIntent, param_name: str) -> Dict[str, Any]:
         dname = next((str(d.get("name", "")) for d in dlist if int(d.get("index", -1)) == di), f"Device {di}")
 
         # Build signature and fetch mapping to get unit/min/max/label_map
-        sig = make_device_signature(dname, params)
+        sig = reported_signature(dlist, di) or make_device_signature(dname, params)
         store = get_store()
         mapping = store.get_device_map(sig) if store.enabled else None
 
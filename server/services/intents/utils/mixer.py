@@ -4,6 +4,8 @@ import math
 import re as _re
 from typing import Any, Dict, Optional, Tuple
 
+import numpy as np
+
 from server.core.deps import get_store
 
 
@@ -192,6 +194,70 @@ def _apply_mixer_fit_forward(param_meta: Dict[str, Any], normalized_value: float
     return None
 
 
+def _apply_mixer_fit_inverse_array(param_meta: Dict[str, Any], display_values: Any) -> Optional[np.ndarray]:
+    """Vectorized _apply_mixer_fit_inverse: display array -> normalized array."""
+    fit = param_meta.get("fit", {})
+    fit_type = fit.get("type")
+    x = np.asarray(display_values, dtype=float)
+
+    if fit_type == "piecewise":
+        points = sorted(fit.get("points", []), key=lambda p: p["db"])
+        if not points:
+            return None
+        dbs = np.array([p["db"] for p in points], dtype=float)
+        norms = np.array([p["normalized"] for p in points], dtype=float)
+        return np.clip(np.interp(x, dbs, norms), 0.0, 1.0)
+
+    if fit_type == "power":
+        coeffs = fit.get("coeffs", {})
+        min_db = coeffs.get("min_db")
+        max_db = coeffs.get("max_db")
+        gamma = coeffs.get("gamma")
+        range_db = coeffs.get("range_db", max_db - min_db if (max_db and min_db) else None)
+        if min_db is None or range_db is None or gamma is None:
+            return None
+        base = np.clip((x - float(min_db)) / float(range_db), 0.0, None)
+        return np.clip(base ** float(gamma), 0.0, 1.0)
+
+    if fit_type == "linear":
+        scale = float(fit.get("coeffs", {}).get("scale", 50.0))
+        return np.clip(x / scale, -1.0, 1.0)
+
+    return None
+
+
+def _apply_mixer_fit_forward_array(param_meta: Dict[str, Any], normalized_values: Any) -> Optional[np.ndarray]:
+    """Vectorized _apply_mixer_fit_forward: normalized array -> display array."""
+    try:
+        fit = param_meta.get("fit", {})
+        fit_type = fit.get("type")
+        n = np.asarray(normalized_values, dtype=float)
+
+        if fit_type == "piecewise":
+            points = sorted(fit.get("points", []), key=lambda p: p["normalized"])
+            if not points:
+                return None
+            norms = np.array([p["normalized"] for p in points], dtype=float)
+            dbs = np.array([p["db"] for p in points], dtype=float)
+            return np.interp(n, norms, dbs)
+
+        if fit_type == "power":
+            coeffs = fit.get("coeffs", {})
+            min_db = coeffs.get("min_db")
+            max_db = coeffs.get("max_db")
+            gamma = coeffs.get("gamma")
+            range_db = coeffs.get("range_db", max_db - min_db if (max_db is not None and min_db is not None) else None)
+            if min_db is None or range_db is None or gamma is None:
+                return None
+            return float(min_db) + float(range_db) * np.clip(n, 0.0, 1.0) ** (1.0 / float(gamma))
+
+        if fit_type == "linear":
+            return n * float(fit.get("coeffs", {}).get("scale", 50.0))
+    except Exception:
+        return None
+    return None
+
+
 def _get_mixer_display_range(field: str) -> Tuple[float, float]:
     try:
         store = get_store()
@@ -254,6 +320,8 @@ normalize_unit = _normalize_unit
 get_mixer_param_meta = _get_mixer_param_meta
 apply_mixer_fit_inverse = _apply_mixer_fit_inverse
 apply_mixer_fit_forward = _apply_mixer_fit_forward
+apply_mixer_fit_inverse_array = _apply_mixer_fit_inverse_array
+apply_mixer_fit_forward_array = _apply_mixer_fit_forward_array
 get_mixer_display_range = _get_mixer_display_range
 resolve_mixer_display_value = _resolve_mixer_display_value
 clamp = _clamp
@@ -1,11 +1,24 @@
+import bisect
+import math
 import os
 import pathlib
+import pickle
 import re
-from typing import List, Tuple
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
 
 ROOT = pathlib.Path(__file__).resolve().parents[2]
 KNOW_DIR = ROOT / "knowledge"
 
+_TOKEN_RE = re.compile(r"[a-z0-9_]+")
+_INDEX_VERSION = 1
+
+# BM25 parameters and the bonus for sections containing the exact query phrase
+BM25_K1 = 1.2
+BM25_B = 0.75
+PHRASE_BOOST = 5.0
+
 
 def _read(path: pathlib.Path) -> str:
     try:
@@ -27,31 +40,157 @@ def _sections(md: str) -> List[Tuple[str, str]]:
     return out
 
 
-def search_knowledge(query: str, limit: int = 3) -> List[Tuple[str, str, str]]:
-    """Return list of (source, title, body) best matches from all knowledge/*.md files."""
-    q = query.lower()
-    keywords = set(re.findall(r"[a-zA-Z0-9_]+", q))
-    scored: List[Tuple[float, str, str, str]] = []
+def _tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall(text.lower())
 
-    include_refs = os.getenv("KNOWLEDGE_INCLUDE_REFERENCES", "").lower() in ("1", "true", "yes", "on")
-    # Collect all .md files under knowledge/, optionally excluding knowledge/references
-    for path in KNOW_DIR.rglob('*.md'):
-        # Skip references (unless explicitly enabled), hidden files, and hidden directories
-        if (not include_refs and any(part == 'references' for part in path.parts)) or any(part.startswith('.') for part in path.parts):  # type: ignore[attr-defined]
+
+def _knowledge_files() -> Dict[str, int]:
+    """rel path -> mtime_ns for every indexable .md file (skipping hidden paths)."""
+    files: Dict[str, int] = {}
+    for path in KNOW_DIR.rglob("*.md"):
+        rel = path.relative_to(KNOW_DIR)
+        if any(part.startswith(".") for part in rel.parts):
             continue
-        rel = str(path.relative_to(KNOW_DIR))
-        text = _read(path)
-        if not text:
+        try:
+            files[str(rel)] = path.stat().st_mtime_ns
+        except OSError:
             continue
-        for title, body in _sections(text):
-            hay = (title + "\n" + body).lower()
-            # simple keyword overlap score
-            score = sum(1 for k in keywords if k in hay)
-            # boost if exact phrase occurs
-            if q in hay:
-                score += 5
-            if score > 0:
-                scored.append((score, rel, title, body))
-
-    scored.sort(key=lambda x: x[0], reverse=True)
-    return [(src, title, body) for _, src, title, body in scored[:limit]]
+    return files
+
+
+class KnowledgeIndex:
+    """Inverted index over knowledge/**/*.md sections with BM25 scoring.
+
+    Postings keep token positions per section so exact-phrase matches can be
+    detected without rescanning text. The index records each file's mtime
+    and is rebuilt when any file is added, removed or modified.
+    """
+
+    def __init__(self, files: Dict[str, int]) -> None:
+        self.files = files
+        self.sections: List[Tuple[str, str, str]] = []  # (source, title, body)
+        self.is_reference: List[bool] = []
+        self.lengths: List[int] = []
+        self.postings: Dict[str, Dict[int, List[int]]] = {}
+        for rel in sorted(files):
+            text = _read(KNOW_DIR / rel)
+            if not text:
+                continue
+            is_ref = "references" in pathlib.PurePath(rel).parts
+            for title, body in _sections(text):
+                sid = len(self.sections)
+                self.sections.append((rel, title, body))
+                self.is_reference.append(is_ref)
+                tokens = _tokenize(title + "\n" + body)
+                self.lengths.append(len(tokens))
+                for pos, tok in enumerate(tokens):
+                    self.postings.setdefault(tok, {}).setdefault(sid, []).append(pos)
+        self.avg_len = (sum(self.lengths) / len(self.lengths)) if self.lengths else 0.0
+        self.vocab = sorted(self.postings)
+
+    def _expand(self, term: str) -> List[str]:
+        """Exact term, else vocabulary terms it prefixes ("compress" -> "compressor")."""
+        if term in self.postings:
+            return [term]
+        i = bisect.bisect_left(self.vocab, term)
+        out: List[str] = []
+        while i < len(self.vocab) and self.vocab[i].startswith(term) and len(out) < 20:
+            out.append(self.vocab[i])
+            i += 1
+        return out
+
+    def _has_phrase(self, sid: int, tokens: List[str]) -> bool:
+        lists = [self.postings.get(t, {}).get(sid) for t in tokens]
+        if any(not pl for pl in lists):
+            return False
+        rest = [set(pl) for pl in lists[1:]]
+        return any(all((p + k + 1) in rest[k] for k in range(len(rest))) for p in lists[0])
+
+    def search(self, query: str, limit: int = 3, include_refs: bool = False) -> List[Tuple[str, str, str]]:
+        q_tokens = _tokenize(query)
+        if not q_tokens or not self.sections:
+            return []
+        n = len(self.sections)
+        scores: Dict[int, float] = {}
+        for term in set(q_tokens):
+            for t in self._expand(term):
+                plist = self.postings[t]
+                idf = math.log(1.0 + (n - len(plist) + 0.5) / (len(plist) + 0.5))
+                for sid, positions in plist.items():
+                    tf = len(positions)
+                    norm = BM25_K1 * (1.0 - BM25_B + BM25_B * self.lengths[sid] / (self.avg_len or 1.0))
+                    scores[sid] = scores.get(sid, 0.0) + idf * tf * (BM25_K1 + 1.0) / (tf + norm)
+        if not include_refs:
+            scores = {sid: s for sid, s in scores.items() if not self.is_reference[sid]}
+        if len(q_tokens) > 1:
+            for sid in scores:
+                if self._has_phrase(sid, q_tokens):
+                    scores[sid] += PHRASE_BOOST
+        ranked = sorted(scores.items(), key=lambda kv: (-kv[1], kv[0]))[:limit]
+        return [self.sections[sid] for sid, _ in ranked]
+
+
+_INDEX: Optional[KnowledgeIndex] = None
+_INDEX_CHECKED = 0.0
+_INDEX_LOCK = threading.Lock()
+
+
+def _cache_path() -> Optional[pathlib.Path]:
+    raw = os.getenv("KNOWLEDGE_INDEX_CACHE")
+    if raw is not None:
+        return pathlib.Path(raw) if raw.strip() else None
+    return pathlib.Path.home() / ".fadebender" / "cache" / "knowledge_index.pkl"
+
+
+def _load_cached(files: Dict[str, int]) -> Optional[KnowledgeIndex]:
+    path = _cache_path()
+    if path is None or not path.exists():
+        return None
+    try:
+        with open(path, "rb") as f:
+            version, root, index = pickle.load(f)
+    except Exception:
+        return None
+    if version != _INDEX_VERSION or root != str(KNOW_DIR) or getattr(index, "files", None) != files:
+        return None
+    return index
+
+
+def _save_cached(index: KnowledgeIndex) -> None:
+    path = _cache_path()
+    if path is None:
+        return
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "wb") as f:
+            pickle.dump((_INDEX_VERSION, str(KNOW_DIR), index), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+    except Exception:
+        pass
+
+
+def get_knowledge_index() -> KnowledgeIndex:
+    """Current index; file mtimes are rechecked at most every KNOWLEDGE_INDEX_CHECK_SEC."""
+    global _INDEX, _INDEX_CHECKED
+    check_sec = float(os.getenv("KNOWLEDGE_INDEX_CHECK_SEC", "5"))
+    with _INDEX_LOCK:
+        now = time.time()
+        if _INDEX is not None and now - _INDEX_CHECKED < check_sec:
+            return _INDEX
+        files = _knowledge_files()
+        _INDEX_CHECKED = now
+        if _INDEX is not None and _INDEX.files == files:
+            return _INDEX
+        index = _load_cached(files)
+        if index is None:
+            index = KnowledgeIndex(files)
+            _save_cached(index)
+        _INDEX = index
+        return _INDEX
+
+
+def search_knowledge(query: str, limit: int = 3) -> List[Tuple[str, str, str]]:
+    """Return list of (source, title, body) best matches from all knowledge/*.md files."""
+    include_refs = os.getenv("KNOWLEDGE_INCLUDE_REFERENCES", "").lower() in ("1", "true", "yes", "on")
+    return get_knowledge_index().search(query, limit=limit, include_refs=include_refs)
@@ -0,0 +1,91 @@
+"""
+Client for the knowledge-retriever worker (cloud-workers/knowledge-retriever).
+
+When KNOWLEDGE_RETRIEVER_URL is set, HybridRAGService retrieves through this
+client instead of loading its own RAGService indexes, so every server process
+shares one warm store. It exposes the same search()/index_version surface.
+
+If the worker errors or times out, searches fall back to the in-process
+RAGService and the worker is retried after KNOWLEDGE_RETRIEVER_RETRY_SEC.
+"""
+
+import logging
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+
+class RemoteRetriever:
+    """RAGService-compatible search against the retriever's POST /search"""
+
+    def __init__(self, base_url: str, timeout: Optional[float] = None, tags: Optional[List[str]] = None):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout if timeout is not None else float(os.getenv('KNOWLEDGE_RETRIEVER_TIMEOUT', '5'))
+        self.tags = tags
+        self.retry_sec = float(os.getenv('KNOWLEDGE_RETRIEVER_RETRY_SEC', '30'))
+        self._client = httpx.Client(timeout=self.timeout)
+        # Store generation reported by the worker; bumps when it re-ingests
+        self._generation = 0
+        self._local: Any = None
+        # While set, searches go to the local retriever until this monotonic time
+        self._fallback_until = 0.0
+
+    @property
+    def index_version(self) -> int:
+        # Local results get their own (negative) versions so callers never
+        # mix them with cached worker results
+        if self._local is not None and time.monotonic() < self._fallback_until:
+            return -1 - int(getattr(self._local, 'index_version', 0))
+        return self._generation
+
+    def _local_search(self, query: str, top_k: int, bm25_weight: float) -> List[Dict[str, Any]]:
+        if self._local is None:
+            from server.services.rag_service import get_rag_service
+            self._local = get_rag_service()
+        return self._local.search(query, top_k=top_k, bm25_weight=bm25_weight)
+
+    def search(self, query: str, top_k: int = 5, bm25_weight: float = 0.3) -> List[Dict[str, Any]]:
+        if time.monotonic() < self._fallback_until:
+            return self._local_search(query, top_k, bm25_weight)
+        body: Dict[str, Any] = {'query': query, 'top_k': top_k}
+        if self.tags:
+            body['tags'] = self.tags
+        try:
+            resp = self._client.post(f"{self.base_url}/search", json=body)
+            resp.raise_for_status()
+            data = resp.json()
+        except (httpx.HTTPError, ValueError) as e:
+            logger.warning(f"Knowledge retriever failed ({e}); using local RAG for {self.retry_sec:.0f}s")
+            try:
+                hits = self._local_search(query, top_k, bm25_weight)
+            except Exception:
+                raise e
+            self._fallback_until = time.monotonic() + self.retry_sec
+            return hits
+        self._generation = int((data.get('usage') or {}).get('generation', self._generation))
+        return [
+            {
+                'title': hit.get('title', ''),
+                'section': hit.get('section', ''),
+                'text': hit.get('text', ''),
+                'path': hit.get('path', ''),
+                'score': float(hit.get('score', 0.0)),
+                'bm25_score': float(hit.get('bm25_score', 0.0)),
+                'semantic_score': float(hit.get('semantic_score', 0.0)),
+            }
+            for hit in data.get('hits') or []
+        ]
+
+
+def get_remote_retriever() -> Optional[RemoteRetriever]:
+    """RemoteRetriever for KNOWLEDGE_RETRIEVER_URL, or None when unset"""
+    url = os.getenv('KNOWLEDGE_RETRIEVER_URL', '').strip()
+    if not url:
+        return None
+    tags = [t.strip() for t in os.getenv('KNOWLEDGE_RETRIEVER_TAGS', '').split(',') if t.strip()]
+    logger.info(f"Using knowledge retriever at {url}")
+    return RemoteRetriever(url, tags=tags or None)
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import asyncio
 import time
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 from server.services.ableton_client import request_op
 
@@ -20,12 +20,21 @@ class LiveIndex:
     """Lightweight index of tracks/returns/master devices + last refresh times.
 
     In-memory only; refreshed on a timer and opportunistically by API flows.
+    A full refresh reads the whole device structure with one get_device_tree
+    op and applies the diff in memory; all UDP/Firestore I/O runs in a worker
+    thread so the event loop is never blocked.
     """
 
     def __init__(self) -> None:
         self._tracks: Dict[int, Dict[str, Any]] = {}
         self._returns: Dict[int, Dict[str, Any]] = {}
+        # Single entry under key 0, so it shares _store_devices with the others
+        self._master: Dict[int, Dict[str, Any]] = {}
         self._last_full_refresh: float = 0.0
+        # Bumped whenever a refresh changes any device list
+        self.version: int = 0
+        # device name -> Firestore device_type (None = known to have none)
+        self._device_types: Dict[str, Optional[str]] = {}
         self._lock = asyncio.Lock()
 
     # --------- Query helpers ---------
@@ -35,79 +44,163 @@ class LiveIndex:
     def get_track_devices_cached(self, ti: int) -> List[Dict[str, Any]]:
         return list((self._tracks.get(int(ti)) or {}).get("devices") or [])
 
+    def get_master_devices_cached(self) -> List[Dict[str, Any]]:
+        return list((self._master.get(0) or {}).get("devices") or [])
+
+    def get_device_signature(self, entity: str, index: int, device_index: int) -> Optional[str]:
+        """Cached structure signature for (entity, device_index), as reported by the Remote Script."""
+        table = {"track": self._tracks, "return": self._returns, "master": self._master}.get(str(entity))
+        if table is None:
+            return None
+        key = 0 if entity == "master" else int(index)
+        for d in (table.get(key) or {}).get("devices") or []:
+            if int(d.get("index", -1)) == int(device_index):
+                return d.get("signature")
+        return None
+
+    def invalidate(self, entity: str, index: int) -> None:
+        """Forget one track/return's device list after a structure change.
+
+        Lookups miss (and callers fall back to Live) until it is refetched.
+        """
+        table = {"track": self._tracks, "return": self._returns}.get(str(entity))
+        if table is not None and table.pop(int(index), None) is not None:
+            self.version += 1
+
+    def iter_devices(self) -> Iterator[Dict[str, Any]]:
+        """Every cached device on tracks, returns and master, in index order."""
+        for table in (self._tracks, self._returns, self._master):
+            for key in sorted(table):
+                yield from table[key].get("devices") or []
+
+    def vocabulary(self) -> Dict[str, Any]:
+        """Unique device names/types across the cached set (no Live calls)."""
+        devices: List[Dict[str, str]] = []
+        seen = set()
+        for d in self.iter_devices():
+            name = str(d.get("name", "")).strip()
+            if name and name not in seen:
+                seen.add(name)
+                devices.append({"name": name, "type": str(d.get("device_type") or "unknown")})
+        return {"version": self.version, "devices": devices, "last_full_refresh": self._last_full_refresh}
+
+    def _store_devices(self, table: Dict[int, Dict[str, Any]], idx: int, items: List[Dict[str, Any]]) -> None:
+        prev = (table.get(idx) or {}).get("devices")
+        if prev != items:
+            self.version += 1
+        table[idx] = {"devices": items, "ts": time.time()}
+
+    def _device_type(self, name: str) -> Optional[str]:
+        """Firestore device_type for a device name, looked up once per name (blocking)."""
+        if name in self._device_types:
+            return self._device_types[name]
+        try:
+            from server.core.deps import get_store
+            store = get_store()
+            if not (store and store.enabled):
+                return None
+            device_type = store.get_device_type_by_name(name) or None
+        except Exception:
+            return None
+        self._device_types[name] = device_type
+        return device_type
+
+    def _device_items(self, resp: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        resp = resp or {}
+        devs = ((resp.get("data") or resp) if isinstance(resp, dict) else resp).get("devices", [])
+        items = []
+        for d in devs:
+            name = str(d.get("name", ""))
+            item: Dict[str, Any] = {
+                "index": int(d.get("index", 0)),
+                "name": name,
+                "nname": _norm_name(name),
+            }
+            if d.get("signature"):
+                item["signature"] = str(d["signature"])
+            # Enrich with device_type from Firestore
+            device_type = self._device_type(name)
+            if device_type:
+                item["device_type"] = device_type
+            items.append(item)
+        return items
+
+    # --------- Fetch (blocking; run via asyncio.to_thread) ---------
+    def _fetch_tree(self) -> Optional[Tuple[Dict[int, Any], Dict[int, Any], List[Dict[str, Any]]]]:
+        """Whole-set device structure as (tracks, returns, master items), or None."""
+        resp = request_op("get_device_tree", timeout=2.0)
+        data = ((resp.get("data") or resp) if isinstance(resp, dict) else None) if resp else None
+        if not (isinstance(data, dict) and resp.get("ok", True) and "tracks" in data):
+            return self._fetch_tree_per_track()
+        tracks = {int(t.get("index", 0)): self._device_items(t) for t in data.get("tracks") or []}
+        returns = {int(r.get("index", 0)): self._device_items(r) for r in data.get("returns") or []}
+        master = self._device_items(data.get("master") or {})
+        return tracks, returns, master
+
+    def _fetch_tree_per_track(self) -> Optional[Tuple[Dict[int, Any], Dict[int, Any], List[Dict[str, Any]]]]:
+        """Fallback for Remote Scripts without get_device_tree: one call per track."""
+        ov = request_op("get_overview", timeout=1.0)
+        if not ov:
+            return None
+        data = (ov.get("data") or ov) if isinstance(ov, dict) else ov
+        tracks: Dict[int, Any] = {}
+        for t in data.get("tracks") or []:
+            ti = int(t.get("index", 0))
+            tracks[ti] = self._device_items(request_op("get_track_devices", timeout=1.0, track_index=ti))
+        rs = request_op("get_return_tracks", timeout=1.0) or {}
+        rdata = (rs.get("data") or rs) if isinstance(rs, dict) else rs
+        returns: Dict[int, Any] = {}
+        for r in rdata.get("returns") or []:
+            ri = int(r.get("index", 0))
+            returns[ri] = self._device_items(request_op("get_return_devices", timeout=1.0, return_index=ri))
+        master = self._device_items(request_op("get_master_devices", timeout=1.0))
+        return tracks, returns, master
+
+    def _apply_tree(self, tracks: Dict[int, Any], returns: Dict[int, Any], master: List[Dict[str, Any]]) -> None:
+        """Diff a fetched structure into the index (deleted tracks/returns are dropped)."""
+        for table, fresh in ((self._tracks, tracks), (self._returns, returns)):
+            for idx in [i for i in table if i not in fresh]:
+                del table[idx]
+                self.version += 1
+            for idx, items in fresh.items():
+                self._store_devices(table, idx, items)
+        self._store_devices(self._master, 0, master)
+
     # --------- Refresh helpers ---------
     async def refresh_return(self, ri: int) -> None:
         try:
-            resp = request_op("get_return_devices", timeout=1.0, return_index=int(ri)) or {}
-            devs = ((resp.get("data") or resp) if isinstance(resp, dict) else resp).get("devices", [])
-            items = []
-            for d in devs:
-                name = str(d.get("name", ""))
-                item: Dict[str, Any] = {
-                    "index": int(d.get("index", 0)),
-                    "name": name,
-                    "nname": _norm_name(name),
-                }
-                # Enrich with device_type from Firestore
-                try:
-                    from server.core.deps import get_store
-                    store = get_store()
-                    if store and store.enabled:
-                        device_type = store.get_device_type_by_name(name)
-                        if device_type:
-                            item["device_type"] = device_type
-                except Exception:
-                    pass
-                items.append(item)
-            self._returns[int(ri)] = {"devices": items, "ts": time.time()}
+            resp = await asyncio.to_thread(request_op, "get_return_devices", 1.0, return_index=int(ri))
+            items = await asyncio.to_thread(self._device_items, resp)
+            self._store_devices(self._returns, int(ri), items)
         except Exception:
             pass
 
     async def refresh_track(self, ti: int) -> None:
         try:
-            resp = request_op("get_track_devices", timeout=1.0, track_index=int(ti)) or {}
-            devs = ((resp.get("data") or resp) if isinstance(resp, dict) else resp).get("devices", [])
-            items = []
-            for d in devs:
-                name = str(d.get("name", ""))
-                item: Dict[str, Any] = {
-                    "index": int(d.get("index", 0)),
-                    "name": name,
-                    "nname": _norm_name(name),
-                }
-                # Enrich with device_type from Firestore
-                try:
-                    from server.core.deps import get_store
-                    store = get_store()
-                    if store and store.enabled:
-                        device_type = store.get_device_type_by_name(name)
-                        if device_type:
-                            item["device_type"] = device_type
-                except Exception:
-                    pass
-                items.append(item)
-            self._tracks[int(ti)] = {"devices": items, "ts": time.time()}
+            resp = await asyncio.to_thread(request_op, "get_track_devices", 1.0, track_index=int(ti))
+            items = await asyncio.to_thread(self._device_items, resp)
+            self._store_devices(self._tracks, int(ti), items)
+        except Exception:
+            pass
+
+    async def refresh_master(self) -> None:
+        try:
+            resp = await asyncio.to_thread(request_op, "get_master_devices", 1.0)
+            if resp is not None:
+                items = await asyncio.to_thread(self._device_items, resp)
+                self._store_devices(self._master, 0, items)
         except Exception:
             pass
 
     async def refresh_all(self) -> None:
         async with self._lock:
             try:
-                ov = request_op("get_overview", timeout=1.0) or {}
-                data = (ov.get("data") or ov) if isinstance(ov, dict) else ov
-                tracks = data.get("tracks") or []
-                for t in tracks:
-                    await self.refresh_track(int(t.get("index", 0)))
+                tree = await asyncio.to_thread(self._fetch_tree)
             except Exception:
-                pass
-            try:
-                rs = request_op("get_return_tracks", timeout=1.0) or {}
-                rdata = (rs.get("data") or rs) if isinstance(rs, dict) else rs
-                returns = rdata.get("returns") or []
-                for r in returns:
-                    await self.refresh_return(int(r.get("index", 0)))
-            except Exception:
-                pass
+                tree = None
+            if tree is None:
+                return
+            self._apply_tree(*tree)
             self._last_full_refresh = time.time()
 
     # --------- Background loop ---------
@@ -118,4 +211,3 @@ class LiveIndex:
             except Exception:
                 pass
             await asyncio.sleep(interval_sec)
-
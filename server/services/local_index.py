@@ -0,0 +1,261 @@
+"""SQLite index over the local preset/mapping JSON trees.
+
+The JSON files under ``~/.fadebender/param_maps`` stay the source of truth;
+this index keeps one row per file (path, mtime, size + the filter/summary
+fields) so listing presets is a single indexed query instead of an rglob and
+a json.load per file. Reads go through an mtime-validated in-memory cache so
+repeated lookups cost one ``stat`` rather than a parse.
+"""
+
+from __future__ import annotations
+
+import copy
+import json
+import os
+import pathlib
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS presets (
+    id TEXT PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    name TEXT,
+    device_name TEXT,
+    category TEXT,
+    subcategory TEXT,
+    preset_type TEXT,
+    structure_signature TEXT
+);
+CREATE INDEX IF NOT EXISTS presets_category ON presets(category);
+CREATE INDEX IF NOT EXISTS presets_signature ON presets(structure_signature);
+CREATE INDEX IF NOT EXISTS presets_type ON presets(preset_type);
+"""
+
+_SUMMARY_COLUMNS = ("id", "name", "device_name", "category", "subcategory", "preset_type", "structure_signature")
+
+
+def preset_id_for_path(path: pathlib.Path) -> str:
+    """Preset ID for a file laid out as presets/<device_type>/<preset_type>/<name>.json."""
+    return f"{path.parent.parent.name}_{path.stem}"
+
+
+def _stat_key(path: pathlib.Path) -> Optional[Tuple[int, int]]:
+    try:
+        st = path.stat()
+        return st.st_mtime_ns, st.st_size
+    except OSError:
+        return None
+
+
+def _preset_row(preset_id: str, path: pathlib.Path, key: Tuple[int, int], data: Dict[str, Any]) -> Tuple[Any, ...]:
+    return (
+        preset_id,
+        str(path),
+        key[0],
+        key[1],
+        data.get("name"),
+        data.get("device_name"),
+        data.get("category"),
+        data.get("subcategory"),
+        data.get("preset_type"),
+        data.get("structure_signature"),
+    )
+
+
+class JsonReadCache:
+    """In-memory JSON cache validated against (mtime_ns, size) on every read.
+
+    Callers get deep copies in both directions, so mutating a loaded dict
+    (or one passed to ``put``) never leaks unsaved edits into the cache.
+    """
+
+    def __init__(self, max_entries: int = 512) -> None:
+        self._max = max(1, int(max_entries))
+        self._entries: Dict[str, Tuple[Tuple[int, int], Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+
+    def load(self, path: pathlib.Path) -> Optional[Dict[str, Any]]:
+        key = _stat_key(path)
+        if key is None:
+            self.forget(path)
+            return None
+        sp = str(path)
+        with self._lock:
+            hit = self._entries.get(sp)
+        if hit is not None and hit[0] == key:
+            return copy.deepcopy(hit[1])
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        with self._lock:
+            if len(self._entries) >= self._max and sp not in self._entries:
+                self._entries.pop(next(iter(self._entries)))
+            self._entries[sp] = (key, copy.deepcopy(data))
+        return data
+
+    def put(self, path: pathlib.Path, data: Dict[str, Any]) -> None:
+        key = _stat_key(path)
+        if key is None:
+            return
+        data = copy.deepcopy(data)
+        with self._lock:
+            self._entries[str(path)] = (key, data)
+
+    def forget(self, path: pathlib.Path) -> None:
+        with self._lock:
+            self._entries.pop(str(path), None)
+
+
+class LocalPresetIndex:
+    """SQLite-backed index of local preset JSON files.
+
+    Rows are kept current by write-through from MappingStore and by
+    ``sync()``, which stats every file under the presets root but only
+    re-parses files whose (mtime, size) changed. ``sync()`` runs on first
+    use and then at most every ``rescan_sec`` seconds so files dropped in by
+    other tools still show up.
+    """
+
+    def __init__(self, root: pathlib.Path, db_path: Optional[pathlib.Path] = None, rescan_sec: Optional[float] = None) -> None:
+        self.root = pathlib.Path(root)
+        self.db_path = pathlib.Path(db_path) if db_path else self.root.parent / "index.sqlite3"
+        if rescan_sec is None:
+            rescan_sec = float(os.getenv("FB_LOCAL_INDEX_RESCAN_SEC", "60"))
+        self._rescan_sec = float(rescan_sec)
+        self._last_sync = 0.0
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    # ---------- Sync / import ----------
+    def _ensure_synced(self) -> None:
+        if self._last_sync == 0.0 or (self._rescan_sec >= 0 and time.time() - self._last_sync > self._rescan_sec):
+            self.sync()
+
+    def sync(self) -> Dict[str, int]:
+        """Reconcile rows with the presets tree; returns {added, updated, removed}."""
+        with self._lock:
+            known = {
+                row[0]: (row[1], row[2])
+                for row in self._conn.execute("SELECT path, mtime_ns, size FROM presets")
+            }
+            rows: List[Tuple[Any, ...]] = []
+            seen = set()
+            added = 0
+            if self.root.exists():
+                for path in self.root.rglob("*.json"):
+                    key = _stat_key(path)
+                    if key is None:
+                        continue
+                    sp = str(path)
+                    seen.add(sp)
+                    if known.get(sp) == key:
+                        continue
+                    try:
+                        with open(path, "r", encoding="utf-8") as f:
+                            data = json.load(f)
+                    except Exception:
+                        continue
+                    if sp not in known:
+                        added += 1
+                    rows.append(_preset_row(preset_id_for_path(path), path, key, data))
+            root_prefix = str(self.root) + os.sep
+            # Rows under root vanish with their file; imported rows elsewhere only when deleted
+            gone = [
+                (p,) for p in known
+                if p not in seen and (p.startswith(root_prefix) or not os.path.exists(p))
+            ]
+            with self._conn:
+                if rows:
+                    self._conn.executemany("INSERT OR REPLACE INTO presets VALUES (?,?,?,?,?,?,?,?,?,?)", rows)
+                if gone:
+                    self._conn.executemany("DELETE FROM presets WHERE path = ?", gone)
+            self._last_sync = time.time()
+            return {"added": added, "updated": len(rows) - added, "removed": len(gone)}
+
+    def import_json_tree(self, src: pathlib.Path) -> int:
+        """Bulk-index an existing presets tree in place (one transaction).
+
+        ``src`` must use the presets/<device_type>/<preset_type>/<name>.json
+        layout. Rows point at the files where they are, so trees kept outside
+        the local dir (e.g. a shared checkout) become listable without copying.
+        """
+        src = pathlib.Path(src)
+        rows: List[Tuple[Any, ...]] = []
+        for path in src.rglob("*.json"):
+            key = _stat_key(path)
+            if key is None:
+                continue
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            except Exception:
+                continue
+            rows.append(_preset_row(preset_id_for_path(path), path, key, data))
+        with self._lock, self._conn:
+            self._conn.executemany("INSERT OR REPLACE INTO presets VALUES (?,?,?,?,?,?,?,?,?,?)", rows)
+        return len(rows)
+
+    # ---------- Write-through ----------
+    def upsert(self, preset_id: str, path: pathlib.Path, data: Dict[str, Any]) -> None:
+        key = _stat_key(path)
+        if key is None:
+            return
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM presets WHERE id = ? OR path = ?", (preset_id, str(path)))
+            self._conn.execute("INSERT INTO presets VALUES (?,?,?,?,?,?,?,?,?,?)", _preset_row(preset_id, path, key, data))
+
+    def remove(self, preset_id: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM presets WHERE id = ?", (preset_id,))
+
+    # ---------- Queries ----------
+    def path_for(self, preset_id: str) -> Optional[pathlib.Path]:
+        self._ensure_synced()
+        with self._lock:
+            row = self._conn.execute("SELECT path FROM presets WHERE id = ?", (preset_id,)).fetchone()
+        return pathlib.Path(row[0]) if row else None
+
+    def list(
+        self,
+        category: Optional[str] = None,
+        structure_signature: Optional[str] = None,
+        preset_type: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        self._ensure_synced()
+        clauses: List[str] = []
+        args: List[Any] = []
+        for col, val in (("category", category), ("structure_signature", structure_signature), ("preset_type", preset_type)):
+            if val:
+                clauses.append(f"{col} = ?")
+                args.append(val)
+        sql = f"SELECT {', '.join(_SUMMARY_COLUMNS)} FROM presets"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY id"
+        with self._lock:
+            rows: Iterable[Tuple[Any, ...]] = self._conn.execute(sql, args).fetchall()
+        return [
+            {
+                "id": r[0],
+                "name": r[1],
+                "device_name": r[2],
+                "device_type": r[3],
+                "subcategory": r[4],
+                "preset_type": r[5],
+                "structure_signature": r[6],
+            }
+            for r in rows
+        ]
+
+    def close(self) -> None:
+        with self._lock:
+            try:
+                self._conn.close()
+            except Exception:
+                pass
@@ -0,0 +1,533 @@
+"""Macro runtime: execute CompiledMacro timelines against Live's beat clock.
+
+``prepare_macro`` does all the slow work up front: it resolves every param
+reference to (track, device, param index) once, converts set/sweep display
+values to normalized values (sweeps are sampled on their curve and inverted
+through the mapping fit in one vectorized pass), and merges everything into
+a time-ordered list of dispatch groups. Params landing on the same device at
+the same beat share one set_device_params_bulk op.
+
+``MacroRun`` then only waits and sends. Beat time comes from a clock that
+is synced to Live's current_song_time and advanced between syncs by the
+tempo in ValueRegistry. Intermediate sweep frames that are already overtaken
+by the next frame are dropped (counted), and each dispatch records its
+lateness so runs report jitter.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import os
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from fastapi import HTTPException
+
+from server.core.deps import get_store, get_value_registry
+from server.core.events import broker
+from server.models.macro import (
+    ArmTrackStep,
+    CompiledMacro,
+    Macro,
+    SetParamStep,
+    SweepParamStep,
+    TransportStep,
+    compile_macro,
+    curve_value,
+    describe_compiled_macro,
+)
+from server.services.ableton_client import data_or_raw, request_op, set_device_params_bulk
+from server.services.intents.param_service import (
+    _fit_is_valid,
+    alias_param_name_if_needed,
+    convert_unit_value,
+    detect_display_unit,
+    invert_fit_to_value,
+    resolve_param,
+)
+from server.services.intents.utils.mixer import parse_target_display
+from server.services.mapping_utils import make_device_signature
+
+SWEEP_STEPS_PER_BEAT = float(os.getenv("MACRO_SWEEP_STEPS_PER_BEAT", "16"))
+CLOCK_RESYNC_SEC = float(os.getenv("MACRO_CLOCK_RESYNC_SEC", "1.0"))
+DEFAULT_TEMPO = 120.0
+
+_ON = {"on", "enable", "enabled", "true", "yes"}
+_OFF = {"off", "disable", "disabled", "false", "no"}
+_TRANSPORT_ACTIONS = {
+    "play": "play",
+    "stop": "stop",
+    # Sent with an explicit target state, so re-running a step never toggles off
+    "session_record": "session_record",
+    "arrangement_record": "arrangement_record",
+    "locate": "locate",
+}
+
+
+# ---------- Display -> normalized ----------
+def invert_fit_array(fit: Dict[str, Any], ys: np.ndarray, vmin: float, vmax: float) -> np.ndarray:
+    """Vectorized invert_fit_to_value over an array of display values."""
+    ys = np.asarray(ys, dtype="float64")
+    ftype = str(fit.get("type", "")).strip().lower()
+    coeffs = fit.get("coeffs", {}) or {}
+    with np.errstate(all="ignore"):
+        if ftype == "linear":
+            a = float(coeffs.get("a", 1.0)); b = float(coeffs.get("b", 0.0))
+            x = (ys - b) / a
+        elif ftype in ("log", "logarithmic", "exp", "exponential", "power"):
+            a = float(coeffs.get("a", 1.0)); b = float(coeffs.get("b", 1.0)); c = float(coeffs.get("c", 0.0))
+            if a == 0 or b == 0:
+                x = np.full_like(ys, vmin)
+            elif ftype in ("log", "logarithmic"):
+                x = (np.exp((ys - c) / a) - 1.0) / b
+            else:
+                r = (ys - c) / a
+                x = np.where(r > 0, np.log(r) / b if ftype.startswith("exp") else np.power(r, 1.0 / b), vmin)
+        else:
+            pts = _fit_points(fit)
+            if pts is None:
+                x = np.array([invert_fit_to_value(fit, float(y), vmin, vmax) for y in ys])
+            elif not len(pts):
+                x = np.full_like(ys, vmin)
+            else:
+                x = np.interp(ys, pts[:, 0], pts[:, 1])
+    return np.clip(np.nan_to_num(x, nan=vmin, posinf=vmax, neginf=vmin), vmin, vmax)
+
+
+def _fit_points(fit: Dict[str, Any]) -> Optional[np.ndarray]:
+    """(display, norm) rows sorted by display for point fits; None for unknown shapes."""
+    ftype = str(fit.get("type", "")).strip().lower()
+    raw = fit.get("points")
+    rows: List[Tuple[float, float]] = []
+    try:
+        if ftype == "piecewise":
+            rows = [(float(p["db"]), float(p["normalized"])) for p in raw or [] if isinstance(p, dict) and "db" in p and "normalized" in p]
+        elif ftype == "point_based":
+            rows = [(float(p["display"]), float(p["norm"])) for p in (raw or {}).values() if isinstance(p, dict) and "display" in p and "norm" in p]
+        elif isinstance(raw, list):
+            rows = [(float(p["y"]), float(p["x"])) for p in raw if isinstance(p, dict) and p.get("x") is not None and p.get("y") is not None]
+        else:
+            return None
+    except (TypeError, ValueError):
+        return None
+    return np.array(sorted(rows), dtype="float64").reshape(-1, 2)
+
+
+class ParamTarget:
+    """A resolved track device parameter plus its mapping metadata."""
+
+    def __init__(self, track_index: int, device_index: int, param: Dict[str, Any], meta: Optional[Dict[str, Any]]) -> None:
+        self.track_index = int(track_index)
+        self.device_index = int(device_index)
+        self.param_index = int(param.get("index", 0))
+        self.name = str(param.get("name", ""))
+        self.vmin = float(param.get("min", 0.0))
+        self.vmax = float(param.get("max", 1.0))
+        self.meta = meta or {}
+
+    def _label_value(self, display: str) -> Optional[float]:
+        lnorm = display.strip().lower()
+        for k, v in (self.meta.get("label_map") or {}).items():
+            if str(v).strip().lower() == lnorm:
+                return float(k)
+        if lnorm in _ON:
+            return self.vmax
+        if lnorm in _OFF:
+            return self.vmin
+        return None
+
+    def _display_number(self, display: str) -> Optional[float]:
+        y = parse_target_display(display)
+        if y is None:
+            return None
+        unit = (self.meta.get("unit") or "").strip().lower() or None
+        return convert_unit_value(float(y), detect_display_unit(display) or unit, unit)
+
+    def to_values(self, ys: np.ndarray) -> np.ndarray:
+        """Normalized values for display-unit numbers (vectorized)."""
+        fit = self.meta.get("fit")
+        if _fit_is_valid(fit):
+            return invert_fit_array(fit, ys, self.vmin, self.vmax)
+        if len(ys) and float(np.min(ys)) >= self.vmin and float(np.max(ys)) <= self.vmax:
+            # No fit: values already in the param's raw range are used as-is
+            return np.asarray(ys, dtype="float64")
+        raise HTTPException(400, f"parameter_missing_fit_model:{self.name}")
+
+    def value_for(self, display: str) -> float:
+        lv = self._label_value(display)
+        if lv is not None:
+            return float(lv)
+        y = self._display_number(display)
+        if y is None:
+            raise HTTPException(400, f"invalid_display_value:{self.name}:{display}")
+        return float(self.to_values(np.array([y]))[0])
+
+    def sweep_values(self, from_display: str, to_display: str, shape: np.ndarray) -> np.ndarray:
+        y0 = self._display_number(from_display)
+        y1 = self._display_number(to_display)
+        if y0 is None or y1 is None:
+            # Label-to-label sweeps degrade to a switch at the midpoint
+            a, b = self.value_for(from_display), self.value_for(to_display)
+            return np.where(shape >= 0.5, b, a)
+        return self.to_values(y0 + (y1 - y0) * shape)
+
+
+def _resolve_target(track_index: int, device_ref: Optional[str], param_ref: str) -> ParamTarget:
+    ti = int(track_index)
+    devs = data_or_raw(request_op("get_track_devices", timeout=1.0, track_index=ti)) or {}
+    devices = devs.get("devices") or []
+    if not devices:
+        raise HTTPException(404, f"no_devices_on_track:{ti}")
+    if device_ref is None or not str(device_ref).strip():
+        candidates = devices
+    elif str(device_ref).strip().isdigit():
+        candidates = [d for d in devices if int(d.get("index", -1)) == int(str(device_ref).strip())]
+    else:
+        ref = str(device_ref).strip().lower()
+        candidates = [d for d in devices if str(d.get("name", "")).lower() == ref] or [
+            d for d in devices if ref in str(d.get("name", "")).lower()
+        ]
+    if not candidates:
+        raise HTTPException(404, f"device_not_found:{device_ref}")
+    refs = [param_ref]
+    alias = alias_param_name_if_needed(param_ref)
+    if alias and alias.lower() != str(param_ref).strip().lower():
+        refs.append(alias)
+    for dev in candidates:
+        di = int(dev.get("index", 0))
+        params = (data_or_raw(request_op("get_track_device_params", timeout=1.2, track_index=ti, device_index=di)) or {}).get("params") or []
+        sel = None
+        for ref in refs:
+            try:
+                sel = resolve_param(params, None, ref)
+                break
+            except HTTPException:
+                continue
+        if sel is None:
+            continue
+        meta = None
+        try:
+            store = get_store()
+            if store.enabled:
+                mapping = store.get_device_mapping(dev.get("signature") or make_device_signature(str(dev.get("name", "")), params))
+                meta = next(
+                    (pm for pm in ((mapping or {}).get("params_meta") or []) if str(pm.get("name", "")).lower() == str(sel.get("name", "")).lower()),
+                    None,
+                )
+        except Exception:
+            meta = None
+        return ParamTarget(ti, di, sel, meta)
+    raise HTTPException(404, f"param_not_found:{param_ref}")
+
+
+# ---------- Plan ----------
+class DispatchGroup:
+    """Everything due at one beat: a bulk param set on one device, or a single op."""
+
+    __slots__ = ("time_beats", "track_index", "device_index", "pairs", "op", "droppable")
+
+    def __init__(
+        self,
+        time_beats: float,
+        *,
+        track_index: Optional[int] = None,
+        device_index: Optional[int] = None,
+        pairs: Optional[List[Tuple[int, float]]] = None,
+        op: Optional[Dict[str, Any]] = None,
+        droppable: bool = False,
+    ) -> None:
+        self.time_beats = float(time_beats)
+        self.track_index = track_index
+        self.device_index = device_index
+        self.pairs = pairs
+        self.op = op
+        self.droppable = droppable
+
+
+class MacroPlan:
+    def __init__(self, name: str, mode: str, groups: List[DispatchGroup], description: List[str]) -> None:
+        self.name = name
+        self.mode = mode
+        self.groups = groups
+        self.description = description
+
+    @property
+    def duration_beats(self) -> float:
+        return self.groups[-1].time_beats if self.groups else 0.0
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "execution_mode": self.mode,
+            "groups": len(self.groups),
+            "param_sets": sum(len(g.pairs or []) for g in self.groups),
+            "duration_beats": self.duration_beats,
+        }
+
+
+def _locator_resolver(name: str) -> float:
+    cues = (data_or_raw(request_op("get_cue_points", timeout=1.0)) or {}).get("cue_points") or []
+    for cp in cues:
+        if str(cp.get("name", "")).strip().lower() == str(name).strip().lower():
+            return float(cp.get("time", 0.0))
+    raise ValueError(f"locator_not_found:{name}")
+
+
+def prepare_macro(macro: Macro) -> MacroPlan:
+    """Compile, resolve and precompute a macro into time-ordered dispatch groups."""
+    try:
+        compiled: CompiledMacro = compile_macro(macro, locator_resolver=_locator_resolver)
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+    targets: Dict[Tuple[int, Optional[str], str], ParamTarget] = {}
+
+    def target_for(step: Any) -> ParamTarget:
+        key = (int(step.track_index), step.device_ref, str(step.param_ref))
+        if key not in targets:
+            targets[key] = _resolve_target(*key)
+        return targets[key]
+
+    # (time, seq, kind, payload, droppable)
+    events: List[Tuple[float, int, str, Any, bool]] = []
+    seq = 0
+    for sop in compiled.steps:
+        step = sop.step
+        t0 = float(sop.time_beats)
+        if isinstance(step, SetParamStep):
+            tgt = target_for(step)
+            events.append((t0, seq, "param", (tgt, tgt.value_for(step.value_display)), False))
+        elif isinstance(step, SweepParamStep):
+            tgt = target_for(step)
+            n = max(2, int(math.ceil(float(step.duration_beats) * SWEEP_STEPS_PER_BEAT)) + 1)
+            norm_t = np.linspace(0.0, 1.0, n)
+            shape = np.fromiter((curve_value(float(t), step.curve) for t in norm_t), dtype="float64", count=n)
+            values = tgt.sweep_values(step.from_display, step.to_display, shape)
+            times = t0 + norm_t * float(step.duration_beats)
+            for i, (tb, v) in enumerate(zip(times.tolist(), values.tolist())):
+                # Only the last point of a sweep must land; earlier frames may be dropped when late
+                events.append((tb, seq, "param", (tgt, v), i < n - 1))
+        elif isinstance(step, ArmTrackStep):
+            events.append((t0, seq, "op", {"op": "set_track_arm", "track_index": int(step.track_index), "arm": bool(step.arm)}, False))
+        elif isinstance(step, TransportStep):
+            msg: Dict[str, Any] = {"op": "set_transport", "action": _TRANSPORT_ACTIONS[step.action]}
+            if step.action == "locate" and step.time_beats is not None:
+                msg["value"] = float(step.time_beats)
+            elif step.action in ("session_record", "arrangement_record"):
+                msg["value"] = 1.0 if step.record else 0.0
+            events.append((t0, seq, "op", msg, False))
+        seq += 1
+    events.sort(key=lambda e: (e[0], e[1]))
+
+    groups: List[DispatchGroup] = []
+    for tb, _seq, kind, payload, droppable in events:
+        if kind == "op":
+            groups.append(DispatchGroup(tb, op=payload))
+            continue
+        tgt, value = payload
+        last = groups[-1] if groups else None
+        if (
+            last is not None
+            and last.op is None
+            and abs(last.time_beats - tb) < 1e-9
+            and last.track_index == tgt.track_index
+            and last.device_index == tgt.device_index
+        ):
+            last.pairs = [p for p in (last.pairs or []) if p[0] != tgt.param_index] + [(tgt.param_index, float(value))]
+            last.droppable = last.droppable and droppable
+        else:
+            groups.append(DispatchGroup(
+                tb,
+                track_index=tgt.track_index,
+                device_index=tgt.device_index,
+                pairs=[(tgt.param_index, float(value))],
+                droppable=droppable,
+            ))
+    return MacroPlan(macro.name, macro.execution_mode, groups, describe_compiled_macro(compiled))
+
+
+# ---------- Clock ----------
+class BeatClock:
+    """Song position estimate: synced to Live, advanced by tempo in between."""
+
+    def __init__(self) -> None:
+        self._beats = 0.0
+        self._wall = time.monotonic()
+        self._tempo = DEFAULT_TEMPO
+        self.playing = False
+        self.synced_at = 0.0
+
+    def sync(self) -> None:
+        data = data_or_raw(request_op("get_transport", timeout=0.5)) or {}
+        now = time.monotonic()
+        try:
+            self._tempo = float(data.get("tempo") or self._tempo)
+        except (TypeError, ValueError):
+            pass
+        self.playing = bool(data.get("is_playing", False))
+        song_time = data.get("current_song_time")
+        # While stopped Live's position stands still; keep free-running on tempo
+        if isinstance(song_time, (int, float)) and (self.playing or self.synced_at == 0.0):
+            self._beats = float(song_time)
+            self._wall = now
+        self.synced_at = now
+
+    def tempo(self) -> float:
+        try:
+            entry = get_value_registry().get_transport_field("tempo")
+            if entry and isinstance(entry.get("value"), (int, float)) and entry["value"] > 0:
+                return float(entry["value"])
+        except Exception:
+            pass
+        return self._tempo
+
+    def now(self) -> float:
+        t = time.monotonic()
+        self._beats += (t - self._wall) * self.tempo() / 60.0
+        self._wall = t
+        return self._beats
+
+
+# ---------- Runs ----------
+class MacroRun:
+    def __init__(self, plan: MacroPlan) -> None:
+        self.id = uuid.uuid4().hex[:12]
+        self.plan = plan
+        self.state = "pending"
+        self.origin_beats: Optional[float] = None
+        self.position = 0
+        self.sent = 0
+        self.dropped = 0
+        self.errors = 0
+        self.error: Optional[str] = None
+        self.jitter_ms: List[float] = []
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._cancel = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def status(self) -> Dict[str, Any]:
+        jit = np.asarray(self.jitter_ms) if self.jitter_ms else None
+        return {
+            "id": self.id,
+            "state": self.state,
+            **self.plan.summary(),
+            "origin_beats": self.origin_beats,
+            "dispatched": self.position,
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "errors": self.errors,
+            "error": self.error,
+            "jitter_ms": None if jit is None else {
+                "mean": round(float(jit.mean()), 2),
+                "p95": round(float(np.percentile(jit, 95)), 2),
+                "max": round(float(jit.max()), 2),
+            },
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+    def cancel(self) -> None:
+        self._cancel.set()
+
+    async def _dispatch(self, g: DispatchGroup) -> None:
+        if g.op is not None:
+            msg = dict(g.op)
+            op = msg.pop("op")
+            resp = await asyncio.to_thread(request_op, op, 1.0, **msg)
+            ok = bool(resp and resp.get("ok", True))
+        else:
+            resp = await asyncio.to_thread(set_device_params_bulk, "track", g.track_index, g.device_index, g.pairs or [])
+            ok = bool(resp.get("ok"))
+        self.sent += 1
+        if not ok:
+            self.errors += 1
+
+    async def run(self) -> None:
+        self.state = "running"
+        self.started_at = time.time()
+        clock = BeatClock()
+        try:
+            await asyncio.to_thread(clock.sync)
+            self.origin_beats = 0.0 if self.plan.mode == "absolute" else clock.now()
+            groups = self.plan.groups
+            for i, g in enumerate(groups):
+                target = self.origin_beats + g.time_beats
+                while True:
+                    ahead = target - clock.now()
+                    if ahead <= 0:
+                        break
+                    wait_sec = ahead * 60.0 / clock.tempo()
+                    if wait_sec > 0.05 and time.monotonic() - clock.synced_at > CLOCK_RESYNC_SEC:
+                        await asyncio.to_thread(clock.sync)
+                        continue
+                    try:
+                        await asyncio.wait_for(self._cancel.wait(), timeout=min(wait_sec, 0.25))
+                        self.state = "cancelled"
+                        return
+                    except asyncio.TimeoutError:
+                        pass
+                if self._cancel.is_set():
+                    self.state = "cancelled"
+                    return
+                now_beats = clock.now()
+                nxt = groups[i + 1] if i + 1 < len(groups) else None
+                if (
+                    g.droppable
+                    and nxt is not None
+                    and nxt.op is None
+                    and (nxt.track_index, nxt.device_index) == (g.track_index, g.device_index)
+                    and self.origin_beats + nxt.time_beats <= now_beats
+                ):
+                    # Already overtaken by the next frame of the same sweep
+                    self.dropped += 1
+                    self.position = i + 1
+                    continue
+                self.jitter_ms.append(max(0.0, (now_beats - target) * 60000.0 / clock.tempo()))
+                await self._dispatch(g)
+                self.position = i + 1
+            self.state = "done"
+        except asyncio.CancelledError:
+            self.state = "cancelled"
+            raise
+        except Exception as e:
+            self.state = "error"
+            self.error = str(e)
+        finally:
+            self.finished_at = time.time()
+            try:
+                await broker.publish({"event": "macro_finished", **self.status()})
+            except Exception:
+                pass
+
+
+_RUNS: Dict[str, MacroRun] = {}
+_MAX_FINISHED = 32
+
+
+def start_run(plan: MacroPlan) -> MacroRun:
+    run = MacroRun(plan)
+    finished = [r for r in _RUNS.values() if r.finished_at is not None]
+    for old in sorted(finished, key=lambda r: r.finished_at or 0.0)[:-_MAX_FINISHED]:
+        _RUNS.pop(old.id, None)
+    _RUNS[run.id] = run
+    run._task = asyncio.get_running_loop().create_task(run.run())
+    return run
+
+
+def get_run(run_id: str) -> Optional[MacroRun]:
+    return _RUNS.get(run_id)
+
+
+def cancel_run(run_id: str) -> bool:
+    run = _RUNS.get(run_id)
+    if run is None or run.finished_at is not None:
+        return False
+    run.cancel()
+    return True
+
+
+def list_runs() -> List[Dict[str, Any]]:
+    return [r.status() for r in _RUNS.values()]
@@ -0,0 +1,174 @@
+"""Content-addressed cache for Firestore device mappings.
+
+A signature's mapping only changes when it is re-learned, so MappingStore
+keeps each fetched mapping (main doc + params subcollection) in a memory LRU
+and on disk under ``<local_dir>/cache/device_maps/<signature>.<etag>.json``.
+The etag is derived from the doc's Firestore update_time, which every
+writer bumps whether or not it stamps ``updated_at``. Params are versioned
+separately (count + newest update_time of the subcollection, read keys-only)
+because scripts write param docs without touching the parent. Memory hits
+skip Firestore entirely until ``revalidate_sec`` has passed.
+
+Returned structures are shared with the cache; callers that edit a mapping
+must save it back (which invalidates the entry) rather than keep local edits.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import pathlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+
+def etag_for(data: Dict[str, Any], snapshot: Any = None) -> str:
+    """Version tag for a device_mappings doc.
+
+    Firestore's update_time changes on every write to the doc, including
+    scripts that update fields without stamping ``updated_at``; the app
+    field is folded in only as an extra discriminator.
+    """
+    update_time = getattr(snapshot, "update_time", None) or ""
+    updated = data.get("updated_at")
+    return f"{update_time}|{updated if updated is not None else ''}"
+
+
+def _etag_key(etag: str) -> str:
+    return hashlib.sha1(etag.encode("utf-8")).hexdigest()[:16]
+
+
+def _full_etag(etag: str, params_version: Optional[str]) -> str:
+    return etag if params_version is None else f"{etag}#{params_version}"
+
+
+class DeviceMapCache:
+    def __init__(
+        self,
+        disk_dir: Optional[pathlib.Path] = None,
+        max_entries: Optional[int] = None,
+        revalidate_sec: Optional[float] = None,
+    ) -> None:
+        if max_entries is None:
+            max_entries = int(os.getenv("FB_DEVICE_MAP_CACHE_SIZE", "256"))
+        if revalidate_sec is None:
+            revalidate_sec = float(os.getenv("FB_DEVICE_MAP_REVALIDATE_SEC", "300"))
+        self._max = max(1, int(max_entries))
+        self._revalidate_sec = float(revalidate_sec)
+        self._mem: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._dir: Optional[pathlib.Path] = None
+        if disk_dir is not None:
+            try:
+                pathlib.Path(disk_dir).mkdir(parents=True, exist_ok=True)
+                self._dir = pathlib.Path(disk_dir)
+            except Exception:
+                self._dir = None
+        self.stats = {"hits": 0, "revalidated": 0, "misses": 0}
+
+    # ---------- Lookup ----------
+    def fresh(self, signature: str, need_params: bool = True) -> Optional[Dict[str, Any]]:
+        """Memory entry that needs no Firestore round trip, else None."""
+        with self._lock:
+            entry = self._mem.get(signature)
+            if entry is None:
+                return None
+            if need_params and entry.get("params") is None:
+                return None
+            if time.time() - float(entry.get("checked_at", 0.0)) > self._revalidate_sec:
+                return None
+            self._mem.move_to_end(signature)
+            self.stats["hits"] += 1
+            return entry
+
+    def lookup(
+        self, signature: str, etag: str, need_params: bool = True, params_version: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Entry matching ``etag`` (and ``params_version`` when params are needed); marks it revalidated."""
+        with self._lock:
+            entry = self._mem.get(signature)
+        if (
+            entry is None
+            or entry.get("etag") != etag
+            or (need_params and (entry.get("params") is None or entry.get("params_version") != params_version))
+        ):
+            entry = self._load_disk(signature, etag, params_version) if need_params else None
+            if entry is None:
+                self.stats["misses"] += 1
+                return None
+        entry["checked_at"] = time.time()
+        self._remember(signature, entry)
+        self.stats["revalidated"] += 1
+        return entry
+
+    # ---------- Writes ----------
+    def put(
+        self,
+        signature: str,
+        etag: str,
+        doc: Dict[str, Any],
+        params: Optional[List[Dict[str, Any]]] = None,
+        params_version: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        entry = {"etag": etag, "doc": doc, "params": params, "params_version": params_version, "checked_at": time.time()}
+        self._remember(signature, entry)
+        if params is not None:
+            self._store_disk(signature, etag, params_version, doc, params)
+        return entry
+
+    def invalidate(self, signature: str) -> None:
+        with self._lock:
+            self._mem.pop(signature, None)
+        for fp in self._disk_files(signature):
+            try:
+                fp.unlink()
+            except Exception:
+                pass
+
+    # ---------- Internals ----------
+    def _remember(self, signature: str, entry: Dict[str, Any]) -> None:
+        with self._lock:
+            self._mem[signature] = entry
+            self._mem.move_to_end(signature)
+            while len(self._mem) > self._max:
+                self._mem.popitem(last=False)
+
+    def _disk_files(self, signature: str) -> List[pathlib.Path]:
+        if self._dir is None:
+            return []
+        return list(self._dir.glob(f"{signature}.*.json"))
+
+    def _load_disk(self, signature: str, etag: str, params_version: Optional[str]) -> Optional[Dict[str, Any]]:
+        if self._dir is None:
+            return None
+        full = _full_etag(etag, params_version)
+        fp = self._dir / f"{signature}.{_etag_key(full)}.json"
+        try:
+            with open(fp, "r", encoding="utf-8") as f:
+                payload = json.load(f)
+        except Exception:
+            return None
+        if payload.get("etag") != full:
+            return None
+        return {"etag": etag, "doc": payload.get("doc") or {}, "params": payload.get("params") or [], "params_version": params_version}
+
+    def _store_disk(
+        self, signature: str, etag: str, params_version: Optional[str], doc: Dict[str, Any], params: List[Dict[str, Any]]
+    ) -> None:
+        if self._dir is None:
+            return
+        full = _full_etag(etag, params_version)
+        fp = self._dir / f"{signature}.{_etag_key(full)}.json"
+        try:
+            tmp = fp.with_suffix(".tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"signature": signature, "etag": full, "doc": doc, "params": params}, f, default=str)
+            os.replace(tmp, fp)
+            for old in self._disk_files(signature):
+                if old != fp:
+                    old.unlink()
+        except Exception:
+            pass
@@ -1,7 +1,11 @@
 from __future__ import annotations
 
 import os
-from typing import Any, Dict, List, Optional
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+from server.services.mapping_cache import DeviceMapCache, etag_for
+from server.services.local_index import JsonReadCache, LocalPresetIndex, preset_id_for_path
 
 
 class MappingStore:
@@ -51,6 +55,17 @@ class MappingStore:
             self._local_dir = p
         except Exception:
             self._local_dir = None
+        # mtime-validated read cache for local JSON (structures + presets)
+        self._json_cache = JsonReadCache()
+        self._preset_index: Optional[LocalPresetIndex] = None
+        self._preset_index_failed = False
+        # Content-addressed cache for Firestore device mappings (memory LRU + disk)
+        self._map_cache = DeviceMapCache(
+            (self._local_dir / "cache" / "device_maps") if self._local_dir else None
+        )
+
+    # Firestore WriteBatch limit
+    _BATCH_LIMIT = 500
 
     @property
     def enabled(self) -> bool:
@@ -71,6 +86,7 @@ class MappingStore:
         try:
             doc = self._client.collection("device_mappings").document(signature)
             meta = {
+                "updated_at": time.time(),
                 "device_name": device_meta.get("name"),
                 "device_type": device_meta.get("device_type", "unknown"),  # NEW: detected type
                 "param_count": len(params),
@@ -80,7 +96,7 @@ class MappingStore:
                 # Optional: persist grouping metadata when provided
                 "groups": device_meta.get("groups", []),
             }
-            doc.set(meta, merge=True)
+            writes = [(doc, meta)]
             # params subcollection
             for p in params:
                 name = str(p.get("name"))
@@ -102,31 +118,105 @@ class MappingStore:
                     "group": p.get("group"),
                     "role": p.get("role"),  # master | dependent | None
                 }
-                doc.collection("params").document(doc_id).set(pdata, merge=True)
+                writes.append((doc.collection("params").document(doc_id), pdata))
+            self._map_cache.invalidate(signature)
+            self._commit_batched(writes)
             return True
         except Exception:
             return False
 
+    def _commit_batched(self, writes: List[Any], merge: bool = True) -> None:
+        """Commit (ref, data) sets - or (ref, None) deletes - in WriteBatch chunks of 500."""
+        for i in range(0, len(writes), self._BATCH_LIMIT):
+            batch = self._client.batch()
+            for ref, data in writes[i:i + self._BATCH_LIMIT]:
+                if data is None:
+                    batch.delete(ref)
+                else:
+                    batch.set(ref, data, merge=merge)
+            batch.commit()
+
+    def _params_version(self, signature: str) -> str:
+        """Count and newest update_time of a signature's params docs (keys-only read).
+
+        Param docs are written without touching the parent doc, so its etag
+        alone can't tell whether cached params are current.
+        """
+        snaps = self._client.collection("device_mappings").document(signature).collection("params").select([]).stream()
+        count, newest = 0, None
+        for pdoc in snaps:
+            count += 1
+            ut = getattr(pdoc, "update_time", None)
+            if ut is not None and (newest is None or ut > newest):
+                newest = ut
+        return f"{count}:{newest or ''}"
+
+    def _fetch_params(self, signature: str) -> List[Dict[str, Any]]:
+        params_snap = self._client.collection("device_mappings").document(signature).collection("params").stream()
+        return [pdoc.to_dict() or {} for pdoc in params_snap]
+
+    def _get_cached_maps(self, signatures: Iterable[str], need_params: bool) -> Dict[str, Dict[str, Any]]:
+        """Resolve cache entries for signatures, batching Firestore reads for misses.
+
+        Fresh memory entries cost nothing; everything else is revalidated with
+        one get_all() over the main docs (plus a keys-only read of the params
+        subcollection when params are needed), and params are streamed only
+        for signatures whose versions have no cached copy.
+        """
+        entries: Dict[str, Dict[str, Any]] = {}
+        stale: List[str] = []
+        for sig in dict.fromkeys(str(s) for s in signatures if s):
+            entry = self._map_cache.fresh(sig, need_params=need_params)
+            if entry is not None:
+                entries[sig] = entry
+            else:
+                stale.append(sig)
+        if not stale:
+            return entries
+        coll = self._client.collection("device_mappings")
+        for snap in self._client.get_all([coll.document(sig) for sig in stale]):
+            sig = snap.id
+            if not snap.exists:
+                self._map_cache.invalidate(sig)
+                continue
+            data = snap.to_dict() or {}
+            etag = etag_for(data, snap)
+            pver = self._params_version(sig) if need_params else None
+            entry = self._map_cache.lookup(sig, etag, need_params=need_params, params_version=pver)
+            if entry is None:
+                params = self._fetch_params(sig) if need_params else None
+                entry = self._map_cache.put(sig, etag, data, params, params_version=pver)
+            entries[sig] = entry
+        return entries
+
+    def get_device_maps(self, signatures: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Batched get_device_map for many signatures -> {signature: mapping}."""
+        if not self._enabled or not self._client:
+            return {}
+        try:
+            entries = self._get_cached_maps(signatures, need_params=True)
+        except Exception:
+            return {}
+        return {sig: {**e["doc"], "params": e["params"]} for sig, e in entries.items()}
+
+    def get_device_mappings(self, signatures: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Batched get_device_mapping (main docs only) -> {signature: doc}."""
+        if not self._enabled or not self._client:
+            return {}
+        try:
+            entries = self._get_cached_maps(signatures, need_params=False)
+        except Exception:
+            return {}
+        return {sig: e["doc"] for sig, e in entries.items()}
+
     def get_device_map(self, signature: str) -> Optional[Dict[str, Any]]:
         if not self._enabled or not self._client:
             return None
         try:
-            from server.config.app_config import get_debug_settings  # lazy import to avoid cycles
-            dbg_cfg = get_debug_settings().get("firestore", False)
-            dbg_env = str(os.getenv("FB_DEBUG_FIRESTORE", "")).lower() in ("1","true","yes","on")
-            dbg = bool(dbg_cfg or dbg_env)
-            doc = self._client.collection("device_mappings").document(signature).get()
-            if not doc.exists:
+            entry = self._get_cached_maps([signature], need_params=True).get(signature)
+            if entry is None:
                 return None
-            data = doc.to_dict() or {}
-            # Pull params
-            params_snap = self._client.collection("device_mappings").document(signature).collection("params").stream()
-            params: List[Dict[str, Any]] = []
-            for pdoc in params_snap:
-                pdata = pdoc.to_dict() or {}
-                params.append(pdata)
-            data["params"] = params
-            return data
+            return {**entry["doc"], "params": entry["params"]}
         except Exception as e:
             if str(os.getenv("FB_DEBUG_FIRESTORE", "")).lower() in ("1","true","yes","on"):
                 import traceback
@@ -192,9 +282,8 @@ class MappingStore:
         try:
             # Try signature first (most accurate)
             if device_signature:
-                doc = self._client.collection("device_mappings").document(device_signature).get()
-                if doc.exists:
-                    data = doc.to_dict()
+                data = self.get_device_mapping(device_signature)
+                if data:
                     param_names = data.get("param_names")
                     if param_names and isinstance(param_names, list):
                         return param_names
@@ -267,11 +356,11 @@ class MappingStore:
         if not self._enabled or not self._client:
             return False
         try:
+            self._map_cache.invalidate(signature)
             doc_ref = self._client.collection("device_mappings").document(signature)
             # Delete params subcollection docs
             try:
-                for pdoc in doc_ref.collection("params").stream():
-                    pdoc.reference.delete()
+                self._commit_batched([(pdoc.reference, None) for pdoc in doc_ref.collection("params").stream()])
             except Exception:
                 pass
             # Delete main doc
@@ -330,6 +419,7 @@ class MappingStore:
             }
             with open(p, "w", encoding="utf-8") as f:
                 json.dump(payload, f, indent=2)
+            self._json_cache.put(p, payload)
             return True
         except Exception:
             return False
@@ -344,12 +434,10 @@ class MappingStore:
             Device mapping dict or None
         """
         try:
-            import json
             p = self._local_path(signature, subdir="structures")
-            if p and p.exists():
-                with open(p, "r", encoding="utf-8") as f:
-                    return json.load(f)
-            return None
+            if not p:
+                return None
+            return self._json_cache.load(p)
         except Exception:
             return None
 
@@ -411,10 +499,8 @@ class MappingStore:
             return None
 
         try:
-            doc = self._client.collection("device_mappings").document(device_signature).get()
-            if not doc.exists:
-                return None
-            return doc.to_dict()
+            entry = self._get_cached_maps([device_signature], need_params=False).get(device_signature)
+            return entry["doc"] if entry else None
         except Exception as e:
             return None
 
@@ -432,8 +518,9 @@ class MappingStore:
             return False
 
         try:
+            self._map_cache.invalidate(device_signature)
             doc = self._client.collection("device_mappings").document(device_signature)
-            doc.set(mapping_data, merge=True)
+            doc.set({**mapping_data, "updated_at": time.time()}, merge=True)
             return True
         except Exception as e:
             return False
@@ -589,6 +676,31 @@ class MappingStore:
 
     # ---------- Local Preset Storage ----------
 
+    def _local_preset_index(self) -> Optional[LocalPresetIndex]:
+        """SQLite index over presets/; None if it cannot be opened (falls back to scans)."""
+        if self._preset_index is not None or self._preset_index_failed or not self._local_dir:
+            return self._preset_index
+        try:
+            import pathlib
+            self._preset_index = LocalPresetIndex(pathlib.Path(self._local_dir) / "presets")
+        except Exception:
+            self._preset_index_failed = True
+        return self._preset_index
+
+    def import_local_presets(self, src: Optional[str] = None) -> int:
+        """Bulk-index a presets JSON tree (defaults to the local presets dir).
+
+        Returns the number of presets indexed.
+        """
+        import pathlib
+        index = self._local_preset_index()
+        if index is None:
+            return 0
+        if src is None:
+            index.sync()
+            return len(index.list())
+        return index.import_json_tree(pathlib.Path(src))
+
     def _preset_local_path(self, preset_id: str) -> Optional[Any]:
         """Get local path for preset file.
 
@@ -627,6 +739,10 @@ class MappingStore:
 
             with open(path, "w", encoding="utf-8") as f:
                 json.dump(preset_data, f, indent=2)
+            self._json_cache.put(path, preset_data)
+            index = self._local_preset_index()
+            if index is not None:
+                index.upsert(preset_id_for_path(path), path, preset_data)
             return True
         except Exception:
             return False
@@ -634,13 +750,14 @@ class MappingStore:
     def _get_preset_local(self, preset_id: str) -> Optional[Dict[str, Any]]:
         """Get preset from local filesystem."""
         try:
-            import json
             path = self._preset_local_path(preset_id)
-            if not path or not path.exists():
+            if path and not path.exists():
+                # Presets imported from another tree live where they were indexed
+                index = self._local_preset_index()
+                path = index.path_for(preset_id) if index is not None else None
+            if not path:
                 return None
-
-            with open(path, "r", encoding="utf-8") as f:
-                return json.load(f)
+            return self._json_cache.load(path)
         except Exception:
             return None
 
@@ -650,13 +767,20 @@ class MappingStore:
         structure_signature: Optional[str] = None,
         preset_type: Optional[str] = None,
     ) -> List[Dict[str, Any]]:
-        """List presets from local filesystem."""
+        """List presets from the local index (full scan only if SQLite is unavailable)."""
         import pathlib
         import json
 
         if not self._local_dir:
             return []
 
+        index = self._local_preset_index()
+        if index is not None:
+            try:
+                return index.list(device_type, structure_signature, preset_type)
+            except Exception:
+                pass
+
         presets = []
         preset_dir = pathlib.Path(self._local_dir) / "presets"
 
@@ -677,13 +801,8 @@ class MappingStore:
                 if preset_type and data.get("preset_type") != preset_type:
                     continue
 
-                # Extract ID from path
-                device_t = preset_file.parent.parent.name
-                preset_name = preset_file.stem
-                preset_id = f"{device_t}_{preset_name}"
-
                 presets.append({
-                    "id": preset_id,
+                    "id": preset_id_for_path(preset_file),
                     "name": data.get("name"),
                     "device_name": data.get("device_name"),
                     "device_type": data.get("category"),
@@ -700,8 +819,12 @@ class MappingStore:
         """Delete preset from local filesystem."""
         try:
             path = self._preset_local_path(preset_id)
+            index = self._local_preset_index()
+            if index is not None:
+                index.remove(preset_id)
             if path and path.exists():
                 path.unlink()
+                self._json_cache.forget(path)
                 return True
             return False
         except Exception:
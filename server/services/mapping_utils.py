@@ -51,3 +51,19 @@ def make_device_signature(name: str, params: List[Dict[str, Any]]) -> str:
     base = f"{len(params)}|{param_names}"
     return hashlib.sha1(base.encode("utf-8")).hexdigest()
 
+
+def reported_signature(devices: List[Dict[str, Any]], device_index: int) -> Optional[str]:
+    """Signature the Remote Script attached to a get_*_devices entry, if any.
+
+    Same hash as make_device_signature, but cached per device in Live, so
+    callers that only need the mapping can skip fetching the param list.
+    """
+    for d in devices or []:
+        try:
+            if int(d.get("index", -1)) == int(device_index):
+                sig = d.get("signature")
+                return str(sig) if sig else None
+        except Exception:
+            continue
+    return None
+
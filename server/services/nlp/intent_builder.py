@@ -8,7 +8,7 @@ from __future__ import annotations
 from typing import Dict, Optional, Any
 import re
 from server.services.nlp.action_parser import ActionMatch
-from server.services.nlp.track_parser import TrackMatch
+from server.services.nlp.track_parser import TrackMatch, strip_track_range
 from server.services.nlp.device_param_parser import DeviceParamMatch
 
 
@@ -299,10 +299,15 @@ def _build_mixer_intent(
     # Determine intent type based on operation
     intent_type = "relative_change" if action.operation == "relative" else "set_parameter"
 
+    # Plural "tracks"/"audio tracks" become a collection target ("all tracks", "audio tracks")
+    track_ref = track.reference
+    if track.reference == "tracks":
+        track_ref = f"{track.filter or 'all'} tracks"
+
     return {
         "intent": intent_type,
         "targets": [{
-            "track": track.reference,
+            "track": track_ref,
             "plugin": None,  # NULL = mixer parameter
             "parameter": device_param.param
         }],
@@ -540,13 +545,17 @@ def parse_command_layered(text: str, parse_index: Dict) -> Optional[Dict[str, An
     if device_browser_intent:
         return device_browser_intent
 
-    # Layer 1: Parse action/value/unit
-    # Pass original text to preserve case in user-provided names
-    action = parse_action(text_lower, original_text=text)
-
     # Layer 2: Parse track/return/master
     track = parse_track(text_lower)
 
+    # Layer 1: Parse action/value/unit
+    # Range numbers ("tracks 1 to 4") must not be read as the value
+    action_text = text_lower
+    if track and track.indices:
+        action_text = strip_track_range(text_lower)
+    # Pass original text to preserve case in user-provided names
+    action = parse_action(action_text, original_text=text)
+
     # Layer 3: Parse device/parameter
     device_param = parse_device_param(text_lower, parse_index)
 
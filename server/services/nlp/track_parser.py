@@ -8,7 +8,7 @@ Extracted patterns from existing mixer_parser.py.
 
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import Optional
+from typing import List, Optional
 import re
 
 
@@ -21,6 +21,7 @@ class TrackMatch:
     confidence: float        # 0.0-1.0
     method: str             # "regex", "llm_fallback"
     filter: Optional[str] = None  # Optional filter: "audio", "midi" for collection queries
+    indices: Optional[List[int]] = None  # Track numbers (1-based) for ranges like "tracks 1-16"
 
 
 # ============================================================================
@@ -113,6 +114,93 @@ def parse_master_reference(text: str) -> Optional[TrackMatch]:
     return None
 
 
+# ============================================================================
+# RANGE/GROUP PATTERNS (for multi-target set commands)
+# ============================================================================
+
+# One list item: "3" or "1-4" / "1 to 4". An upper bound that carries a unit
+# ("to 3 db") is the value being set, not part of the range.
+_RANGE_ITEM = r"\d+(?:\s*(?:-|–|\bto\b|\bthrough\b|\bthru\b)\s*\d+(?!\d|\s*(?:db\b|%|percent\b)))?"
+TRACK_RANGE_PATTERN = rf"\btracks\s+({_RANGE_ITEM}(?:\s*(?:,|\band\b|&)\s*{_RANGE_ITEM})*)\b"
+
+# Trailing "to <value>" of a set command: "set pan on tracks 1-4 to 20"
+_VALUE_TAIL = re.compile(r"\s+to\s+[-+]?\d+(?:\.\d+)?\s*(db|%|percent)?\s*$", re.IGNORECASE)
+_VALUE_VERB = re.compile(r"^\s*(?:set|change|adjust|make|put|bring|turn)\b", re.IGNORECASE)
+
+
+def _without_value_tail(text: str) -> str:
+    tail = _VALUE_TAIL.search(text)
+    if tail and (tail.group(1) or _VALUE_VERB.match(text)):
+        return text[:tail.start()]
+    return text
+
+
+def strip_track_range(text: str) -> str:
+    """Replace the range in 'tracks 1 to 4' with plain 'tracks', keeping any trailing value."""
+    head = _without_value_tail(text)
+    return re.sub(TRACK_RANGE_PATTERN, "tracks", head, count=1, flags=re.IGNORECASE) + text[len(head):]
+
+
+def parse_track_range(text: str) -> Optional[TrackMatch]:
+    """Parse explicit track ranges/lists: 'tracks 1-16', 'tracks 1 to 4', 'tracks 1, 3 and 5'.
+
+    Examples:
+        "set tracks 1-4 volume to -6 dB" → TrackMatch(domain="track", index=None, reference="Tracks 1,2,3,4", indices=[1, 2, 3, 4])
+        "mute tracks 2 and 5" → TrackMatch(domain="track", index=None, reference="Tracks 2,5", indices=[2, 5])
+        "set volume on tracks 1-4 to 3 db" → TrackMatch(..., indices=[1, 2, 3, 4])
+    """
+    match = re.search(TRACK_RANGE_PATTERN, _without_value_tail(text), re.IGNORECASE)
+    if not match:
+        return None
+
+    indices: List[int] = []
+    for part in re.split(r"\s*(?:,|\band\b|&)\s*", match.group(1), flags=re.IGNORECASE):
+        bounds = re.split(r"\s*(?:-|–|\bto\b|\bthrough\b|\bthru\b)\s*", part.strip(), flags=re.IGNORECASE)
+        nums = [int(b) for b in bounds if b.isdigit()]
+        if len(nums) == 2 and nums[0] <= nums[1]:
+            indices.extend(range(nums[0], nums[1] + 1))
+        elif len(nums) == 1:
+            indices.append(nums[0])
+        else:
+            return None
+    indices = list(dict.fromkeys(i for i in indices if i >= 1))
+    if not indices:
+        return None
+
+    return TrackMatch(
+        domain="track",
+        index=None,
+        reference="Tracks " + ",".join(str(i) for i in indices),
+        confidence=0.95,
+        method="regex",
+        indices=indices,
+    )
+
+
+def parse_track_group(text: str) -> Optional[TrackMatch]:
+    """Parse named track groups: 'all drum tracks', 'all vocal tracks'.
+
+    The name is matched against track names when the intent executes.
+
+    Examples:
+        "mute all drum tracks" → TrackMatch(domain="track", index=None, reference="drum tracks", filter="drum")
+    """
+    pattern = r"\ball\s+(?:the\s+)?(?!the\b|audio\b|midi\b|return\b)([a-z][\w-]*)\s+tracks\b"
+    match = re.search(pattern, text, re.IGNORECASE)
+    if not match:
+        return None
+
+    name = match.group(1).lower()
+    return TrackMatch(
+        domain="track",
+        index=None,
+        reference=f"{name} tracks",
+        confidence=0.9,
+        method="regex",
+        filter=name,
+    )
+
+
 # ============================================================================
 # COLLECTION/PLURAL PATTERNS (for list commands)
 # ============================================================================
@@ -188,8 +276,9 @@ def parse_track(text: str) -> Optional[TrackMatch]:
     1. Specific track references (track 1, track 2, ...) - most specific
     2. Specific return references (return A, return B, ...)
     3. Master reference (master)
-    4. Track collections (tracks, audio tracks, midi tracks) - for list commands
-    5. Return collections (returns, return tracks) - for list commands
+    4. Track ranges/groups (tracks 1-16, all drum tracks) - for multi-target sets
+    5. Track collections (tracks, audio tracks, midi tracks) - for list commands
+    6. Return collections (returns, return tracks) - for list commands
 
     Args:
         text: Input text (lowercase recommended but not required - patterns are case-insensitive)
@@ -212,6 +301,15 @@ def parse_track(text: str) -> Optional[TrackMatch]:
     if result:
         return result
 
+    # Try track ranges and named groups (tracks 1-16, all drum tracks)
+    result = parse_track_range(text) or parse_track_group(text)
+    if result:
+        return result
+
+    # Numbered tracks that don't form a valid range must never widen to "all tracks"
+    if re.search(r"\btracks\s+\d", text, re.IGNORECASE):
+        return None
+
     # Try track collections (tracks, audio tracks, midi tracks)
     result = parse_track_collection(text)
     if result:
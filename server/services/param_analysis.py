@@ -1,10 +1,10 @@
 from __future__ import annotations
 
-import math
 import re
 from typing import Dict, List, Optional, Tuple
 
 from server.config.param_learn_config import get_param_learn_config
+from server.services.curve_fitting import fit_models  # noqa: F401  (re-exported)
 
 
 def parse_unit_from_display(disp: str) -> Optional[str]:
@@ -130,75 +130,3 @@ def build_groups_from_params(params: List[Dict], device_name: Optional[str]) ->
                 {"name": name, "index": int(param.get("index", 0)), "master": master_name}
             )
     return list(groups.values())
-
-
-def fit_models(samples: List[Dict]) -> Optional[Dict]:
-    points = [
-        (float(s["value"]), float(s["display_num"]))
-        for s in samples
-        if s.get("display_num") is not None and math.isfinite(float(s.get("value", 0.0))) and math.isfinite(float(s["display_num"]))
-    ]
-    if len(points) < 3:
-        return None
-    points.sort(key=lambda p: p[0])
-    xs = [p[0] for p in points]
-    ys = [p[1] for p in points]
-
-    def linear_fit(x_vals, y_vals):
-        n = len(x_vals)
-        sx = sum(x_vals)
-        sy = sum(y_vals)
-        sxx = sum(v * v for v in x_vals)
-        sxy = sum(a * b for a, b in zip(x_vals, y_vals))
-        denominator = n * sxx - sx * sx
-        if denominator == 0:
-            return None
-        slope = (n * sxy - sx * sy) / denominator
-        intercept = (sy - slope * sx) / n
-        predictions = [slope * v + intercept for v in x_vals]
-        ss_res = sum((yv - pv) ** 2 for yv, pv in zip(y_vals, predictions))
-        mean_y = sy / n
-        ss_tot = sum((yv - mean_y) ** 2 for yv in y_vals) or 1.0
-        r_squared = 1.0 - ss_res / ss_tot
-        return {"type": "linear", "a": slope, "b": intercept, "r2": r_squared}
-
-    def log_fit(x_vals, y_vals):
-        try:
-            transformed = [math.log(max(1e-9, v)) for v in x_vals]
-        except ValueError:
-            return None
-        fit = linear_fit(transformed, y_vals)
-        if not fit:
-            return None
-        return {**fit, "type": "log", "x_transform": "ln(x)"}
-
-    def exp_fit(x_vals, y_vals):
-        if any(val <= 0 for val in y_vals):
-            return None
-        transformed = [math.log(val) for val in y_vals]
-        fit = linear_fit(x_vals, transformed)
-        if not fit:
-            return None
-        a = fit["a"]
-        b = fit["b"]
-        r2 = fit["r2"]
-        return {"type": "exp", "a": a, "b": b, "r2": r2}
-
-    candidates = []
-    linear = linear_fit(xs, ys)
-    if linear:
-        candidates.append(linear)
-    log_candidate = log_fit(xs, ys)
-    if log_candidate:
-        candidates.append(log_candidate)
-    exp_candidate = exp_fit(xs, ys)
-    if exp_candidate:
-        candidates.append(exp_candidate)
-    best = max(candidates, key=lambda d: d["r2"]) if candidates else None
-    if best and best.get("r2", 0.0) >= 0.9:
-        return best
-    return {
-        "type": "piecewise",
-        "r2": best.get("r2") if best else 0.0,
-        "points": [{"x": x, "y": y} for x, y in points],
-    }
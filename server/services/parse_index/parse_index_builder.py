@@ -215,18 +215,10 @@ class ParseIndexBuilder:
     def _batch_query_device_mappings(self, signatures: List[str]) -> Dict[str, Dict]:
         """Query device_mappings by document IDs (signatures).
 
-        Uses Firestore's .get() for direct document access by ID.
+        One batched get_all() through the store's mapping cache; signatures
+        already warm in memory skip Firestore.
         """
-        sig_to_mapping = {}
-
-        for sig in signatures:
-            doc = self.store._client.collection("device_mappings").document(sig).get()
-
-            if doc.exists:
-                mapping = doc.to_dict()
-                sig_to_mapping[sig] = mapping
-
-        return sig_to_mapping
+        return self.store.get_device_mappings(signatures)
 
     def _build_param_aliases(self, device_name: str, param_names: List[str]) -> Dict[str, List[str]]:
         """Build parameter aliases from natural variations only (NO global config aliases).
@@ -0,0 +1,123 @@
+"""
+Parse Index Service
+
+One process-wide parse index for the layered parser (/intent/parse and
+chat). It is built in-process from LiveIndex devices with the shared
+MappingStore, and rebuilt when LiveIndex reports a device change or the
+TTL (PARSE_INDEX_TTL_SEC, default 60 s) expires so Firestore edits are
+picked up.
+
+Rebuilds are single-flight: the first caller after expiry builds while
+concurrent callers get the previous index (or wait for the first build
+when there is none yet), so a burst of parses triggers one build.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+MIXER_PARAMS: List[str] = ["volume", "pan", "mute", "solo", *[f"send {chr(ord('a') + i)}" for i in range(12)]]
+
+
+def minimal_parse_index() -> Dict[str, Any]:
+    """Device-less index so mixer/track/open/list commands still parse."""
+    return {
+        "version": "pi-minimal",
+        "devices_in_set": [],
+        "params_by_device": {},
+        "device_type_index": {},
+        "param_to_device_types": {},
+        "mixer_params": list(MIXER_PARAMS),
+        "typo_map": {},
+    }
+
+
+class ParseIndexService:
+    def __init__(self, store: Any, live_index: Any, ttl_sec: Optional[float] = None) -> None:
+        self._store = store
+        self._live_index = live_index
+        self.ttl_sec = float(ttl_sec if ttl_sec is not None else os.getenv("PARSE_INDEX_TTL_SEC", "60"))
+        self._index: Optional[Dict[str, Any]] = None
+        self._built_at = 0.0
+        self._built_for: Optional[int] = None
+        self._build_lock = threading.Lock()
+        self._stats: Dict[str, Any] = {
+            "builds": 0,
+            "build_errors": 0,
+            "stale_served": 0,
+            "last_build_ms": None,
+            "last_error": None,
+        }
+
+    def _fresh(self) -> bool:
+        return (
+            self._index is not None
+            and time.time() - self._built_at < self.ttl_sec
+            and self._built_for == getattr(self._live_index, "version", None)
+        )
+
+    def _live_devices(self) -> List[Dict[str, Any]]:
+        return [
+            {"name": d.get("name"), "device_type": str(d.get("device_type", "unknown")).lower(), "ordinals": 1}
+            for d in self._live_index.iter_devices()
+            if d.get("name")
+        ]
+
+    def _build(self) -> None:
+        version = getattr(self._live_index, "version", None)
+        t0 = time.perf_counter()
+        try:
+            from server.services.parse_index.parse_index_builder import ParseIndexBuilder
+
+            index = ParseIndexBuilder(store=self._store).build_from_live_set(self._live_devices())
+        except Exception as e:
+            print(f"[PARSE_INDEX] Build failed: {e}, using minimal index")
+            self._stats["build_errors"] += 1
+            self._stats["last_error"] = str(e)
+            index = self._index or minimal_parse_index()
+        self._stats["builds"] += 1
+        self._stats["last_build_ms"] = round((time.perf_counter() - t0) * 1000.0, 1)
+        self._index = index
+        self._built_at = time.time()
+        self._built_for = version
+
+    def get(self) -> Dict[str, Any]:
+        """Current parse index, rebuilding (once) when stale."""
+        if self._fresh():
+            return self._index  # type: ignore[return-value]
+        if self._index is not None:
+            # Someone is already rebuilding: serve the previous index
+            if not self._build_lock.acquire(blocking=False):
+                self._stats["stale_served"] += 1
+                return self._index
+        else:
+            self._build_lock.acquire()
+        try:
+            if not self._fresh():
+                self._build()
+            return self._index  # type: ignore[return-value]
+        finally:
+            self._build_lock.release()
+
+    def peek(self) -> Optional[Dict[str, Any]]:
+        """Cached index without building or refreshing it."""
+        return self._index
+
+    def invalidate(self) -> None:
+        self._built_at = 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        idx = self._index or {}
+        return {
+            **self._stats,
+            "version": idx.get("version"),
+            "devices": len(idx.get("devices_in_set") or []),
+            "built_at": self._built_at or None,
+            "age_sec": round(time.time() - self._built_at, 1) if self._built_at else None,
+            "ttl_sec": self.ttl_sec,
+            "live_index_version": self._built_for,
+            "fresh": self._fresh(),
+        }
@@ -0,0 +1,300 @@
+"""Preset morphing: interpolate a device between two parameter_values vectors.
+
+A morph runs as an asyncio task that emits frames at ``fps`` through the
+set_device_params_bulk op, so each frame is one UDP round trip and one Live
+tick. Interpolation is vectorized over the parameter axis with NumPy.
+Continuous params follow the curve (``curve_value`` shapes from
+server.models.macro); binary/quantized params (mapping ``control_type``)
+jump from the source to the target at the curve midpoint.
+
+Durations in beats track the current tempo from ValueRegistry each frame.
+Frames whose slot passed while the previous one was in flight are skipped
+and counted as dropped; the next frame is computed for the actual elapsed
+time, so a slow link shortens resolution, not the morph.
+
+A morph that is cancelled, superseded or fails still records the values it
+had already sent as one undo step.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from server.core.events import broker
+from server.models.macro import curve_value
+from server.services import history as History
+from server.services import value_registry as VR
+from server.services.ableton_client import set_device_params_bulk
+
+MAX_FPS = 60.0
+DEFAULT_FPS = float(os.getenv("PRESET_MORPH_FPS", "20"))
+DEFAULT_TEMPO = 120.0
+# Changes smaller than this are not resent
+_EPS = 1e-6
+
+_STEPPED_TYPES = {"binary", "quantized"}
+
+
+def _current_tempo() -> float:
+    try:
+        from server.core.deps import get_value_registry
+        entry = get_value_registry().get_transport_field("tempo")
+        if entry and isinstance(entry.get("value"), (int, float)) and entry["value"] > 0:
+            return float(entry["value"])
+    except Exception:
+        pass
+    return DEFAULT_TEMPO
+
+
+class MorphPlan:
+    """Source/target vectors over the params shared by both presets."""
+
+    def __init__(
+        self,
+        live_params: List[Dict[str, Any]],
+        source: Dict[str, Any],
+        target: Dict[str, Any],
+        mapping_params: Optional[List[Dict[str, Any]]] = None,
+    ) -> None:
+        ctypes = {str(p.get("name")): p.get("control_type") for p in (mapping_params or []) if isinstance(p, dict)}
+        idx: List[int] = []
+        names: List[str] = []
+        cur: List[float] = []
+        a: List[float] = []
+        b: List[float] = []
+        lo: List[float] = []
+        hi: List[float] = []
+        stepped: List[bool] = []
+        for p in live_params:
+            name = p.get("name")
+            if name not in target or p.get("index") is None:
+                continue
+            start = source.get(name, p.get("value"))
+            try:
+                start_v = float(start)
+                end_v = float(target[name])
+            except (TypeError, ValueError):
+                continue
+            try:
+                cur_v = float(p.get("value"))
+            except (TypeError, ValueError):
+                cur_v = start_v
+            idx.append(int(p["index"]))
+            names.append(str(name))
+            cur.append(cur_v)
+            a.append(start_v)
+            b.append(end_v)
+            lo.append(float(p.get("min", 0.0)))
+            hi.append(float(p.get("max", 1.0)))
+            stepped.append(ctypes.get(str(name)) in _STEPPED_TYPES)
+        self.indices = np.asarray(idx, dtype=np.int64)
+        self.names = names
+        # What the device holds now; the first frame moves from here to ``start``
+        self.current = np.asarray(cur, dtype="float64")
+        self.start = np.clip(np.asarray(a, dtype="float64"), lo, hi) if idx else np.zeros(0)
+        self.end = np.clip(np.asarray(b, dtype="float64"), lo, hi) if idx else np.zeros(0)
+        self.stepped = np.asarray(stepped, dtype=bool)
+        # Params that differ between source and target
+        self.moving = np.abs(self.end - self.start) > _EPS
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def values_at(self, shaped: float) -> np.ndarray:
+        """Values for a curve-shaped position in [0, 1]."""
+        cont = self.start + (self.end - self.start) * shaped
+        return np.where(self.stepped, self.end if shaped >= 0.5 else self.start, cont)
+
+
+class MorphJob:
+    def __init__(
+        self,
+        plan: MorphPlan,
+        domain: str,
+        index: int,
+        device_index: int,
+        *,
+        duration_beats: Optional[float] = None,
+        duration_sec: Optional[float] = None,
+        curve: str = "linear",
+        fps: Optional[float] = None,
+        label: str = "",
+    ) -> None:
+        self.id = uuid.uuid4().hex[:12]
+        self.plan = plan
+        self.domain = domain
+        self.index = int(index)
+        self.device_index = int(device_index)
+        self.duration_beats = float(duration_beats) if duration_beats else None
+        self.duration_sec = float(duration_sec) if duration_sec else None
+        if self.duration_beats is None and self.duration_sec is None:
+            self.duration_beats = 4.0
+        self.curve = curve
+        self.fps = max(1.0, min(MAX_FPS, float(fps or DEFAULT_FPS)))
+        self.label = label
+        self.state = "pending"
+        self.progress = 0.0
+        self.frames_sent = 0
+        self.frames_dropped = 0
+        self.errors = 0
+        self.error: Optional[str] = None
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._cancel = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def key(self) -> tuple:
+        return (self.domain, self.index, self.device_index)
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "state": self.state,
+            "label": self.label,
+            "domain": self.domain,
+            "index": self.index,
+            "device_index": self.device_index,
+            "params": len(self.plan),
+            "moving": int(self.plan.moving.sum()),
+            "duration_beats": self.duration_beats,
+            "duration_sec": self.duration_sec,
+            "curve": self.curve,
+            "fps": self.fps,
+            "progress": round(self.progress, 4),
+            "frames_sent": self.frames_sent,
+            "frames_dropped": self.frames_dropped,
+            "errors": self.errors,
+            "error": self.error,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+    def cancel(self) -> None:
+        self._cancel.set()
+
+    async def _send(self, values: np.ndarray, mask: np.ndarray) -> None:
+        pairs = list(zip(self.plan.indices[mask].tolist(), values[mask].tolist()))
+        if not pairs:
+            return
+        result = await asyncio.to_thread(set_device_params_bulk, self.domain, self.index, self.device_index, pairs)
+        self.frames_sent += 1
+        if not result.get("ok"):
+            self.errors += 1
+
+    async def run(self) -> None:
+        self.state = "running"
+        self.started_at = time.time()
+        frame_sec = 1.0 / self.fps
+        last_sent = self.plan.current.copy()
+        beats_done = 0.0
+        prev = start = time.monotonic()
+        next_frame = prev
+        try:
+            while True:
+                now = time.monotonic()
+                if self.duration_beats is not None:
+                    beats_done += (now - prev) * _current_tempo() / 60.0
+                    t = beats_done / self.duration_beats
+                else:
+                    t = (now - start) / self.duration_sec
+                prev = now
+                if t >= 1.0:
+                    break
+                self.progress = t
+                values = self.plan.values_at(curve_value(t, self.curve))
+                changed = np.abs(values - last_sent) > _EPS
+                await self._send(values, changed)
+                last_sent = np.where(changed, values, last_sent)
+
+                next_frame += frame_sec
+                behind = time.monotonic() - next_frame
+                if behind > 0:
+                    skipped = int(behind // frame_sec) + 1
+                    self.frames_dropped += skipped
+                    next_frame += skipped * frame_sec
+                try:
+                    await asyncio.wait_for(self._cancel.wait(), timeout=max(0.0, next_frame - time.monotonic()))
+                    self.state = "cancelled"
+                    return
+                except asyncio.TimeoutError:
+                    pass
+            # Land exactly on the target
+            self.progress = 1.0
+            await self._send(self.plan.end, np.abs(self.plan.end - last_sent) > _EPS)
+            last_sent = self.plan.end.copy()
+            self.state = "done"
+        except asyncio.CancelledError:
+            self.state = "cancelled"
+            raise
+        except Exception as e:
+            self.state = "error"
+            self.error = str(e)
+        finally:
+            self.finished_at = time.time()
+            if _ACTIVE.get(self.key) == self.id:
+                _ACTIVE.pop(self.key, None)
+            try:
+                self._record(last_sent)
+            except Exception:
+                pass
+            try:
+                await broker.publish({"event": "preset_morph_finished", **self.status()})
+            except Exception:
+                pass
+
+    def _record(self, applied: np.ndarray) -> None:
+        """Write the values sent so far through to ValueRegistry and make them undoable."""
+        plan = self.plan
+        changed = [
+            (pi, name, p, n)
+            for pi, name, p, n in zip(plan.indices.tolist(), plan.names, plan.current.tolist(), applied.tolist())
+            if abs(n - p) > _EPS
+        ]
+        for pi, name, _, n in changed:
+            VR.update_device_param(self.domain, self.index, self.device_index, name, normalized_value=n, param_index=pi)
+        History.record(
+            [History.param_change(self.domain, self.index, self.device_index, pi, p, n) for pi, _, p, n in changed],
+            label=self.label or "morph",
+        )
+
+
+_JOBS: Dict[str, MorphJob] = {}
+_ACTIVE: Dict[tuple, str] = {}
+_MAX_FINISHED = 32
+
+
+def start_morph(job: MorphJob) -> MorphJob:
+    """Schedule a morph on the running loop; cancels any morph already on that device."""
+    prev_id = _ACTIVE.get(job.key)
+    if prev_id and prev_id in _JOBS:
+        _JOBS[prev_id].cancel()
+    _JOBS[job.id] = job
+    _ACTIVE[job.key] = job.id
+    finished = [j for j in _JOBS.values() if j.finished_at is not None]
+    for old in sorted(finished, key=lambda j: j.finished_at or 0.0)[:-_MAX_FINISHED]:
+        _JOBS.pop(old.id, None)
+    job._task = asyncio.get_running_loop().create_task(job.run())
+    return job
+
+
+def get_morph(morph_id: str) -> Optional[MorphJob]:
+    return _JOBS.get(morph_id)
+
+
+def cancel_morph(morph_id: str) -> bool:
+    job = _JOBS.get(morph_id)
+    if job is None or job.finished_at is not None:
+        return False
+    job.cancel()
+    return True
+
+
+def list_morphs() -> List[Dict[str, Any]]:
+    return [j.status() for j in _JOBS.values()]
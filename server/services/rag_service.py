@@ -10,20 +10,87 @@ Uses:
 
 import os
 import json
+import hashlib
 import pickle
 from pathlib import Path
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Optional, Tuple
 from bs4 import BeautifulSoup
 import numpy as np
 from rank_bm25 import BM25Okapi
 import faiss
 from openai import OpenAI
 import logging
+import re
+import threading
+from collections import OrderedDict
 
 logger = logging.getLogger(__name__)
 
+# Bump when the on-disk layout or chunking changes
+INDEX_VERSION = 3
+EMBED_MODEL = os.getenv("RAG_EMBED_MODEL", "text-embedding-3-small")
+EMBED_DIM = int(os.getenv("RAG_EMBED_DIM", "512"))
+# HNSW graph: neighbours per node, build-time and minimum query-time beam width
+HNSW_M = 32
+HNSW_EF_CONSTRUCTION = 80
+HNSW_EF_SEARCH = 64
+# Map the saved index's vectors instead of copying them into RAM (older faiss: plain mmap flag)
+_FAISS_MMAP = getattr(faiss, "IO_FLAG_MMAP_IFC", faiss.IO_FLAG_MMAP)
+
+_WS_RE = re.compile(r"\s+")
+
+
+def _bm25_from_freqs(doc_freqs: List[Dict[str, int]], doc_len: List[int]) -> BM25Okapi:
+    """BM25Okapi over precomputed per-document term frequencies.
+
+    Same state its constructor derives from tokens, so rows of unchanged files
+    are reused and only corpus-wide stats (avgdl, idf) are recomputed.
+    """
+    bm25 = BM25Okapi.__new__(BM25Okapi)
+    bm25.k1, bm25.b, bm25.epsilon = 1.5, 0.75, 0.25
+    bm25.tokenizer = None
+    bm25.corpus_size = len(doc_freqs)
+    bm25.doc_freqs = doc_freqs
+    bm25.doc_len = doc_len
+    bm25.avgdl = sum(doc_len) / max(1, len(doc_len))
+    bm25.idf = {}
+    nd: Dict[str, int] = {}
+    for freqs in doc_freqs:
+        for word in freqs:
+            nd[word] = nd.get(word, 0) + 1
+    bm25._calc_idf(nd)
+    return bm25
+
+
+def _term_freqs(tokens: List[str]) -> Dict[str, int]:
+    freqs: Dict[str, int] = {}
+    for word in tokens:
+        freqs[word] = freqs.get(word, 0) + 1
+    return freqs
+
+
+def normalize_query(text: str) -> str:
+    """Cache key form of a query: lowercased, whitespace collapsed, trailing punctuation dropped"""
+    return _WS_RE.sub(" ", (text or "").lower()).strip().rstrip("?!. ")
+
 class RAGService:
-    """Hybrid RAG with OpenAI embeddings + BM25 keyword search"""
+    """Hybrid RAG with OpenAI embeddings + BM25 keyword search
+
+    Persisted under cache_dir:
+    - rag_manifest.json: per-file (mtime, size, sha1) and its chunk range
+    - rag_documents.json: chunk metadata/text in row order
+    - rag_embeddings.npy: float32 matrix, opened memory-mapped
+    - rag_faiss.index: HNSW graph over those rows (vectors memory-mapped on load)
+    - rag_bm25.pkl: BM25 index
+
+    Only knowledge files whose content hash changed are re-chunked and
+    re-embedded; unchanged rows (embeddings and BM25 term frequencies) are
+    carried over.
+    """
+
+    # ANN/BM25 candidates per requested result before fusion
+    CANDIDATES_PER_RESULT = 10
+    MIN_CANDIDATES = 50
 
     def __init__(self, knowledge_dir: str = None, cache_dir: str = None):
         """
@@ -53,77 +120,176 @@ class RAGService:
         self.bm25_index = None
         self.faiss_index = None
         self.embeddings = None
+        self.files: Dict[str, Dict[str, Any]] = {}
+        # token -> doc ids, for candidate-limited BM25 scoring
+        self._postings: Dict[str, np.ndarray] = {}
+        # Bumped on every (re)build so callers can key caches on it
+        self.index_version = 0
+        # normalized query -> embedding row; the model is fixed, so entries survive rebuilds
+        self._query_embeddings: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._query_embeddings_max = int(os.getenv('RAG_QUERY_EMBED_CACHE_SIZE', '512'))
+        self._query_lock = threading.Lock()
 
         # Load or build indexes
         self._load_or_build_indexes()
 
+    def _path(self, name: str) -> str:
+        return os.path.join(self.cache_dir, name)
+
     def _load_or_build_indexes(self):
-        """Load cached indexes or build from scratch"""
-        cache_file = os.path.join(self.cache_dir, 'rag_cache.pkl')
+        """Load persisted indexes, then bring them up to date with the knowledge files"""
+        if self._load_persisted():
+            logger.info(f"Loaded {len(self.documents)} documents from cache")
+        else:
+            logger.info("Building RAG indexes from knowledge base...")
+        self._build_indexes()
 
-        if os.path.exists(cache_file):
-            logger.info("Loading RAG indexes from cache...")
+    def _load_persisted(self) -> bool:
+        try:
+            with open(self._path('rag_manifest.json'), 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            if manifest.get('version') != INDEX_VERSION:
+                return False
+            if manifest.get('model') != EMBED_MODEL or manifest.get('dim') != EMBED_DIM:
+                return False  # embedding space changed: everything is re-embedded
+            with open(self._path('rag_documents.json'), 'r', encoding='utf-8') as f:
+                documents = json.load(f)
+            embeddings = np.load(self._path('rag_embeddings.npy'), mmap_mode='r')
+            if embeddings.shape[0] != len(documents):
+                return False
+            faiss_index = faiss.read_index(self._path('rag_faiss.index'), _FAISS_MMAP)
+            with open(self._path('rag_bm25.pkl'), 'rb') as f:
+                bm25_index = pickle.load(f)
+        except Exception as e:
+            logger.info(f"No usable RAG cache ({e})")
+            return False
+        for doc in documents:
+            doc['tokens'] = doc['text'].lower().split()
+        self.files = manifest.get('files') or {}
+        self.documents = documents
+        self.embeddings = embeddings
+        self.faiss_index = faiss_index
+        self.bm25_index = bm25_index
+        self._build_postings()
+        self.index_version += 1
+        return True
+
+    def _scan_files(self) -> Dict[str, Tuple[int, int]]:
+        out: Dict[str, Tuple[int, int]] = {}
+        root = Path(self.knowledge_dir)
+        for html_file in root.glob('**/*.html'):
             try:
-                with open(cache_file, 'rb') as f:
-                    cache_data = pickle.load(f)
-                    self.documents = cache_data['documents']
-                    self.bm25_index = cache_data['bm25_index']
-                    self.embeddings = cache_data['embeddings']
-
-                    # Rebuild FAISS index (can't pickle FAISS objects directly)
-                    dimension = self.embeddings.shape[1]
-                    self.faiss_index = faiss.IndexFlatL2(dimension)
-                    self.faiss_index.add(self.embeddings)
-
-                logger.info(f"Loaded {len(self.documents)} documents from cache")
-                return
-            except Exception as e:
-                logger.warning(f"Cache load failed: {e}, rebuilding indexes...")
-
-        logger.info("Building RAG indexes from knowledge base...")
-        self._build_indexes()
-        self._save_cache(cache_file)
+                st = html_file.stat()
+            except OSError:
+                continue
+            out[str(html_file.relative_to(root))] = (st.st_mtime_ns, st.st_size)
+        return out
 
-    def _build_indexes(self):
-        """Build BM25 and embedding indexes from HTML files"""
-        # Load all HTML documents
-        self.documents = self._load_documents()
+    def _build_indexes(self, force: bool = False):
+        """Incrementally (re)build indexes from HTML files.
 
-        if not self.documents:
+        Files are matched by (mtime, size) first and by content hash second;
+        only files whose content changed are re-chunked and re-embedded.
+        """
+        root = Path(self.knowledge_dir)
+        current = self._scan_files()
+        if not current:
             raise ValueError(f"No documents found in {self.knowledge_dir}")
 
-        logger.info(f"Loaded {len(self.documents)} document chunks")
-
-        # Build BM25 index for keyword search
-        tokenized_docs = [doc['tokens'] for doc in self.documents]
-        self.bm25_index = BM25Okapi(tokenized_docs)
-        logger.info("Built BM25 keyword index")
-
-        # Generate embeddings for semantic search
-        texts = [doc['text'] for doc in self.documents]
-        self.embeddings = self._generate_embeddings(texts)
-        logger.info(f"Generated {len(self.embeddings)} embeddings")
-
-        # Build FAISS index for fast similarity search
-        dimension = self.embeddings.shape[1]
-        self.faiss_index = faiss.IndexFlatL2(dimension)
-        self.faiss_index.add(self.embeddings)
-        logger.info("Built FAISS semantic index")
-
-    def _load_documents(self) -> List[Dict[str, Any]]:
-        """Load and chunk HTML documents from knowledge base"""
-        documents = []
-        knowledge_path = Path(self.knowledge_dir)
-
-        # Process all HTML files
-        for html_file in knowledge_path.glob('**/*.html'):
+        old_files = {} if force else self.files
+        reuse: Dict[str, Dict[str, Any]] = {}
+        changed: Dict[str, Tuple[Dict[str, Any], List[Dict[str, Any]]]] = {}
+        for rel, (mtime_ns, size) in sorted(current.items()):
+            prev = old_files.get(rel)
+            if prev and prev.get('mtime_ns') == mtime_ns and prev.get('size') == size:
+                reuse[rel] = prev
+                continue
+            try:
+                raw = (root / rel).read_bytes()
+            except OSError:
+                continue
+            digest = hashlib.sha1(raw).hexdigest()
+            if prev and prev.get('sha1') == digest:
+                reuse[rel] = {**prev, 'mtime_ns': mtime_ns, 'size': size}
+                continue
             try:
-                chunks = self._chunk_html_file(html_file)
-                documents.extend(chunks)
+                chunks = self._chunk_html_file(root / rel)
             except Exception as e:
-                logger.warning(f"Failed to process {html_file}: {e}")
+                logger.warning(f"Failed to process {rel}: {e}")
+                chunks = []
+            changed[rel] = ({'mtime_ns': mtime_ns, 'size': size, 'sha1': digest}, chunks)
+
+        removed = set(old_files) - set(current)
+        if self.faiss_index is not None and not changed and not removed and reuse == old_files:
+            return  # persisted index is current
+
+        # Embed only the changed files' chunks
+        new_texts = [c['text'] for _, chunks in changed.values() for c in chunks]
+        new_embeddings = self._generate_embeddings(new_texts) if new_texts else np.zeros((0, EMBED_DIM), dtype='float32')
+        logger.info(f"RAG index: {len(reuse)} files reused, {len(changed)} re-embedded ({len(new_texts)} chunks), {len(removed)} removed")
+
+        documents: List[Dict[str, Any]] = []
+        blocks: List[np.ndarray] = []
+        files: Dict[str, Dict[str, Any]] = {}
+        doc_freqs: List[Dict[str, int]] = []
+        doc_len: List[int] = []
+        old_bm25 = self.bm25_index
+        bm25_reusable = old_bm25 is not None and len(old_bm25.doc_freqs) == len(self.documents)
+        offset = 0
+        for rel in sorted(set(reuse) | set(changed)):
+            if rel in reuse:
+                info = reuse[rel]
+                start, count = int(info['start']), int(info['count'])
+                docs = self.documents[start:start + count]
+                rows = np.asarray(self.embeddings[start:start + count], dtype='float32')
+                if bm25_reusable:
+                    doc_freqs.extend(old_bm25.doc_freqs[start:start + count])
+                    doc_len.extend(old_bm25.doc_len[start:start + count])
+                else:
+                    doc_freqs.extend(_term_freqs(d['tokens']) for d in docs)
+                    doc_len.extend(len(d['tokens']) for d in docs)
+            else:
+                info, docs = changed[rel]
+                count = len(docs)
+                rows = new_embeddings[offset:offset + count]
+                offset += count
+                doc_freqs.extend(_term_freqs(d['tokens']) for d in docs)
+                doc_len.extend(len(d['tokens']) for d in docs)
+            files[rel] = {**info, 'start': len(documents), 'count': len(docs)}
+            documents.extend(docs)
+            blocks.append(rows)
+
+        if not documents:
+            raise ValueError(f"No documents found in {self.knowledge_dir}")
 
-        return documents
+        embeddings = np.ascontiguousarray(np.vstack(blocks), dtype='float32')
+        self.documents = documents
+        self.files = files
+
+        # BM25 for keyword search: only corpus-wide stats are recomputed
+        self.bm25_index = _bm25_from_freqs(doc_freqs, doc_len)
+        self._build_postings()
+
+        # HNSW graph for approximate nearest neighbours (sub-linear per query)
+        self.faiss_index = faiss.IndexHNSWFlat(embeddings.shape[1], HNSW_M)
+        self.faiss_index.hnsw.efConstruction = HNSW_EF_CONSTRUCTION
+        self.faiss_index.add(embeddings)
+        logger.info(f"Built indexes over {len(documents)} chunks")
+
+        self._save_cache(embeddings)
+        # Serve vectors from the memory-mapped copy just written
+        try:
+            self.embeddings = np.load(self._path('rag_embeddings.npy'), mmap_mode='r')
+        except Exception:
+            self.embeddings = embeddings
+        self.index_version += 1
+
+    def _build_postings(self):
+        postings: Dict[str, List[int]] = {}
+        for i, doc in enumerate(self.documents):
+            for tok in set(doc['tokens']):
+                postings.setdefault(tok, []).append(i)
+        self._postings = {tok: np.asarray(ids, dtype=np.int64) for tok, ids in postings.items()}
 
     def _chunk_html_file(self, file_path: Path) -> List[Dict[str, Any]]:
         """
@@ -208,9 +374,9 @@ class RAGService:
             logger.info(f"Generating embeddings {i+1}-{min(i+batch_size, len(texts))} of {len(texts)}")
 
             response = self.openai_client.embeddings.create(
-                model="text-embedding-3-small",
+                model=EMBED_MODEL,
                 input=batch,
-                dimensions=512  # Smaller dimension = faster + cheaper
+                dimensions=EMBED_DIM  # Smaller dimension = faster + cheaper
             )
 
             batch_embeddings = [item.embedding for item in response.data]
@@ -218,23 +384,56 @@ class RAGService:
 
         return np.array(embeddings, dtype='float32')
 
-    def _save_cache(self, cache_file: str):
-        """Save indexes to cache file"""
-        cache_data = {
-            'documents': self.documents,
-            'bm25_index': self.bm25_index,
-            'embeddings': self.embeddings
-        }
-
-        with open(cache_file, 'wb') as f:
-            pickle.dump(cache_data, f)
-
-        logger.info(f"Saved RAG cache to {cache_file}")
+    def embed_query(self, query: str) -> np.ndarray:
+        """Embedding for a search query, served from an LRU keyed by normalized text"""
+        key = normalize_query(query)
+        with self._query_lock:
+            hit = self._query_embeddings.get(key)
+            if hit is not None:
+                self._query_embeddings.move_to_end(key)
+                return hit
+        # The normalized form is only the cache key; the model sees the query as typed
+        embedding = self._generate_embeddings([query])[0].reshape(1, -1)
+        with self._query_lock:
+            self._query_embeddings[key] = embedding
+            while len(self._query_embeddings) > max(1, self._query_embeddings_max):
+                self._query_embeddings.popitem(last=False)
+        return embedding
+
+    def _save_cache(self, embeddings: np.ndarray):
+        """Persist manifest, documents, embeddings (.npy), FAISS and BM25 indexes"""
+        tmp = self._path('rag_embeddings.npy.tmp')
+        with open(tmp, 'wb') as f:
+            np.save(f, embeddings)
+        os.replace(tmp, self._path('rag_embeddings.npy'))
+
+        # Replace, never rewrite in place: a loaded index maps the old file
+        tmp = self._path('rag_faiss.index.tmp')
+        faiss.write_index(self.faiss_index, tmp)
+        os.replace(tmp, self._path('rag_faiss.index'))
+
+        with open(self._path('rag_bm25.pkl'), 'wb') as f:
+            pickle.dump(self.bm25_index, f)
+
+        docs = [{k: v for k, v in doc.items() if k != 'tokens'} for doc in self.documents]
+        with open(self._path('rag_documents.json'), 'w', encoding='utf-8') as f:
+            json.dump(docs, f)
+
+        # Manifest last: it is what marks the cache as complete
+        manifest = {'version': INDEX_VERSION, 'model': EMBED_MODEL, 'dim': int(embeddings.shape[1]), 'files': self.files}
+        with open(self._path('rag_manifest.json'), 'w', encoding='utf-8') as f:
+            json.dump(manifest, f)
+
+        logger.info(f"Saved RAG cache to {self.cache_dir}")
 
     def search(self, query: str, top_k: int = 5, bm25_weight: float = 0.3) -> List[Dict[str, Any]]:
         """
         Hybrid search combining BM25 + semantic search
 
+        Both retrievers contribute a bounded candidate set (top_k *
+        CANDIDATES_PER_RESULT); scores are computed and normalized over the
+        union of candidates only, not over the whole corpus.
+
         Args:
             query: Search query
             top_k: Number of results to return
@@ -243,22 +442,46 @@ class RAGService:
         Returns:
             List of top-k documents with scores
         """
+        n_docs = len(self.documents)
+        if n_docs == 0:
+            return []
+        n_cand = min(n_docs, max(self.MIN_CANDIDATES, top_k * self.CANDIDATES_PER_RESULT))
+
         # Tokenize query for BM25
         query_tokens = query.lower().split()
 
-        # BM25 keyword search
-        bm25_scores = self.bm25_index.get_scores(query_tokens)
+        # BM25: score only documents containing a query token
+        hits = [self._postings[t] for t in set(query_tokens) if t in self._postings]
+        bm25_cand = np.unique(np.concatenate(hits)) if hits else np.zeros(0, dtype=np.int64)
+        if len(bm25_cand):
+            cand_scores = np.asarray(self.bm25_index.get_batch_scores(query_tokens, bm25_cand.tolist()))
+            keep = np.argsort(cand_scores)[::-1][:n_cand]
+            bm25_cand = bm25_cand[keep]
+
+        # Semantic: ANN top candidates (beam at least as wide as the candidate set)
+        query_embedding = self.embed_query(query)
+        params = faiss.SearchParametersHNSW(efSearch=max(HNSW_EF_SEARCH, n_cand))
+        distances, indices = self.faiss_index.search(query_embedding, n_cand, params=params)
+        ann = {int(i): float(d) for i, d in zip(indices[0], distances[0]) if i >= 0}
+
+        candidates = np.unique(np.concatenate([bm25_cand, np.fromiter(ann.keys(), dtype=np.int64, count=len(ann))]))
+        if len(candidates) == 0:
+            return []
+
+        bm25_scores = np.asarray(self.bm25_index.get_batch_scores(query_tokens, candidates.tolist()), dtype='float64')
+        # Exact distances for BM25-only candidates come straight from the mmap rows
+        missing = [i for i, c in enumerate(candidates) if int(c) not in ann]
+        dist = np.array([ann.get(int(c), 0.0) for c in candidates], dtype='float64')
+        if missing:
+            rows = np.asarray(self.embeddings[candidates[missing]], dtype='float32')
+            dist[missing] = ((rows - query_embedding) ** 2).sum(axis=1)
 
         # Normalize BM25 scores to 0-1
         if bm25_scores.max() > 0:
             bm25_scores = bm25_scores / bm25_scores.max()
 
-        # Semantic search with embeddings
-        query_embedding = self._generate_embeddings([query])[0].reshape(1, -1)
-        distances, indices = self.faiss_index.search(query_embedding, len(self.documents))
-
         # Convert distances to similarity scores (lower distance = higher similarity)
-        semantic_scores = 1 / (1 + distances[0])  # Convert to 0-1 range
+        semantic_scores = 1 / (1 + dist)
 
         # Normalize semantic scores
         if semantic_scores.max() > 0:
@@ -268,24 +491,25 @@ class RAGService:
         combined_scores = (bm25_weight * bm25_scores) + ((1 - bm25_weight) * semantic_scores)
 
         # Get top-k results
-        top_indices = np.argsort(combined_scores)[-top_k:][::-1]
+        order = np.argsort(combined_scores)[-top_k:][::-1]
 
         results = []
-        for idx in top_indices:
-            doc = self.documents[idx].copy()
-            doc['score'] = float(combined_scores[idx])
-            doc['bm25_score'] = float(bm25_scores[idx])
-            doc['semantic_score'] = float(semantic_scores[idx])
+        for j in order:
+            doc = self.documents[int(candidates[j])].copy()
+            doc['score'] = float(combined_scores[j])
+            doc['bm25_score'] = float(bm25_scores[j])
+            doc['semantic_score'] = float(semantic_scores[j])
             results.append(doc)
 
         return results
 
-    def rebuild_index(self):
-        """Force rebuild of all indexes (useful after adding new documents)"""
+    def rebuild_index(self, force: bool = False):
+        """Bring indexes up to date after knowledge changes.
+
+        Only new/changed files are re-embedded; force=True re-embeds everything.
+        """
         logger.info("Rebuilding RAG indexes...")
-        self._build_indexes()
-        cache_file = os.path.join(self.cache_dir, 'rag_cache.pkl')
-        self._save_cache(cache_file)
+        self._build_indexes(force=force)
         logger.info("Index rebuild complete")
 
 
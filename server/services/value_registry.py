@@ -7,7 +7,32 @@ introducing import cycles.
 
 from __future__ import annotations
 
-from typing import Any, Dict, Optional
+import time
+from typing import Any, Dict, Optional, Tuple
+
+
+# Live event name -> mixer entity
+_MIXER_EVENTS = {
+  "mixer_changed": "track",
+  "return_mixer_changed": "return",
+  "master_mixer_changed": "master",
+}
+
+# Structural events that shift or replace slots; affected state is dropped
+_TRACK_STRUCTURE_EVENTS = {"track_created", "track_deleted", "track_duplicated"}
+_DEVICE_STRUCTURE_EVENTS = {
+  "track_device_loaded": "track",
+  "track_device_deleted": "track",
+  "track_device_reordered": "track",
+  "return_device_loaded": "return",
+  "return_device_deleted": "return",
+  "return_device_reordered": "return",
+}
+
+
+def send_field(send_index: int) -> str:
+  """Registry field name for a send slot ("send A", "send B", ...)."""
+  return f"send {chr(ord('A') + int(send_index))}"
 
 
 class ValueRegistry:
@@ -17,6 +42,11 @@ class ValueRegistry:
   - update_mixer/update_device_param write-through from ops/services
   - get_mixer/get_devices provide data to snapshot/overview APIs
   - update_transport/get_transport track tempo/metronome state
+  - apply_event keeps slots current from Live push events
+
+  Every slot carries a ``ts`` freshness timestamp; query paths use
+  get_mixer_field/get_transport_field/get_device_params with a max age and
+  fall back to UDP reads only when the slot is missing or stale.
   """
 
   def __init__(self) -> None:
@@ -25,12 +55,34 @@ class ValueRegistry:
       "return": {},
       "master": {},
     }
-    # devices: domain -> index -> device_index -> param_name -> {normalized, display, unit}
+    # devices: domain -> index -> device_index -> param_name -> {normalized, display, unit, ts}
     self._devices: Dict[str, Dict[int, Dict[int, Dict[str, Dict[str, Any]]]]] = {
       "track": {},
       "return": {},
+      "master": {},
     }
+    # (domain, index, device_index, param_index) -> param_name, learned from reads
+    self._param_names: Dict[Tuple[str, int, int, int], str] = {}
     self._transport: Dict[str, Any] = {}
+    self._transport_meta: Dict[str, Dict[str, Any]] = {}
+
+  # --- Freshness ---
+  @staticmethod
+  def is_fresh(entry: Optional[Dict[str, Any]], max_age: Optional[float], pushed_max_age: Optional[float] = None) -> bool:
+    """True when a slot exists and is younger than its max age.
+
+    Slots last written by a Live push event (source "live") may use the
+    longer ``pushed_max_age`` since Live keeps them current.
+    """
+    if not entry:
+      return False
+    if max_age is None:
+      return True
+    ts = entry.get("ts")
+    if not isinstance(ts, (int, float)):
+      return False
+    limit = pushed_max_age if (pushed_max_age is not None and entry.get("source") == "live") else max_age
+    return (time.time() - float(ts)) <= float(limit)
 
   # --- Mixer ---
   def update_mixer(
@@ -38,10 +90,10 @@ class ValueRegistry:
     entity: str,
     index: int,
     field: str,
-    *,
     normalized_value: Optional[float] = None,
     display_value: Optional[str] = None,
     unit: Optional[str] = None,
+    *,
     source: str = "op",
   ) -> None:
     try:
@@ -52,6 +104,7 @@ class ValueRegistry:
         "display": display_value,
         "unit": unit,
         "source": source,
+        "ts": time.time(),
       }
     except Exception:
       pass
@@ -59,10 +112,26 @@ class ValueRegistry:
   def get_mixer(self) -> Dict[str, Any]:
     return self._mixer
 
+  def get_mixer_field(
+    self,
+    entity: str,
+    index: int,
+    field: str,
+    *,
+    max_age: Optional[float] = None,
+    pushed_max_age: Optional[float] = None,
+  ) -> Optional[Dict[str, Any]]:
+    """Return a mixer slot if present and fresh, else None."""
+    try:
+      idx = 0 if entity == "master" else int(index)
+      entry = (self._mixer.get(str(entity)) or {}).get(idx, {}).get(str(field))
+    except Exception:
+      return None
+    return entry if self.is_fresh(entry, max_age, pushed_max_age) else None
+
   # --- Devices ---
   def update_device_param(
     self,
-    *,
     domain: str,
     index: int,
     device_index: int,
@@ -70,34 +139,201 @@ class ValueRegistry:
     normalized_value: Optional[float] = None,
     display_value: Optional[str] = None,
     unit: Optional[str] = None,
+    *,
+    param_index: Optional[int] = None,
     source: str = "op",
   ) -> None:
     try:
+      if param_index is not None and str(param_name) in ("", f"param_{int(param_index)}"):
+        # Set ops don't echo names; reuse the name learned from an earlier read
+        known = self._param_names.get((str(domain), int(index), int(device_index), int(param_index)))
+        if known:
+          param_name = known
       dom = self._devices.setdefault(str(domain), {})
       devs = dom.setdefault(int(index), {})
       params = devs.setdefault(int(device_index), {})
-      params[str(param_name)] = {
+      entry: Dict[str, Any] = {
         "normalized": normalized_value,
         "display": display_value,
         "unit": unit,
         "source": source,
+        "ts": time.time(),
       }
+      if param_index is not None:
+        entry["index"] = int(param_index)
+        self._param_names[(str(domain), int(index), int(device_index), int(param_index))] = str(param_name)
+      else:
+        prev = params.get(str(param_name)) or {}
+        if "index" in prev:
+          entry["index"] = prev["index"]
+      params[str(param_name)] = entry
     except Exception:
       pass
 
   def get_devices(self) -> Dict[str, Any]:
     return self._devices
 
+  def get_device_params(
+    self,
+    domain: str,
+    index: int,
+    device_index: int,
+    *,
+    max_age: Optional[float] = None,
+    pushed_max_age: Optional[float] = None,
+  ) -> Optional[Dict[str, Dict[str, Any]]]:
+    """Return all known params of one device if every slot is fresh, else None."""
+    try:
+      params = (self._devices.get(str(domain)) or {}).get(int(index), {}).get(int(device_index))
+    except Exception:
+      return None
+    if not params:
+      return None
+    if not all(self.is_fresh(e, max_age, pushed_max_age) for e in params.values()):
+      return None
+    return params
+
+  def _drop_devices(self, domain: str, index: Optional[int] = None) -> None:
+    dom = self._devices.get(domain)
+    if dom is None:
+      return
+    if index is None:
+      dom.clear()
+    else:
+      dom.pop(int(index), None)
+    self._param_names = {
+      k: v for k, v in self._param_names.items()
+      if not (k[0] == domain and (index is None or k[1] == int(index)))
+    }
+
   # --- Transport ---
   def update_transport(self, name: str, value: Any, *, source: str = "op") -> None:
     try:
       self._transport[str(name)] = value
+      self._transport_meta[str(name)] = {"value": value, "source": source, "ts": time.time()}
     except Exception:
       pass
 
   def get_transport(self) -> Dict[str, Any]:
     return dict(self._transport)
 
+  def get_transport_field(
+    self,
+    name: str,
+    *,
+    max_age: Optional[float] = None,
+    pushed_max_age: Optional[float] = None,
+  ) -> Optional[Dict[str, Any]]:
+    """Return {value, source, ts} for a transport field if fresh, else None."""
+    entry = self._transport_meta.get(str(name))
+    return entry if self.is_fresh(entry, max_age, pushed_max_age) else None
+
+  # --- Live push events ---
+  def apply_event(self, event: Dict[str, Any]) -> bool:
+    """Apply one Live event (from the Remote Script listener) to its slot.
+
+    Value events update the matching mixer/send/device/transport slot with
+    source "live". Structural events (tracks or devices added, removed or
+    reordered) drop the slots whose indices they invalidate. Returns True
+    when the registry changed.
+    """
+    try:
+      name = str(event.get("event") or "")
+      value = event.get("value")
+
+      entity = _MIXER_EVENTS.get(name)
+      if entity is not None:
+        field = event.get("field")
+        if not field or not isinstance(value, (int, float)):
+          return False
+        if entity == "master":
+          index = 0
+        else:
+          raw = event.get("track" if entity == "track" else "return")
+          if raw is None:
+            return False
+          index = int(raw)
+        display = event.get("display_value")
+        self.update_mixer(
+          entity,
+          index,
+          str(field),
+          float(value),
+          str(display) if display is not None else None,
+          source="live",
+        )
+        return True
+
+      if name == "send_changed":
+        if event.get("send_index") is None or not isinstance(value, (int, float)):
+          return False
+        if event.get("track") is not None:
+          entity, index = "track", int(event["track"])
+        elif event.get("return") is not None:
+          entity, index = "return", int(event["return"])
+        else:
+          return False
+        display = event.get("display_value")
+        self.update_mixer(
+          entity,
+          index,
+          send_field(int(event["send_index"])),
+          float(value),
+          str(display) if display is not None else None,
+          source="live",
+        )
+        return True
+
+      if name == "transport_changed":
+        field = event.get("field")
+        if not field or "value" not in event:
+          return False
+        self.update_transport(str(field), value, source="live")
+        return True
+
+      if name in ("device_param_changed", "master_device_param_changed"):
+        domain = "master" if name.startswith("master") else str(event.get("domain") or "track")
+        index = 0 if domain == "master" else int(event.get("track", event.get("return", event.get("index", 0))))
+        di = event.get("device_index")
+        pi = event.get("param_index")
+        if di is None or pi is None or not isinstance(value, (int, float)):
+          return False
+        pname = event.get("param_name") or self._param_names.get((domain, index, int(di), int(pi)))
+        if not pname:
+          return False
+        display = event.get("display_value")
+        self.update_device_param(
+          domain,
+          index,
+          int(di),
+          str(pname),
+          float(value),
+          str(display) if display is not None else None,
+          param_index=int(pi),
+          source="live",
+        )
+        return True
+
+      if name in _TRACK_STRUCTURE_EVENTS:
+        # Track indices shift: drop per-track state, keep returns/master
+        self._mixer["track"].clear()
+        self._drop_devices("track")
+        return True
+
+      if name in ("return_created",):
+        self._mixer["return"].clear()
+        self._drop_devices("return")
+        return True
+
+      domain = _DEVICE_STRUCTURE_EVENTS.get(name)
+      if domain is not None:
+        raw = event.get("track" if domain == "track" else "return")
+        self._drop_devices(domain, int(raw) if raw is not None else None)
+        return True
+    except Exception:
+      return False
+    return False
+
 
 # --- Façade wrappers (import inside to avoid cycles) ---
 def update_mixer(
@@ -135,6 +371,7 @@ def update_device_param(
   normalized_value: Optional[float] = None,
   display_value: Optional[str] = None,
   unit: Optional[str] = None,
+  param_index: Optional[int] = None,
   source: str = "op",
 ) -> None:
   try:
@@ -148,6 +385,7 @@ def update_device_param(
       normalized_value=normalized_value,
       display_value=display_value,
       unit=unit,
+      param_index=param_index,
       source=source,
     )
   except Exception:
@@ -0,0 +1,219 @@
+"""
+Write Queue
+
+Coalescing writer for continuous controls (UI knob drags, MCP tool loops).
+Each (entity, index, field[, send/device/param]) key has one slot holding
+only the newest pending value; a flusher thread sends the pending slots at
+WRITE_QUEUE_RATE_HZ (default 50), up to WRITE_QUEUE_MAX_BATCH keys per
+apply_writes datagram.
+
+Values are never dropped by coalescing: a key's latest value is always in
+the next flush, and a failed flush is re-queued (unless a newer value has
+arrived) up to WRITE_QUEUE_RETRIES times. Callers don't wait for Live unless
+they pass wait=True.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from server.services.ableton_client import data_or_raw, request_op
+
+WriteKey = Tuple[str, int, str, Optional[int], Optional[int], Optional[int]]
+
+
+class _Slot:
+    __slots__ = ("write", "waiters", "attempts")
+
+    def __init__(self, write: Dict[str, Any]) -> None:
+        self.write = write
+        self.waiters: List["_Waiter"] = []
+        self.attempts = 0
+
+
+class _Waiter:
+    __slots__ = ("event", "result")
+
+    def __init__(self) -> None:
+        self.event = threading.Event()
+        self.result: Optional[Dict[str, Any]] = None
+
+    def resolve(self, result: Dict[str, Any]) -> None:
+        self.result = result
+        self.event.set()
+
+
+def _send_writes(writes: List[Dict[str, Any]], timeout: float) -> Optional[Dict[str, Any]]:
+    resp = request_op("apply_writes", timeout=timeout, writes=writes)
+    if not resp:
+        return None
+    data = data_or_raw(resp)
+    return data if isinstance(data, dict) else None
+
+
+class WriteQueue:
+    def __init__(
+        self,
+        send_fn: Optional[Callable[[List[Dict[str, Any]], float], Optional[Dict[str, Any]]]] = None,
+        rate_hz: Optional[float] = None,
+        max_batch: Optional[int] = None,
+        retries: Optional[int] = None,
+    ) -> None:
+        self._send = send_fn or _send_writes
+        self.rate_hz = max(1.0, float(rate_hz if rate_hz is not None else os.getenv("WRITE_QUEUE_RATE_HZ", "50")))
+        self.max_batch = max(1, int(max_batch if max_batch is not None else os.getenv("WRITE_QUEUE_MAX_BATCH", "64")))
+        self.retries = max(0, int(retries if retries is not None else os.getenv("WRITE_QUEUE_RETRIES", "3")))
+        self._slots: Dict[WriteKey, _Slot] = {}  # insertion-ordered: oldest pending key first
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._in_flight = 0
+        self._last_flush = 0.0
+        self._stats: Dict[str, Any] = {
+            "submitted": 0,
+            "coalesced": 0,
+            "datagrams": 0,
+            "writes_sent": 0,
+            "retried": 0,
+            "failed": 0,
+            "last_batch": 0,
+            "last_flush_ms": None,
+        }
+
+    # --------- Submit ---------
+    def submit(
+        self,
+        entity: str,
+        index: int,
+        field: str,
+        value: float,
+        *,
+        send_index: Optional[int] = None,
+        device_index: Optional[int] = None,
+        param_index: Optional[int] = None,
+        wait: bool = False,
+        timeout: float = 1.0,
+    ) -> Dict[str, Any]:
+        """Queue a value write; the newest value per key wins.
+
+        With wait=True, block until the write is acknowledged by Live (or
+        timeout) and return its result.
+        """
+        key: WriteKey = (str(entity), int(index), str(field), send_index, device_index, param_index)
+        write: Dict[str, Any] = {"entity": key[0], "index": key[1], "field": key[2], "value": float(value)}
+        if send_index is not None:
+            write["send_index"] = int(send_index)
+        if device_index is not None:
+            write["device_index"] = int(device_index)
+        if param_index is not None:
+            write["param_index"] = int(param_index)
+
+        waiter = _Waiter() if wait else None
+        with self._cond:
+            self._stats["submitted"] += 1
+            slot = self._slots.get(key)
+            coalesced = slot is not None
+            if slot is None:
+                slot = self._slots[key] = _Slot(write)
+            else:
+                self._stats["coalesced"] += 1
+                slot.write = write
+                slot.attempts = 0
+            if waiter is not None:
+                slot.waiters.append(waiter)
+            self._ensure_thread()
+            self._cond.notify()
+
+        if waiter is None:
+            return {"ok": True, "queued": True, "coalesced": coalesced}
+        if not waiter.event.wait(timeout):
+            return {"ok": False, "error": "timeout", "queued": True}
+        return waiter.result or {"ok": False, "error": "no_result"}
+
+    # --------- Flushing ---------
+    def _ensure_thread(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="write-queue", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        interval = 1.0 / self.rate_hz
+        while True:
+            with self._cond:
+                while not self._slots:
+                    self._cond.wait()
+            # Pace datagrams; writes arriving meanwhile coalesce into the pending slots
+            delay = self._last_flush + interval - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            try:
+                self.flush_once()
+            except Exception:
+                pass
+
+    def flush_once(self) -> int:
+        """Send up to max_batch pending keys in one datagram. Returns keys sent."""
+        with self._cond:
+            keys = list(self._slots)[: self.max_batch]
+            batch = [(k, self._slots.pop(k)) for k in keys]
+            self._in_flight += len(batch)
+        if not batch:
+            return 0
+        self._last_flush = time.monotonic()
+        t0 = time.perf_counter()
+        writes = [slot.write for _, slot in batch]
+        try:
+            out = self._send(writes, 1.0 + 0.01 * len(writes))
+        except Exception:
+            out = None
+        results = list((out or {}).get("results") or [])
+
+        with self._cond:
+            self._in_flight -= len(batch)
+            self._stats["datagrams"] += 1
+            self._stats["writes_sent"] += len(writes)
+            self._stats["last_batch"] = len(writes)
+            self._stats["last_flush_ms"] = round((time.perf_counter() - t0) * 1000.0, 1)
+            for n, (key, slot) in enumerate(batch):
+                res = results[n] if n < len(results) else None
+                if res is None and key in self._slots:
+                    # No reply, but a newer value is already queued: it carries these waiters
+                    self._slots[key].waiters.extend(slot.waiters)
+                    continue
+                if res is None and slot.attempts < self.retries:
+                    # No reply: re-queue so the final value still reaches Live
+                    slot.attempts += 1
+                    self._slots[key] = slot
+                    self._stats["retried"] += 1
+                    continue
+                if res is None:
+                    res = {"ok": False, "error": "no_reply"}
+                if not res.get("ok"):
+                    self._stats["failed"] += 1
+                for w in slot.waiters:
+                    w.resolve(res)
+            self._cond.notify_all()
+        return len(batch)
+
+    def drain(self, timeout: float = 2.0) -> bool:
+        """Block until nothing is pending or in flight (shutdown/tests)."""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while self._slots or self._in_flight:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                **self._stats,
+                "pending": len(self._slots),
+                "in_flight": self._in_flight,
+                "rate_hz": self.rate_hz,
+                "max_batch": self.max_batch,
+            }
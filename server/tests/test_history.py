@@ -0,0 +1,151 @@
+"""
+Tests for the undo/redo journal (server/services/history.py).
+
+Covers replay of the JSON-lines log, log compaction into a snapshot line,
+and how _restore_msg collapses repeated writes to the same slot.
+"""
+
+import json
+
+import pytest
+
+from server.services import history as History
+from server.services.history import Entry, HistoryJournal
+
+
+def _entry(label, value, prev=0.0):
+    return Entry(label, [History.mixer_change("track", 0, "volume", prev, value)])
+
+
+def _labels(entries):
+    return [e.label for e in entries]
+
+
+@pytest.fixture
+def log_path(tmp_path):
+    return str(tmp_path / "history.jsonl")
+
+
+# ============================================================================
+# REPLAY
+# ============================================================================
+
+def test_replay_restores_undo_and_redo_stacks(log_path):
+    journal = HistoryJournal(max_entries=16, log_path=log_path)
+    for i, label in enumerate(("a", "b", "c")):
+        journal.push(_entry(label, 0.1 * (i + 1)))
+    journal.undone(journal.pop_undo())
+    journal.undone(journal.pop_undo())
+    journal.redone(journal.pop_redo())
+
+    replayed = HistoryJournal(max_entries=16, log_path=log_path)
+    assert _labels(replayed.undo) == ["a", "b"]
+    assert _labels(replayed.redo) == ["c"]
+    assert replayed.undo[-1].changes[0].new == pytest.approx(0.2)
+
+
+def test_replay_push_clears_redo(log_path):
+    journal = HistoryJournal(max_entries=16, log_path=log_path)
+    journal.push(_entry("a", 0.1))
+    journal.undone(journal.pop_undo())
+    journal.push(_entry("b", 0.2))
+
+    replayed = HistoryJournal(max_entries=16, log_path=log_path)
+    assert _labels(replayed.undo) == ["b"]
+    assert not replayed.redo
+
+
+def test_replay_ignores_torn_final_line(log_path):
+    journal = HistoryJournal(max_entries=16, log_path=log_path)
+    journal.push(_entry("a", 0.1))
+    with open(log_path, "a", encoding="utf-8") as f:
+        f.write('{"op":"push","entry":{"lab')
+
+    replayed = HistoryJournal(max_entries=16, log_path=log_path)
+    assert _labels(replayed.undo) == ["a"]
+
+
+def test_restore_is_not_logged(log_path):
+    journal = HistoryJournal(max_entries=16, log_path=log_path)
+    journal.push(_entry("a", 0.1))
+    # A failed undo puts the entry back without changing logged state
+    journal.restore(journal.pop_undo(), to_undo=True)
+
+    replayed = HistoryJournal(max_entries=16, log_path=log_path)
+    assert _labels(replayed.undo) == ["a"]
+
+
+# ============================================================================
+# COMPACTION
+# ============================================================================
+
+def test_log_compacts_to_snapshot(log_path):
+    journal = HistoryJournal(max_entries=2, log_path=log_path)
+    for i in range(9):
+        journal.push(_entry(f"e{i}", 0.01 * i))
+
+    with open(log_path, "r", encoding="utf-8") as f:
+        lines = [json.loads(line) for line in f]
+    # 9 lines > 4 * max_entries: rewritten as one snapshot, then appended to
+    assert len(lines) < 9
+    assert lines[0]["op"] == "snapshot"
+    assert _labels(journal.undo) == ["e7", "e8"]
+
+    replayed = HistoryJournal(max_entries=2, log_path=log_path)
+    assert _labels(replayed.undo) == ["e7", "e8"]
+
+
+def test_replay_compacts_long_log(log_path):
+    journal = HistoryJournal(max_entries=4, log_path=log_path)
+    for i in range(4):
+        journal.push(_entry(f"e{i}", 0.01 * i))
+    journal.undone(journal.pop_undo())
+
+    replayed = HistoryJournal(max_entries=4, log_path=log_path)
+    with open(log_path, "r", encoding="utf-8") as f:
+        lines = [json.loads(line) for line in f]
+    assert [rec["op"] for rec in lines] == ["snapshot"]
+    assert _labels(replayed.undo) == ["e0", "e1", "e2"]
+    assert _labels(replayed.redo) == ["e3"]
+
+
+# ============================================================================
+# RESTORE MESSAGE
+# ============================================================================
+
+def test_restore_msg_dedupes_slots():
+    entry = Entry(
+        "group",
+        [
+            History.mixer_change("track", 0, "volume", 0.5, 0.6),
+            History.mixer_change("track", 0, "volume", 0.6, 0.7),
+            History.mixer_change("track", 1, "pan", 0.0, 0.25),
+            History.param_change("track", 0, 1, 3, 0.1, 0.2),
+            History.param_change("track", 0, 1, 3, 0.2, 0.9),
+        ],
+    )
+
+    undo = History._restore_msg(entry, "prev")
+    assert undo["op"] == "apply_writes"
+    assert len(undo["writes"]) == 3
+    by_slot = {(w["index"], w["field"], w.get("param_index")): w["value"] for w in undo["writes"]}
+    # Undo restores the value from before the first change to each slot
+    assert by_slot == {(0, "volume", None): 0.5, (1, "pan", None): 0.0, (0, "param", 3): 0.1}
+
+    redo = History._restore_msg(entry, "new")
+    by_slot = {(w["index"], w["field"], w.get("param_index")): w["value"] for w in redo["writes"]}
+    # Redo lands on the value after the last change to each slot
+    assert by_slot == {(0, "volume", None): 0.7, (1, "pan", None): 0.25, (0, "param", 3): 0.9}
+
+
+def test_restore_msg_keeps_device_and_send_indices():
+    entry = Entry(
+        "mixed",
+        [
+            History.send_change("return", 1, 0, 0.3, 0.4),
+            History.param_change("return", 1, 2, 5, 0.0, 1.0),
+        ],
+    )
+    writes = History._restore_msg(entry, "prev")["writes"]
+    assert {"entity": "return", "index": 1, "field": "send", "value": 0.3, "send_index": 0} in writes
+    assert {"entity": "return", "index": 1, "field": "param", "value": 0.0, "device_index": 2, "param_index": 5} in writes
@@ -0,0 +1,113 @@
+"""
+Tests for /snapshot/query target fan-out (server/api/overview.py).
+
+Targets are answered concurrently and share one per-request _LiveReads, so
+each distinct Live read is sent once however many targets need it.
+"""
+
+import asyncio
+import threading
+import time
+from collections import Counter
+from unittest.mock import patch
+
+from server.api import overview
+from server.api.overview import QueryTarget, SnapshotQueryRequest, _LiveReads
+
+OVERVIEW = {
+    "tracks": [
+        {"index": 1, "name": "Drums", "type": "audio"},
+        {"index": 2, "name": "Bass", "type": "midi"},
+    ]
+}
+RETURNS = {"returns": [{"index": 0, "name": "Reverb"}]}
+
+
+class FakeLive:
+    """request_op stand-in that counts calls per op."""
+
+    def __init__(self, delay=0.0):
+        self.calls = Counter()
+        self.delay = delay
+        self._lock = threading.Lock()
+
+    def __call__(self, op, timeout=1.0, **params):
+        with self._lock:
+            self.calls[op] += 1
+        if self.delay:
+            time.sleep(self.delay)
+        if op == "get_overview":
+            return {"ok": True, "data": OVERVIEW}
+        if op == "get_return_tracks":
+            return {"ok": True, "data": RETURNS}
+        return None
+
+
+def _query(*targets):
+    request = SnapshotQueryRequest(targets=[QueryTarget(**t) for t in targets])
+    return asyncio.run(overview.query_parameters(request))
+
+
+def test_project_targets_share_live_reads():
+    live = FakeLive()
+    with patch("server.api.overview.request_op", live):
+        out = _query(
+            {"parameter": "tracks_count"},
+            {"parameter": "audio_tracks_list"},
+            {"parameter": "midi_tracks_count"},
+            {"parameter": "return_tracks_list"},
+            {"track": "Track 2", "parameter": "name"},
+        )
+
+    assert out["ok"]
+    values = [v["value"] for v in out["values"]]
+    assert values == [2, ["Track 1 (Drums)"], 1, ["Return A (Reverb)"], "Bass"]
+    assert live.calls == Counter({"get_overview": 1, "get_return_tracks": 1})
+
+
+def test_results_keep_target_order():
+    live = FakeLive(delay=0.05)
+    with patch("server.api.overview.request_op", live):
+        out = _query(
+            {"track": "Return A", "parameter": "name"},
+            {"parameter": "tracks_count"},
+            {"track": "Track 1", "parameter": "name"},
+        )
+    assert [v["value"] for v in out["values"]] == ["Reverb", 2, "Drums"]
+
+
+def test_live_reads_memoize_by_op_and_args():
+    live = FakeLive(delay=0.05)
+
+    async def run():
+        reads = _LiveReads()
+        with patch("server.api.overview.request_op", live):
+            t0 = time.perf_counter()
+            results = await asyncio.gather(
+                reads.data("get_overview"),
+                reads.data("get_overview"),
+                reads.data("get_return_tracks"),
+                reads.data("get_track_status", track_index=1),
+                reads.data("get_track_status", track_index=2),
+                reads.data("get_track_status", track_index=1),
+            )
+            return results, time.perf_counter() - t0
+
+    results, elapsed = asyncio.run(run())
+    assert results[0] == results[1] == OVERVIEW
+    assert results[3] == {}
+    assert live.calls == Counter({"get_overview": 1, "get_return_tracks": 1, "get_track_status": 2})
+    # Distinct reads run concurrently rather than back to back
+    assert elapsed < 4 * live.delay
+
+
+def test_live_reads_swallow_failures():
+    def broken(op, timeout=1.0, **params):
+        raise OSError("socket closed")
+
+    async def run():
+        reads = _LiveReads()
+        with patch("server.api.overview.request_op", broken):
+            return await reads.data("get_overview")
+
+    assert asyncio.run(run()) == {}
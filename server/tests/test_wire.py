@@ -0,0 +1,181 @@
+"""
+Tests for the compact UDP wire format (ableton_remote/Fadebender/wire.py).
+
+Covers encode/decode round-trips against JSON, fragmenting replies across
+datagrams, and the Reassembler's resend requests for missing fragments,
+lost whole parts and a lost final part.
+"""
+
+import json
+
+import pytest
+
+from ableton_remote.Fadebender import wire
+
+
+def _json_roundtrip(obj):
+    return json.loads(json.dumps(obj))
+
+
+def _params(n, device="Reverb"):
+    return [
+        {"index": i, "name": f"{device} P{i}", "value": i / 10.0, "min": 0.0, "max": 1.0, "display": f"{i} %"}
+        for i in range(n)
+    ]
+
+
+# ============================================================================
+# ENCODE / DECODE
+# ============================================================================
+
+@pytest.mark.parametrize(
+    "obj",
+    [
+        None,
+        True,
+        0,
+        -(2 ** 63),
+        2 ** 70,
+        1.5,
+        "",
+        "héllo",
+        [],
+        {},
+        [1, "a", None, 2.5, [True, False]],
+        {"a": 1, "b": {"c": [1, 2, 3]}, "c": "a"},
+        {1: "int key", None: "none key"},
+        (1, 2),
+        [{"x": 1}, {"x": 2}],
+        [{"x": 1}, {"y": 2}],
+        [{"n": 2 ** 40}, {"n": 1}],
+        [{"s": "same"} for _ in range(10)],
+        [{"s": f"s{i}"} for i in range(10)],
+        [{"s": "a\x00b"} for _ in range(10)],
+        [{"v": 1}, {"v": 1.5}, {"v": None}],
+    ],
+)
+def test_roundtrip_matches_json(obj):
+    assert wire.decode(wire.encode(obj)) == _json_roundtrip(obj)
+
+
+def test_roundtrip_device_param_dump():
+    dump = {
+        "ok": True,
+        "data": {
+            "devices": [
+                {"index": 0, "name": "Reverb", "signature": "abc", "params": _params(32)},
+                {"index": 1, "name": "Reverb", "signature": "abc", "params": _params(32)},
+                {"index": 2, "name": "EQ Eight", "signature": "def", "params": _params(12, "EQ")},
+            ]
+        },
+    }
+    blob = wire.encode(dump)
+    assert wire.decode(blob) == _json_roundtrip(dump)
+    # Repeated param-name columns are sent once
+    assert len(blob) < len(json.dumps(dump))
+
+
+def test_dumps_loads_both_encodings():
+    obj = {"ok": True, "values": [0.1, 0.2]}
+    assert wire.loads(wire.dumps(obj, wire.ENCODING)) == obj
+    assert wire.loads(wire.dumps(obj)) == obj
+    assert wire.dumps(obj, wire.ENCODING)[:3] == wire.MAGIC
+
+
+def test_choose_first_supported():
+    assert wire.choose(["cbor", "fbp1", "json"]) == wire.ENCODING
+    assert wire.choose("json") == wire.JSON
+    assert wire.choose(None) == wire.JSON
+
+
+def test_decode_rejects_other_frames():
+    with pytest.raises(ValueError):
+        wire.decode(b'{"ok":true}')
+
+
+# ============================================================================
+# FRAGMENTS AND REASSEMBLY
+# ============================================================================
+
+def _stream(parts, sid=7, frag_bytes=64):
+    """Datagrams per part for a stream of objects."""
+    return [
+        wire.fragment(sid, n, wire.encode(obj), last=(n == len(parts) - 1), frag_bytes=frag_bytes)
+        for n, obj in enumerate(parts)
+    ]
+
+
+def _feed(rs, datagrams):
+    out = []
+    for d in datagrams:
+        out.extend(rs.add(wire.parse_fragment(d)))
+    return out
+
+
+def test_fragments_reassemble_in_order():
+    parts = [{"track": i, "params": _params(6)} for i in range(3)]
+    frags = _stream(parts)
+    assert all(len(f) > 1 for f in frags)
+
+    rs = wire.Reassembler()
+    # Parts arrive out of order; they are released in order
+    got = _feed(rs, frags[2] + frags[0][::-1] + frags[1])
+    assert got == parts
+    assert rs.done
+    assert not rs.incomplete
+
+
+def test_parse_fragment_ignores_plain_reply():
+    assert wire.parse_fragment(wire.encode({"ok": True})) is None
+    assert wire.parse_fragment(b'{"ok":true}') is None
+
+
+def test_duplicates_and_other_streams_are_ignored():
+    parts = [{"a": 1}, {"b": 2}]
+    frags = _stream(parts)
+    rs = wire.Reassembler()
+    assert _feed(rs, frags[0]) == [parts[0]]
+    assert _feed(rs, frags[0]) == []
+    assert _feed(rs, _stream([{"z": 0}], sid=8)[0]) == []
+    assert _feed(rs, frags[1]) == [parts[1]]
+
+
+def test_resend_lists_missing_fragments_and_parts():
+    parts = [{"track": i, "params": _params(6)} for i in range(4)]
+    frags = _stream(parts)
+    rs = wire.Reassembler()
+    # Part 0 loses fragment 1, part 1 is lost entirely, part 2 arrives whole
+    got = _feed(rs, [f for n, f in enumerate(frags[0]) if n != 1] + frags[2])
+    assert got == []
+    assert rs.incomplete
+
+    req = rs.resend_request()
+    assert req["op"] == "resend" and req["stream_id"] == 7
+    assert "tail" not in req
+    assert sorted(map(tuple, req["missing"])) == [(0, 1), (1, -1)]
+
+    got = _feed(rs, [frags[0][1]] + frags[1] + frags[3])
+    assert got == parts
+    assert rs.done
+
+
+def test_resend_asks_for_tail_when_nothing_known_missing():
+    parts = [{"a": 1}, {"b": 2}, {"c": 3}]
+    frags = _stream(parts)
+    rs = wire.Reassembler()
+    # The final part is lost: nothing is known missing, but the stream isn't done
+    assert _feed(rs, frags[0] + frags[1]) == parts[:2]
+    assert not rs.incomplete and not rs.done
+
+    req = rs.resend_request()
+    assert req == {"op": "resend", "stream_id": 7, "missing": [], "tail": 1}
+
+    assert _feed(rs, frags[2]) == parts[2:]
+    assert rs.done
+
+
+def test_empty_part_is_one_fragment():
+    datagrams = wire.fragment(1, 0, b"", last=True)
+    assert len(datagrams) == 1
+    sid, part, frag, nfrags, last, payload = wire.parse_fragment(datagrams[0])
+    assert (sid, part, frag, nfrags, last, payload) == (1, 0, 0, 1, True, b"")
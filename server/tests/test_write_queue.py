@@ -0,0 +1,152 @@
+"""
+Tests for the coalescing write queue (server/services/write_queue.py).
+
+Most tests keep the flusher thread from starting and call flush_once()
+directly, so batching and retries are deterministic.
+"""
+
+import threading
+
+from server.services.write_queue import WriteQueue
+
+
+class FakeLive:
+    """send_fn recording each datagram; replies follow ``script`` then default to ok."""
+
+    def __init__(self, script=None):
+        self.sent = []
+        self.script = list(script or [])
+        self._lock = threading.Lock()
+
+    def __call__(self, writes, timeout):
+        with self._lock:
+            self.sent.append([dict(w) for w in writes])
+            reply = self.script.pop(0) if self.script else "ok"
+        if reply is None:
+            return None
+        if isinstance(reply, Exception):
+            raise reply
+        return {"results": [{"ok": True, "value": w["value"]} for w in writes]}
+
+
+def _manual(live, **kw):
+    queue = WriteQueue(send_fn=live, rate_hz=1000, **kw)
+    queue._ensure_thread = lambda: None
+    return queue
+
+
+# ============================================================================
+# COALESCING
+# ============================================================================
+
+def test_newest_value_per_key_wins():
+    live = FakeLive()
+    queue = _manual(live)
+    for v in (0.1, 0.2, 0.3):
+        queue.submit("track", 0, "volume", v)
+    queue.submit("track", 1, "volume", 0.5)
+
+    assert queue.flush_once() == 2
+    assert live.sent == [[
+        {"entity": "track", "index": 0, "field": "volume", "value": 0.3},
+        {"entity": "track", "index": 1, "field": "volume", "value": 0.5},
+    ]]
+    stats = queue.stats()
+    assert stats["submitted"] == 4
+    assert stats["coalesced"] == 2
+    assert stats["pending"] == 0
+
+
+def test_keys_include_send_and_param_indices():
+    live = FakeLive()
+    queue = _manual(live)
+    queue.submit("track", 0, "send", 0.1, send_index=0)
+    queue.submit("track", 0, "send", 0.2, send_index=1)
+    queue.submit("track", 0, "param", 0.3, device_index=0, param_index=2)
+    queue.submit("track", 0, "param", 0.4, device_index=0, param_index=2)
+
+    assert queue.flush_once() == 3
+    assert [w["value"] for w in live.sent[0]] == [0.1, 0.2, 0.4]
+    assert live.sent[0][2]["device_index"] == 0 and live.sent[0][2]["param_index"] == 2
+
+
+def test_batches_are_capped_oldest_first():
+    live = FakeLive()
+    queue = _manual(live, max_batch=2)
+    for i in range(5):
+        queue.submit("track", i, "pan", 0.0)
+
+    assert [queue.flush_once() for _ in range(4)] == [2, 2, 1, 0]
+    assert [[w["index"] for w in batch] for batch in live.sent] == [[0, 1], [2, 3], [4]]
+
+
+# ============================================================================
+# RETRY
+# ============================================================================
+
+def test_lost_reply_is_retried_then_reported():
+    live = FakeLive(script=[None, None, None])
+    queue = _manual(live, retries=2)
+    queue.submit("track", 0, "volume", 0.7)
+
+    # First send + 2 retries all go unanswered
+    assert [queue.flush_once() for _ in range(4)] == [1, 1, 1, 0]
+    stats = queue.stats()
+    assert stats["retried"] == 2
+    assert stats["failed"] == 1
+    assert all(batch[0]["value"] == 0.7 for batch in live.sent)
+
+
+def test_retry_succeeds_after_send_error():
+    live = FakeLive(script=[OSError("socket")])
+    queue = _manual(live, retries=1)
+    queue.submit("track", 0, "volume", 0.4)
+
+    assert queue.flush_once() == 1
+    assert queue.stats()["pending"] == 1
+    assert queue.flush_once() == 1
+    stats = queue.stats()
+    assert stats["retried"] == 1
+    assert stats["failed"] == 0
+    assert stats["pending"] == 0
+
+
+def test_newer_value_supersedes_retry():
+    live = FakeLive(script=[None])
+    queue = _manual(live)
+    queue.submit("track", 0, "volume", 0.1)
+
+    def send_and_resubmit(writes, timeout):
+        # A newer value lands while the first datagram is unanswered
+        queue.submit("track", 0, "volume", 0.9)
+        return live(writes, timeout)
+
+    queue._send = send_and_resubmit
+    queue.flush_once()
+    queue._send = live
+    queue.flush_once()
+
+    assert [batch[0]["value"] for batch in live.sent] == [0.1, 0.9]
+    assert queue.stats()["retried"] == 0
+
+
+# ============================================================================
+# FLUSHER THREAD
+# ============================================================================
+
+def test_wait_returns_live_result():
+    live = FakeLive()
+    queue = WriteQueue(send_fn=live, rate_hz=1000)
+
+    res = queue.submit("return", 1, "pan", -0.25, wait=True, timeout=2.0)
+    assert res == {"ok": True, "value": -0.25}
+    assert queue.drain(timeout=2.0)
+
+
+def test_wait_reports_no_reply_after_retries():
+    live = FakeLive(script=[None, None])
+    queue = WriteQueue(send_fn=live, rate_hz=1000, retries=1)
+
+    res = queue.submit("track", 2, "mute", 1.0, wait=True, timeout=2.0)
+    assert res == {"ok": False, "error": "no_reply"}
+    assert len(live.sent) == 2